@@ -5,7 +5,6 @@ Compatible with Termux and PC
 Features: Check account info, upload profile photo, change name, username, bio, and email
 """
 
-import sqlite3
 import json
 import os
 import re
@@ -13,6 +12,7 @@ import hashlib
 import shutil
 from datetime import datetime
 from pathlib import Path
+from core.account_db import get_account_db
 
 class AccountBot:
     def __init__(self):
@@ -28,26 +28,8 @@ class AccountBot:
             os.makedirs(self.profile_pics_dir)
     
     def setup_database(self):
-        """Initialize SQLite database with users table"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                bio TEXT,
-                profile_picture TEXT,
-                created_at TEXT,
-                updated_at TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Initialize SQLite database with users table (koneksi bersama, lihat core/account_db.py)"""
+        self.db = get_account_db(self.db_name)
     
     def hash_password(self, password):
         """Hash password using SHA-256 (hashlib)"""
@@ -81,14 +63,9 @@ class AccountBot:
                 continue
             
             # Check if username exists
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
-            if cursor.fetchone():
-                conn.close()
+            if self.db.username_taken(username):
                 print("Username sudah digunakan!")
                 continue
-            conn.close()
             break
         
         # Get name
@@ -105,14 +82,9 @@ class AccountBot:
                 continue
             
             # Check if email exists
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM users WHERE email = ?", (email,))
-            if cursor.fetchone():
-                conn.close()
+            if self.db.email_taken(email):
                 print("Email sudah digunakan!")
                 continue
-            conn.close()
             break
         
         # Get password
@@ -135,17 +107,7 @@ class AccountBot:
         hashed_password = self.hash_password(password)
         
         # Insert into database
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        
-        cursor.execute('''
-            INSERT INTO users (username, name, email, password, bio, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (username, name, email, hashed_password, bio, now, now))
-        
-        conn.commit()
-        conn.close()
+        self.db.create_user(username, name, email, hashed_password, bio)
         
         print("\nRegistrasi berhasil! Silakan login.")
     
@@ -158,25 +120,10 @@ class AccountBot:
         username = input("Username: ").strip()
         password = input("Password: ").strip()
         
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-        user = cursor.fetchone()
-        conn.close()
-        
-        if user and self.verify_password(password, user[4]):  # user[4] is password
-            self.current_user = {
-                'id': user[0],
-                'username': user[1],
-                'name': user[2],
-                'email': user[3],
-                'password': user[4],
-                'bio': user[5],
-                'profile_picture': user[6],
-                'created_at': user[7],
-                'updated_at': user[8]
-            }
+        user = self.db.get_by_username(username)
+        
+        if user and self.verify_password(password, user['password']):
+            self.current_user = user
             print(f"\nLogin berhasil! Selamat datang, {self.current_user['name']}!")
             return True
         else:
@@ -235,18 +182,7 @@ class AccountBot:
             shutil.copy2(file_path, new_path)
             
             # Update database
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            now = datetime.now().isoformat()
-            
-            cursor.execute('''
-                UPDATE users 
-                SET profile_picture = ?, updated_at = ?
-                WHERE id = ?
-            ''', (new_path, now, self.current_user['id']))
-            
-            conn.commit()
-            conn.close()
+            now = self.db.update_user(self.current_user['id'], 'profile_picture', new_path)
             
             # Update current user
             self.current_user['profile_picture'] = new_path
@@ -273,18 +209,7 @@ class AccountBot:
             new_name = input("Nama baru: ").strip()
         
         # Update database
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        
-        cursor.execute('''
-            UPDATE users 
-            SET name = ?, updated_at = ?
-            WHERE id = ?
-        ''', (new_name, now, self.current_user['id']))
-        
-        conn.commit()
-        conn.close()
+        now = self.db.update_user(self.current_user['id'], 'name', new_name)
         
         # Update current user
         self.current_user['name'] = new_name
@@ -310,25 +235,12 @@ class AccountBot:
                 continue
             
             # Check if username exists
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM users WHERE username = ? AND id != ?", 
-                          (new_username, self.current_user['id']))
-            if cursor.fetchone():
-                conn.close()
+            if self.db.username_taken(new_username, self.current_user['id']):
                 print("Username sudah digunakan!")
                 continue
             
             # Update database
-            now = datetime.now().isoformat()
-            cursor.execute('''
-                UPDATE users 
-                SET username = ?, updated_at = ?
-                WHERE id = ?
-            ''', (new_username, now, self.current_user['id']))
-            
-            conn.commit()
-            conn.close()
+            now = self.db.update_user(self.current_user['id'], 'username', new_username)
             
             # Update current user
             self.current_user['username'] = new_username
@@ -351,18 +263,7 @@ class AccountBot:
         new_bio = input("Bio baru: ").strip()
         
         # Update database
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        
-        cursor.execute('''
-            UPDATE users 
-            SET bio = ?, updated_at = ?
-            WHERE id = ?
-        ''', (new_bio, now, self.current_user['id']))
-        
-        conn.commit()
-        conn.close()
+        now = self.db.update_user(self.current_user['id'], 'bio', new_bio)
         
         # Update current user
         self.current_user['bio'] = new_bio
@@ -388,32 +289,18 @@ class AccountBot:
                 continue
             
             # Check if email exists
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM users WHERE email = ? AND id != ?", 
-                          (new_email, self.current_user['id']))
-            if cursor.fetchone():
-                conn.close()
+            if self.db.email_taken(new_email, self.current_user['id']):
                 print("Email sudah digunakan!")
                 continue
             
             # Verify current password for security
             password = input("Masukkan password untuk konfirmasi: ").strip()
             if not self.verify_password(password, self.current_user['password']):
-                conn.close()
                 print("Password salah!")
                 return
             
             # Update database
-            now = datetime.now().isoformat()
-            cursor.execute('''
-                UPDATE users 
-                SET email = ?, updated_at = ?
-                WHERE id = ?
-            ''', (new_email, now, self.current_user['id']))
-            
-            conn.commit()
-            conn.close()
+            now = self.db.update_user(self.current_user['id'], 'email', new_email)
             
             # Update current user
             self.current_user['email'] = new_email
@@ -463,7 +350,9 @@ if __name__ == "__main__":
     while True:
         print("\n1. Register")
         print("2. Login")
-        print("3. Keluar")
+        print("3. Export registry (csv/json)")
+        print("4. Import registry (csv/json)")
+        print("5. Keluar")
         choice = input("Pilih: ").strip()
         if choice == '1':
             bot.register_user()
@@ -471,6 +360,15 @@ if __name__ == "__main__":
             if bot.login():
                 bot.show_main_menu()
         elif choice == '3':
+            path = input("File tujuan (.csv / .json): ").strip() or "accounts_export.json"
+            print(f"{bot.db.export_file(path)} user diexport ke {path}")
+        elif choice == '4':
+            path = input("File sumber (.csv / .json): ").strip()
+            if os.path.exists(path):
+                print(f"{bot.db.import_file(path)} user diimport")
+            else:
+                print("File tidak ditemukan!")
+        elif choice == '5':
             break
         else:
             print("Pilihan tidak valid!")
\ No newline at end of file
@@ -4,6 +4,11 @@ Banner untuk Bucol Bot Instagram
 """
 
 from colorama import Fore, Style, init
+import logging
+from core.log_pipeline import ui_message
+
+# Pesan success/error/info/warning lewat logger "ui": tampil di console dan
+# (kalau setup_logging sudah dipanggil) ikut tercatat di logs/bot.jsonl
 
 def show_banner():
     """Tampilkan banner Bucol Bot Instagram - Garis Lurus & Simetris"""
@@ -30,16 +35,16 @@ def show_separator():
 
 def success_msg(text):
     """Pesan sukses"""
-    print(f"{Fore.GREEN}✅ {text}{Style.RESET_ALL}")
+    ui_message(logging.INFO, "success", text)
 
 def error_msg(text):
     """Pesan error"""
-    print(f"{Fore.RED}❌ {text}{Style.RESET_ALL}")
+    ui_message(logging.ERROR, "error", text)
 
 def info_msg(text):
     """Pesan info"""
-    print(f"{Fore.CYAN}ℹ️  {text}{Style.RESET_ALL}")
+    ui_message(logging.INFO, "info", text)
 
 def warning_msg(text):
     """Pesan warning"""
-    print(f"{Fore.YELLOW}⚠️  {text}{Style.RESET_ALL}")
+    ui_message(logging.WARNING, "warning", text)
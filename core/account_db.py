@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Account DB - Data access bersama untuk accounts.db (AccountBot & info.py)
+Fitur:
+- Satu koneksi SQLite long-lived per file (mode WAL)
+- SQL konstan -> prepared statement di-cache oleh sqlite3
+- Row dikembalikan sebagai mapping (row['password']), bukan tuple (user[4])
+- Migrasi schema bertahap (tabel schema_version), index username/email
+- Riwayat perubahan profil (profile_history)
+- Import/export registry massal dalam satu transaksi
+"""
+
+import os
+import csv
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_CACHE = 64
+
+# =====================================================
+# 🧱 MIGRATIONS
+# =====================================================
+# (versi, deskripsi, statement). Tambah migrasi baru di akhir, jangan ubah yang sudah rilis.
+MIGRATIONS = [
+    (1, "tabel users", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            bio TEXT,
+            profile_picture TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        """,
+    ]),
+    (2, "index username & email (case-insensitive)", [
+        "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email COLLATE NOCASE)",
+    ]),
+    (3, "riwayat perubahan profil", [
+        """
+        CREATE TABLE IF NOT EXISTS profile_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            field TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            changed_at TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_profile_history_user ON profile_history(user_id, changed_at)",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+REGISTRY_COLUMNS = ["username", "name", "email", "password", "bio", "profile_picture", "created_at", "updated_at"]
+
+SQL = {
+    "by_username": "SELECT * FROM users WHERE username = ?",
+    "by_id": "SELECT * FROM users WHERE id = ?",
+    # COLLATE NOCASE -> pakai index migrasi 2, "Budi@Mail.com" dianggap sama dengan "budi@mail.com"
+    "username_taken": "SELECT 1 FROM users WHERE username = ? COLLATE NOCASE AND id != ?",
+    "email_taken": "SELECT 1 FROM users WHERE email = ? COLLATE NOCASE AND id != ?",
+    "insert": """
+        INSERT INTO users (username, name, email, password, bio, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "upsert": """
+        INSERT INTO users (username, name, email, password, bio, profile_picture, created_at, updated_at)
+        VALUES (:username, :name, :email, :password, :bio, :profile_picture, :created_at, :updated_at)
+        ON CONFLICT(username) DO UPDATE SET
+            name = excluded.name, email = excluded.email, password = excluded.password,
+            bio = excluded.bio, profile_picture = excluded.profile_picture, updated_at = excluded.updated_at
+    """,
+    "history_insert": """
+        INSERT INTO profile_history (user_id, field, old_value, new_value, changed_at)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    "history_by_user": "SELECT * FROM profile_history WHERE user_id = ? ORDER BY changed_at DESC, id DESC LIMIT ?",
+    "all_users": "SELECT * FROM users ORDER BY id",
+}
+
+# Kolom yang boleh diubah lewat update_user (nama kolom tidak bisa jadi parameter SQL)
+UPDATABLE_COLUMNS = ("username", "name", "email", "password", "bio", "profile_picture")
+SQL.update({
+    f"update_{column}": f"UPDATE users SET {column} = ?, updated_at = ? WHERE id = ?"
+    for column in UPDATABLE_COLUMNS
+})
+SQL.update({f"select_{column}": f"SELECT {column} FROM users WHERE id = ?" for column in UPDATABLE_COLUMNS})
+
+class AccountDB:
+    def __init__(self, db_path="accounts.db"):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.migrate()
+
+    # =====================================================
+    # 🧱 MIGRATION RUNNER
+    # =====================================================
+    def schema_version(self):
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                "version INTEGER PRIMARY KEY, description TEXT, applied_at TEXT)"
+            )
+            row = self.conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return row[0] or 0
+
+    def migrate(self, target=None):
+        """Jalankan migrasi yang belum diterapkan, masing-masing dalam satu transaksi"""
+        target = target or SCHEMA_VERSION
+        current = self.schema_version()
+        for version, description, statements in MIGRATIONS:
+            if version <= current or version > target:
+                continue
+            with self.lock:
+                try:
+                    self.conn.execute("BEGIN")
+                    for statement in statements:
+                        self.conn.execute(statement)
+                    self.conn.execute(
+                        "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                        (version, description, datetime.now().isoformat()),
+                    )
+                    self.conn.commit()
+                except Exception:
+                    self.conn.rollback()
+                    raise
+            logger.info(f"🧱 accounts.db migrasi {version}: {description}")
+        return self.schema_version()
+
+    def _one(self, key, params):
+        with self.lock:
+            return self.conn.execute(SQL[key], params).fetchone()
+
+    def get_by_username(self, username):
+        row = self._one("by_username", (username,))
+        return dict(row) if row else None
+
+    def get_by_id(self, user_id):
+        row = self._one("by_id", (user_id,))
+        return dict(row) if row else None
+
+    def username_taken(self, username, exclude_id=-1):
+        return self._one("username_taken", (username, exclude_id)) is not None
+
+    def email_taken(self, email, exclude_id=-1):
+        return self._one("email_taken", (email, exclude_id)) is not None
+
+    def create_user(self, username, name, email, password_hash, bio=""):
+        """Insert user baru. Return id user."""
+        now = datetime.now().isoformat()
+        with self.lock, self.conn:
+            cursor = self.conn.execute(SQL["insert"], (username, name, email, password_hash, bio, now, now))
+        return cursor.lastrowid
+
+    def update_user(self, user_id, column, value):
+        """Update satu kolom + updated_at, catat ke profile_history. Return timestamp updated_at."""
+        if column not in UPDATABLE_COLUMNS:
+            raise ValueError(f"Kolom tidak bisa diubah: {column}")
+        now = datetime.now().isoformat()
+        with self.lock, self.conn:
+            old = self.conn.execute(SQL[f"select_{column}"], (user_id,)).fetchone()
+            self.conn.execute(SQL[f"update_{column}"], (value, now, user_id))
+            # Hash password tidak perlu disimpan di riwayat
+            logged = (None, None) if column == "password" else (old[0] if old else None, value)
+            self.conn.execute(SQL["history_insert"], (user_id, column, logged[0], logged[1], now))
+        return now
+
+    def profile_history(self, user_id, limit=50):
+        with self.lock:
+            return [dict(r) for r in self.conn.execute(SQL["history_by_user"], (user_id, limit))]
+
+    # =====================================================
+    # 📦 BULK IMPORT / EXPORT
+    # =====================================================
+    def import_users(self, rows):
+        """
+        Upsert banyak user (dict per baris, key = REGISTRY_COLUMNS) dalam satu transaksi.
+        Return jumlah baris. Kalau satu baris gagal, semua dibatalkan.
+        """
+        now = datetime.now().isoformat()
+
+        def normalized():
+            for row in rows:
+                record = {column: row.get(column) or None for column in REGISTRY_COLUMNS}
+                record["bio"] = record["bio"] or ""
+                record["created_at"] = record["created_at"] or now
+                record["updated_at"] = record["updated_at"] or now
+                yield record
+
+        with self.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(SQL["upsert"], normalized())
+            return self.conn.total_changes - before
+
+    def iter_users(self):
+        with self.lock:
+            rows = self.conn.execute(SQL["all_users"]).fetchall()
+        for row in rows:
+            yield dict(row)
+
+    def export_file(self, path):
+        """Export registry ke .csv atau .json (format dari ekstensi). Return jumlah baris."""
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.DictWriter(f, fieldnames=REGISTRY_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                for user in self.iter_users():
+                    writer.writerow(user)
+                    count += 1
+            else:
+                users = [{k: user[k] for k in REGISTRY_COLUMNS} for user in self.iter_users()]
+                json.dump(users, f, indent=2, ensure_ascii=False)
+                count = len(users)
+        return count
+
+    def import_file(self, path):
+        """Import registry dari .csv atau .json hasil export_file"""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                return self.import_users(csv.DictReader(f))
+            return self.import_users(json.load(f))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# Satu koneksi per file database per proses
+_connections = {}
+_connections_lock = threading.Lock()
+
+def get_account_db(db_path="accounts.db"):
+    key = os.path.abspath(db_path)
+    with _connections_lock:
+        if key not in _connections:
+            _connections[key] = AccountDB(db_path)
+        return _connections[key]
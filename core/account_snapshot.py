@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Account Snapshot - Ringkasan akun sendiri untuk layar Info Akun & Statistik
+Fitur:
+- user_info_by_username, account_info & user_medias_v1 diambil paralel (thread pool)
+- Satu objek AccountSnapshot dipakai bersama oleh view_info & stats_account
+- Memo per sesi dengan TTL pendek; pindah layar tidak mengulang request
+- Request yang sedang jalan dipakai bersama (dua layar buka bersamaan = satu fetch)
+- Gagal sebagian (mis. account_info) tidak menggagalkan seluruh snapshot
+"""
+
+import time
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.request_broker import lane_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60  # detik
+DEFAULT_MEDIA_AMOUNT = 30
+
+class AccountSnapshot:
+    def __init__(self, username, user_info=None, account_info=None, medias=None, errors=None, fetched_at=None):
+        self.username = username
+        self.user_info = user_info
+        self.account_info = account_info
+        self.medias = medias if medias is not None else []
+        self.errors = errors or {}
+        self.fetched_at = fetched_at or time.time()
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    @property
+    def complete(self):
+        return not self.errors
+
+    def require(self, part):
+        """Ambil bagian snapshot; kalau bagian itu gagal di-fetch, lempar error aslinya"""
+        if part in self.errors:
+            raise self.errors[part]
+        return getattr(self, part)
+
+    @property
+    def email(self):
+        """Email dari account_info (private), fallback ke public_email profil"""
+        account = self.account_info
+        email = account.get("email") if isinstance(account, dict) else getattr(account, "email", None)
+        return email or getattr(self.user_info, "public_email", None) or ""
+
+    @property
+    def follower_count(self):
+        return getattr(self.user_info, "follower_count", 0) or 0
+
+class AccountOverviewLoader:
+    # nama bagian -> fetch(client, username, amount), tiap bagian satu request independen
+    PARTS = {
+        "user_info": lambda client, username, amount: client.user_info_by_username(username),
+        "account_info": lambda client, username, amount: client.account_info(),
+        "medias": lambda client, username, amount: client.user_medias_v1(client.user_id, amount=amount),
+    }
+
+    def __init__(self, ttl=DEFAULT_TTL, max_workers=3):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._executor = None
+        # client -> {(username, amount): snapshot}; hilang sendiri saat client di-GC
+        self._memo = weakref.WeakKeyDictionary()
+        self._inflight = {}
+        self.lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="overview")
+        return self._executor
+
+    def _fetch(self, client, username, amount):
+        client = lane_client(client, "interactive")
+        futures = {
+            part: self.executor.submit(fetch, client, username, amount)
+            for part, fetch in self.PARTS.items()
+        }
+        results, errors = {}, {}
+        for part, future in futures.items():
+            try:
+                results[part] = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️ Gagal ambil {part} @{username}: {e}")
+                errors[part] = e
+        return AccountSnapshot(username, errors=errors, **results)
+
+    def load(self, client, username, amount=DEFAULT_MEDIA_AMOUNT, force=False):
+        """Snapshot akun; dari memo kalau umurnya < ttl (kecuali force=True)"""
+        key = (username, amount)
+        inflight_key = (id(client), key)
+        with self.lock:
+            cached = self._memo.get(client, {}).get(key)
+            if cached and not force and cached.age < self.ttl:
+                return cached
+            pending = self._inflight.get(inflight_key)
+            if pending is None:
+                pending = self._inflight[inflight_key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            snapshot = self._fetch(client, username, amount)
+            with self.lock:
+                # Snapshot yang profil/medianya gagal tidak di-memo, layar berikutnya coba lagi
+                if "user_info" not in snapshot.errors and "medias" not in snapshot.errors:
+                    self._memo.setdefault(client, {})[key] = snapshot
+            pending.set_result(snapshot)
+            return snapshot
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self._inflight.pop(inflight_key, None)
+
+    def invalidate(self, client=None):
+        """Buang memo (setelah upload/edit profil) untuk satu client atau semua"""
+        with self.lock:
+            if client is None:
+                self._memo.clear()
+            else:
+                self._memo.pop(client, None)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+_shared_loader = None
+
+def get_overview_loader():
+    global _shared_loader
+    if _shared_loader is None:
+        _shared_loader = AccountOverviewLoader()
+    return _shared_loader
+
+def load_account_snapshot(client, username, force=False):
+    """Shortcut: snapshot akun lewat loader bersama"""
+    return get_overview_loader().load(client, username, force=force)
@@ -3,44 +3,59 @@
 Analytics Core - Enhanced Version
 Fitur:
 - Action Logging (Melacak setiap like/comment individu)
-- Daily Stats Snapshot
+- Daily Stats Snapshot (disimpan di data/bot.db, lihat core.datastore)
 - Exportable Reports
+- Post History (snapshot performa per post, append-only JSONL; snapshot yang sama dengan
+  snapshot terakhir post itu tidak ditulis ulang, dicek lewat tabel post_latest di data/bot.db)
+- Statistik jam posting terbaik (core.best_time), ikut ter-update tiap track_medias
+- Index hashtag -> post (core.hashtag_index), ikut ter-update tiap track_medias
 """
 
 import os
 import json
 import logging
 from datetime import datetime
-from collections import defaultdict
+
+from core.datastore import COUNTERS, get_datastore
+from core.best_time import BestTimeRecommender
+from core.hashtag_index import HashtagIndex
 
 logger = logging.getLogger(__name__)
 
+LATEST_SOURCE = "post_history_latest"  # json_imports: post_history.jsonl lama -> tabel post_latest
+
 class Analytics:
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", datastore=None):
         self.log_dir = log_dir
         self.stats_file = os.path.join(log_dir, "stats.json")
         self.activity_log = os.path.join(log_dir, "activity_log.json")
+        self.post_history = os.path.join(log_dir, "post_history.jsonl")
         
         os.makedirs(log_dir, exist_ok=True)
         
-        self.stats = self._load_json(self.stats_file)
-        self.activities = self._load_json(self.activity_log)
+        # Counter harian & activity log sekarang di data/bot.db (stats.json lama di-import sekali)
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.analytics
+        self.datastore.migrate_json({"stats": self.stats_file, "activity_log": self.activity_log})
+        self._best_time = None
+        self._hashtag_index = None
+        self._latest_ready = False
 
-    def _load_json(self, filepath):
-        if not os.path.exists(filepath):
-            return {}
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    @property
+    def best_time(self):
+        """Recommender jam posting; pertama kali dipakai, post_history.jsonl lama di-import sekali"""
+        if self._best_time is None:
+            self._best_time = BestTimeRecommender(self.datastore)
+            self._best_time.backfill(self)
+        return self._best_time
 
-    def _save_json(self, data, filepath):
-        try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Error saving analytics: {e}")
+    @property
+    def hashtag_index(self):
+        """Inverted index hashtag -> post; pertama kali dipakai, post_history.jsonl lama di-import sekali"""
+        if self._hashtag_index is None:
+            self._hashtag_index = HashtagIndex(self.datastore)
+            self._hashtag_index.backfill(self)
+        return self._hashtag_index
 
     # =====================================================
     # 🧩 ACTION TRACKING (Real-time)
@@ -53,41 +68,107 @@ class Analytics:
         today = datetime.now().strftime("%Y-%m-%d")
         username = metadata.get("username", "unknown") if metadata else "unknown"
         
-        # 1. Update Daily Counter
-        if username not in self.stats:
-            self.stats[username] = {}
-        if today not in self.stats[username]:
-            self.stats[username][today] = {
-                "likes": 0, "follows": 0, "comments": 0, 
-                "stories": 0, "dms": 0, "errors": 0
-            }
-            
+        # 1. Update Daily Counter (upsert satu baris, bukan tulis ulang seluruh file)
         key = f"{action_type}s" if not action_type.endswith('s') else action_type
-        if success:
-            if key in self.stats[username][today]:
-                self.stats[username][today][key] += 1
-        else:
-            self.stats[username][today]["errors"] += 1
-            
-        self._save_json(self.stats, self.stats_file)
-
-        # 2. Log Activity Detail (Optional: Bisa dimatikan kalau file kebesaran)
-        if metadata:
-            entry = {
-                "time": datetime.now().isoformat(),
-                "action": action_type,
-                "success": success,
-                "details": metadata
-            }
-            if username not in self.activities:
-                self.activities[username] = []
-            
-            self.activities[username].append(entry)
-            # Keep only last 1000 logs per user to save space
-            if len(self.activities[username]) > 1000:
-                self.activities[username] = self.activities[username][-1000:]
-                
-            self._save_json(self.activities, self.activity_log)
+        try:
+            if not success:
+                self.repo.increment(username, today, "errors")
+            elif key in COUNTERS:
+                self.repo.increment(username, today, key)
+
+            # 2. Log Activity Detail (1000 log terakhir per user)
+            if metadata:
+                self.repo.add_activity(username, action_type, success, metadata, keep=1000)
+        except Exception as e:
+            logger.error(f"❌ Error saving analytics: {e}")
+
+    # =====================================================
+    # 📸 POST HISTORY (Per-post performance)
+    # =====================================================
+    def _media_to_record(self, username, media):
+        taken_at = getattr(media, "taken_at", None)
+        return {
+            "username": username,
+            "media_id": str(getattr(media, "id", None) or getattr(media, "pk", "")),
+            "caption": getattr(media, "caption_text", "") or "",
+            "likes": getattr(media, "like_count", 0) or 0,
+            "comments": getattr(media, "comment_count", 0) or 0,
+            "media_type": getattr(media, "media_type", None),
+            "taken_at": taken_at.isoformat() if taken_at else None,
+            "captured_at": datetime.now().isoformat(),
+        }
+
+    def _ensure_latest(self):
+        """Sekali saja: isi tabel post_latest dari logs/post_history.jsonl yang sudah ada"""
+        if self._latest_ready:
+            return
+        if not self.datastore.imported(LATEST_SOURCE):
+            with self.datastore.transaction() as conn:
+                rows = len(self.datastore.post_latest.observe(conn, self.get_latest_posts().values()))
+                self.datastore.mark_imported(conn, LATEST_SOURCE, self.post_history, rows)
+        self._latest_ready = True
+
+    def track_medias(self, username, medias):
+        """
+        Catat snapshot like/comment post milik sendiri.
+        File-nya append-only: satu baris per snapshot, baris terakhir per media_id yang berlaku.
+        Post yang like / komentar / caption-nya tidak berubah sejak snapshot terakhir tidak ditulis lagi.
+        Return jumlah snapshot baru.
+        """
+        if not medias:
+            return 0
+        try:
+            self._ensure_latest()
+            records, by_id = [], {}
+            for media in medias:
+                record = self._media_to_record(username, media)
+                if record["media_id"] not in by_id:
+                    by_id[record["media_id"]] = media
+                    records.append(record)
+            # File ditulis di dalam transaksi: kalau gagal, post_latest ikut rollback (snapshot tidak hilang)
+            with self.datastore.transaction() as conn:
+                changed = self.datastore.post_latest.observe(conn, records)
+                if not changed:
+                    return 0
+                with open(self.post_history, "a", encoding="utf-8") as f:
+                    for record in changed:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            changed_medias = [by_id[record["media_id"]] for record in changed]
+            self.best_time.observe_medias(username, changed_medias)
+            self.hashtag_index.observe_medias(username, changed_medias)
+            return len(changed)
+        except Exception as e:
+            logger.error(f"❌ Error saving post history: {e}")
+            return 0
+
+    def caption_totals(self, username=None):
+        """{baris pertama caption: (jumlah post, total engagement)} dari snapshot terakhir tiap post"""
+        self._ensure_latest()
+        return self.datastore.post_latest.caption_totals(username)
+
+    def iter_post_history(self, username=None):
+        """Stream semua snapshot post (tanpa load seluruh file ke memory)"""
+        if not os.path.exists(self.post_history):
+            return
+        with open(self.post_history, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # baris terpotong (partial write)
+                if username and record.get("username") != username:
+                    continue
+                yield record
+
+    def get_latest_posts(self, username=None):
+        """Snapshot terbaru per media_id -> {media_id: record}"""
+        latest = {}
+        for record in self.iter_post_history(username):
+            latest[record["media_id"]] = record
+        return latest
 
     # =====================================================
     # 📈 STATS SUMMARY
@@ -97,20 +178,22 @@ class Analytics:
         today = datetime.now().strftime("%Y-%m-%d")
         
         if username:
-            return self.stats.get(username, {}).get(today, {})
+            return self.repo.day(username, today)
         
         # Aggregate all users
-        total = defaultdict(int)
-        for user, days in self.stats.items():
-            if today in days:
-                for k, v in days[today].items():
-                    total[k] += v
-        return dict(total)
+        return self.repo.day_totals(today)
+
+    def iter_daily(self, username=None):
+        """(username, tanggal, counters) untuk semua hari yang tercatat"""
+        return self.repo.iter_daily(username)
+
+    def get_activities(self, username, limit=100):
+        """Activity detail terakhir (terbaru dulu)"""
+        return self.repo.activities(username, limit)
 
     def save_stats(self):
-        """Force save"""
-        self._save_json(self.stats, self.stats_file)
-        self._save_json(self.activities, self.activity_log)
+        """Force save (checkpoint WAL ke bot.db)"""
+        self.datastore.checkpoint()
 
 if __name__ == "__main__":
     a = Analytics()
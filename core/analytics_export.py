@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Analytics Export - Streaming CSV / JSONL / Parquet
+Fitur:
+- Export per-post (logs/post_history.jsonl) & per-hari (data/bot.db lewat Analytics.iter_daily)
+- Streaming baris per baris, histori besar tidak di-load ke memory
+- Mode incremental: hanya baris baru sejak export terakhir yang di-append
+- Parquet (kolumnar) kalau pyarrow terinstall
+"""
+
+import os
+import csv
+import json
+import logging
+from datetime import datetime
+
+from core.analytics import Analytics
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional, hanya dibutuhkan untuk format parquet
+    pa = None
+    pq = None
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+COLUMNS = {
+    "posts": [
+        ("username", "string"), ("media_id", "string"), ("caption", "string"),
+        ("likes", "int64"), ("comments", "int64"), ("media_type", "int64"),
+        ("taken_at", "string"), ("captured_at", "string"),
+    ],
+    "daily": [
+        ("username", "string"), ("date", "string"), ("likes", "int64"),
+        ("follows", "int64"), ("comments", "int64"), ("stories", "int64"),
+        ("dms", "int64"), ("errors", "int64"),
+    ],
+}
+
+PARQUET_BATCH_ROWS = 5000
+
+class AnalyticsExporter:
+    def __init__(self, analytics=None, export_dir="analytics/exports"):
+        self.analytics = analytics or Analytics()
+        self.export_dir = export_dir
+        self.state_file = os.path.join(export_dir, "export_state.json")
+        os.makedirs(export_dir, exist_ok=True)
+
+    # =====================================================
+    # 💾 WATERMARK STATE
+    # =====================================================
+    def _load_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_state(self, state):
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    # =====================================================
+    # 📥 ROW SOURCES (generator)
+    # =====================================================
+    def _iter_post_rows(self, username, watermark):
+        """
+        Yield (row, new_watermark). Watermark = byte offset di post_history.jsonl,
+        hanya maju setelah baris lengkap (diakhiri newline) terbaca.
+        """
+        path = self.analytics.post_history
+        if not os.path.exists(path):
+            return
+        offset = watermark or 0
+        if offset > os.path.getsize(path):
+            offset = 0  # file di-reset/dipadatkan, mulai dari awal
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # baris sedang ditulis, ambil di export berikutnya
+                offset += len(raw)
+                try:
+                    record = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    continue
+                if username and record.get("username") != username:
+                    continue
+                yield record, offset
+        yield None, offset
+
+    def _iter_daily_rows(self, username, watermark, incremental):
+        """Yield (row, new_watermark). Watermark = tanggal terakhir yang sudah diexport."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        last_date = watermark or ""
+        newest = last_date
+        for user, date, counters in self.analytics.iter_daily(username):
+            if incremental and (date <= last_date or date >= today):
+                continue  # hari ini belum final, tunggu besok
+            row = {"username": user, "date": date}
+            row.update(counters)
+            newest = max(newest, date)
+            yield row, newest
+        yield None, newest
+
+    # =====================================================
+    # 📤 WRITERS
+    # =====================================================
+    def _output_path(self, dataset, fmt, username, incremental):
+        owner = username or "all"
+        if incremental:
+            name = f"{dataset}_{owner}"
+        else:
+            name = f"{dataset}_{owner}_{int(datetime.now().timestamp())}"
+        if fmt == "parquet":
+            # Parquet tidak bisa di-append: tiap export jadi part file baru di folder dataset
+            folder = os.path.join(self.export_dir, name)
+            os.makedirs(folder, exist_ok=True)
+            part = len([p for p in os.listdir(folder) if p.endswith(".parquet")])
+            return os.path.join(folder, f"part-{part:05d}.parquet")
+        return os.path.join(self.export_dir, f"{name}.{fmt}")
+
+    def _write_csv(self, path, columns, rows):
+        names = [c for c, _ in columns]
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        count = 0
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=names, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def _write_jsonl(self, path, columns, rows):
+        names = [c for c, _ in columns]
+        count = 0
+        with open(path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({k: row.get(k) for k in names}, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def _write_parquet(self, path, columns, rows):
+        if pa is None:
+            raise RuntimeError("Format parquet butuh pyarrow: pip install pyarrow")
+        schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in columns])
+        names = [c for c, _ in columns]
+        writer = None
+        count = 0
+        batch = {name: [] for name in names}
+
+        def flush():
+            nonlocal writer
+            if not batch[names[0]]:
+                return
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema, compression="snappy")
+            writer.write_table(pa.table(batch, schema=schema))
+            for name in names:
+                batch[name] = []
+
+        try:
+            for row in rows:
+                for name in names:
+                    batch[name].append(row.get(name))
+                count += 1
+                if count % PARQUET_BATCH_ROWS == 0:
+                    flush()
+            flush()
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
+
+    # =====================================================
+    # 🚀 PUBLIC API
+    # =====================================================
+    def export(self, dataset="posts", fmt="csv", username=None, incremental=False):
+        """
+        Export dataset ('posts' / 'daily') ke format 'csv' / 'jsonl' / 'parquet'.
+        Return dict {path, rows} atau None kalau tidak ada baris baru.
+        """
+        if dataset not in COLUMNS:
+            raise ValueError(f"Dataset tidak dikenal: {dataset}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {fmt}")
+
+        state = self._load_state()
+        state_key = f"{dataset}:{fmt}:{username or 'all'}"
+        watermark = state.get(state_key) if incremental else None
+
+        if dataset == "posts":
+            source = self._iter_post_rows(username, watermark)
+        else:
+            source = self._iter_daily_rows(username, watermark, incremental)
+
+        final = {"watermark": watermark}
+
+        def rows():
+            for row, mark in source:
+                final["watermark"] = mark
+                if row is not None:
+                    yield row
+
+        path = self._output_path(dataset, fmt, username, incremental)
+        writer = {"csv": self._write_csv, "jsonl": self._write_jsonl, "parquet": self._write_parquet}[fmt]
+        count = writer(path, COLUMNS[dataset], rows())
+
+        if fmt == "parquet" and count == 0 and os.path.exists(path):
+            os.remove(path)
+        if incremental:
+            state[state_key] = final["watermark"]
+            self._save_state(state)
+
+        logger.info(f"📤 Export {dataset} ({fmt}): {count} baris -> {path}")
+        if count == 0:
+            return None
+        return {"path": path, "rows": count}
+
+    def export_incremental_all(self, fmt="csv", username=None):
+        """Dipanggil scheduler: append baris baru semua dataset"""
+        results = {}
+        for dataset in COLUMNS:
+            try:
+                results[dataset] = self.export(dataset, fmt, username, incremental=True)
+            except Exception as e:
+                logger.error(f"❌ Export {dataset} gagal: {e}")
+                results[dataset] = None
+        return results
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(AnalyticsExporter().export_incremental_all())
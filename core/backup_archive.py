@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Backup Archive - Format arsip backup content-addressed (dipakai ContentBackup)
+Fitur:
+- Media dipecah per chunk (CHUNK_SIZE), tiap chunk disimpan sekali di blobs/<2 hex>/<sha256>:
+  chunk yang sama di snapshot mana pun tidak ditulis ulang (backup harian hanya menambah byte baru)
+- Tiap backup = satu snapshot manifest (metadata semua post + daftar chunk per file),
+  dikompres zstd (kalau paket zstandard ada) atau gzip
+- Restore satu post langsung dari manifest + chunk-nya, tanpa membongkar seluruh arsip
+- verify(): cek hash semua chunk yang direferensikan secara paralel, dibaca lewat mmap
+- Tulis atomik (file sementara + os.replace): backup yang terputus tidak meninggalkan chunk / manifest rusak
+"""
+
+import os
+import gzip
+import json
+import mmap
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # zstandard opsional; tanpa itu manifest pakai gzip
+    zstandard = None
+
+ARCHIVE_VERSION = 1
+CHUNK_SIZE = 4 * 1024 * 1024
+VERIFY_WORKERS = 4
+MANIFEST_EXTENSIONS = (".json.zst", ".json.gz")
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+class BackupArchive:
+    def __init__(self, root):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.snapshot_dir = os.path.join(root, "snapshots")
+
+    # =====================================================
+    # 🧱 BLOBS
+    # =====================================================
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest[2:])
+
+    def put_chunk(self, data):
+        """Simpan satu chunk (kalau belum ada). Return (digest, byte baru yang ditulis)."""
+        digest = _digest(data)
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        _write_atomic(path, data)
+        return digest, len(data)
+
+    def put_file(self, path, name=None):
+        """File -> entry manifest {"name", "size", "chunks"} + jumlah byte baru di arsip"""
+        chunks, size, written = [], 0, 0
+        with open(path, "rb") as f:
+            for data in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest, new = self.put_chunk(data)
+                chunks.append(digest)
+                size += len(data)
+                written += new
+        return {"name": name or os.path.basename(path), "size": size, "chunks": chunks}, written
+
+    def read_file(self, entry, dest):
+        """Susun ulang satu file dari chunk-nya ke `dest` (folder). Return path file."""
+        os.makedirs(dest, exist_ok=True)
+        path = os.path.join(dest, entry["name"])
+        with open(path, "wb") as f:
+            for digest in entry["chunks"]:
+                with open(self.blob_path(digest), "rb") as blob:
+                    f.write(blob.read())
+        return path
+
+    def blob_stats(self):
+        count = size = 0
+        for folder, _, files in os.walk(self.blob_dir):
+            for name in files:
+                if not name.startswith(".tmp-"):
+                    count += 1
+                    size += os.path.getsize(os.path.join(folder, name))
+        return {"blobs": count, "bytes": size}
+
+    # =====================================================
+    # 📜 SNAPSHOTS
+    # =====================================================
+    def snapshots(self):
+        """Nama snapshot (tanpa ekstensi), terlama dulu"""
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        names = [f for f in os.listdir(self.snapshot_dir) if f.endswith(MANIFEST_EXTENSIONS)]
+        return sorted(n.split(".", 1)[0] for n in names)
+
+    def write_snapshot(self, username, posts, created=None):
+        """Manifest baru berisi semua post (entry file menunjuk ke chunk). Return nama snapshot."""
+        created = created or datetime.now()
+        name = created.strftime("%Y%m%d-%H%M%S-%f")
+        manifest = {
+            "version": ARCHIVE_VERSION, "username": username, "created_at": created.isoformat(),
+            "posts": posts,
+        }
+        raw = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if zstandard is not None:
+            data, extension = zstandard.ZstdCompressor(level=10).compress(raw), ".json.zst"
+        else:
+            data, extension = gzip.compress(raw, compresslevel=9, mtime=0), ".json.gz"
+        _write_atomic(os.path.join(self.snapshot_dir, name + extension), data)
+        return name
+
+    def load_snapshot(self, name=None):
+        """Manifest snapshot `name` (default terbaru), None kalau arsip masih kosong"""
+        names = self.snapshots()
+        if not names:
+            return None
+        name = name or names[-1]
+        for extension in MANIFEST_EXTENSIONS:
+            path = os.path.join(self.snapshot_dir, name + extension)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            if extension == ".json.zst":
+                if zstandard is None:
+                    raise RuntimeError(f"Snapshot {name} dikompres zstd, install paket zstandard")
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = gzip.decompress(data)
+            return json.loads(data)
+        raise ValueError(f"Snapshot {name} tidak ada")
+
+    def restore_post(self, media_id, dest, snapshot=None):
+        """Restore satu post (file media + metadata.json) ke dest/<media_id>. Return list path."""
+        manifest = self.load_snapshot(snapshot)
+        post = next((p for p in (manifest or {}).get("posts", []) if str(p.get("id")) == str(media_id)), None)
+        if post is None:
+            raise ValueError(f"Post {media_id} tidak ada di snapshot")
+        folder = os.path.join(dest, str(media_id))
+        paths = [self.read_file(entry, folder) for entry in post.get("files", [])]
+        meta = {k: v for k, v in post.items() if k != "files"}
+        with open(os.path.join(folder, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=4, ensure_ascii=False)
+        return paths
+
+    # =====================================================
+    # 🔍 VERIFY
+    # =====================================================
+    def _check_blob(self, digest):
+        path = self.blob_path(digest)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return "ok" if _digest(b"") == digest else "corrupt"
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    return "ok" if _digest(view) == digest else "corrupt"  # sha256 lepas GIL
+        except FileNotFoundError:
+            return "missing"
+
+    def referenced(self, snapshot=None):
+        """Set digest chunk yang dipakai satu snapshot (atau semua snapshot)"""
+        digests = set()
+        for name in [snapshot] if snapshot else self.snapshots():
+            for post in self.load_snapshot(name)["posts"]:
+                for entry in post.get("files", []):
+                    digests.update(entry["chunks"])
+        return digests
+
+    def verify(self, snapshot=None, workers=VERIFY_WORKERS):
+        """Cek integritas chunk secara paralel. Return {"checked", "corrupt": [...], "missing": [...]}."""
+        digests = sorted(self.referenced(snapshot))
+        result = {"checked": len(digests), "corrupt": [], "missing": []}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for digest, status in zip(digests, pool.map(self._check_blob, digests)):
+                if status != "ok":
+                    result[status].append(digest)
+        if result["corrupt"] or result["missing"]:
+            logger.warning(f"⚠️ Arsip {self.root}: {len(result['corrupt'])} chunk rusak, "
+                           f"{len(result['missing'])} hilang")
+        return result
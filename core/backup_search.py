@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Backup Search - Cari post sendiri yang sudah di-backup (caption, hashtag, lokasi, tanggal, engagement)
+Fitur:
+- Index di data/bot.db: tabel backup_posts + SQLite FTS5 (external content, trigger)
+- Update inkremental setelah tiap backup: hanya snapshot arsip yang belum pernah di-index,
+  dan baris yang teksnya tidak berubah tidak menyentuh index FTS
+- Query bebas: kata biasa (semua harus ada), "#tag" (kolom hashtag), "kata*" (prefix);
+  filter tanggal & minimal likes; ranking bm25 per kolom lalu engagement
+- Komentar di post sendiri dicari lewat index comment inbox yang sudah ada (core.comment_inbox)
+"""
+
+import os
+import logging
+
+from core.backup_archive import BackupArchive
+from core.datastore import get_datastore
+from core.hashtag_index import extract_hashtags
+
+logger = logging.getLogger(__name__)
+
+BACKUP_BASE = "backups"
+SOURCE_PREFIX = "backup_snapshot"  # json_imports: snapshot arsip yang sudah di-index
+
+def build_match(query):
+    """Query user -> ekspresi FTS5 aman (tiap kata di-quote, tanda baca tidak jadi sintaks)"""
+    terms = []
+    for word in (query or "").split():
+        column = ""
+        if word.startswith("#"):
+            column, word = "hashtags : ", word.lstrip("#")
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if not word:
+            continue
+        terms.append(column + '"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms) or None
+
+def _record(username, post, snapshot):
+    caption = post.get("caption") or ""
+    return {
+        "username": username,
+        "media_id": str(post["id"]),
+        "caption": caption,
+        "hashtags": " ".join(extract_hashtags(caption)),
+        "location": post.get("location") or "",
+        "taken_at": post.get("timestamp"),
+        "post_type": post.get("type"),
+        "likes": post.get("likes") or 0,
+        "comments": post.get("comments") or 0,
+        "snapshot": snapshot,
+    }
+
+class BackupSearch:
+    def __init__(self, datastore=None, backup_base=BACKUP_BASE):
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.backup_posts
+        self.backup_base = backup_base
+
+    # =====================================================
+    # 📥 INDEX
+    # =====================================================
+    def _source(self, username, snapshot):
+        return f"{SOURCE_PREFIX}:{username}:{snapshot}"
+
+    def index_snapshot(self, username, archive, snapshot, posts=None):
+        """Index satu snapshot (sekali saja). Return jumlah post yang berubah, None kalau sudah pernah."""
+        source = self._source(username, snapshot)
+        if self.datastore.imported(source):
+            return None
+        if posts is None:
+            posts = archive.load_snapshot(snapshot)["posts"]
+        with self.datastore.transaction() as conn:
+            changed = self.repo.upsert_many(conn, (_record(username, post, snapshot) for post in posts))
+            self.datastore.mark_imported(conn, source, archive.root, changed)
+        return changed
+
+    def sync(self, username, archive=None):
+        """Index semua snapshot arsip yang belum di-index, urut lama -> baru. Return jumlah post berubah."""
+        archive = archive or BackupArchive(os.path.join(self.backup_base, username, "archive"))
+        changed = 0
+        for snapshot in archive.snapshots():
+            changed += self.index_snapshot(username, archive, snapshot) or 0
+        if changed:
+            logger.info(f"🔎 Index backup @{username}: {changed} post baru / berubah")
+        return changed
+
+    # =====================================================
+    # 🔍 SEARCH
+    # =====================================================
+    def search(self, username, query="", since=None, until=None, min_likes=0, limit=20):
+        """since / until: 'YYYY-MM-DD' (until eksklusif)"""
+        return self.repo.search(username, build_match(query), since, until, min_likes, limit)
+
+    def search_comments(self, username, query, limit=20):
+        return self.datastore.comments.search(username, query, limit)
+
+_shared_search = None
+
+def get_backup_search():
+    global _shared_search
+    if _shared_search is None:
+        _shared_search = BackupSearch()
+    return _shared_search
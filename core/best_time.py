@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Best Time - Rekomendasi jam posting dari histori post sendiri
+Fitur:
+- Statistik engagement per (hari, jam) di data/bot.db, update O(1) per post baru / snapshot baru
+- Bobot recency dengan forward decay: post lama makin kecil pengaruhnya (half-life 45 hari)
+  tanpa perlu menghitung ulang histori
+- Skor per slot ditarik ke rata-rata akun kalau datanya sedikit, plus interval kepercayaan 95%
+- next_best_slots(): N slot terbaik berikutnya, langsung dari database (tanpa fetch media),
+  jadwal pending yang sudah ada dihindari; slot tanpa data hanya dipakai kalau slot berdata habis
+"""
+
+import math
+import logging
+from datetime import datetime, timedelta
+
+from core.datastore import get_datastore
+
+logger = logging.getLogger(__name__)
+
+HALF_LIFE_DAYS = 45
+# Forward decay: bobot = 2^((t - LANDMARK) / half_life). Landmark tetap -> bobot post lama tidak
+# perlu diubah saat waktu berjalan; aman (tanpa overflow w²) sampai ±60 tahun dari landmark.
+LANDMARK = datetime(2024, 1, 1).timestamp()
+PRIOR_POSTS = 2.0  # slot dengan bobot < ini masih banyak ditarik ke rata-rata akun
+CONFIDENCE_Z = 1.96
+DEFAULT_HORIZON_DAYS = 7
+DEFAULT_MIN_GAP_HOURS = 3
+WEEKDAYS = ("Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu")
+HISTORY_SOURCE = "post_history_timing"
+
+def engagement_of(likes, comments):
+    """Satu angka engagement per post (komentar dihitung 2x, sama dengan heatmap lama)"""
+    return (likes or 0) + 2 * (comments or 0)
+
+def decay_weight(timestamp):
+    return 2.0 ** ((timestamp - LANDMARK) / (HALF_LIFE_DAYS * 86400))
+
+def _local(taken_at):
+    if isinstance(taken_at, str):
+        taken_at = datetime.fromisoformat(taken_at)
+    return taken_at.astimezone().replace(tzinfo=None) if taken_at.tzinfo else taken_at
+
+def slot_label(weekday, hour):
+    return f"{WEEKDAYS[weekday]} {hour:02d}:00"
+
+class BestTimeRecommender:
+    def __init__(self, datastore=None):
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.post_timing
+
+    # =====================================================
+    # 📥 OBSERVE
+    # =====================================================
+    def observe(self, username, media_id, taken_at, likes, comments):
+        """Catat satu post (atau snapshot terbaru-nya). O(1): satu upsert slot."""
+        if not taken_at:
+            return False
+        local = _local(taken_at)
+        return self.repo.observe(
+            username, str(media_id), local.weekday(), local.hour, decay_weight(local.timestamp()),
+            float(engagement_of(likes, comments)), local.isoformat(),
+        )
+
+    def observe_medias(self, username, medias):
+        """Media instagrapi -> statistik. Return jumlah post yang berubah."""
+        changed = 0
+        for media in medias or []:
+            changed += bool(self.observe(
+                username, getattr(media, "id", None) or getattr(media, "pk", ""), getattr(media, "taken_at", None),
+                getattr(media, "like_count", 0), getattr(media, "comment_count", 0),
+            ))
+        return changed
+
+    def backfill(self, analytics):
+        """Sekali saja: isi statistik dari logs/post_history.jsonl yang sudah ada"""
+        if self.datastore.imported(HISTORY_SOURCE):
+            return 0
+        rows = 0
+        with self.datastore.transaction() as conn:
+            for record in analytics.get_latest_posts().values():
+                rows += bool(self.observe(record["username"], record["media_id"], record.get("taken_at"),
+                                          record.get("likes"), record.get("comments")))
+            self.datastore.mark_imported(conn, HISTORY_SOURCE, analytics.post_history, rows)
+        if rows:
+            logger.info(f"📥 {rows} post dari post_history -> statistik jam posting")
+        return rows
+
+    # =====================================================
+    # 📊 STATS
+    # =====================================================
+    def slot_stats(self, username, now=None):
+        """
+        {(weekday, hour): {...}} untuk slot yang punya data:
+        posts, weight (bobot recency, 1 = satu post hari ini), mean, score, ci (bawah, atas)
+        """
+        rows = self.repo.slots(username)
+        total_w = sum(r["w"] for r in rows)
+        if total_w <= 0:
+            return {}
+        mean_all = sum(r["wx"] for r in rows) / total_w
+        var_all = max(0.0, sum(r["wxx"] for r in rows) / total_w - mean_all ** 2)
+        scale = decay_weight((now or datetime.now()).timestamp())
+
+        stats = {}
+        for r in rows:
+            if r["w"] <= 0:
+                continue
+            mean = r["wx"] / r["w"]
+            n_eff = r["w"] ** 2 / r["ww"] if r["ww"] > 0 else 0.0
+            var = max(0.0, r["wxx"] / r["w"] - mean ** 2) if n_eff >= 2 else var_all
+            weight = r["w"] / scale
+            half = CONFIDENCE_Z * math.sqrt(var / max(n_eff, 1.0))
+            stats[(r["weekday"], r["hour"])] = {
+                "weekday": r["weekday"], "hour": r["hour"], "label": slot_label(r["weekday"], r["hour"]),
+                "posts": r["posts"], "weight": weight, "mean": mean,
+                "score": (weight * mean + PRIOR_POSTS * mean_all) / (weight + PRIOR_POSTS),
+                "ci": (max(0.0, mean - half), mean + half),
+            }
+        return stats
+
+    def account_mean(self, username):
+        rows = self.repo.slots(username)
+        total_w = sum(r["w"] for r in rows)
+        return sum(r["wx"] for r in rows) / total_w if total_w > 0 else 0.0
+
+    def best_slots(self, username, n=5, now=None):
+        """Slot mingguan terbaik (tanpa tanggal), skor tertinggi dulu"""
+        return sorted(self.slot_stats(username, now).values(), key=lambda s: s["score"], reverse=True)[:n]
+
+    def next_best_slots(self, username, n=3, start=None, horizon_days=DEFAULT_HORIZON_DAYS,
+                        min_gap_hours=DEFAULT_MIN_GAP_HOURS, booked=None):
+        """
+        N waktu posting terbaik berikutnya dalam horizon (jam penuh, setelah start).
+        booked: datetime yang sudah terisi (default: jadwal pending akun ini) -> dijaga jaraknya.
+        """
+        stats = self.slot_stats(username, start)
+        if not stats:
+            return []
+        mean_all = self.account_mean(username)
+        start = start or datetime.now()
+        first = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        if booked is None:
+            booked = [
+                datetime.strptime(s["post_time"], "%Y-%m-%d %H:%M")
+                for s in self.datastore.schedules.pending() if s.get("username") in (None, username)
+            ]
+        gap = timedelta(hours=min_gap_hours)
+
+        # Slot berdata dulu (skor tertinggi, lalu paling cepat); slot tanpa data hanya pengisi
+        candidates = []
+        for i in range(horizon_days * 24):
+            when = first + timedelta(hours=i)
+            slot = stats.get((when.weekday(), when.hour))
+            candidates.append((slot is not None, slot["score"] if slot else mean_all, -i, when, slot))
+        candidates.sort(key=lambda c: c[:3], reverse=True)
+
+        picked = []
+        for _, score, _, when, slot in candidates:
+            if any(abs(when - other) < gap for other in booked + [p["time"] for p in picked]):
+                continue
+            picked.append({
+                "time": when, "post_time": when.strftime("%Y-%m-%d %H:%M"), "label": slot_label(when.weekday(), when.hour),
+                "score": score, "ci": slot["ci"] if slot else None, "posts": slot["posts"] if slot else 0,
+            })
+            if len(picked) >= n:
+                break
+        return sorted(picked, key=lambda p: p["time"])
+
+_shared_recommender = None
+
+def get_recommender():
+    global _shared_recommender
+    if _shared_recommender is None:
+        _shared_recommender = BestTimeRecommender()
+    return _shared_recommender
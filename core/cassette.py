@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Cassette - Rekam & putar ulang trafik HTTP instagrapi (akun sendiri)
+Fitur:
+- Recorder dipasang di session requests milik Client (private & public), tanpa ubah kode fitur
+- Cassette = JSONL terkompresi gzip (data/cassettes/*.jsonl.gz), satu baris per request
+- Rahasia dibuang sebelum ditulis: cookie, authorization, token, password, email/telepon
+- Replay: Client offline yang menjawab dari cassette dengan waktu asli atau diskalakan
+- Request kembar diputar sesuai urutan rekaman (paginasi tetap realistis), lalu berulang
+"""
+
+import os
+import gzip
+import json
+import time
+import base64
+import logging
+import threading
+from collections import deque, defaultdict
+from datetime import timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_DIR = "data/cassettes"
+CASSETTE_VERSION = 1
+MAX_BODY = 1024 * 1024  # body lebih besar (foto/video CDN) hanya dicatat ukurannya
+SCRUBBED = "***"
+
+# key JSON / parameter yang nilainya tidak boleh ikut tersimpan
+SECRET_KEYS = {
+    "password", "enc_password", "sessionid", "csrftoken", "_csrftoken", "token", "access_token",
+    "authorization", "authorization_data", "ds_user_id_token", "nonce", "nonce_code", "fbid_v2_token",
+    "email", "phone_number", "contact_point", "two_factor_identifier", "verification_code",
+}
+# parameter yang berubah tiap sesi/perangkat, diabaikan saat mencocokkan request
+VOLATILE_PARAMS = {
+    "_uuid", "uuid", "device_id", "phone_id", "guid", "adid", "rank_token", "session_id",
+    "timezone_offset", "client_time", "timestamp", "_csrftoken", "battery_level", "is_charging",
+}
+KEPT_HEADERS = ("content-type",)
+
+# =====================================================
+# 🧼 SCRUB & KEY
+# =====================================================
+def scrub(value):
+    """Salin struktur JSON dengan nilai rahasia diganti ***"""
+    if isinstance(value, dict):
+        return {k: SCRUBBED if k.lower() in SECRET_KEYS else scrub(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [scrub(v) for v in value]
+    return value
+
+def scrub_url(url):
+    parts = urlsplit(url)
+    query = [(k, SCRUBBED if k.lower() in SECRET_KEYS else v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def request_key(method, url):
+    """Kunci pencocokan: method + host + path + query tanpa parameter volatil/rahasia"""
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in VOLATILE_PARAMS and k.lower() not in SECRET_KEYS
+    )
+    return f"{method.upper()} {parts.netloc}{parts.path}" + (f"?{urlencode(query)}" if query else "")
+
+# =====================================================
+# 🎙️ RECORD
+# =====================================================
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter yang menyalin tiap pasangan request/response ke recorder"""
+
+    def __init__(self, recorder, inner=None, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+        self.inner = inner  # adapter lain (mis. stub di test); default kirim ke jaringan
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs) if self.inner else super().send(request, **kwargs)
+        self.recorder.add(request, response)
+        return response
+
+class CassetteRecorder:
+    def __init__(self, path, max_body=MAX_BODY, inner=None):
+        self.path = path
+        self.max_body = max_body
+        self.inner = inner
+        self.meta = {"type": "meta", "version": CASSETTE_VERSION}
+        self.entries = []
+        self.lock = threading.Lock()
+        self._sessions = []
+        self._started = time.monotonic()
+
+    def attach(self, client):
+        """Mulai rekam semua request client (akun yang sedang login)"""
+        self.meta.update({
+            "username": getattr(client, "username", None),
+            "user_id": str(client.user_id) if client.user_id else None,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        for session in (client.private, client.public):
+            original = dict(session.adapters)
+            adapter = RecordingAdapter(self, inner=self.inner)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._sessions.append((session, original))
+        return client
+
+    def detach(self):
+        for session, original in self._sessions:
+            session.adapters.clear()
+            session.adapters.update(original)
+        self._sessions = []
+
+    def add(self, request, response):
+        content = response.content or b""
+        entry = {
+            "type": "http",
+            "key": request_key(request.method, request.url),
+            "method": request.method,
+            "url": scrub_url(request.url),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+            "elapsed": response.elapsed.total_seconds() if response.elapsed else 0.0,
+            "size": len(content),
+        }
+        if len(content) > self.max_body:
+            entry["truncated"] = True
+        else:
+            try:
+                entry["json"] = scrub(json.loads(content))
+            except ValueError:
+                try:
+                    entry["text"] = content.decode("utf-8")
+                except UnicodeDecodeError:
+                    entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        with self.lock:
+            entry["t"] = round(time.monotonic() - self._started, 4)
+            self.entries.append(entry)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with self.lock, gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for line in [self.meta] + self.entries:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        logger.info(f"📼 Cassette disimpan: {self.path} ({len(self.entries)} request)")
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.detach()
+        self.save()
+        return False
+
+def record(client, path, **kwargs):
+    """with record(client, "data/cassettes/akun.jsonl.gz"): ... -> semua request client direkam"""
+    recorder = CassetteRecorder(path, **kwargs)
+    recorder.attach(client)
+    return recorder
+
+# =====================================================
+# ▶️ REPLAY
+# =====================================================
+class Cassette:
+    def __init__(self, meta, entries, loop=True):
+        self.meta = meta
+        self.loop = loop
+        self.entries = entries
+        self.misses = []
+        self._queues = defaultdict(deque)
+        for entry in entries:
+            self._queues[entry["key"]].append(entry)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, loop=True):
+        meta, entries = {}, []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if item.get("type") == "meta":
+                    meta = item
+                else:
+                    entries.append(item)
+        return cls(meta, entries, loop=loop)
+
+    def match(self, method, url):
+        """Entry berikutnya untuk request ini (urut rekaman; diputar ulang kalau loop=True)"""
+        key = request_key(method, url)
+        with self.lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self.misses.append(key)
+                return None
+            entry = queue.popleft()
+            if self.loop:
+                queue.append(entry)
+            return entry
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter requests yang menjawab dari cassette; time_scale=1 waktu asli, 0 instan"""
+
+    def __init__(self, cassette, time_scale=1.0):
+        super().__init__()
+        self.cassette = cassette
+        self.time_scale = time_scale
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.match(request.method, request.url)
+        if entry is None:
+            raise RequestsConnectionError(f"Request tidak ada di cassette: {request_key(request.method, request.url)}",
+                                          request=request)
+        if self.time_scale and entry["elapsed"]:
+            time.sleep(entry["elapsed"] * self.time_scale)
+
+        response = Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason") or ""
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        if "json" in entry:
+            response._content = json.dumps(entry["json"]).encode("utf-8")
+        elif "text" in entry:
+            response._content = entry["text"].encode("utf-8")
+        elif "body_b64" in entry:
+            response._content = base64.b64decode(entry["body_b64"])
+        else:
+            response._content = b"\0" * entry.get("size", 0)  # body besar tidak direkam, ukurannya saja
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=entry["elapsed"])
+        return response
+
+    def close(self):
+        pass
+
+def replay_client(path, time_scale=1.0, loop=True, client=None):
+    """Client instagrapi offline yang menjawab dari cassette"""
+    from instagrapi import Client
+
+    cassette = path if isinstance(path, Cassette) else Cassette.load(path, loop=loop)
+    client = client or Client()
+    client.request_timeout = 0  # jeda antar request datang dari rekaman, bukan dari client
+    client.delay_range = None
+    adapter = ReplayAdapter(cassette, time_scale=time_scale)
+    for session in (client.private, client.public):
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    if cassette.meta.get("user_id"):
+        client.private.cookies.set("ds_user_id", cassette.meta["user_id"], domain=".instagram.com")
+    client.username = cassette.meta.get("username")
+    client.cassette = cassette
+    return client
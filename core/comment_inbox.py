@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Comment Inbox - Sinkron komentar di post sendiri secara inkremental + moderasi
+Fitur:
+- Watermark per media di data/bot.db (comment_count & waktu komentar terakhir):
+  post yang comment_count-nya tidak berubah tidak di-fetch sama sekali
+- Daftar post + counter dari feed sendiri (1 request per 33 post); komentar hanya di-fetch
+  untuk post yang ada aktivitas baru, sebanyak selisihnya (+ margin)
+- Komentar disimpan dengan full-text index SQLite FTS5 (search() urut bm25)
+- Aturan moderasi dijalankan saat komentar masuk: keyword (kata dipantau) & blocklist (kata / @akun),
+  aksi notify / flag / delete. Histori yang diambil saat sync pertama akun hanya disimpan, kecuali
+  sync(backscan=True) (aturan delete baru tidak menghapus komentar lama secara massal); post yang
+  baru muncul setelah itu diperlakukan sebagai aktivitas baru
+"""
+
+import re
+import logging
+import threading
+
+from core.datastore import get_datastore
+from core.post_curves import FEED_PAGE_SIZE
+from core.request_broker import get_broker
+
+logger = logging.getLogger(__name__)
+
+RULE_KINDS = ("keyword", "block")
+RULE_ACTIONS = ("notify", "flag", "delete")  # urut dari paling ringan
+DEFAULT_PAGES = 1    # halaman feed (x33 post terbaru) yang dicek tiap sync; 0 = semua post
+FETCH_MARGIN = 5     # komentar ekstra per fetch (komentar yang dihapus bikin selisih count meleset)
+INITIAL_FETCH = 50   # post yang baru pertama kali terlihat: komentar terakhir sebanyak ini jadi histori
+
+def _comment_record(comment):
+    user = getattr(comment, "user", None)
+    created = getattr(comment, "created_at_utc", None)
+    return {
+        "pk": str(comment.pk),
+        "user_id": str(getattr(user, "pk", "") or "") or None,
+        "author": getattr(user, "username", None),
+        "text": getattr(comment, "text", "") or "",
+        "created_at": created.isoformat() if created else None,
+    }
+
+class CommentInbox:
+    def __init__(self, datastore=None, lane="notifications"):
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.comments
+        self.lane = lane
+        self.lock = threading.Lock()  # satu sync per proses
+        self._compiled = None
+
+    # =====================================================
+    # 🛡️ RULES
+    # =====================================================
+    def add_rule(self, kind, pattern, action="flag"):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"kind harus salah satu dari {RULE_KINDS}")
+        if action not in RULE_ACTIONS:
+            raise ValueError(f"action harus salah satu dari {RULE_ACTIONS}")
+        pattern = pattern.strip().lower()
+        if not pattern or pattern == "@":
+            raise ValueError("Pattern kosong")
+        self._compiled = None
+        return self.repo.add_rule(kind, pattern, action)
+
+    def remove_rule(self, rule_id):
+        self._compiled = None
+        return self.repo.remove_rule(rule_id)
+
+    def rules(self):
+        return self.repo.rules()
+
+    def _matchers(self):
+        """Aturan -> (rule, fungsi cocok); di-compile sekali sampai aturan berubah"""
+        if self._compiled is None:
+            compiled = []
+            for rule in self.repo.rules():
+                pattern = rule["pattern"]
+                if rule["kind"] == "block" and pattern.startswith("@"):
+                    author = pattern[1:]
+                    compiled.append((rule, lambda c, author=author: (c.get("author") or "").lower() == author))
+                else:
+                    regex = re.compile(r"(?<!\w)" + re.escape(pattern) + r"(?!\w)", re.IGNORECASE)
+                    compiled.append((rule, lambda c, regex=regex: bool(regex.search(c.get("text") or ""))))
+            self._compiled = compiled
+        return self._compiled
+
+    def moderate(self, comment):
+        """Aturan dengan aksi terberat yang cocok untuk satu komentar, None kalau tidak ada"""
+        hits = [rule for rule, match in self._matchers() if match(comment)]
+        return max(hits, key=lambda r: RULE_ACTIONS.index(r["action"]), default=None)
+
+    def _apply(self, client, media_id, comment, rule):
+        status = "flagged"
+        if rule["action"] == "delete":
+            try:
+                get_broker().call(self.lane, client.comment_bulk_delete, media_id, [comment["pk"]])
+                status = "deleted"
+            except Exception as e:
+                logger.warning(f"⚠️ Gagal hapus komentar {comment['pk']}: {e}")
+        elif rule["action"] == "notify":
+            status = "ok"
+        self.repo.set_status(comment["id"], status, f"{rule['kind']}:{rule['pattern']}")
+        return dict(comment, status=status, rule=rule["pattern"], action=rule["action"])
+
+    # =====================================================
+    # 🔄 SYNC
+    # =====================================================
+    @staticmethod
+    def _fresh(records, mark, count):
+        """pk komentar yang dianggap baru: selisih count paling baru, plus yang lebih baru dari watermark"""
+        if mark is None:
+            return set()
+        newest = sorted(records, key=lambda c: c["created_at"] or "", reverse=True)
+        fresh = {c["pk"] for c in newest[:max(0, count - mark["comment_count"])]}
+        if mark["last_created_at"]:
+            fresh |= {c["pk"] for c in records if (c["created_at"] or "") > mark["last_created_at"]}
+        return fresh
+
+    def sync(self, client, username, pages=DEFAULT_PAGES, initial=INITIAL_FETCH, backscan=False):
+        """
+        Cek post terbaru (pages x 33, 0 = semua) dan ambil komentar baru saja.
+        Sync pertama akun (belum ada watermark sama sekali) hanya menyimpan histori;
+        backscan=True: histori itu juga dicek aturan moderasi.
+        Return {"checked", "fetched", "new": [komentar baru], "moderated": [komentar kena aturan]}.
+        """
+        broker = get_broker()
+        summary = {"checked": 0, "fetched": 0, "new": [], "moderated": []}
+        with self.lock:
+            marks = self.repo.watermarks(username)
+            bootstrap = not marks  # sync pertama akun: komentar yang sudah ada = histori
+            medias = broker.paginate(self.lane, client.user_medias_paginated_v1, client.user_id,
+                                     page_size=FEED_PAGE_SIZE, limit=pages * FEED_PAGE_SIZE)
+            for media in medias:
+                summary["checked"] += 1
+                media_id, count = str(media.id), media.comment_count or 0
+                mark = marks.get(media_id)
+                if mark is None and bootstrap:
+                    amount = min(count, initial)  # histori terakhir saja
+                else:
+                    if mark is None:  # post baru setelah sync pertama: semua komentarnya aktivitas baru
+                        mark = {"comment_count": 0, "last_created_at": None}
+                    elif count == mark["comment_count"]:
+                        continue
+                    amount = count - mark["comment_count"] + FETCH_MARGIN if count > mark["comment_count"] else 0
+                if amount <= 0:
+                    self.repo.add_many(username, media_id, [], count)  # geser watermark tanpa request
+                    continue
+
+                comments = broker.call(self.lane, client.media_comments, media.id, amount=amount)
+                summary["fetched"] += 1
+                records = [_comment_record(c) for c in comments]
+                fresh = self._fresh(records, mark, count)
+                for comment in self.repo.add_many(username, media_id, records, count):
+                    if mark is None:
+                        if not backscan:
+                            continue  # histori sync pertama: disimpan saja, aturan hanya untuk komentar yang masuk
+                    elif comment["pk"] not in fresh:
+                        continue  # komentar lama dari margin: disimpan saja, bukan aktivitas baru
+                    else:
+                        summary["new"].append(comment)
+                    rule = self.moderate(comment)
+                    if rule:
+                        summary["moderated"].append(self._apply(client, media.id, comment, rule))
+        if summary["fetched"]:
+            logger.info(f"💬 @{username}: {summary['checked']} post dicek, {summary['fetched']} di-fetch, "
+                        f"{len(summary['new'])} komentar baru")
+        return summary
+
+    # =====================================================
+    # 🔍 READ
+    # =====================================================
+    def search(self, username, query, limit=20):
+        return self.repo.search(username, query, limit)
+
+    def recent(self, username, status=None, limit=20):
+        return self.repo.recent(username, status, limit)
+
+_shared_inbox = None
+
+def get_comment_inbox():
+    global _shared_inbox
+    if _shared_inbox is None:
+        _shared_inbox = CommentInbox()
+    return _shared_inbox
@@ -26,6 +26,7 @@ sys.path.append(os.getcwd())
 try:
     from core.account_manager import AccountManager
     from core.login_manager import LoginManager
+    from core.backup_search import get_backup_search
     from instagrapi.exceptions import (
         BadPassword, TwoFactorRequired, ChallengeRequired, 
         FeedbackRequired, LoginRequired
@@ -238,6 +239,44 @@ def feature_auto_follow():
     send_telegram_log(laporan)
     questionary.press_any_key_to_continue().ask()
 
+def feature_backup_search():
+    """Panel cari post di backup (index lokal, tanpa request ke IG)"""
+    if not active_client: return
+    username = current_user_data['username']
+
+    console.print("\n[bold cyan]🔎 CARI DI BACKUP[/bold cyan]")
+    query = questionary.text("Kata kunci (#tag, kata*, kosong = terbaru):").ask() or ""
+    min_likes = int(questionary.text("Minimal likes:", default="0").ask() or 0)
+
+    search = get_backup_search()
+    search.sync(username)
+    started = time.perf_counter()
+    posts = search.search(username, query, min_likes=min_likes, limit=25)
+    comments = search.search_comments(username, query, limit=10) if query else []
+    elapsed = (time.perf_counter() - started) * 1000
+
+    table = Table(show_header=True, header_style="bold magenta", expand=True)
+    table.add_column("Tanggal", style="cyan", no_wrap=True)
+    table.add_column("Caption", style="white")
+    table.add_column("📍", style="green")
+    table.add_column("❤️", justify="right")
+    table.add_column("💬", justify="right")
+    for post in posts:
+        table.add_row((post['taken_at'] or '')[:10], post['snippet'] or post['caption'][:80],
+                      post['location'], f"{post['likes']:,}", f"{post['comments']:,}")
+    console.print(table)
+
+    if comments:
+        ctable = Table(show_header=True, header_style="bold magenta", expand=True, title="Komentar")
+        ctable.add_column("Dari", style="cyan")
+        ctable.add_column("Komentar", style="white")
+        for comment in comments:
+            ctable.add_row(f"@{comment['author']}", comment['snippet'])
+        console.print(ctable)
+
+    console.print(f"[dim]{len(posts)} post dari {search.repo.count(username)} ter-index ({elapsed:.1f} ms)[/dim]")
+    questionary.press_any_key_to_continue().ask()
+
 # ================= LOGIN SYSTEM =================
 
 def login_menu():
@@ -323,6 +362,7 @@ def main():
                 "👤 Dashboard Akun",
                 "❤️ Auto Like",
                 "👥 Auto Follow",
+                "🔎 Cari Backup",
                 "🚪 Logout / Ganti Akun",
                 "❌ Keluar Aplikasi"
             ]
@@ -348,6 +388,8 @@ def main():
             feature_auto_like()
         elif choice == "👥 Auto Follow":
             feature_auto_follow()
+        elif choice == "🔎 Cari Backup":
+            feature_backup_search()
         elif choice == "🚪 Logout / Ganti Akun":
             active_client = None
             current_user_data = None
@@ -0,0 +1,1343 @@
+#!/usr/bin/env python3
+"""
+Datastore - Satu database SQLite (data/bot.db) untuk state yang dulu tersebar di file JSON
+Fitur:
+- Satu koneksi long-lived per proses (mode WAL), aman dipakai thread background
+- Repository bertipe: analytics, schedules, notifications, login_events,
+  hashtag_cache, follower_snapshots, whitelist, post_timing, post_samples, hashtag_index, comments,
+  story_viewers, backup_posts, post_latest
+- Migrasi schema bertahap (tabel schema_version), satu transaksi per versi
+- Import sekali dari file JSON lama (stats.json, scheduled_posts.json, ...) dalam satu transaksi,
+  dicatat di tabel json_imports supaya tidak diulang
+- compact_* per repository untuk core.housekeeping (rollup + hapus detail lama)
+"""
+
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = "data/bot.db"
+STATEMENT_CACHE = 128
+COUNTERS = ("likes", "follows", "comments", "stories", "dms", "errors")
+
+# =====================================================
+# 🧱 MIGRATIONS
+# =====================================================
+# (versi, deskripsi, statement). Tambah migrasi baru di akhir, jangan ubah yang sudah rilis.
+MIGRATIONS = [
+    (1, "analytics, schedules, notifications, hashtag cache, follower snapshots, whitelist", [
+        f"""
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            username TEXT NOT NULL,
+            day TEXT NOT NULL,
+            {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in COUNTERS)},
+            PRIMARY KEY (username, day)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            time TEXT NOT NULL,
+            action TEXT NOT NULL,
+            success INTEGER NOT NULL,
+            details TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_activities_user ON activities(username, id)",
+        "CREATE INDEX IF NOT EXISTS idx_activities_time ON activities(time)",
+        """
+        CREATE TABLE IF NOT EXISTS schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL,
+            caption TEXT NOT NULL DEFAULT '',
+            post_time TEXT NOT NULL,
+            post_type TEXT NOT NULL DEFAULT 'photo',
+            created_at TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            posted_at TEXT,
+            error TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_schedules_status ON schedules(status, post_time)",
+        """
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            read INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_notifications_time ON notifications(timestamp)",
+        """
+        CREATE TABLE IF NOT EXISTS hashtag_cache (
+            name TEXT PRIMARY KEY,
+            stats TEXT NOT NULL,
+            ts REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS follower_snapshots (
+            username TEXT NOT NULL,
+            day TEXT NOT NULL,
+            followers INTEGER NOT NULL,
+            PRIMARY KEY (username, day)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS whitelist (
+            username TEXT PRIMARY KEY,
+            added_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS json_imports (
+            source TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            imported_at TEXT NOT NULL
+        )
+        """,
+    ]),
+    (2, "schedules: akun pemilik (publish daemon)", [
+        "ALTER TABLE schedules ADD COLUMN username TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_schedules_user ON schedules(username, status, post_time)",
+    ]),
+    (3, "post_slots & post_timing: statistik jam posting terbaik (forward decay)", [
+        """
+        CREATE TABLE IF NOT EXISTS post_slots (
+            username TEXT NOT NULL,
+            weekday INTEGER NOT NULL,
+            hour INTEGER NOT NULL,
+            posts INTEGER NOT NULL DEFAULT 0,
+            w REAL NOT NULL DEFAULT 0,
+            ww REAL NOT NULL DEFAULT 0,
+            wx REAL NOT NULL DEFAULT 0,
+            wxx REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (username, weekday, hour)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS post_timing (
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            weekday INTEGER NOT NULL,
+            hour INTEGER NOT NULL,
+            weight REAL NOT NULL,
+            engagement REAL NOT NULL,
+            taken_at TEXT,
+            PRIMARY KEY (username, media_id)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (4, "post_tracking & post_samples: kurva performa post (sampling setelah publish)", [
+        """
+        CREATE TABLE IF NOT EXISTS post_tracking (
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            post_type TEXT NOT NULL DEFAULT 'photo',
+            published_at INTEGER NOT NULL,
+            next_step INTEGER NOT NULL DEFAULT 0,
+            next_due INTEGER,
+            PRIMARY KEY (username, media_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_post_tracking_due ON post_tracking(username, next_due)",
+        """
+        CREATE TABLE IF NOT EXISTS post_samples (
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            step INTEGER NOT NULL,
+            age INTEGER NOT NULL,
+            likes INTEGER NOT NULL,
+            comments INTEGER NOT NULL,
+            PRIMARY KEY (username, media_id, step)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (5, "hashtag_posts & hashtag_stats: inverted index hashtag -> post sendiri", [
+        """
+        CREATE TABLE IF NOT EXISTS hashtag_posts (
+            username TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            engagement REAL NOT NULL,
+            PRIMARY KEY (username, tag, media_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_hashtag_posts_media ON hashtag_posts(username, media_id)",
+        """
+        CREATE TABLE IF NOT EXISTS hashtag_stats (
+            username TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            posts INTEGER NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0,
+            total_sq REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (username, tag)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (6, "comments (+ FTS5), comment_sync watermark, comment_rules moderasi", [
+        """
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            pk TEXT NOT NULL,
+            user_id TEXT,
+            author TEXT,
+            text TEXT NOT NULL DEFAULT '',
+            created_at TEXT,
+            fetched_at TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'ok',
+            rule TEXT,
+            UNIQUE (username, media_id, pk)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_comments_user ON comments(username, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_comments_status ON comments(username, status, created_at)",
+        # External content: teks tidak disimpan dua kali, index ikut trigger
+        "CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5("
+        "text, author, content='comments', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        """
+        CREATE TRIGGER IF NOT EXISTS comments_ai AFTER INSERT ON comments BEGIN
+            INSERT INTO comments_fts (rowid, text, author) VALUES (new.id, new.text, new.author);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS comments_ad AFTER DELETE ON comments BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, text, author) VALUES ('delete', old.id, old.text, old.author);
+        END
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS comment_sync (
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            comment_count INTEGER NOT NULL,
+            last_created_at TEXT,
+            synced_at TEXT NOT NULL,
+            PRIMARY KEY (username, media_id)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS comment_rules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            pattern TEXT NOT NULL,
+            action TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            UNIQUE (kind, pattern)
+        )
+        """,
+    ]),
+    (7, "story_tracking & story_snapshots: viewer story sendiri sebelum expired (ID array delta-encoded)", [
+        """
+        CREATE TABLE IF NOT EXISTS story_tracking (
+            username TEXT NOT NULL,
+            story_pk TEXT NOT NULL,
+            taken_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            next_due INTEGER,
+            snapshots INTEGER NOT NULL DEFAULT 0,
+            viewer_count INTEGER NOT NULL DEFAULT 0,
+            viewers BLOB,
+            PRIMARY KEY (username, story_pk)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_story_tracking_due ON story_tracking(username, next_due)",
+        "CREATE INDEX IF NOT EXISTS idx_story_tracking_taken ON story_tracking(username, taken_at)",
+        """
+        CREATE TABLE IF NOT EXISTS story_snapshots (
+            username TEXT NOT NULL,
+            story_pk TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            taken INTEGER NOT NULL,
+            viewer_count INTEGER NOT NULL,
+            added BLOB NOT NULL,
+            removed BLOB NOT NULL,
+            PRIMARY KEY (username, story_pk, seq)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS story_viewer_names (
+            user_id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+        """,
+    ]),
+    (8, "backup_posts (+ FTS5): index pencarian post yang sudah di-backup", [
+        """
+        CREATE TABLE IF NOT EXISTS backup_posts (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            caption TEXT NOT NULL DEFAULT '',
+            hashtags TEXT NOT NULL DEFAULT '',
+            location TEXT NOT NULL DEFAULT '',
+            taken_at TEXT,
+            post_type TEXT,
+            likes INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            snapshot TEXT NOT NULL,
+            UNIQUE (username, media_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_backup_posts_taken ON backup_posts(username, taken_at)",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS backup_posts_fts USING fts5("
+        "caption, hashtags, location, content='backup_posts', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        """
+        CREATE TRIGGER IF NOT EXISTS backup_posts_ai AFTER INSERT ON backup_posts BEGIN
+            INSERT INTO backup_posts_fts (rowid, caption, hashtags, location)
+            VALUES (new.id, new.caption, new.hashtags, new.location);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS backup_posts_ad AFTER DELETE ON backup_posts BEGIN
+            INSERT INTO backup_posts_fts (backup_posts_fts, rowid, caption, hashtags, location)
+            VALUES ('delete', old.id, old.caption, old.hashtags, old.location);
+        END
+        """,
+        # Likes / komentar berubah tiap backup; index teks hanya disentuh kalau teksnya berubah
+        """
+        CREATE TRIGGER IF NOT EXISTS backup_posts_au AFTER UPDATE ON backup_posts
+        WHEN old.caption IS NOT new.caption OR old.hashtags IS NOT new.hashtags OR old.location IS NOT new.location
+        BEGIN
+            INSERT INTO backup_posts_fts (backup_posts_fts, rowid, caption, hashtags, location)
+            VALUES ('delete', old.id, old.caption, old.hashtags, old.location);
+            INSERT INTO backup_posts_fts (rowid, caption, hashtags, location)
+            VALUES (new.id, new.caption, new.hashtags, new.location);
+        END
+        """,
+    ]),
+    (9, "post_latest: snapshot terakhir per post sendiri (dedup post_history, boost template caption)", [
+        """
+        CREATE TABLE IF NOT EXISTS post_latest (
+            username TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            caption TEXT NOT NULL DEFAULT '',
+            first_line TEXT NOT NULL DEFAULT '',
+            likes INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            captured_at TEXT,
+            PRIMARY KEY (username, media_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_post_latest_first_line ON post_latest(username, first_line)",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def _month(day):
+    return day[:7]
+
+# =====================================================
+# 📊 ANALYTICS
+# =====================================================
+class AnalyticsRepo:
+    SQL = {
+        "day": "SELECT * FROM daily_stats WHERE username = ? AND day = ?",
+        "day_all": "SELECT * FROM daily_stats WHERE day = ?",
+        "daily": "SELECT * FROM daily_stats ORDER BY username, day",
+        "daily_user": "SELECT * FROM daily_stats WHERE username = ? ORDER BY day",
+        "activity_insert": "INSERT INTO activities (username, time, action, success, details) VALUES (?, ?, ?, ?, ?)",
+        # Simpan `keep` activity terakhir per user (pakai index (username, id))
+        "activity_trim": """
+            DELETE FROM activities WHERE username = ? AND id <= (
+                SELECT id FROM activities WHERE username = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+        """,
+        "activities_user": "SELECT * FROM activities WHERE username = ? ORDER BY id DESC LIMIT ?",
+    }
+    SQL.update({
+        f"increment_{c}": f"""
+            INSERT INTO daily_stats (username, day, {c}) VALUES (?, ?, ?)
+            ON CONFLICT(username, day) DO UPDATE SET {c} = {c} + excluded.{c}
+        """
+        for c in COUNTERS
+    })
+
+    def __init__(self, store):
+        self.store = store
+
+    def increment(self, username, day, counter, n=1):
+        if counter not in COUNTERS:
+            raise ValueError(f"Counter tidak dikenal: {counter}")
+        self.store.execute(self.SQL[f"increment_{counter}"], (username, day, n))
+
+    def add_activity(self, username, action, success, details=None, when=None, keep=1000):
+        when = when or datetime.now().isoformat()
+        with self.store.transaction() as conn:
+            conn.execute(self.SQL["activity_insert"], (
+                username, when, action, int(bool(success)), json.dumps(details, ensure_ascii=False, default=str),
+            ))
+            conn.execute(self.SQL["activity_trim"], (username, username, keep))
+
+    def activities(self, username, limit=100):
+        rows = self.store.query(self.SQL["activities_user"], (username, limit))
+        for row in rows:
+            row["success"] = bool(row["success"])
+            row["details"] = json.loads(row["details"]) if row["details"] else None
+        return rows
+
+    @staticmethod
+    def _counters(row):
+        return {c: row[c] for c in COUNTERS}
+
+    def day(self, username, day):
+        row = self.store.query_one(self.SQL["day"], (username, day))
+        return self._counters(row) if row else {}
+
+    def day_totals(self, day):
+        total = {}
+        for row in self.store.query(self.SQL["day_all"], (day,)):
+            for c in COUNTERS:
+                total[c] = total.get(c, 0) + row[c]
+        return total
+
+    def iter_daily(self, username=None):
+        """(username, day, counters) terurut per user lalu tanggal"""
+        sql, params = (self.SQL["daily_user"], (username,)) if username else (self.SQL["daily"], ())
+        for row in self.store.query(sql, params):
+            yield row["username"], row["day"], self._counters(row)
+
+    def import_json(self, conn, stats=None, activities=None):
+        rows = 0
+        for username, days in (stats or {}).items():
+            for day, counters in days.items():
+                values = [int(counters.get(c, 0) or 0) for c in COUNTERS]
+                conn.execute(
+                    f"INSERT OR REPLACE INTO daily_stats (username, day, {', '.join(COUNTERS)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(COUNTERS))})", (username, day, *values))
+                rows += 1
+        for username, entries in (activities or {}).items():
+            for entry in entries:
+                conn.execute(self.SQL["activity_insert"], (
+                    username, entry.get("time", ""), entry.get("action", ""), int(bool(entry.get("success"))),
+                    json.dumps(entry.get("details"), ensure_ascii=False, default=str),
+                ))
+                rows += 1
+        return rows
+
+    def compact_daily(self, cutoff):
+        """Hari sebelum cutoff dijumlah per bulan -> (rollup, jumlah baris dihapus, 'sum')"""
+        day = cutoff.strftime("%Y-%m-%d")
+        rollup = {}
+        with self.store.transaction() as conn:
+            for row in conn.execute("SELECT * FROM daily_stats WHERE day < ?", (day,)):
+                month = rollup.setdefault(row["username"], {}).setdefault(_month(row["day"]), {})
+                for c in COUNTERS:
+                    month[c] = month.get(c, 0) + row[c]
+            removed = conn.execute("DELETE FROM daily_stats WHERE day < ?", (day,)).rowcount
+        return rollup, removed, "sum"
+
+    def compact_activities(self, cutoff):
+        rollup = {}
+        with self.store.transaction() as conn:
+            for row in conn.execute(
+                "SELECT username, substr(time, 1, 10) AS day, action, COUNT(*) AS n FROM activities "
+                "WHERE time < ? GROUP BY username, day, action", (cutoff.isoformat(),)
+            ):
+                rollup.setdefault(row["username"], {}).setdefault(row["day"], {})[row["action"]] = row["n"]
+            removed = conn.execute("DELETE FROM activities WHERE time < ?", (cutoff.isoformat(),)).rowcount
+        return rollup, removed, "sum"
+
+# =====================================================
+# ⏰ SCHEDULES
+# =====================================================
+class ScheduleRepo:
+    COLUMNS = ("id", "file_path", "caption", "post_time", "post_type", "created_at", "status", "posted_at", "error",
+               "username")
+    # Jadwal tanpa username (dibuat sebelum migrasi 2) boleh dipublish akun mana saja
+    OWNED_BY = "(username = ? OR username IS NULL)"
+
+    def __init__(self, store):
+        self.store = store
+
+    def add(self, file_path, caption, post_time, post_type="photo", username=None):
+        """Return dict jadwal baru (id dari AUTOINCREMENT, tidak pernah dipakai ulang)"""
+        now = datetime.now().isoformat()
+        with self.store.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO schedules (file_path, caption, post_time, post_type, created_at, username) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (file_path, caption, post_time, post_type, now, username),
+            )
+        return self.get(cursor.lastrowid)
+
+    def get(self, schedule_id):
+        return self.store.query_one("SELECT * FROM schedules WHERE id = ?", (schedule_id,))
+
+    def all(self):
+        return self.store.query("SELECT * FROM schedules ORDER BY id")
+
+    def pending(self):
+        return self.store.query("SELECT * FROM schedules WHERE status = 'pending' ORDER BY post_time, id")
+
+    def due(self, now, username=None):
+        """Jadwal pending yang waktunya (YYYY-MM-DD HH:MM) sudah lewat"""
+        sql = "SELECT * FROM schedules WHERE status = 'pending' AND post_time <= ?"
+        params = (now.strftime("%Y-%m-%d %H:%M"),)
+        if username:
+            sql, params = sql + f" AND {self.OWNED_BY}", params + (username,)
+        return self.store.query(sql + " ORDER BY post_time, id", params)
+
+    def claim(self, schedule_id):
+        """pending -> publishing secara atomik. False kalau sudah diambil proses lain."""
+        return self.store.execute(
+            "UPDATE schedules SET status = 'publishing' WHERE id = ? AND status = 'pending'", (schedule_id,)
+        ).rowcount > 0
+
+    def fail_interrupted(self, username=None):
+        """
+        Jadwal yang tertinggal di status publishing (proses mati saat upload) -> failed.
+        Sengaja tidak dikembalikan ke pending: upload-nya mungkin sudah sukses, jangan posting dobel.
+        """
+        sql = "UPDATE schedules SET status = 'failed', error = 'terputus saat publish' WHERE status = 'publishing'"
+        params = ()
+        if username:
+            sql, params = sql + f" AND {self.OWNED_BY}", (username,)
+        return self.store.execute(sql, params).rowcount
+
+    def set_status(self, schedule_id, status, error=None):
+        posted_at = datetime.now().isoformat() if status == "posted" else None
+        self.store.execute(
+            "UPDATE schedules SET status = ?, posted_at = COALESCE(?, posted_at), error = ? WHERE id = ?",
+            (status, posted_at, error, schedule_id),
+        )
+
+    def delete(self, schedule_id):
+        return self.store.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,)).rowcount > 0
+
+    def import_json(self, conn, schedules):
+        for schedule in schedules:
+            record = {c: schedule.get(c) for c in self.COLUMNS}
+            record["caption"] = record["caption"] or ""
+            record["created_at"] = record["created_at"] or datetime.now().isoformat()
+            record["status"] = record["status"] or "pending"
+            record["post_type"] = record["post_type"] or "photo"
+            conn.execute(
+                f"INSERT OR REPLACE INTO schedules ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join(':' + c for c in self.COLUMNS)})", record)
+        return len(schedules)
+
+    def compact(self, cutoff):
+        """Jadwal selesai (posted/failed) sebelum cutoff -> hitungan per hari & status"""
+        where = "status IN ('posted', 'failed') AND COALESCE(posted_at, created_at) < ?"
+        rollup = {}
+        with self.store.transaction() as conn:
+            for row in conn.execute(
+                f"SELECT substr(COALESCE(posted_at, created_at), 1, 10) AS day, status, COUNT(*) AS n "
+                f"FROM schedules WHERE {where} GROUP BY day, status", (cutoff.isoformat(),)
+            ):
+                rollup.setdefault("all", {}).setdefault(row["day"], {})[row["status"]] = row["n"]
+            removed = conn.execute(f"DELETE FROM schedules WHERE {where}", (cutoff.isoformat(),)).rowcount
+        return rollup, removed, "sum"
+
+# =====================================================
+# 🔔 NOTIFICATIONS
+# =====================================================
+class NotificationRepo:
+    def __init__(self, store):
+        self.store = store
+
+    def add(self, notification_type, data, keep=None):
+        """Simpan notifikasi; kalau keep di-set, hanya `keep` notifikasi terakhir yang disimpan"""
+        notification = {
+            "type": notification_type,
+            "data": data,
+            "timestamp": datetime.now().isoformat(),
+            "read": False,
+        }
+        with self.store.transaction() as conn:
+            conn.execute(
+                "INSERT INTO notifications (type, data, timestamp, read) VALUES (?, ?, ?, 0)",
+                (notification_type, json.dumps(data, ensure_ascii=False, default=str), notification["timestamp"]),
+            )
+            if keep:
+                conn.execute(
+                    "DELETE FROM notifications WHERE id <= "
+                    "(SELECT id FROM notifications ORDER BY id DESC LIMIT 1 OFFSET ?)", (keep,))
+        return notification
+
+    def recent(self, limit=20):
+        """Notifikasi terakhir, urut lama -> baru"""
+        rows = self.store.query("SELECT * FROM notifications ORDER BY id DESC LIMIT ?", (limit,))
+        for row in rows:
+            row["data"] = json.loads(row["data"])
+            row["read"] = bool(row["read"])
+        return rows[::-1]
+
+    def unread_count(self):
+        return self.store.query_one("SELECT COUNT(*) AS n FROM notifications WHERE read = 0")["n"]
+
+    def mark_all_read(self):
+        self.store.execute("UPDATE notifications SET read = 1 WHERE read = 0")
+
+    def import_json(self, conn, notifications):
+        conn.executemany(
+            "INSERT INTO notifications (type, data, timestamp, read) VALUES (?, ?, ?, ?)",
+            (
+                (n.get("type", ""), json.dumps(n.get("data"), ensure_ascii=False, default=str),
+                 n.get("timestamp", ""), int(bool(n.get("read"))))
+                for n in notifications if isinstance(n, dict)
+            ),
+        )
+        return len(notifications)
+
+    def compact(self, cutoff):
+        rollup = {}
+        with self.store.transaction() as conn:
+            for row in conn.execute(
+                "SELECT substr(timestamp, 1, 10) AS day, type, COUNT(*) AS n FROM notifications "
+                "WHERE timestamp < ? GROUP BY day, type", (cutoff.isoformat(),)
+            ):
+                rollup.setdefault("all", {}).setdefault(row["day"], {})[row["type"]] = row["n"]
+            removed = conn.execute("DELETE FROM notifications WHERE timestamp < ?", (cutoff.isoformat(),)).rowcount
+        return rollup, removed, "sum"
+
+# =====================================================
+# #️⃣ HASHTAG CACHE
+# =====================================================
+class HashtagCacheRepo:
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, name):
+        row = self.store.query_one("SELECT stats FROM hashtag_cache WHERE name = ?", (name,))
+        return json.loads(row["stats"]) if row else None
+
+    def put(self, name, stats):
+        self.store.execute(
+            "INSERT OR REPLACE INTO hashtag_cache (name, stats, ts) VALUES (?, ?, ?)",
+            (name, json.dumps(stats, ensure_ascii=False), stats.get("timestamp") or time.time()),
+        )
+
+    def all(self):
+        return {row["name"]: json.loads(row["stats"]) for row in self.store.query("SELECT * FROM hashtag_cache")}
+
+    def import_json(self, conn, cache):
+        conn.executemany(
+            "INSERT OR REPLACE INTO hashtag_cache (name, stats, ts) VALUES (?, ?, ?)",
+            (
+                (name, json.dumps(stats, ensure_ascii=False), stats.get("timestamp") or 0)
+                for name, stats in cache.items() if isinstance(stats, dict)
+            ),
+        )
+        return len(cache)
+
+    def compact(self, cutoff):
+        removed = self.store.execute("DELETE FROM hashtag_cache WHERE ts < ?", (cutoff.timestamp(),)).rowcount
+        return {}, removed, "sum"
+
+# =====================================================
+# 📈 FOLLOWER SNAPSHOTS
+# =====================================================
+class FollowerSnapshotRepo:
+    def __init__(self, store):
+        self.store = store
+
+    def record(self, username, day, followers):
+        """Simpan snapshot harian (sekali per hari). Return True kalau baru disimpan."""
+        return self.store.execute(
+            "INSERT OR IGNORE INTO follower_snapshots (username, day, followers) VALUES (?, ?, ?)",
+            (username, day, followers),
+        ).rowcount > 0
+
+    def get(self, username, day):
+        row = self.store.query_one(
+            "SELECT followers FROM follower_snapshots WHERE username = ? AND day = ?", (username, day))
+        return row["followers"] if row else None
+
+    def history(self, username):
+        return {
+            row["day"]: row["followers"]
+            for row in self.store.query(
+                "SELECT day, followers FROM follower_snapshots WHERE username = ? ORDER BY day", (username,))
+        }
+
+    def import_json(self, conn, data):
+        rows = [(user, day, count) for user, days in data.items() for day, count in days.items()]
+        conn.executemany("INSERT OR REPLACE INTO follower_snapshots (username, day, followers) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def compact(self, cutoff):
+        """Snapshot sebelum cutoff -> nilai terakhir per bulan"""
+        day = cutoff.strftime("%Y-%m-%d")
+        rollup = {}
+        with self.store.transaction() as conn:
+            for row in conn.execute(
+                "SELECT username, day, followers FROM follower_snapshots WHERE day < ? ORDER BY username, day", (day,)
+            ):
+                rollup.setdefault(row["username"], {})[_month(row["day"])] = row["followers"]
+            removed = conn.execute("DELETE FROM follower_snapshots WHERE day < ?", (day,)).rowcount
+        return rollup, removed, "last"
+
+# =====================================================
+# 🕒 POST TIMING
+# =====================================================
+class PostTimingRepo:
+    """
+    Jumlahan berbobot per (username, hari, jam): w, w², w·x, w·x² (x = engagement).
+    Post baru / snapshot baru satu post = update O(1); kontribusi lama post itu dikurangi dulu.
+    """
+    SQL = {
+        "get": "SELECT * FROM post_timing WHERE username = ? AND media_id = ?",
+        "put": """
+            INSERT OR REPLACE INTO post_timing (username, media_id, weekday, hour, weight, engagement, taken_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        "add": """
+            INSERT INTO post_slots (username, weekday, hour, posts, w, ww, wx, wxx) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(username, weekday, hour) DO UPDATE SET
+                posts = posts + excluded.posts, w = w + excluded.w, ww = ww + excluded.ww,
+                wx = wx + excluded.wx, wxx = wxx + excluded.wxx
+        """,
+        "prune": "DELETE FROM post_slots WHERE username = ? AND weekday = ? AND hour = ? AND posts <= 0",
+    }
+
+    def __init__(self, store):
+        self.store = store
+
+    def _add(self, conn, username, weekday, hour, weight, x, sign):
+        conn.execute(self.SQL["add"], (
+            username, weekday, hour, sign, sign * weight, sign * weight * weight, sign * weight * x, sign * weight * x * x,
+        ))
+        if sign < 0:
+            conn.execute(self.SQL["prune"], (username, weekday, hour))
+
+    def observe(self, username, media_id, weekday, hour, weight, engagement, taken_at=None):
+        """Catat / perbarui satu post. Return False kalau nilainya sama dengan yang sudah tercatat."""
+        with self.store.transaction() as conn:
+            old = conn.execute(self.SQL["get"], (username, media_id)).fetchone()
+            if old:
+                if (old["weekday"], old["hour"], old["weight"], old["engagement"]) == (weekday, hour, weight, engagement):
+                    return False
+                self._add(conn, username, old["weekday"], old["hour"], old["weight"], old["engagement"], -1)
+            conn.execute(self.SQL["put"], (username, media_id, weekday, hour, weight, engagement, taken_at))
+            self._add(conn, username, weekday, hour, weight, engagement, 1)
+        return True
+
+    def slots(self, username):
+        return self.store.query("SELECT * FROM post_slots WHERE username = ? ORDER BY weekday, hour", (username,))
+
+    def count(self, username):
+        return self.store.query_one("SELECT COUNT(*) AS n FROM post_timing WHERE username = ?", (username,))["n"]
+
+# =====================================================
+# 📉 POST SAMPLES
+# =====================================================
+class PostSampleRepo:
+    """
+    Post yang sedang di-sample (post_tracking) + time series counter-nya (post_samples).
+    Satu baris sample = (step, umur detik, likes, komentar), semua integer: kecil & urut per post.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def track(self, username, media_id, post_type, published_at, first_due):
+        """Return False kalau post ini sudah di-track"""
+        return self.store.execute(
+            "INSERT OR IGNORE INTO post_tracking (username, media_id, post_type, published_at, next_step, next_due) "
+            "VALUES (?, ?, ?, ?, 0, ?)", (username, media_id, post_type, int(published_at), int(first_due)),
+        ).rowcount > 0
+
+    def due(self, username, now):
+        """Post yang jadwal sample berikutnya sudah lewat (pakai index (username, next_due))"""
+        return self.store.query(
+            "SELECT * FROM post_tracking WHERE username = ? AND next_due <= ? ORDER BY next_due",
+            (username, int(now)))
+
+    def tracked(self, username):
+        return self.store.query(
+            "SELECT * FROM post_tracking WHERE username = ? ORDER BY published_at DESC", (username,))
+
+    def record(self, username, samples, finished=()):
+        """
+        Satu transaksi untuk satu batch:
+        samples = [(media_id, step, age, likes, comments, next_step, next_due)], next_due None = selesai.
+        finished = media_id yang berhenti di-sample (mis. post dihapus).
+        """
+        with self.store.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO post_samples (username, media_id, step, age, likes, comments) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((username, media_id, step, int(age), likes, comments)
+                 for media_id, step, age, likes, comments, _, _ in samples))
+            conn.executemany(
+                "UPDATE post_tracking SET next_step = ?, next_due = ? WHERE username = ? AND media_id = ?",
+                ((next_step, None if next_due is None else int(next_due), username, media_id)
+                 for media_id, _, _, _, _, next_step, next_due in samples))
+            conn.executemany(
+                "UPDATE post_tracking SET next_due = NULL WHERE username = ? AND media_id = ?",
+                ((username, media_id) for media_id in finished))
+
+    def samples(self, username):
+        return self.store.query(
+            "SELECT media_id, step, age, likes, comments FROM post_samples WHERE username = ? ORDER BY media_id, age",
+            (username,))
+
+# =====================================================
+# #️⃣ HASHTAG INDEX
+# =====================================================
+class HashtagIndexRepo:
+    """
+    Inverted index hashtag -> post (hashtag_posts, urut per tag) + agregat per tag (hashtag_stats).
+    Tag ALL ("") berisi semua post, termasuk yang tanpa hashtag: agregat seluruh akun.
+    Post baru / snapshot baru = O(jumlah tag post itu).
+    """
+    ALL = ""
+    SQL = {
+        "post": "SELECT tag, engagement FROM hashtag_posts WHERE username = ? AND media_id = ?",
+        "put": "INSERT OR REPLACE INTO hashtag_posts (username, tag, media_id, engagement) VALUES (?, ?, ?, ?)",
+        "remove": "DELETE FROM hashtag_posts WHERE username = ? AND tag = ? AND media_id = ?",
+        "add": """
+            INSERT INTO hashtag_stats (username, tag, posts, total, total_sq) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(username, tag) DO UPDATE SET
+                posts = posts + excluded.posts, total = total + excluded.total, total_sq = total_sq + excluded.total_sq
+        """,
+        "prune": "DELETE FROM hashtag_stats WHERE username = ? AND tag = ? AND posts <= 0",
+    }
+
+    def __init__(self, store):
+        self.store = store
+
+    def _add(self, conn, username, tag, x, sign):
+        conn.execute(self.SQL["add"], (username, tag, sign, sign * x, sign * x * x))
+        if sign < 0:
+            conn.execute(self.SQL["prune"], (username, tag))
+
+    def observe(self, username, media_id, tags, engagement):
+        """Catat / perbarui tag & engagement satu post. Return False kalau tidak ada yang berubah."""
+        current = {tag: engagement for tag in set(tags) | {self.ALL}}
+        with self.store.transaction() as conn:
+            old = {row["tag"]: row["engagement"] for row in conn.execute(self.SQL["post"], (username, media_id))}
+            if old == current:
+                return False
+            for tag, x in old.items():
+                if current.get(tag) != x:
+                    self._add(conn, username, tag, x, -1)
+                    if tag not in current:
+                        conn.execute(self.SQL["remove"], (username, tag, media_id))
+            for tag, x in current.items():
+                if old.get(tag) != x:
+                    conn.execute(self.SQL["put"], (username, tag, media_id, x))
+                    self._add(conn, username, tag, x, 1)
+        return True
+
+    def stats(self, username=None, min_posts=1):
+        """Agregat per tag (posts, total, total_sq); username None = semua akun digabung"""
+        return self.store.query(
+            "SELECT tag, SUM(posts) AS posts, SUM(total) AS total, SUM(total_sq) AS total_sq FROM hashtag_stats "
+            "WHERE (? IS NULL OR username = ?) GROUP BY tag HAVING SUM(posts) >= ?",
+            (username, username, min_posts))
+
+    def posts(self, username, tag, limit=20):
+        """Posting list satu tag, engagement tertinggi dulu"""
+        return self.store.query(
+            "SELECT media_id, engagement FROM hashtag_posts WHERE username = ? AND tag = ? "
+            "ORDER BY engagement DESC LIMIT ?", (username, tag, limit))
+
+# =====================================================
+# 📸 POST LATEST
+# =====================================================
+class PostLatestRepo:
+    """
+    Snapshot terakhir per post sendiri (= baris terakhir per media_id di logs/post_history.jsonl).
+    Dipakai untuk menulis snapshot hanya kalau ada yang berubah, dan agregat per baris pertama caption.
+    """
+    SQL = {
+        "upsert": """
+            INSERT INTO post_latest (username, media_id, caption, first_line, likes, comments, captured_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(username, media_id) DO UPDATE SET
+                caption = excluded.caption, first_line = excluded.first_line, likes = excluded.likes,
+                comments = excluded.comments, captured_at = excluded.captured_at
+            WHERE caption != excluded.caption OR likes != excluded.likes OR comments != excluded.comments
+        """,
+    }
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def first_line(caption):
+        return (caption or "").split("\n", 1)[0].strip()
+
+    def observe(self, conn, records):
+        """Record post_history -> tabel. Return record yang baru / berubah (snapshot lama yang sama dilewati)."""
+        changed = []
+        for record in records:
+            caption = record.get("caption") or ""
+            cursor = conn.execute(self.SQL["upsert"], (
+                record["username"], str(record["media_id"]), caption, self.first_line(caption),
+                record.get("likes") or 0, record.get("comments") or 0, record.get("captured_at"),
+            ))
+            if cursor.rowcount:
+                changed.append(record)
+        return changed
+
+    def caption_totals(self, username=None):
+        """{baris pertama caption: (jumlah post, total engagement)}; engagement = likes + 2x komentar"""
+        return {
+            row["first_line"]: (row["posts"], row["total"])
+            for row in self.store.query(
+                "SELECT first_line, COUNT(*) AS posts, SUM(likes + 2 * comments) AS total FROM post_latest "
+                "WHERE (? IS NULL OR username = ?) AND first_line != '' GROUP BY first_line",
+                (username, username))
+        }
+
+# =====================================================
+# 💬 COMMENTS
+# =====================================================
+class CommentRepo:
+    """Komentar di post sendiri (FTS5 comments_fts), watermark sync per media, aturan moderasi"""
+    COLUMNS = ("username", "media_id", "pk", "user_id", "author", "text", "created_at", "fetched_at")
+
+    def __init__(self, store):
+        self.store = store
+
+    # --- watermark ---
+    def watermark(self, username, media_id):
+        return self.store.query_one(
+            "SELECT * FROM comment_sync WHERE username = ? AND media_id = ?", (username, media_id))
+
+    def watermarks(self, username):
+        return {row["media_id"]: row for row in self.store.query(
+            "SELECT * FROM comment_sync WHERE username = ?", (username,))}
+
+    # --- comments ---
+    def add_many(self, username, media_id, comments, comment_count):
+        """
+        Simpan komentar (yang sudah ada dilewati) + geser watermark, satu transaksi.
+        Return list komentar yang benar-benar baru (dict, dengan id).
+        """
+        now = datetime.now().isoformat()
+        added = []
+        with self.store.transaction() as conn:
+            for comment in comments:
+                record = dict(comment, username=username, media_id=media_id, fetched_at=now)
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO comments ({', '.join(self.COLUMNS)}) "
+                    f"VALUES ({', '.join(':' + c for c in self.COLUMNS)})", {c: record.get(c) for c in self.COLUMNS})
+                if cursor.rowcount:
+                    added.append(dict(record, id=cursor.lastrowid, status="ok", rule=None))
+            last = max((c["created_at"] for c in comments if c.get("created_at")), default=None)
+            conn.execute(
+                "INSERT INTO comment_sync (username, media_id, comment_count, last_created_at, synced_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(username, media_id) DO UPDATE SET "
+                "comment_count = excluded.comment_count, synced_at = excluded.synced_at, "
+                "last_created_at = NULLIF(MAX(COALESCE(last_created_at, ''), COALESCE(excluded.last_created_at, '')), '')",
+                (username, media_id, comment_count, last, now))
+        return added
+
+    def set_status(self, comment_id, status, rule=None):
+        self.store.execute("UPDATE comments SET status = ?, rule = ? WHERE id = ?", (status, rule, comment_id))
+
+    def recent(self, username, status=None, limit=20):
+        sql, params = "SELECT * FROM comments WHERE username = ?", (username,)
+        if status:
+            sql, params = sql + " AND status = ?", params + (status,)
+        return self.store.query(sql + " ORDER BY created_at DESC, id DESC LIMIT ?", params + (limit,))
+
+    def search(self, username, query, limit=20):
+        """Full-text (FTS5, ranking bm25); query mentah di-quote per kata supaya tanda baca aman"""
+        terms = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+        if not terms:
+            return []
+        return self.store.query(
+            "SELECT c.*, snippet(comments_fts, 0, '[', ']', '…', 8) AS snippet "
+            "FROM comments_fts JOIN comments c ON c.id = comments_fts.rowid "
+            "WHERE comments_fts MATCH ? AND c.username = ? ORDER BY bm25(comments_fts) LIMIT ?",
+            (terms, username, limit))
+
+    def count(self, username):
+        return self.store.query_one("SELECT COUNT(*) AS n FROM comments WHERE username = ?", (username,))["n"]
+
+    # --- moderation rules ---
+    def rules(self):
+        return self.store.query("SELECT * FROM comment_rules ORDER BY id")
+
+    def add_rule(self, kind, pattern, action):
+        return self.store.execute(
+            "INSERT OR REPLACE INTO comment_rules (kind, pattern, action, created_at) VALUES (?, ?, ?, ?)",
+            (kind, pattern, action, datetime.now().isoformat())).rowcount > 0
+
+    def remove_rule(self, rule_id):
+        return self.store.execute("DELETE FROM comment_rules WHERE id = ?", (rule_id,)).rowcount > 0
+
+# =====================================================
+# 📖 STORY VIEWERS
+# =====================================================
+class StoryViewerRepo:
+    """
+    Story sendiri yang di-snapshot sebelum expired (story_tracking) + delta antar snapshot (story_snapshots).
+    Viewer disimpan sebagai BLOB ID array terurut (encoding di core.story_viewers); repo ini tidak decode.
+    story_tracking.viewers = set viewer terakhir (gabungan semua delta), yang dibaca query agregat.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def track(self, username, story_pk, taken_at, expires_at, first_due):
+        """Return False kalau story ini sudah di-track"""
+        return self.store.execute(
+            "INSERT OR IGNORE INTO story_tracking (username, story_pk, taken_at, expires_at, next_due) "
+            "VALUES (?, ?, ?, ?, ?)", (username, story_pk, int(taken_at), int(expires_at), int(first_due)),
+        ).rowcount > 0
+
+    def get(self, username, story_pk):
+        return self.store.query_one(
+            "SELECT * FROM story_tracking WHERE username = ? AND story_pk = ?", (username, story_pk))
+
+    def due(self, username, now):
+        return self.store.query(
+            "SELECT * FROM story_tracking WHERE username = ? AND next_due <= ? ORDER BY next_due",
+            (username, int(now)))
+
+    def pending(self, username):
+        return self.store.query_one(
+            "SELECT COUNT(*) AS n FROM story_tracking WHERE username = ? AND next_due IS NOT NULL", (username,))["n"]
+
+    def record(self, username, story_pk, seq, taken, viewer_count, added, removed, viewers, next_due, names=()):
+        """Satu snapshot: delta + set viewer terbaru + jadwal berikutnya (None = selesai), satu transaksi"""
+        with self.store.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO story_snapshots (username, story_pk, seq, taken, viewer_count, added, removed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (username, story_pk, seq, int(taken), viewer_count, added, removed))
+            conn.execute(
+                "UPDATE story_tracking SET snapshots = ?, viewer_count = ?, viewers = ?, next_due = ? "
+                "WHERE username = ? AND story_pk = ?",
+                (seq + 1, viewer_count, viewers, None if next_due is None else int(next_due), username, story_pk))
+            conn.executemany(
+                "INSERT OR REPLACE INTO story_viewer_names (user_id, username, updated_at) VALUES (?, ?, ?)",
+                ((user_id, name, int(taken)) for user_id, name in names))
+
+    def finish(self, username, story_pks):
+        with self.store.transaction() as conn:
+            conn.executemany(
+                "UPDATE story_tracking SET next_due = NULL WHERE username = ? AND story_pk = ?",
+                ((username, pk) for pk in story_pks))
+
+    def stories(self, username, since=0):
+        """Story yang sudah punya snapshot sejak `since` (epoch), urut waktu naik"""
+        return self.store.query(
+            "SELECT story_pk, taken_at, viewer_count, snapshots, viewers FROM story_tracking "
+            "WHERE username = ? AND taken_at >= ? AND viewers IS NOT NULL ORDER BY taken_at",
+            (username, int(since)))
+
+    def snapshots(self, username, story_pk):
+        return self.store.query(
+            "SELECT * FROM story_snapshots WHERE username = ? AND story_pk = ? ORDER BY seq", (username, story_pk))
+
+    def names(self, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        rows = self.store.query(
+            f"SELECT user_id, username FROM story_viewer_names WHERE user_id IN ({', '.join('?' * len(user_ids))})",
+            user_ids)
+        return {row["user_id"]: row["username"] for row in rows}
+
+# =====================================================
+# 🔎 BACKUP SEARCH
+# =====================================================
+class BackupPostRepo:
+    """Post yang sudah di-backup (backup_posts) + full-text index FTS5 caption / hashtag / lokasi"""
+    COLUMNS = ("username", "media_id", "caption", "hashtags", "location", "taken_at", "post_type",
+               "likes", "comments", "snapshot")
+    WEIGHTS = (10.0, 5.0, 2.0)  # bm25 per kolom: caption, hashtags, location
+
+    def __init__(self, store):
+        self.store = store
+
+    def upsert_many(self, conn, records):
+        """Insert / update post (dipanggil di transaksi pemanggil). Return jumlah baris yang berubah."""
+        changed = 0
+        for record in records:
+            changed += conn.execute(
+                f"INSERT INTO backup_posts ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join(':' + c for c in self.COLUMNS)}) "
+                "ON CONFLICT(username, media_id) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in self.COLUMNS[2:])
+                + " WHERE " + " OR ".join(f"{c} IS NOT excluded.{c}" for c in self.COLUMNS[2:-1]),
+                record,
+            ).rowcount
+        return changed
+
+    def search(self, username, match=None, since=None, until=None, min_likes=0, limit=20):
+        """
+        match = ekspresi FTS5 yang sudah aman (lihat core.backup_search); None = tanpa teks, urut terbaru.
+        Ranking bm25 berbobot kolom, seri diurutkan engagement.
+        """
+        where, params = ["p.username = ?", "p.likes >= ?"], [username, min_likes]
+        if since:
+            where.append("p.taken_at >= ?")
+            params.append(since)
+        if until:
+            where.append("p.taken_at < ?")
+            params.append(until)
+        if match is None:
+            return self.store.query(
+                f"SELECT p.*, NULL AS snippet FROM backup_posts p WHERE {' AND '.join(where)} "
+                "ORDER BY p.taken_at DESC LIMIT ?", params + [limit])
+        weights = ", ".join(str(w) for w in self.WEIGHTS)
+        return self.store.query(
+            "SELECT p.*, snippet(backup_posts_fts, 0, '[', ']', '…', 12) AS snippet, "
+            f"bm25(backup_posts_fts, {weights}) AS rank "
+            "FROM backup_posts_fts JOIN backup_posts p ON p.id = backup_posts_fts.rowid "
+            f"WHERE backup_posts_fts MATCH ? AND {' AND '.join(where)} "
+            "ORDER BY rank, p.likes + 2 * p.comments DESC LIMIT ?",
+            [match] + params + [limit])
+
+    def count(self, username):
+        return self.store.query_one("SELECT COUNT(*) AS n FROM backup_posts WHERE username = ?", (username,))["n"]
+
+# =====================================================
+# 🛡️ WHITELIST
+# =====================================================
+class WhitelistRepo:
+    def __init__(self, store):
+        self.store = store
+
+    def all(self):
+        return [row["username"] for row in self.store.query("SELECT username FROM whitelist ORDER BY added_at, username")]
+
+    def contains(self, username):
+        return self.store.query_one("SELECT 1 AS x FROM whitelist WHERE username = ?", (username,)) is not None
+
+    def add(self, username):
+        return self.store.execute(
+            "INSERT OR IGNORE INTO whitelist (username, added_at) VALUES (?, ?)",
+            (username, datetime.now().isoformat()),
+        ).rowcount > 0
+
+    def remove(self, username):
+        return self.store.execute("DELETE FROM whitelist WHERE username = ?", (username,)).rowcount > 0
+
+    def import_json(self, conn, usernames):
+        now = datetime.now().isoformat()
+        conn.executemany("INSERT OR IGNORE INTO whitelist (username, added_at) VALUES (?, ?)",
+                         ((u, now) for u in usernames))
+        return len(usernames)
+
+# =====================================================
+# 🗄️ DATASTORE
+# =====================================================
+# Sumber JSON lama -> (repository, cara import). Path relatif terhadap working directory.
+JSON_SOURCES = {
+    "stats": ("logs/stats.json", lambda s, conn, data: s.analytics.import_json(conn, stats=data)),
+    "activity_log": ("logs/activity_log.json", lambda s, conn, data: s.analytics.import_json(conn, activities=data)),
+    "scheduled_posts": ("scheduled_posts.json", lambda s, conn, data: s.schedules.import_json(conn, data)),
+    "notifications": ("data/notifications_log.json", lambda s, conn, data: s.notifications.import_json(conn, data)),
+    "hashtag_cache": ("data/hashtag_cache.json", lambda s, conn, data: s.hashtag_cache.import_json(conn, data)),
+    "follower_growth": ("follower_growth.json", lambda s, conn, data: s.follower_snapshots.import_json(conn, data)),
+    "whitelist": ("data/whitelist.json", lambda s, conn, data: s.whitelist.import_json(conn, data)),
+}
+
+class DataStore:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE,
+                                    isolation_level=None)  # autocommit; transaksi eksplisit lewat transaction()
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        # Harus sebelum tabel pertama dibuat; halaman kosong bekas compact_* dikembalikan lewat reclaim()
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.migrate()
+
+        self.analytics = AnalyticsRepo(self)
+        self.schedules = ScheduleRepo(self)
+        self.notifications = NotificationRepo(self)
+        self.hashtag_cache = HashtagCacheRepo(self)
+        self.follower_snapshots = FollowerSnapshotRepo(self)
+        self.whitelist = WhitelistRepo(self)
+        self.post_timing = PostTimingRepo(self)
+        self.post_samples = PostSampleRepo(self)
+        self.hashtag_index = HashtagIndexRepo(self)
+        self.comments = CommentRepo(self)
+        self.story_viewers = StoryViewerRepo(self)
+        self.backup_posts = BackupPostRepo(self)
+        self.post_latest = PostLatestRepo(self)
+        self._login_events = None
+
+    @property
+    def login_events(self):
+        """core.login_events.LoginEventStore di atas koneksi yang sama"""
+        if self._login_events is None:
+            from core.login_events import LoginEventStore
+            self._login_events = LoginEventStore(self.db_path, datastore=self)
+        return self._login_events
+
+    # =====================================================
+    # 🔒 TRANSACTIONS
+    # =====================================================
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, rollback kalau error. Bisa nested (savepoint)."""
+        with self.lock:
+            if self.conn.in_transaction:
+                self.conn.execute("SAVEPOINT nested")
+                try:
+                    yield self.conn
+                    self.conn.execute("RELEASE nested")
+                except Exception:
+                    self.conn.execute("ROLLBACK TO nested")
+                    self.conn.execute("RELEASE nested")
+                    raise
+                return
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def execute(self, sql, params=()):
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def query_one(self, sql, params=()):
+        with self.lock:
+            row = self.conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def changes(self):
+        """Penanda murah ada tulisan baru (koneksi ini + proses lain), untuk cache yang diturunkan dari tabel"""
+        with self.lock:
+            return self.conn.total_changes, self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def row_counts(self):
+        tables = ("daily_stats", "activities", "schedules", "notifications", "hashtag_cache",
+                  "follower_snapshots", "whitelist")
+        return {table: self.query_one(f"SELECT COUNT(*) AS n FROM {table}")["n"] for table in tables}
+
+    def table_bytes(self, table):
+        """Ukuran tabel + index-nya (butuh SQLite dengan dbstat, selain itu 0)"""
+        try:
+            row = self.query_one(
+                "SELECT SUM(pgsize) AS size FROM dbstat WHERE name = ? "
+                "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?)", (table, table))
+        except sqlite3.OperationalError:
+            return 0
+        return row["size"] or 0
+
+    def reclaim(self):
+        """Kembalikan halaman kosong ke filesystem (setelah housekeeping menghapus baris)"""
+        with self.lock:
+            self.conn.execute("PRAGMA incremental_vacuum").fetchall()
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def checkpoint(self):
+        """Tulis WAL ke file database utama (dipanggil saat shutdown)"""
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # =====================================================
+    # 🧱 MIGRATION RUNNER
+    # =====================================================
+    def schema_version(self):
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                "version INTEGER PRIMARY KEY, description TEXT, applied_at TEXT)"
+            )
+            row = self.conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return row[0] or 0
+
+    def migrate(self):
+        current = self.schema_version()
+        for version, description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            with self.transaction() as conn:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.now().isoformat()),
+                )
+            logger.info(f"🧱 bot.db migrasi {version}: {description}")
+        return self.schema_version()
+
+    def imported(self, source):
+        return self.query_one("SELECT * FROM json_imports WHERE source = ?", (source,)) is not None
+
+    def mark_imported(self, conn, source, path, rows):
+        """Catat sumber lama sudah di-import (panggil di transaksi yang sama dengan datanya)"""
+        conn.execute(
+            "INSERT INTO json_imports (source, path, rows, imported_at) VALUES (?, ?, ?, ?)",
+            (source, os.path.abspath(path), rows, datetime.now().isoformat()),
+        )
+
+    def migrate_json(self, sources=None):
+        """
+        Import file JSON lama yang belum pernah di-import: {source: path}.
+        Tiap file satu transaksi (data + catatan json_imports), jadi import tidak pernah setengah jalan.
+        File JSON dibiarkan di tempatnya (tidak dipakai lagi). Return {source: jumlah baris}.
+        """
+        sources = sources or {name: path for name, (path, _) in JSON_SOURCES.items()}
+        results = {}
+        for source, path in sources.items():
+            if not os.path.exists(path) or self.imported(source):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ {path} tidak bisa dibaca, dilewati: {e}")
+                continue
+            importer = JSON_SOURCES[source][1]
+            with self.transaction() as conn:
+                rows = importer(self, conn, data)
+                self.mark_imported(conn, source, path, rows)
+            results[source] = rows
+            logger.info(f"📥 {path} -> bot.db ({rows} baris)")
+        if results:
+            self.checkpoint()  # WAL hasil import besar langsung dipindah, bukan di write berikutnya
+        return results
+
+# Satu koneksi per file database per proses
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_datastore(db_path=DB_PATH, migrate_json=True):
+    """Datastore bersama. Pertama kali dibuka, file JSON lama di-import (sekali)."""
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        if key not in _stores:
+            store = DataStore(db_path)
+            if migrate_json:
+                store.migrate_json()
+            _stores[key] = store
+        return _stores[key]
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    store = get_datastore()
+    print(json.dumps(store.row_counts(), indent=2))
@@ -1,26 +1,17 @@
-import random
+from core.suggestion_engine import get_engine
 
 class HashtagGenerator:
-    def __init__(self):
-        # Base hashtag populer, bisa tambah di .env kalau mau
-        self.base_tags = {
-            'general': ['love', 'instagood', 'photooftheday', 'fashion', 'beautiful'],
-            'food': ['food', 'foodporn', 'delicious', 'yum', 'eat'],
-            'travel': ['travel', 'adventure', 'wanderlust', 'vacation', 'explore'],
-            # Tambah kategori lain kalau perlu
-        }
+    def __init__(self, engine=None):
+        # Data hashtag sekarang dari corpus bersama (data/caption_corpus/hashtags.jsonl)
+        self.engine = engine or get_engine()
 
     def generate_hashtags(self, keyword: str, count: int = 5):
-        """Generate variasi hashtag kreatif dari keyword, mirip manusia (acak + variasi)"""
+        """Generate hashtag dari keyword: kata kunci sendiri + saran dari suggestion engine"""
         tags = []
-        words = keyword.lower().split()
-        for word in words:
-            tags.append(word)
-            tags.append(f"{word}love")  # Variasi random
-            tags.append(f"best{word}")
-        # Tambah dari base
-        category = random.choice(list(self.base_tags.keys()))
-        tags.extend(random.sample(self.base_tags[category], min(3, len(self.base_tags[category]))))
-        # Acak dan limit
-        random.shuffle(tags)
-        return [f"#{tag}" for tag in tags[:count]]
\ No newline at end of file
+        for word in keyword.lower().split():
+            if word not in tags:
+                tags.append(word)
+        for tag in self.engine.suggest_hashtags(keyword, count):
+            if tag not in tags:
+                tags.append(tag)
+        return [f"#{tag}" for tag in tags[:count]]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Hashtag Index - Hashtag mana yang berkorelasi dengan engagement lebih tinggi (post sendiri)
+Fitur:
+- Inverted index hashtag -> post di data/bot.db, diisi tiap Analytics.track_medias
+- Update O(jumlah tag) per post baru / snapshot baru; caption tidak di-parse ulang saat dibaca
+- performance(): agregasi seluruh histori dari index (bukan scan 10 post terakhir):
+  rata-rata dengan vs tanpa tag, lift, dan t-statistic (Welch)
+- Histori lama (logs/post_history.jsonl) di-import sekali
+"""
+
+import re
+import math
+import logging
+
+from core.best_time import engagement_of
+from core.datastore import get_datastore
+
+logger = logging.getLogger(__name__)
+
+HASHTAG_RE = re.compile(r"#(\w+)", re.UNICODE)
+HISTORY_SOURCE = "post_history_hashtags"
+DEFAULT_MIN_POSTS = 2
+
+def extract_hashtags(text):
+    """Ambil hashtag (lowercase, tanpa '#') dari caption"""
+    if not text:
+        return []
+    return [tag.lower() for tag in HASHTAG_RE.findall(text)]
+
+def _mean_var(n, total, total_sq):
+    if n <= 0:
+        return None, None
+    mean = total / n
+    var = max(0.0, total_sq / n - mean ** 2) * n / (n - 1) if n > 1 else 0.0
+    return mean, var
+
+class HashtagIndex:
+    def __init__(self, datastore=None):
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.hashtag_index
+
+    # =====================================================
+    # 📥 OBSERVE
+    # =====================================================
+    def observe(self, username, media_id, caption, likes, comments):
+        return self.repo.observe(username, str(media_id), extract_hashtags(caption),
+                                 float(engagement_of(likes, comments)))
+
+    def observe_medias(self, username, medias):
+        """Media instagrapi -> index. Return jumlah post yang berubah."""
+        changed = 0
+        for media in medias or []:
+            changed += bool(self.observe(
+                username, getattr(media, "id", None) or getattr(media, "pk", ""), getattr(media, "caption_text", ""),
+                getattr(media, "like_count", 0), getattr(media, "comment_count", 0),
+            ))
+        return changed
+
+    def backfill(self, analytics):
+        """Sekali saja: isi index dari logs/post_history.jsonl yang sudah ada"""
+        if self.datastore.imported(HISTORY_SOURCE):
+            return 0
+        rows = 0
+        with self.datastore.transaction() as conn:
+            for record in analytics.get_latest_posts().values():
+                rows += bool(self.observe(record["username"], record["media_id"], record.get("caption"),
+                                          record.get("likes"), record.get("comments")))
+            self.datastore.mark_imported(conn, HISTORY_SOURCE, analytics.post_history, rows)
+        if rows:
+            logger.info(f"📥 {rows} post dari post_history -> index hashtag")
+        return rows
+
+    # =====================================================
+    # 📊 AGGREGATION
+    # =====================================================
+    def account(self, username=None):
+        """(jumlah post, total engagement) seluruh akun"""
+        row = next((r for r in self.repo.stats(username) if r["tag"] == self.repo.ALL), None)
+        return (row["posts"], row["total"]) if row else (0, 0.0)
+
+    def tag_totals(self, username=None):
+        """{tag: (jumlah post, total engagement)} semua tag"""
+        return {r["tag"]: (r["posts"], r["total"]) for r in self.repo.stats(username) if r["tag"] != self.repo.ALL}
+
+    def performance(self, username=None, min_posts=DEFAULT_MIN_POSTS):
+        """
+        Per tag (dipakai minimal min_posts post): mean dengan tag vs tanpa tag, lift, t.
+        Urut lift tertinggi dulu; tag yang dipakai di semua post tidak punya pembanding (lift None).
+        """
+        rows = self.repo.stats(username)
+        account = next((r for r in rows if r["tag"] == self.repo.ALL), None)
+        if not account:
+            return []
+        result = []
+        for r in rows:
+            if r["tag"] == self.repo.ALL or r["posts"] < min_posts:
+                continue
+            mean, var = _mean_var(r["posts"], r["total"], r["total_sq"])
+            rest = account["posts"] - r["posts"]
+            mean_without, var_without = _mean_var(rest, account["total"] - r["total"],
+                                                  account["total_sq"] - r["total_sq"])
+            lift = t = None
+            if mean_without:
+                lift = mean / mean_without
+            if mean_without is not None:
+                se = math.sqrt(var / r["posts"] + var_without / rest)
+                t = (mean - mean_without) / se if se > 0 else None
+            result.append({
+                "tag": r["tag"], "posts": r["posts"], "mean": mean, "mean_without": mean_without,
+                "lift": lift, "t": t,
+            })
+        return sorted(result, key=lambda x: (x["lift"] is not None, x["lift"] or 0, x["posts"]), reverse=True)
+
+    def top_posts(self, username, tag, limit=5):
+        return self.repo.posts(username, tag.lstrip("#").lower(), limit)
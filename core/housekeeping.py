@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Housekeeping - Retensi & kompaksi data/ dan logs/
+Fitur:
+- Aturan retensi deklaratif per dataset (RULES)
+- Tabel data/bot.db (core.datastore) dikompaksi lewat compact_* milik repository-nya
+- Detail lama di-rollup ke ringkasan (data/summaries/<dataset>.json) sebelum dibuang
+- File dingin (export analytics, log lama) di-gzip, backup session dibatasi N terakhir
+- Laporan disk usage per dataset
+- Jalan incremental di background thread: tiap tick hanya rule yang sudah jatuh tempo
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import shutil
+import fnmatch
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from core.datastore import DB_PATH, get_datastore
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# 📜 RULES
+# =====================================================
+# kind:
+#   datastore   tabel di data/bot.db -> <repo>.<method>(cutoff) rollup + hapus baris lama
+#   files       folder berisi file   -> gzip / hapus / simpan N terakhir
+#               (pattern = fnmatch nama file, match = regex tambahan)
+RULES = [
+    {"name": "stats", "path": DB_PATH, "kind": "datastore", "table": "daily_stats",
+     "compact": "analytics.compact_daily", "keep_days": 90},
+    {"name": "activity_log", "path": DB_PATH, "kind": "datastore", "table": "activities",
+     "compact": "analytics.compact_activities", "keep_days": 30},
+    {"name": "notifications", "path": DB_PATH, "kind": "datastore", "table": "notifications",
+     "compact": "notifications.compact", "keep_days": 30},
+    {"name": "hashtag_cache", "path": DB_PATH, "kind": "datastore", "table": "hashtag_cache",
+     "compact": "hashtag_cache.compact", "keep_days": 7},
+    {"name": "follower_growth", "path": DB_PATH, "kind": "datastore", "table": "follower_snapshots",
+     "compact": "follower_snapshots.compact", "keep_days": 90},
+    # Hanya jadwal yang sudah selesai (posted/failed); yang pending tidak pernah disentuh
+    {"name": "scheduled_posts", "path": DB_PATH, "kind": "datastore", "table": "schedules",
+     "compact": "schedules.compact", "keep_days": 30},
+    # Hanya export sekali jalan (nama berakhiran _<epoch>); export incremental (exports/<dataset>_<user>.csv)
+    # masih di-append AnalyticsExporter dan barisnya tercatat di export_state.json, jadi tidak disentuh
+    {"name": "analytics_exports", "path": "analytics", "kind": "files", "match": r"_\d{10}\.(csv|json|jsonl)$",
+     "recursive": True, "compress_days": 7, "delete_days": 180},
+    {"name": "session_backups", "path": "session_backups", "kind": "files", "pattern": ["*.json"],
+     "group_by": r"^(.*)_session_backup_", "keep_last": 5, "delete_days": 90},
+    # Sudah dimigrasi ke data/login_events.jsonl (core.login_events), simpan versi gzip saja
+    {"name": "login_activity_legacy", "path": "data", "kind": "files", "pattern": ["login_activity.json"],
+     "requires": "data/login_events.jsonl", "compress_days": 30},
+]
+
+DEFAULT_INTERVAL = 6 * 3600  # detik antar kompaksi per rule
+SUMMARY_DIR = "data/summaries"
+STATE_FILE = "data/housekeeping_state.json"
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path), 1
+    total = files = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                continue
+    return total, files
+
+def gzip_file(path):
+    """Kompres path -> path.gz (mtime dipertahankan), hapus file asli. Return path baru."""
+    dest = path + ".gz"
+    stat = os.stat(path)
+    with open(path, "rb") as src, gzip.open(dest + ".tmp", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(dest + ".tmp", dest)
+    os.utime(dest, (stat.st_atime, stat.st_mtime))
+    os.remove(path)
+    return dest
+
+class Housekeeper:
+    def __init__(self, base_dir=".", rules=None, interval=DEFAULT_INTERVAL, datastore=None):
+        self.base_dir = base_dir
+        self._datastore = datastore
+        self.rules = rules or RULES
+        self.interval = interval
+        self.summary_dir = os.path.join(base_dir, SUMMARY_DIR)
+        self.state_file = os.path.join(base_dir, STATE_FILE)
+        self.state = _read_json(self.state_file, {})
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _path(self, rule):
+        return os.path.join(self.base_dir, rule["path"])
+
+    @property
+    def datastore(self):
+        if self._datastore is None:
+            self._datastore = get_datastore(os.path.join(self.base_dir, DB_PATH))
+        return self._datastore
+
+    # =====================================================
+    # 📊 SUMMARIES
+    # =====================================================
+    def summary_path(self, name):
+        return os.path.join(self.summary_dir, f"{name}.json")
+
+    def load_summary(self, name):
+        return _read_json(self.summary_path(name), {})
+
+    def _merge_summary(self, name, rollup, mode="sum"):
+        """rollup: {group: {period: {key: n}}} (sum) atau {group: {period: value}} (last)"""
+        if not rollup:
+            return
+        summary = self.load_summary(name)
+        for group, periods in rollup.items():
+            target = summary.setdefault(group, {})
+            for period, value in periods.items():
+                if mode == "last":
+                    target[period] = value
+                    continue
+                counts = target.setdefault(period, {})
+                for key, n in value.items():
+                    counts[key] = counts.get(key, 0) + n
+        _write_json(self.summary_path(name), summary)
+
+    # =====================================================
+    # 🧹 COMPACTORS
+    # =====================================================
+    def _compact_datastore(self, rule, cutoff):
+        repo_name, method = rule["compact"].split(".")
+        compactor = getattr(getattr(self.datastore, repo_name), method)
+        # Satu transaksi: ringkasan ditulis sebelum COMMIT. Kalau proses mati di tengah, baris detail
+        # masih ada (bisa double count, tapi tidak ada data yang hilang)
+        with self.datastore.transaction():
+            rollup, removed, mode = compactor(cutoff)
+            if removed:
+                self._merge_summary(rule["name"], rollup, mode)
+        return removed
+
+    @staticmethod
+    def _iter_files(folder, rule):
+        """(path, mtime, gzipped) untuk file yang cocok pattern rule (termasuk versi .gz-nya)"""
+        walker = os.walk(folder) if rule.get("recursive") else [(folder, [], os.listdir(folder))]
+        for root, _, names in walker:
+            for name in names:
+                gzipped = name.endswith(".gz")
+                plain = name[:-3] if gzipped else name
+                path = os.path.join(root, name)
+                if not os.path.isfile(path) or (rule.get("match") and not re.search(rule["match"], plain)):
+                    continue
+                if any(fnmatch.fnmatch(plain, pattern) for pattern in rule.get("pattern", ["*"])):
+                    yield path, os.path.getmtime(path), gzipped
+
+    def _compact_files(self, rule, now):
+        folder = self._path(rule)
+        required = rule.get("requires")
+        if not os.path.isdir(folder) or (required and not os.path.exists(os.path.join(self.base_dir, required))):
+            return 0
+
+        files = list(self._iter_files(folder, rule))
+        doomed = set()
+        if rule.get("keep_last"):
+            groups = {}
+            for path, mtime, _ in files:
+                match = re.match(rule.get("group_by", r"^()"), os.path.basename(path))
+                groups.setdefault(match.group(1) if match else "", []).append((mtime, path))
+            for members in groups.values():
+                doomed.update(path for _, path in sorted(members, reverse=True)[rule["keep_last"]:])
+
+        changed = 0
+        for path, mtime, gzipped in files:
+            age_days = (now - datetime.fromtimestamp(mtime)).days
+            if path in doomed or (rule.get("delete_days") and age_days >= rule["delete_days"]):
+                os.remove(path)
+                changed += 1
+            elif not gzipped and rule.get("compress_days") is not None and age_days >= rule["compress_days"]:
+                gzip_file(path)
+                changed += 1
+        return changed
+
+    # =====================================================
+    # 🚀 RUN
+    # =====================================================
+    def _size(self, rule):
+        """(bytes, jumlah file / baris tabel) untuk satu rule"""
+        if rule["kind"] == "datastore":
+            return self.datastore.table_bytes(rule["table"]), self.datastore.row_counts()[rule["table"]]
+        path = self._path(rule)
+        return _path_size(path) if os.path.exists(path) else (0, 0)
+
+    def compact(self, rule, now=None):
+        """Jalankan satu rule sekarang. Return dict hasil (juga disimpan di state)."""
+        now = now or datetime.now()
+        before = self._size(rule)[0]
+        if rule["kind"] == "files":
+            removed = self._compact_files(rule, now)
+        else:
+            removed = self._compact_datastore(rule, now - timedelta(days=rule["keep_days"]))
+            if removed:
+                self.datastore.reclaim()
+        after = self._size(rule)[0]
+        result = {"last_run": now.timestamp(), "removed": removed, "bytes_before": before, "bytes_after": after}
+        self.state[rule["name"]] = result
+        if removed:
+            logger.info(f"🧹 {rule['name']}: {removed} item dikompaksi ({before} -> {after} bytes)")
+        return result
+
+    def due_rules(self, now=None):
+        now = (now or datetime.now()).timestamp()
+        return [
+            rule for rule in self.rules
+            if now - self.state.get(rule["name"], {}).get("last_run", 0) >= rule.get("interval", self.interval)
+        ]
+
+    def run_once(self, budget_seconds=None, now=None):
+        """
+        Proses rule yang jatuh tempo, berhenti kalau budget waktu habis
+        (sisanya lanjut di tick berikutnya). Return {nama_rule: hasil}.
+        """
+        started = time.monotonic()
+        results = {}
+        with self.lock:
+            for rule in self.due_rules(now):
+                if budget_seconds is not None and results and time.monotonic() - started >= budget_seconds:
+                    break
+                try:
+                    results[rule["name"]] = self.compact(rule, now)
+                except Exception as e:
+                    logger.error(f"❌ Housekeeping {rule['name']} gagal: {e}")
+                    self.state[rule["name"]] = {"last_run": (now or datetime.now()).timestamp(), "error": str(e)}
+            if results:
+                _write_json(self.state_file, self.state)
+        return results
+
+    def disk_usage(self):
+        """Ukuran per dataset (file data / tabel bot.db + ringkasan) -> list dict, terbesar dulu"""
+        report = []
+        for rule in self.rules:
+            size, files = self._size(rule)
+            summary = self.summary_path(rule["name"])
+            report.append({
+                "name": rule["name"],
+                "path": f"{rule['path']}:{rule['table']}" if rule["kind"] == "datastore" else rule["path"],
+                "bytes": size,
+                "files": files,
+                "summary_bytes": os.path.getsize(summary) if os.path.exists(summary) else 0,
+                "last_run": self.state.get(rule["name"], {}).get("last_run"),
+            })
+        return sorted(report, key=lambda r: r["bytes"] + r["summary_bytes"], reverse=True)
+
+    # =====================================================
+    # 🧵 BACKGROUND
+    # =====================================================
+    def start(self, tick=300, budget_seconds=5.0):
+        """Thread daemon: tiap `tick` detik jalankan run_once dengan budget waktu"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                self.run_once(budget_seconds=budget_seconds)
+                self._stop.wait(tick)
+
+        self._thread = threading.Thread(target=loop, name="housekeeping", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+_shared_housekeeper = None
+
+def get_housekeeper():
+    global _shared_housekeeper
+    if _shared_housekeeper is None:
+        _shared_housekeeper = Housekeeper()
+    return _shared_housekeeper
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    keeper = Housekeeper(interval=0)
+    print(json.dumps(keeper.run_once(), indent=2))
+    for row in keeper.disk_usage():
+        print(f"{row['name']:<24}{row['bytes'] / 1024:>10.1f} KB{row['files']:>6} file")
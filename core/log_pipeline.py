@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Log Pipeline - Logging terpusat, non-blocking, JSON lines
+Fitur:
+- QueueHandler/QueueListener: tulis file jalan di thread listener, bukan thread pemanggil
+- Rotasi berdasarkan ukuran DAN waktu, file hasil rotasi di-gzip (bot.jsonl.1.gz, ...)
+- Format JSON lines (satu record per baris) -> gampang di-grep / di-query
+- Logger "ui" untuk banner.success_msg dkk: tidak propagate ke root, punya console & queue handler
+  sendiri; selama pipeline belum aktif pesan langsung di-print tanpa membangun LogRecord
+- Logger "activity" ditulis ke file terpisah (logs/activity.jsonl) untuk Activity Log dashboard
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+import threading
+from datetime import datetime
+
+from colorama import Fore, Style
+
+UI_LOGGER = "ui"
+ACTIVITY_LOGGER = "activity"
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 10
+DEFAULT_ROTATE_SECONDS = 24 * 3600
+
+# Atribut bawaan LogRecord, sisanya dianggap field tambahan (extra=...)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# =====================================================
+# 🧾 JSON LINES FORMATTER
+# =====================================================
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+# =====================================================
+# 🔄 ROTATING + GZIP HANDLER
+# =====================================================
+class GzipRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotasi kalau file melewati max_bytes ATAU sudah berumur rotate_seconds.
+    File lama jadi <nama>.1.gz, <nama>.2.gz, ... (backup_count terakhir disimpan).
+    """
+
+    def __init__(self, filename, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 rotate_seconds=DEFAULT_ROTATE_SECONDS, encoding="utf-8"):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.rotate_seconds = rotate_seconds
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._gzip_rotate
+        started = os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+        self.rollover_at = started + rotate_seconds if rotate_seconds else None
+
+    @staticmethod
+    def _gzip_rotate(source, dest):
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.rollover_at and time.time() >= self.rollover_at and os.path.exists(self.baseFilename):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        if self.rotate_seconds:
+            self.rollover_at = time.time() + self.rotate_seconds
+
+# =====================================================
+# 🖥️ CONSOLE (banner)
+# =====================================================
+UI_STYLES = {
+    "success": (Fore.GREEN, "✅ "),
+    "error": (Fore.RED, "❌ "),
+    "info": (Fore.CYAN, "ℹ️  "),
+    "warning": (Fore.YELLOW, "⚠️  "),
+}
+
+class ConsoleHandler(logging.Handler):
+    """
+    Tulis ke console secara sinkron (urutan dengan print()/input() harus tetap terjaga).
+    Pakai print() supaya ikut sys.stdout saat ini (Windows UTF-8 fix, capture di test).
+    """
+
+    def emit(self, record):
+        try:
+            print(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+def format_ui(kind, text):
+    color, icon = UI_STYLES.get(kind, ("", ""))
+    return f"{color}{icon}{text}{Style.RESET_ALL if color else ''}"
+
+class UIFormatter(logging.Formatter):
+    def format(self, record):
+        return format_ui(getattr(record, "ui", ""), record.getMessage())
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler tanpa format di thread pemanggil. Pesan UI sudah string final (tanpa args),
+    jadi record langsung masuk queue; JSON diformat di thread listener.
+    """
+
+    def prepare(self, record):
+        return record
+
+_ui_logger = None
+
+def get_ui_logger():
+    """
+    Logger untuk pesan banner. Tidak propagate ke root (handler root / pytest tidak ikut memproses
+    pesan UI); selalu punya console handler, queue handler dipasang setup_logging.
+    """
+    global _ui_logger
+    ui_logger = _ui_logger = logging.getLogger(UI_LOGGER)
+    if not any(isinstance(h, ConsoleHandler) for h in ui_logger.handlers):
+        handler = ConsoleHandler()
+        handler.setFormatter(UIFormatter())
+        ui_logger.addHandler(handler)
+        ui_logger.setLevel(logging.INFO)
+        ui_logger.propagate = False
+    return ui_logger
+
+def ui_message(level, kind, text):
+    """
+    Kirim pesan banner. Selama pipeline belum aktif cukup print (tanpa LogRecord), jadi pesan di
+    hot path semurah print(); setelah setup_logging lewat logger "ui" -> console + queue file.
+    """
+    ui_logger = _ui_logger or get_ui_logger()
+    if not ui_logger.isEnabledFor(level):
+        return
+    if _ui_handler is None:
+        print(format_ui(kind, text))
+    else:
+        ui_logger.log(level, text, extra={"ui": kind})
+
+# =====================================================
+# 🚀 SETUP
+# =====================================================
+_listener = None
+_handlers = []
+_ui_handler = None
+_lock = threading.Lock()
+
+def setup_logging(log_dir="logs", level=logging.INFO, console=True, max_bytes=DEFAULT_MAX_BYTES,
+                  backup_count=DEFAULT_BACKUP_COUNT, rotate_seconds=DEFAULT_ROTATE_SECONDS):
+    """
+    Pasang pipeline di root logger (idempotent):
+      root -> QueueHandler -> QueueListener -> logs/bot.jsonl (+ logs/activity.jsonl)
+      root -> console (opsional)
+      ui   -> console + QueueHandler sendiri (tidak propagate ke root)
+    Return QueueListener yang aktif.
+    """
+    global _listener, _ui_handler
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        file_handler = GzipRotatingFileHandler(
+            os.path.join(log_dir, "bot.jsonl"), max_bytes, backup_count, rotate_seconds)
+        file_handler.setFormatter(JsonLineFormatter())
+
+        activity_handler = GzipRotatingFileHandler(
+            os.path.join(log_dir, "activity.jsonl"), max_bytes, backup_count, rotate_seconds)
+        activity_handler.setFormatter(JsonLineFormatter())
+        activity_handler.addFilter(lambda record: record.name == ACTIVITY_LOGGER)
+
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, activity_handler, respect_handler_level=True)
+        _handlers.append(logging.handlers.QueueHandler(log_queue))
+        if console:
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+            _handlers.append(stream)
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        for handler in _handlers:
+            root.addHandler(handler)
+
+        _ui_handler = RecordQueueHandler(log_queue)
+        get_ui_logger().addHandler(_ui_handler)
+        logging.getLogger(ACTIVITY_LOGGER).setLevel(logging.INFO)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+def shutdown_logging():
+    """Flush queue ke file dan lepas handler (dipanggil otomatis saat exit)"""
+    global _listener, _ui_handler
+    with _lock:
+        if _listener is None:
+            return
+        get_ui_logger().removeHandler(_ui_handler)
+        _ui_handler = None
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        for handler in _handlers:
+            logging.getLogger().removeHandler(handler)
+        _handlers.clear()
+        _listener = None
+
+# =====================================================
+# 🔎 READ
+# =====================================================
+def tail_jsonl(path, limit=20, block_size=8192):
+    """Ambil `limit` record terakhir dari file JSON lines tanpa membaca seluruh file"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= limit:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    records = []
+    for line in data.splitlines()[-limit:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Login Events - Log login append-only + deteksi anomali real-time
+Fitur:
+- Event login ditulis append-only ke data/login_events.jsonl (tidak rewrite file)
+- Ring buffer per akun (login terakhir) di memory
+- Counter sliding window O(1) untuk login gagal per menit / jam / hari
+- Deteksi device & lokasi baru
+- Alert lewat callback begitu threshold terlewati (log bersama: tampil di console, didaftarkan sekali)
+- Index SQLite (tabel login_events di data/bot.db) untuk histori per halaman, filter & export streaming
+"""
+
+import os
+import csv
+import json
+import time
+import logging
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from core.log_pipeline import ui_message
+
+logger = logging.getLogger(__name__)
+
+RING_SIZE = 100
+
+# window (detik) & jumlah login gagal yang memicu alert
+WINDOWS = {"minute": 60, "hour": 3600, "day": 86400}
+DEFAULT_THRESHOLDS = {"minute": 3, "hour": 5, "day": 20}
+
+# =====================================================
+# ⏱️ SLIDING WINDOW COUNTER
+# =====================================================
+class SlidingWindowCounter:
+    """
+    Hitung event dalam `window` detik terakhir.
+    Window dibagi ke `buckets` slot; add/count amortized O(1), memory tetap.
+    Presisi batas window = lebar satu bucket.
+    """
+
+    def __init__(self, window, buckets=60):
+        self.window = window
+        self.size = buckets
+        self.width = window / buckets
+        self.counts = [0] * buckets
+        self.head = None  # index bucket terbaru
+        self.total = 0
+
+    def _advance(self, idx):
+        if self.head is None:
+            self.head = idx
+            return
+        if idx <= self.head:
+            return
+        # Kosongkan bucket yang keluar window (maks `size` langkah)
+        for step in range(1, min(idx - self.head, self.size) + 1):
+            slot = (self.head + step) % self.size
+            self.total -= self.counts[slot]
+            self.counts[slot] = 0
+        self.head = idx
+
+    def add(self, ts, n=1):
+        idx = int(ts // self.width)
+        self._advance(idx)
+        if idx <= self.head - self.size:
+            return  # sudah di luar window
+        self.counts[idx % self.size] += n
+        self.total += n
+
+    def count(self, now=None):
+        self._advance(int((now if now is not None else time.time()) // self.width))
+        return self.total
+
+# =====================================================
+# 🗃️ INDEXED STORE (SQLite)
+# =====================================================
+EXPORT_COLUMNS = ["timestamp", "username", "device", "location", "status", "new_device", "new_location"]
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS login_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts REAL NOT NULL,
+        timestamp TEXT NOT NULL,
+        username TEXT NOT NULL,
+        device TEXT,
+        location TEXT,
+        status TEXT NOT NULL,
+        new_device INTEGER NOT NULL DEFAULT 0,
+        new_location INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_login_user_ts ON login_events(username, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_login_user_status_ts ON login_events(username, status, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_login_ts ON login_events(ts)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+class LoginEventStore:
+    """
+    Index SQLite dari login_events.jsonl. JSONL tetap sumber utama;
+    store menyimpan offset byte terakhir yang sudah di-index.
+    """
+
+    def __init__(self, db_path="data/login_events.db", datastore=None):
+        self.db_path = db_path
+        if datastore is not None:
+            # Numpang koneksi core.datastore (data/bot.db), transaksi lewat datastore
+            self.conn, self.lock, self._owns_conn = datastore.conn, datastore.lock, False
+            self._transaction = datastore.transaction
+        else:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.lock = threading.RLock()
+            self._owns_conn = True
+            self._transaction = self._own_transaction
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _own_transaction(self):
+        with self.lock, self.conn:
+            yield self.conn
+
+    def get_offset(self):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'jsonl_offset'").fetchone()
+        return int(row["value"]) if row else 0
+
+    def add_many(self, events, offset):
+        """Simpan event (sudah lewat _apply) + update offset dalam satu transaksi"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO login_events (ts, timestamp, username, device, location, status, new_device, new_location) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        event["ts"], event.get("timestamp", ""), event["username"], event.get("device"),
+                        event.get("location"), event.get("status", "success"),
+                        int(event.get("new_device", False)), int(event.get("new_location", False)),
+                    )
+                    for event in events
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('jsonl_offset', ?)", (str(offset),)
+            )
+
+    def reset(self):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM login_events")
+            conn.execute("DELETE FROM meta WHERE key = 'jsonl_offset'")
+
+    @staticmethod
+    def _where(username=None, status=None, since=None, until=None, new_device=None, new_location=None):
+        clauses, params = [], []
+        if username:
+            clauses.append("username = ?"); params.append(username)
+        if status:
+            clauses.append("status = ?"); params.append(status)
+        if since is not None:
+            clauses.append("ts >= ?"); params.append(since)
+        if until is not None:
+            clauses.append("ts < ?"); params.append(until)
+        if new_device is not None:
+            clauses.append("new_device = ?"); params.append(int(new_device))
+        if new_location is not None:
+            clauses.append("new_location = ?"); params.append(int(new_location))
+        return clauses, params
+
+    def page(self, username=None, cursor=None, limit=20, **filters):
+        """
+        Satu halaman histori (terbaru dulu). cursor = (ts, id) dari halaman sebelumnya.
+        Return (rows, next_cursor); next_cursor None kalau sudah habis.
+        """
+        clauses, params = self._where(username, **filters)
+        if cursor:
+            clauses.append("(ts < ? OR (ts = ? AND id < ?))")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            rows = [dict(r) for r in self.conn.execute(
+                f"SELECT * FROM login_events {where} ORDER BY ts DESC, id DESC LIMIT ?", params + [limit + 1]
+            )]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]["ts"], rows[-1]["id"])
+        return rows, next_cursor
+
+    def count(self, username=None, **filters):
+        clauses, params = self._where(username, **filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM login_events {where}", params).fetchone()[0]
+
+    def query(self, username=None, batch=500, **filters):
+        """Stream semua event yang cocok (lama -> baru), per batch keyset"""
+        clauses, params = self._where(username, **filters)
+        last = None
+        while True:
+            extra, extra_params = list(clauses), list(params)
+            if last:
+                extra.append("(ts > ? OR (ts = ? AND id > ?))")
+                extra_params.extend([last[0], last[0], last[1]])
+            where = f"WHERE {' AND '.join(extra)}" if extra else ""
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT * FROM login_events {where} ORDER BY ts, id LIMIT ?", extra_params + [batch]
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last = (rows[-1]["ts"], rows[-1]["id"])
+
+    def export(self, path, fmt="csv", username=None, **filters):
+        """Export streaming ke CSV (quoted) atau JSONL. Return jumlah baris."""
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                for row in self.query(username, **filters):
+                    writer.writerow(row)
+                    count += 1
+            elif fmt == "jsonl":
+                for row in self.query(username, **filters):
+                    f.write(json.dumps({k: row[k] for k in EXPORT_COLUMNS}, ensure_ascii=False) + "\n")
+                    count += 1
+            else:
+                raise ValueError(f"Format tidak dikenal: {fmt}")
+        return count
+
+    def close(self):
+        if self._owns_conn:
+            with self.lock:
+                self.conn.close()
+
+# =====================================================
+# 📒 LOGIN EVENT LOG
+# =====================================================
+class LoginEventLog:
+    def __init__(self, log_file="data/login_events.jsonl", legacy_file="data/login_activity.json",
+                 thresholds=None, on_alert=None, store=None):
+        self.log_file = log_file
+        self.store = store or LoginEventStore(os.path.splitext(log_file)[0] + ".db")
+        self.legacy_file = legacy_file
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.callbacks = [on_alert] if on_alert else []
+        self.lock = threading.RLock()
+
+        self.recent = {}      # username -> deque event terakhir
+        self.failures = {}    # username -> {window: SlidingWindowCounter}
+        self.devices = {}     # username -> set device yang pernah login sukses
+        self.locations = {}   # username -> set lokasi yang pernah login sukses
+        self.alerts = deque(maxlen=200)
+
+        os.makedirs(os.path.dirname(self.log_file) or ".", exist_ok=True)
+        self._migrate_legacy()
+        self._replay()
+
+    # =====================================================
+    # 💾 PERSISTENCE
+    # =====================================================
+    def _migrate_legacy(self):
+        """Pindahkan data/login_activity.json lama ke format JSONL (sekali saja)"""
+        if os.path.exists(self.log_file) or not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        try:
+            with open(self.legacy_file, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        events = [
+            dict(log, username=username)
+            for username, logs in legacy.items()
+            for log in logs
+        ]
+        events.sort(key=lambda e: e.get("timestamp", ""))
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        logger.info(f"📦 {len(events)} login lama dimigrasi ke {self.log_file}")
+
+    def _iter_lines(self):
+        """Yield (event, offset_akhir_baris) dari file, baris rusak/belum lengkap dilewati"""
+        if not os.path.exists(self.log_file):
+            return
+        offset = 0
+        with open(self.log_file, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                offset += len(raw)
+                try:
+                    yield json.loads(raw.decode("utf-8")), offset
+                except ValueError:
+                    continue
+
+    def iter_events(self, username=None):
+        """Stream semua event dari file (lama -> baru)"""
+        for event, _ in self._iter_lines():
+            if username and event.get("username") != username:
+                continue
+            yield event
+
+    def _replay(self):
+        """Bangun ulang ring buffer, counter & device dikenal; index event yang belum masuk store"""
+        indexed = self.store.get_offset()
+        if indexed > (os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0):
+            self.store.reset()  # file log diganti, index ulang dari awal
+            indexed = 0
+        pending, offset = [], indexed
+        for event, end in self._iter_lines():
+            self._apply(event, alert=False)
+            if end > indexed:
+                pending.append(event)
+                offset = end
+                if len(pending) >= 1000:
+                    self.store.add_many(pending, offset)
+                    pending = []
+        if pending:
+            self.store.add_many(pending, offset)
+
+    # =====================================================
+    # 🧮 STATE UPDATE
+    # =====================================================
+    def _counters(self, username):
+        if username not in self.failures:
+            self.failures[username] = {name: SlidingWindowCounter(window) for name, window in WINDOWS.items()}
+        return self.failures[username]
+
+    def _apply(self, event, alert=True, now=None):
+        username = event["username"]
+        ts = event.get("ts")
+        if ts is None:
+            try:
+                ts = datetime.fromisoformat(event["timestamp"]).timestamp()
+            except (KeyError, ValueError):
+                ts = 0.0
+        event["ts"] = ts
+
+        self.recent.setdefault(username, deque(maxlen=RING_SIZE)).append(event)
+        alerts = []
+
+        # Device/lokasi baru = belum pernah dipakai login sukses (login pertama jadi baseline)
+        device, location = event.get("device"), event.get("location")
+        known_devices = self.devices.setdefault(username, set())
+        known_locations = self.locations.setdefault(username, set())
+        event["new_device"] = bool(known_devices) and device not in known_devices
+        event["new_location"] = bool(known_locations) and location not in known_locations and location != "Unknown"
+
+        if event.get("status") == "failed":
+            for name, counter in self._counters(username).items():
+                counter.add(ts)
+                count = counter.count(now if now is not None else ts)
+                # Alert sekali saat threshold pas terlewati, bukan di setiap kegagalan berikutnya
+                if count == self.thresholds[name]:
+                    alerts.append({"type": "failed_logins", "window": name, "count": count})
+        elif event.get("status") == "success":
+            if event["new_device"]:
+                alerts.append({"type": "new_device", "device": device})
+            if event["new_location"]:
+                alerts.append({"type": "new_location", "location": location})
+            known_devices.add(device)
+            if location != "Unknown":
+                known_locations.add(location)
+
+        if alert:
+            for info in alerts:
+                self._fire(dict(info, username=username, event=event))
+        return alerts
+
+    def _fire(self, alert):
+        alert["timestamp"] = datetime.now().isoformat()
+        self.alerts.append(alert)
+        logger.warning(f"🚨 Login alert @{alert['username']}: {alert['type']}")
+        for callback in self.callbacks:
+            try:
+                callback(alert)
+            except Exception as e:
+                logger.error(f"❌ Alert callback error: {e}")
+
+    # =====================================================
+    # 🚀 PUBLIC API
+    # =====================================================
+    def add_callback(self, callback):
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+
+    def record(self, username, status="success", device="Web", location="Unknown", now=None):
+        """Catat satu event login. Return list alert yang terpicu."""
+        ts = now if now is not None else time.time()
+        event = {
+            "username": username,
+            "timestamp": datetime.fromtimestamp(ts).isoformat(),
+            "device": device,
+            "location": location,
+            "status": status,
+        }
+        with self.lock:
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                offset = f.tell()
+            event["ts"] = ts
+            alerts = self._apply(event, now=ts)
+            self.store.add_many([event], offset)
+            return alerts
+
+    def failed_count(self, username, window="hour", now=None):
+        with self.lock:
+            if username not in self.failures:
+                return 0
+            return self.failures[username][window].count(now)
+
+    def is_suspicious(self, username, now=None):
+        """True kalau salah satu window sedang di atas threshold"""
+        return any(
+            self.failed_count(username, name, now) >= limit
+            for name, limit in self.thresholds.items()
+        )
+
+    def recent_events(self, username, limit=20):
+        with self.lock:
+            events = list(self.recent.get(username, ()))
+        return events[-limit:] if limit else events
+
+def format_alert(alert):
+    if alert['type'] == 'failed_logins':
+        return f"🚨 @{alert['username']}: {alert['count']} login gagal dalam 1 {alert['window']}"
+    if alert['type'] == 'new_device':
+        return f"🚨 @{alert['username']}: login dari device baru ({alert['device']})"
+    if alert['type'] == 'new_location':
+        return f"🚨 @{alert['username']}: login dari lokasi baru ({alert['location']})"
+    return f"🚨 @{alert['username']}: {alert['type']}"
+
+def console_alert(alert):
+    """Handler alert bawaan log bersama: warning di console (sama seperti banner.warning_msg)"""
+    ui_message(logging.WARNING, "warning", format_alert(alert))
+
+# Instance bersama: LoginManager yang mencatat, menu monitor yang membaca.
+# Handler console dipasang sekali di sini, jadi alert muncul sejak login pertama
+# (tanpa harus membuka menu monitor) dan tidak dobel walau LoginMonitor dibuat berkali-kali.
+_shared_log = None
+
+def get_login_events():
+    global _shared_log
+    if _shared_log is None:
+        from core.datastore import get_datastore
+        _shared_log = LoginEventLog(store=get_datastore().login_events, on_alert=console_alert)
+    return _shared_log
@@ -19,6 +19,7 @@ from core.session_manager_v2 import SessionManagerV2
 from core.verification_handler import VerificationHandler
 from core.account_manager import AccountManager
 from core.device_identity_generator import DeviceIdentityGenerator
+from core.login_events import get_login_events
 
 load_dotenv()
 
@@ -28,6 +29,8 @@ class LoginManager:
         self.verifier = VerificationHandler()
         self.account_manager = AccountManager()
         self.device_generator = DeviceIdentityGenerator()
+        self.login_events = get_login_events()
+        self.device_labels = {}
         self.max_retries = 3
 
     # --- FIX: INI YANG TADI KURANG ---
@@ -42,6 +45,7 @@ class LoginManager:
 
     def _inject_device_settings(self, client: Client, username: str):
         device_data = self.device_generator.get_identity(username)
+        self.device_labels[username] = (f"{device_data['manufacturer']} {device_data['model']}", device_data.get('country', 'Unknown'))
         
         client.set_device({
             "app_version": device_data["app_version"],
@@ -71,6 +75,14 @@ class LoginManager:
         
         return client
 
+    def _record_login(self, username, status):
+        """Catat event login untuk login monitor (alert anomali jalan otomatis)"""
+        device, location = self.device_labels.get(username, ("Web", "Unknown"))
+        try:
+            self.login_events.record(username, status=status, device=device, location=location)
+        except Exception as e:
+            print(f"⚠️ Gagal catat login event: {e}")
+
     def login(self, username: str, password: str) -> Client | None:
         client = Client()
         client = self._inject_device_settings(client, username)
@@ -93,20 +105,26 @@ class LoginManager:
                 client.login(username, password)
                 print(f"✅ Login sukses!")
                 self.session_manager.save_session(client, username)
+                self._record_login(username, "success")
                 return client
 
             except TwoFactorRequired:
                 client = self.verifier.handle_two_factor(client, username, password)
                 if client:
                     self.session_manager.save_session(client, username)
+                    self._record_login(username, "success")
                     return client
+                self._record_login(username, "failed")
             except ChallengeRequired:
                 client = self.verifier.handle_challenge(client, username)
                 if client:
                     self.session_manager.save_session(client, username)
+                    self._record_login(username, "success")
                     return client
+                self._record_login(username, "failed")
             except Exception as e:
                 print(f"❌ Error login: {e}")
+                self._record_login(username, "failed")
                 time.sleep(5)
 
         return None
\ No newline at end of file
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Media Library - Index media lokal (content-addressed)
+Fitur:
+- Satu entry per file: path, size, mtime, hash, dimensi, durasi, thumbnail
+- Thumbnail dibuat di background (core.thumbnail_cache), per hash konten
+- Update incremental: file hanya di-hash ulang kalau size/mtime berubah
+- Watcher inotify (opsional, pakai inotify_simple kalau ada)
+- Deteksi file duplikat dari hash (tanpa baca file lagi)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+
+from PIL import Image
+
+from core.mp4_probe import probe_mp4
+from core.thumbnail_cache import ThumbnailCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # opsional; tanpa inotify pakai cek mtime saat list
+    INotify = None
+    inotify_flags = None
+
+INDEX_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi')
+
+MEDIA_FOLDERS = {
+    "photos": "posts_photos",
+    "reels": "posts_reels",
+    "stories": "posts_stories",
+    "profile": "profile_pictures",
+}
+
+def file_hash(file_path):
+    """Hash konten file (blake2b 128-bit, baca per 1 MB)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def file_md5(file_path):
+    """MD5 file (dipakai fitur MD5 changer), baca per 1 MB"""
+    h = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def media_kind(filename):
+    lower = filename.lower()
+    if lower.endswith(IMAGE_EXTENSIONS):
+        return "image"
+    if lower.endswith(VIDEO_EXTENSIONS):
+        return "video"
+    return None
+
+class MediaLibrary:
+    def __init__(self, index_file="data/media_index.json", thumbs_dir="data/media_cache/thumbs"):
+        self.index_file = index_file
+        self.thumbs_dir = thumbs_dir
+        self.thumbs = ThumbnailCache(thumbs_dir)
+        self.lock = threading.RLock()
+        self.entries = {}
+        self._dirty_folders = set()
+        self._clean_folders = set()
+        self._watcher = None
+        self._watched = set()
+        self._load_index()
+
+    # =====================================================
+    # 💾 INDEX PERSISTENCE
+    # =====================================================
+    def _load_index(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("entries", {})
+        except Exception as e:
+            logger.warning(f"⚠️ Media index rusak, dibangun ulang: {e}")
+            self.entries = {}
+
+    def _save_index(self):
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_file)
+
+    # =====================================================
+    # 🔍 PROBING
+    # =====================================================
+    def _probe(self, path, kind, st):
+        content_hash = file_hash(path)
+        entry = {
+            "path": path,
+            "name": os.path.basename(path),
+            "folder": os.path.dirname(path),
+            "kind": kind,
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "hash": content_hash,
+            "width": None,
+            "height": None,
+            "duration": None,
+            "thumbnail": self.thumbs.path_for(content_hash),  # dibuat di background
+        }
+        if kind == "image":
+            try:
+                with Image.open(path) as img:  # hanya baca header
+                    entry["width"], entry["height"] = img.size
+            except Exception:
+                pass
+        else:
+            info = probe_mp4(path)
+            if info:
+                entry["width"], entry["height"] = info["width"], info["height"]
+                entry["duration"] = info["duration"]
+        return entry
+
+    # =====================================================
+    # 🔄 INCREMENTAL REFRESH
+    # =====================================================
+    def refresh(self, folder):
+        """Sinkronkan index dengan isi folder. Return jumlah entry yang berubah."""
+        changed = 0
+        seen = set()
+        probed = []
+        with self.lock:
+            if os.path.isdir(folder):
+                with os.scandir(folder) as it:
+                    for dir_entry in it:
+                        if not dir_entry.is_file():
+                            continue
+                        kind = media_kind(dir_entry.name)
+                        if not kind:
+                            continue
+                        path = os.path.join(folder, dir_entry.name)
+                        seen.add(path)
+                        st = dir_entry.stat()
+                        old = self.entries.get(path)
+                        if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns:
+                            continue
+                        try:
+                            self.entries[path] = self._probe(path, kind, st)
+                            probed.append(self.entries[path])
+                            changed += 1
+                        except OSError as e:
+                            logger.warning(f"⚠️ Gagal index {path}: {e}")
+
+            prefix = os.path.join(folder, "")
+            for path in [p for p in self.entries if p.startswith(prefix) and p not in seen]:
+                del self.entries[path]
+                changed += 1
+
+            if changed:
+                self._save_index()
+            self._dirty_folders.discard(folder)
+            self._clean_folders.add(folder)
+        self.thumbs.warm(probed)
+        return changed
+
+    def list_media(self, folder, kind=None):
+        """List entry media di folder (urut nama), refresh dulu kalau perlu"""
+        with self.lock:
+            # Dengan watcher aktif, folder yang tidak ada event tidak perlu di-scan lagi
+            if folder not in self._watched or folder in self._dirty_folders or folder not in self._clean_folders:
+                self.refresh(folder)
+            prefix = os.path.join(folder, "")
+            items = [
+                e for p, e in self.entries.items()
+                if p.startswith(prefix) and (kind is None or e["kind"] == kind)
+            ]
+        return sorted(items, key=lambda e: e["name"])
+
+    def get(self, path):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                kind = media_kind(path)
+                if kind and os.path.isfile(path):
+                    entry = self._probe(path, kind, os.stat(path))
+                    self.entries[path] = entry
+                    self._save_index()
+                    self.thumbs.warm([entry])
+            return entry
+
+    def thumbnail(self, entry, timeout=None):
+        """Path thumbnail entry (tunggu kalau masih dibuat), None kalau gagal"""
+        return self.thumbs.get(entry, timeout=timeout)
+
+    def contact_sheet(self, folder, out_path, kind=None, columns=6):
+        """Export grid thumbnail satu folder ke out_path"""
+        return self.thumbs.contact_sheet(self.list_media(folder, kind), out_path, columns=columns)
+
+    def duplicates(self, folder=None):
+        """Group path dengan hash sama -> {hash: [path, ...]} (hanya yang > 1)"""
+        groups = {}
+        with self.lock:
+            for path, entry in self.entries.items():
+                if folder and not path.startswith(os.path.join(folder, "")):
+                    continue
+                groups.setdefault(entry["hash"], []).append(path)
+        return {h: sorted(paths) for h, paths in groups.items() if len(paths) > 1}
+
+    def duplicate_paths(self, folder=None):
+        """Set path yang punya kembaran (untuk ditandai di menu)"""
+        return {p for paths in self.duplicates(folder).values() for p in paths}
+
+    # =====================================================
+    # 👀 INOTIFY WATCHER (opsional)
+    # =====================================================
+    def start_watcher(self, folders=None):
+        """Pantau folder via inotify. Return False kalau inotify tidak tersedia."""
+        if INotify is None or self._watcher is not None:
+            return self._watcher is not None
+        folders = folders or list(MEDIA_FOLDERS.values())
+        inotify = INotify()
+        mask = (inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.MODIFY
+                | inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO)
+        watches = {}
+        for folder in folders:
+            if os.path.isdir(folder):
+                watches[inotify.add_watch(folder, mask)] = folder
+
+        def _loop():
+            while True:
+                for event in inotify.read():
+                    folder = watches.get(event.wd)
+                    if folder:
+                        with self.lock:
+                            self._dirty_folders.add(folder)
+
+        self._watched = set(watches.values())
+        self._watcher = threading.Thread(target=_loop, daemon=True)
+        self._watcher.start()
+        logger.info(f"👀 Media watcher aktif untuk {len(watches)} folder")
+        return True
+
+# Instance bersama supaya index cukup di-load sekali per proses
+_shared_library = None
+
+def get_library():
+    global _shared_library
+    if _shared_library is None:
+        _shared_library = MediaLibrary()
+        _shared_library.start_watcher()
+    return _shared_library
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    lib = MediaLibrary()
+    for folder in MEDIA_FOLDERS.values():
+        print(folder, len(lib.list_media(folder)))
+    print("Duplikat:", lib.duplicates())
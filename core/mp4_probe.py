@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+MP4 Probe - Baca metadata video tanpa ffmpeg
+Parser box ISO-BMFF (mp4/mov) sederhana: durasi, resolusi, codec, bitrate.
+Hanya header (moov) yang dibaca, data video (mdat) di-skip.
+"""
+
+import os
+import struct
+
+CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"edts"}
+
+def _iter_boxes(f, start, end):
+    """Yield (type, payload_start, box_end) untuk box di antara start..end"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        payload = pos + 8
+        if size == 1:  # 64-bit size
+            size = struct.unpack(">Q", f.read(8))[0]
+            payload += 8
+        elif size == 0:  # box sampai akhir file
+            size = end - pos
+        if size < 8:
+            return
+        yield box_type, payload, min(pos + size, end)
+        pos += size
+
+def _parse_mvhd(f, payload):
+    f.seek(payload)
+    version = f.read(1)[0]
+    if version == 1:
+        f.seek(payload + 4 + 16)
+        timescale, duration = struct.unpack(">IQ", f.read(12))
+    else:
+        f.seek(payload + 4 + 8)
+        timescale, duration = struct.unpack(">II", f.read(8))
+    return duration / timescale if timescale else 0.0
+
+def _parse_tkhd(f, payload):
+    f.seek(payload)
+    version = f.read(1)[0]
+    # width/height fixed-point 16.16 di 8 byte terakhir box
+    offset = payload + (88 if version == 1 else 76)
+    f.seek(offset)
+    width, height = struct.unpack(">II", f.read(8))
+    return width >> 16, height >> 16
+
+def _parse_trak(f, start, end, info):
+    track = {"width": 0, "height": 0, "handler": None, "codec": None}
+    stack = [(start, end)]
+    while stack:
+        s, e = stack.pop()
+        for box_type, payload, box_end in _iter_boxes(f, s, e):
+            if box_type == b"tkhd":
+                track["width"], track["height"] = _parse_tkhd(f, payload)
+            elif box_type == b"hdlr":
+                f.seek(payload + 8)
+                track["handler"] = f.read(4)
+            elif box_type == b"stsd":
+                f.seek(payload + 8 + 4)  # version/flags + entry_count, lalu size entry
+                track["codec"] = f.read(4).decode("latin-1")
+            elif box_type in CONTAINER_BOXES:
+                stack.append((payload, box_end))
+
+    if track["handler"] == b"vide" and not info["video_codec"]:
+        info["video_codec"] = track["codec"]
+        info["width"], info["height"] = track["width"], track["height"]
+    elif track["handler"] == b"soun" and not info["audio_codec"]:
+        info["audio_codec"] = track["codec"]
+
+def probe_mp4(path):
+    """
+    Return dict metadata video, atau None kalau bukan ISO-BMFF yang valid.
+    Keys: container, duration, width, height, video_codec, audio_codec, bitrate, size
+    """
+    size = os.path.getsize(path)
+    info = {
+        "container": None, "duration": 0.0, "width": 0, "height": 0,
+        "video_codec": None, "audio_codec": None, "bitrate": 0, "size": size,
+    }
+    try:
+        with open(path, "rb") as f:
+            found_moov = False
+            for box_type, payload, box_end in _iter_boxes(f, 0, size):
+                if box_type == b"ftyp":
+                    f.seek(payload)
+                    brand = f.read(4).decode("latin-1").strip()
+                    info["container"] = "mov" if brand == "qt" else "mp4"
+                elif box_type == b"moov":
+                    found_moov = True
+                    for child, c_payload, c_end in _iter_boxes(f, payload, box_end):
+                        if child == b"mvhd":
+                            info["duration"] = _parse_mvhd(f, c_payload)
+                        elif child == b"trak":
+                            _parse_trak(f, c_payload, c_end, info)
+    except (OSError, struct.error, IndexError):
+        return None
+
+    if not found_moov or not info["container"]:
+        return None
+    if info["duration"] > 0:
+        info["bitrate"] = int(size * 8 / info["duration"])
+    return info
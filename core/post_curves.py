@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Post Curves - Kurva performa post sendiri (seberapa cepat engagement jenuh)
+Fitur:
+- Post yang dipublish (ScheduledPost / publish daemon / post_photo) otomatis di-track
+- Counter like & komentar dibaca ulang dengan jadwal meluruh: 5m, 15m, 1j, 6j, 24j, 7h setelah publish
+- Satu batch per tick: semua post yang jatuh tempo dibaca dari feed akun sendiri (1 request per
+  33 post terbaru), bukan media_info per post; lewat lane "analytics" broker
+- Telat sample (bot mati)? Step yang terlewat tidak dikejar, sample diambil di umur aslinya
+- compare(): semua kurva diinterpolasi ke grid umur yang sama lalu dibandingkan per kolom
+  (median akun, kurva saturasi tipikal, performa relatif & waktu-ke-90% per post)
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime
+
+from core.best_time import engagement_of
+from core.datastore import get_datastore
+from core.request_broker import get_broker
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_OFFSETS = (5 * 60, 15 * 60, 3600, 6 * 3600, 86400, 7 * 86400)  # detik setelah publish
+SAMPLE_LABELS = ("5m", "15m", "1j", "6j", "24j", "7h")
+SAMPLE_TICK = 60       # detik antar cek jatuh tempo (thread sampler di proses menu)
+FEED_PAGE_SIZE = 33    # ukuran halaman feed akun sendiri di Instagram
+MAX_PINNED = 3         # post yang di-pin muncul paling atas walau sudah lama
+FEED_SLACK = 3600      # toleransi beda jam taken_at vs waktu publish yang tercatat
+
+def _epoch(value):
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+def _interpolate(points, age):
+    """Nilai di umur `age` dari titik (umur, nilai) terurut; None kalau belum sampai umur itu"""
+    for (a0, v0), (a1, v1) in zip(points, points[1:]):
+        if a0 <= age <= a1:
+            return v0 if a1 == a0 else v0 + (v1 - v0) * (age - a0) / (a1 - a0)
+    return None
+
+def _median(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+class PostSampler:
+    def __init__(self, datastore=None, offsets=SAMPLE_OFFSETS):
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.post_samples
+        self.offsets = offsets
+        self.lock = threading.Lock()  # satu batch sampling sekaligus per proses
+
+    # =====================================================
+    # 📌 TRACK
+    # =====================================================
+    def track(self, username, media_id, published_at=None, post_type="photo"):
+        published = _epoch(published_at)
+        return self.repo.track(username, str(media_id), post_type, published, published + self.offsets[0])
+
+    def track_media(self, username, media, post_type=None):
+        """Media hasil upload instagrapi -> mulai di-sample. Return False kalau tidak bisa / sudah."""
+        if media is None or not username:
+            return False
+        if post_type is None:
+            post_type = "reel" if getattr(media, "product_type", "") == "clips" else "photo"
+        media_id = getattr(media, "id", None) or getattr(media, "pk", None)
+        if not media_id:
+            return False
+        return self.track(username, media_id, getattr(media, "taken_at", None), post_type)
+
+    # =====================================================
+    # 📥 SAMPLE
+    # =====================================================
+    def _step_for(self, age):
+        """Step terakhir yang sudah lewat di umur ini (step terlewat tidak dikejar)"""
+        step = 0
+        for i, offset in enumerate(self.offsets):
+            if age >= offset:
+                step = i
+        return step
+
+    def _feed(self, client, due):
+        """Cari post jatuh tempo di feed sendiri, berhenti begitu semua ketemu / sudah lewat yang tertua"""
+        oldest = min(row["published_at"] for row in due.values()) - FEED_SLACK
+        found = {}
+        medias = get_broker().paginate("analytics", client.user_medias_paginated_v1, client.user_id,
+                                       page_size=FEED_PAGE_SIZE)
+        for i, media in enumerate(medias):
+            media_id = str(media.id)
+            if media_id in due:
+                found[media_id] = media
+                if len(found) == len(due):
+                    break
+            elif i >= MAX_PINNED and media.taken_at and media.taken_at.timestamp() < oldest:
+                break
+        return found
+
+    def sample_due(self, client, username, now=None):
+        """Baca counter semua post yang jatuh tempo dalam satu batch. Return jumlah sample baru."""
+        with self.lock:
+            now = now or time.time()
+            due = {row["media_id"]: row for row in self.repo.due(username, now)}
+            if not due:
+                return 0
+            found = self._feed(client, due)
+
+            samples, finished = [], []
+            for media_id, row in due.items():
+                media = found.get(media_id)
+                if media is None:
+                    finished.append(media_id)  # dihapus / diarsip: berhenti di-sample
+                    continue
+                age = max(0, now - row["published_at"])
+                step = self._step_for(age)
+                next_step = step + 1
+                next_due = row["published_at"] + self.offsets[next_step] if next_step < len(self.offsets) else None
+                samples.append((media_id, step, age, media.like_count or 0, media.comment_count or 0,
+                                next_step, next_due))
+            self.repo.record(username, samples, finished)
+        if finished:
+            logger.info(f"📉 {len(finished)} post @{username} tidak ada lagi di feed, sampling dihentikan")
+        logger.debug(f"📉 {len(samples)} sample @{username} dari {len(due)} post jatuh tempo")
+        return len(samples)
+
+    # =====================================================
+    # 📊 CURVES
+    # =====================================================
+    def curves(self, username):
+        """{media_id: [engagement di tiap umur SAMPLE_OFFSETS atau None]} (interpolasi linear dari 0)"""
+        points = {}
+        for row in self.repo.samples(username):
+            points.setdefault(row["media_id"], [(0, 0.0)]).append(
+                (row["age"], float(engagement_of(row["likes"], row["comments"]))))
+        return {media_id: [_interpolate(p, offset) for offset in self.offsets] for media_id, p in points.items()}
+
+    def compare(self, username):
+        """
+        Bandingkan kurva semua post per kolom umur:
+        median (engagement tipikal di tiap umur), saturation (fraksi nilai akhir yang sudah tercapai,
+        dari post yang sudah lengkap), dan per post: relative (vs median di umur terakhir) & t90.
+        """
+        curves = self.curves(username)
+        if not curves:
+            return None
+        tracked = {row["media_id"]: row for row in self.repo.tracked(username)}
+        ids = sorted(curves, key=lambda m: tracked.get(m, {}).get("published_at", 0), reverse=True)
+        matrix = [curves[m] for m in ids]
+
+        # satu kolom per umur; operasi per kolom, bukan per post
+        median = [_median(column) for column in zip(*matrix)]
+        fractions = [
+            [v / row[-1] if v is not None else None for v in row] if row[-1] else None for row in matrix
+        ]
+        complete = [f for f in fractions if f is not None]
+        saturation = [_median(column) for column in zip(*complete)] if complete else [None] * len(self.offsets)
+
+        posts = []
+        for media_id, row, fraction in zip(ids, matrix, fractions):
+            last = max((j for j, v in enumerate(row) if v is not None), default=None)
+            relative = row[last] / median[last] if last is not None and median[last] else None
+            t90 = next((self.offsets[j] for j, f in enumerate(fraction) if f is not None and f >= 0.9), None) \
+                if fraction else None
+            info = tracked.get(media_id, {})
+            posts.append({
+                "media_id": media_id, "post_type": info.get("post_type"), "published_at": info.get("published_at"),
+                "values": row, "relative": relative, "t90": t90,
+            })
+        return {"offsets": list(self.offsets), "labels": list(SAMPLE_LABELS), "median": median,
+                "saturation": saturation, "posts": posts}
+
+    # =====================================================
+    # 🔁 BACKGROUND
+    # =====================================================
+    def start(self, client, username, tick=SAMPLE_TICK):
+        """Thread sampler (sekali per akun per proses) untuk proses menu; daemon memanggil sample_due sendiri"""
+        with _threads_lock:
+            thread = _threads.get(username)
+            if thread and thread.is_alive():
+                return thread
+            thread = threading.Thread(target=self._loop, args=(client, username, tick),
+                                      name=f"post-sampler-{username}", daemon=True)
+            _threads[username] = thread
+            thread.start()
+            return thread
+
+    def _loop(self, client, username, tick):
+        while True:
+            try:
+                self.sample_due(client, username)
+            except Exception as e:
+                logger.warning(f"⚠️ Sampling post @{username} gagal: {e}")
+            if not self.repo.due(username, time.time() + 8 * 86400):
+                return  # tidak ada post yang masih di-sample
+            time.sleep(tick)
+
+_threads = {}
+_threads_lock = threading.Lock()
+_shared_sampler = None
+
+def get_sampler():
+    global _shared_sampler
+    if _shared_sampler is None:
+        _shared_sampler = PostSampler()
+    return _shared_sampler
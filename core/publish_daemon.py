@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Publish Daemon - Satu proses headless untuk semua posting terjadwal
+Fitur:
+- Menjalankan antrian jadwal di data/bot.db (tabel schedules) sampai dihentikan
+- PID/lock file (data/publisher.pid): hanya satu daemon per folder bot
+- Satu client Instagram yang tetap hangat (session dimuat sekali, relogin kalau expired)
+- SIGTERM/SIGINT: job yang sedang upload diselesaikan, status & session di-flush, baru keluar
+- Control socket (localhost, JSON lines + token) untuk CLI: add / list / status / cancel / wake / stop
+- Klaim jadwal atomik (pending -> publishing): daemon & scheduler menu tidak pernah posting dobel
+- Post yang terbit di-track untuk kurva performa (core.post_curves), di-sample tiap tick
+- Viewer story aktif di-snapshot sebelum expired (core.story_viewers) dengan client yang sama
+"""
+
+import os
+import json
+import time
+import signal
+import socket
+import logging
+import secrets
+import threading
+import socketserver
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from instagrapi.exceptions import LoginRequired
+
+from core.datastore import get_datastore
+from core.post_curves import PostSampler
+from core.request_broker import get_broker
+from core.story_viewers import StorySnapshotter
+
+logger = logging.getLogger(__name__)
+
+PID_FILE = "data/publisher.pid"
+CONTROL_FILE = "data/publisher.json"  # port + token control socket
+DEFAULT_TICK = 30  # detik antar cek antrian (add lewat socket langsung membangunkan loop)
+POST_TYPES = ("photo", "reel")
+LOGIN_BACKOFF = (60, 5 * 60, 15 * 60, 60 * 60)  # jeda login ulang setelah gagal ke-1, 2, 3, 4+
+
+# =====================================================
+# 📤 PUBLISH
+# =====================================================
+def publish_schedule(client, schedule):
+    """Upload satu jadwal dengan client yang sudah login. Error dilempar ke pemanggil."""
+    file_path, caption = schedule["file_path"], schedule.get("caption") or ""
+    if schedule["post_type"] == "photo":
+        return client.photo_upload(file_path, caption=caption)
+    if schedule["post_type"] == "reel":
+        from core.reel_preflight import get_preflight
+        result = get_preflight().prepare(file_path)
+        if result["fatal"]:
+            raise ValueError("; ".join(result["fatal"]))
+        return client.clip_upload(result["output"], caption=caption)
+    raise ValueError(f"Tipe posting tidak dikenal: {schedule['post_type']}")
+
+def run_schedule(client, repo, schedule):
+    """
+    Klaim -> upload -> tandai posted/failed.
+    Upload lewat lane "publish": didahulukan, dan lane latar menunggu sampai upload selesai.
+    Return (status, error): status None kalau jadwal sudah diklaim proses lain.
+    """
+    if not repo.claim(schedule["id"]):
+        return None, None
+    try:
+        media = get_broker().call("publish", publish_schedule, client, schedule)
+    except Exception as e:
+        repo.set_status(schedule["id"], "failed", str(e))
+        logger.error(f"❌ Jadwal {schedule['id']} gagal: {e}")
+        return "failed", e
+    repo.set_status(schedule["id"], "posted")
+    logger.info(f"✅ Jadwal {schedule['id']} terposting ({schedule['post_type']})")
+    try:
+        # Mulai kurva performa (5m, 15m, 1j, ...); gagal di sini tidak membatalkan status posted
+        PostSampler(repo.store).track_media(schedule.get("username") or getattr(client, "username", None), media,
+                                            schedule["post_type"])
+    except Exception as e:
+        logger.warning(f"⚠️ Post jadwal {schedule['id']} tidak di-track: {e}")
+    return "posted", None
+
+# =====================================================
+# 🔒 PID LOCK
+# =====================================================
+class PidLock:
+    """
+    Lock eksklusif di file PID. Lock ikut lepas kalau proses mati, jadi file basi tidak mengunci.
+    File tidak pernah dihapus (hanya dikosongkan): kalau di-unlink, proses yang sudah membuka
+    inode lama dan proses yang membuat file baru bisa sama-sama dapat lock.
+    """
+
+    def __init__(self, path=PID_FILE):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        """True kalau lock didapat; False kalau daemon lain masih jalan"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        handle = open(self.path, "a+")
+        try:
+            if fcntl:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._file = handle
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.truncate()  # kosongkan PID selagi lock masih dipegang
+        self._file.flush()
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+    def read_pid(self):
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+# =====================================================
+# 🔌 CONTROL SOCKET
+# =====================================================
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.daemon_ref
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not secrets.compare_digest(str(request.get("token", "")), daemon.token):
+                    response = {"ok": False, "error": "token salah"}
+                else:
+                    response = daemon.handle_command(request)
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+class _ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def send_command(cmd, control_file=CONTROL_FILE, timeout=10, **params):
+    """Kirim satu perintah ke daemon. Return dict respon, None kalau daemon tidak jalan."""
+    try:
+        with open(control_file, "r", encoding="utf-8") as f:
+            control = json.load(f)
+        with socket.create_connection(("127.0.0.1", control["port"]), timeout=timeout) as sock:
+            request = dict(params, cmd=cmd, token=control["token"])
+            sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as reader:
+                return json.loads(reader.readline())
+    except (OSError, ValueError, KeyError):
+        return None
+
+# =====================================================
+# 🤖 DAEMON
+# =====================================================
+class PublishDaemon:
+    def __init__(self, username, client_factory=None, datastore=None, pid_file=PID_FILE,
+                 control_file=CONTROL_FILE, tick=DEFAULT_TICK):
+        self.username = username
+        self.client_factory = client_factory or self._login
+        self._owns_session = client_factory is None  # session file hanya disimpan kalau daemon yang login
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.schedules
+        self.sampler = PostSampler(self.datastore)
+        self.stories = StorySnapshotter(self.datastore)
+        self.lock = PidLock(pid_file)
+        self.control_file = control_file
+        self.tick = tick
+        self.token = secrets.token_hex(16)
+        self.client = None
+        self.booted_at = time.time()  # discover story pertama menunggu DISCOVER_INTERVAL, bukan langsung login
+        self._login_failures = 0
+        self._login_retry_at = 0
+        self.server = None
+        self.started_at = None
+        self.current = None  # jadwal yang sedang di-upload
+        self.stats = {"posted": 0, "failed": 0}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    # --- client ---
+    def _login(self):
+        from core.login_manager import LoginManager
+        manager = LoginManager()
+        account = next((a for a in manager.get_accounts() if a["username"] == self.username), None)
+        if not account:
+            raise RuntimeError(f"Akun @{self.username} tidak ada di accounts.db")
+        client = manager.login(account["username"], account["password"])
+        if not client:
+            raise RuntimeError(f"Login @{self.username} gagal")
+        return client
+
+    def _ensure_client(self):
+        if self.client is None:
+            if time.time() < self._login_retry_at:
+                wait = int(self._login_retry_at - time.time())
+                raise RuntimeError(f"Login @{self.username} ditunda {wait} detik lagi (gagal {self._login_failures}x)")
+            logger.info(f"🔐 Menyiapkan session @{self.username} (sekali untuk seluruh umur daemon)")
+            try:
+                self.client = self.client_factory()
+            except Exception:
+                self._login_failures += 1
+                self._login_retry_at = time.time() + LOGIN_BACKOFF[min(self._login_failures, len(LOGIN_BACKOFF)) - 1]
+                raise
+            self._login_failures = 0
+        return self.client
+
+    def _save_session(self):
+        if self.client is None or not self._owns_session:
+            return
+        try:
+            from core.session_manager_v2 import SessionManagerV2
+            SessionManagerV2().save_session(self.client, self.username)
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal simpan session: {e}")
+
+    # --- antrian ---
+    def run_due(self, now=None):
+        """Publish semua jadwal yang jatuh tempo. Return jumlah jadwal yang diproses."""
+        processed = 0
+        for schedule in self.repo.due(now or datetime.now(), self.username):
+            if self._stop.is_set():
+                break  # sisa antrian dikerjakan daemon berikutnya
+            client = self._ensure_client()
+            self.current = schedule
+            try:
+                status, error = run_schedule(client, self.repo, schedule)
+            finally:
+                self.current = None
+            if isinstance(error, LoginRequired):
+                self.client = None  # session basi: login ulang di jadwal berikutnya
+            if status:
+                self.stats[status] += 1
+                processed += 1
+        return processed
+
+    def sample_posts(self, now=None):
+        """Satu batch sampling kurva performa (client hangat yang sama, lane analytics)"""
+        if not self.sampler.repo.due(self.username, now or time.time()):
+            return 0
+        return self.sampler.sample_due(self._ensure_client(), self.username, now)
+
+    def snapshot_stories(self, now=None):
+        """Snapshot viewer story yang jatuh tempo (user_stories paling sering tiap 30 menit)"""
+        if not self.stories.pending(self.username, now or time.time(), since=self.booted_at):
+            return 0
+        return self.stories.snapshot_due(self._ensure_client(), self.username, now)
+
+    # --- control ---
+    def handle_command(self, request):
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            return {"ok": True, "pid": os.getpid(), "username": self.username}
+        if cmd == "status":
+            return {
+                "ok": True, "pid": os.getpid(), "username": self.username, "started_at": self.started_at,
+                "current": self.current, "stats": self.stats, "pending": len(self.repo.pending()),
+                "lanes": get_broker().metrics(),
+            }
+        if cmd == "list":
+            return {"ok": True, "schedules": self.repo.all()}
+        if cmd == "add":
+            post_time = request["post_time"]
+            datetime.strptime(post_time, "%Y-%m-%d %H:%M")  # validasi format
+            post_type = request.get("post_type", "photo")
+            if post_type not in POST_TYPES:
+                return {"ok": False, "error": f"post_type harus salah satu dari {POST_TYPES}"}
+            if not os.path.exists(request["file_path"]):
+                return {"ok": False, "error": f"File tidak ditemukan: {request['file_path']}"}
+            schedule = self.repo.add(request["file_path"], request.get("caption", ""), post_time, post_type,
+                                     username=self.username)
+            self._wake.set()
+            return {"ok": True, "schedule": schedule}
+        if cmd == "cancel":
+            schedule = self.repo.get(int(request["id"]))
+            if not schedule or schedule["status"] != "pending":
+                return {"ok": False, "error": "Hanya jadwal pending yang bisa dibatalkan"}
+            return {"ok": self.repo.delete(schedule["id"])}
+        if cmd == "wake":
+            self._wake.set()
+            return {"ok": True}
+        if cmd == "stop":
+            self.stop()
+            return {"ok": True}
+        return {"ok": False, "error": f"Perintah tidak dikenal: {cmd}"}
+
+    def _start_control(self):
+        self.server = _ControlServer(("127.0.0.1", 0), _ControlHandler)
+        self.server.daemon_ref = self
+        threading.Thread(target=self.server.serve_forever, name="publisher-control", daemon=True).start()
+        control = {"pid": os.getpid(), "port": self.server.server_address[1], "token": self.token,
+                   "username": self.username, "started_at": self.started_at}
+        tmp_path = self.control_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(control, f)
+        if hasattr(os, "chmod"):
+            os.chmod(tmp_path, 0o600)  # token hanya bisa dibaca user pemilik
+        os.replace(tmp_path, self.control_file)
+
+    # --- lifecycle ---
+    def stop(self, signum=None, frame=None):
+        if signum:
+            logger.info(f"🛑 Sinyal {signum} diterima, menyelesaikan job yang berjalan...")
+        self._stop.set()
+        self._wake.set()
+
+    def install_signal_handlers(self):
+        for name in ("SIGTERM", "SIGINT", "SIGHUP"):
+            if hasattr(signal, name):
+                try:
+                    signal.signal(getattr(signal, name), self.stop)
+                except ValueError:
+                    pass  # bukan main thread
+
+    def serve(self):
+        """Loop utama sampai stop(). Return False kalau daemon lain sudah memegang lock."""
+        if not self.lock.acquire():
+            logger.error(f"❌ Publish daemon sudah jalan (PID {self.lock.read_pid()})")
+            return False
+        self.started_at = datetime.now().isoformat()
+        try:
+            interrupted = self.repo.fail_interrupted(self.username)
+            if interrupted:
+                logger.warning(f"⚠️ {interrupted} jadwal terputus saat publish sebelumnya, ditandai failed")
+            self._start_control()
+            logger.info(f"🚀 Publish daemon @{self.username} jalan (PID {os.getpid()})")
+            while not self._stop.is_set():
+                try:
+                    self.run_due()
+                except Exception as e:
+                    logger.error(f"❌ Publish loop error: {e}")
+                    self.client = None
+                try:
+                    self.sample_posts()
+                except Exception as e:
+                    logger.warning(f"⚠️ Sampling post gagal: {e}")
+                try:
+                    self.snapshot_stories()
+                except Exception as e:
+                    logger.warning(f"⚠️ Snapshot viewer story gagal: {e}")
+                self._wake.wait(self.tick)
+                self._wake.clear()
+        finally:
+            self._flush()
+        return True
+
+    def _flush(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        try:
+            os.remove(self.control_file)
+        except OSError:
+            pass
+        self._save_session()
+        self.datastore.checkpoint()
+        self.lock.release()
+        logger.info(f"👋 Publish daemon berhenti ({self.stats['posted']} posted, {self.stats['failed']} failed)")
+
+def daemon_status(control_file=CONTROL_FILE):
+    """Status daemon yang sedang jalan, None kalau tidak ada"""
+    return send_command("status", control_file=control_file)
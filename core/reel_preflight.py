@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Reel Preflight & Transcode
+Fitur:
+- Probe container, codec, resolusi, durasi, bitrate sebelum upload
+- Transcode ke MP4 (H.264 + AAC) yang sesuai spesifikasi Reels kalau perlu
+- Jalan di background: hash file sumber di thread, probe/transcode di process pool
+- Cache per hash file sumber: reel yang sama tidak pernah di-encode dua kali
+- Hasil fatal yang bergantung pada tool (ffmpeg/ffprobe belum terpasang) dicek ulang kalau tool berubah
+"""
+
+import os
+import json
+import shutil
+import logging
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from core.media_library import file_hash
+from core.mp4_probe import probe_mp4
+
+logger = logging.getLogger(__name__)
+
+# Batas aman untuk clip_upload
+REEL_SPEC = {
+    "container": "mp4",
+    "video_codec": "h264",
+    "audio_codecs": ("aac", None),
+    "min_duration": 3.0,
+    "max_duration": 90.0,
+    "max_width": 1080,
+    "max_height": 1920,
+    "max_bitrate": 8_000_000,
+    "max_size": 100 * 1024 * 1024,
+}
+
+CODEC_ALIASES = {
+    "avc1": "h264", "avc3": "h264", "hvc1": "hevc", "hev1": "hevc",
+    "mp4a": "aac", "mp4v": "mpeg4", "vp09": "vp9", "av01": "av1",
+}
+
+def _normalize_codec(codec):
+    if not codec:
+        return None
+    codec = codec.strip().lower()
+    return CODEC_ALIASES.get(codec, codec)
+
+def available_tools():
+    """Tool eksternal yang terpasang; hasil preflight yang ditolak tergantung pada ini"""
+    return [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool)]
+
+# =====================================================
+# 🔍 PROBE
+# =====================================================
+def probe_video(path):
+    """Probe pakai ffprobe kalau ada, fallback ke parser MP4 bawaan"""
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe:
+        try:
+            out = subprocess.run(
+                [ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", path],
+                capture_output=True, text=True, timeout=60, check=True,
+            ).stdout
+            data = json.loads(out)
+            fmt = data.get("format", {})
+            video = next((s for s in data.get("streams", []) if s.get("codec_type") == "video"), {})
+            audio = next((s for s in data.get("streams", []) if s.get("codec_type") == "audio"), {})
+            format_names = fmt.get("format_name", "").split(",")
+            return {
+                "container": "mp4" if "mp4" in format_names else format_names[0] or None,
+                "duration": float(fmt.get("duration") or 0),
+                "width": int(video.get("width") or 0),
+                "height": int(video.get("height") or 0),
+                "video_codec": _normalize_codec(video.get("codec_name")),
+                "audio_codec": _normalize_codec(audio.get("codec_name")),
+                "bitrate": int(fmt.get("bit_rate") or 0),
+                "size": os.path.getsize(path),
+            }
+        except (subprocess.SubprocessError, ValueError, OSError) as e:
+            logger.warning(f"⚠️ ffprobe gagal, pakai parser MP4: {e}")
+
+    info = probe_mp4(path)
+    if info:
+        info["video_codec"] = _normalize_codec(info["video_codec"])
+        info["audio_codec"] = _normalize_codec(info["audio_codec"])
+    return info
+
+def check_reel(info, spec=REEL_SPEC):
+    """
+    Bandingkan hasil probe dengan spesifikasi.
+    Return (fatal, fixable): list masalah yang tidak bisa / bisa diperbaiki transcode.
+    """
+    if not info:
+        return ["File bukan video yang bisa dibaca"], []
+    fatal, fixable = [], []
+    if info["duration"] and info["duration"] < spec["min_duration"]:
+        fatal.append(f"Durasi terlalu pendek ({info['duration']:.1f}s, min {spec['min_duration']:.0f}s)")
+    if info["duration"] > spec["max_duration"]:
+        fixable.append(f"Durasi {info['duration']:.1f}s, dipotong jadi {spec['max_duration']:.0f}s")
+    if info["container"] != spec["container"]:
+        fixable.append(f"Container {info['container']} -> {spec['container']}")
+    if info["video_codec"] != spec["video_codec"]:
+        fixable.append(f"Codec video {info['video_codec']} -> {spec['video_codec']}")
+    if info["audio_codec"] not in spec["audio_codecs"]:
+        fixable.append(f"Codec audio {info['audio_codec']} -> aac")
+    if info["width"] > spec["max_width"] or info["height"] > spec["max_height"]:
+        fixable.append(f"Resolusi {info['width']}x{info['height']} terlalu besar")
+    if info["bitrate"] > spec["max_bitrate"]:
+        fixable.append(f"Bitrate {info['bitrate'] // 1000} kbps terlalu tinggi")
+    if info["size"] > spec["max_size"]:
+        fixable.append(f"Ukuran {info['size'] / (1024 * 1024):.1f} MB terlalu besar")
+    return fatal, fixable
+
+# =====================================================
+# 🎬 TRANSCODE (jalan di worker process)
+# =====================================================
+def _ffmpeg_command(ffmpeg, src, dst, spec):
+    scale = (f"scale='min({spec['max_width']},iw)':'min({spec['max_height']},ih)'"
+             f":force_original_aspect_ratio=decrease,scale=trunc(iw/2)*2:trunc(ih/2)*2")
+    return [
+        ffmpeg, "-y", "-v", "error", "-i", src,
+        "-t", str(spec["max_duration"]),
+        "-vf", scale,
+        "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "high", "-pix_fmt", "yuv420p",
+        "-b:v", str(int(spec["max_bitrate"] * 0.6)), "-maxrate", str(spec["max_bitrate"]),
+        "-bufsize", str(spec["max_bitrate"] * 2),
+        "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+        "-movflags", "+faststart",
+        dst,
+    ]
+
+def transcode(src, dst, spec=REEL_SPEC):
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg tidak ditemukan, install ffmpeg untuk transcode reels")
+    tmp_dst = dst + ".part.mp4"
+    subprocess.run(_ffmpeg_command(ffmpeg, src, tmp_dst, spec), check=True, capture_output=True, timeout=1800)
+    os.replace(tmp_dst, dst)
+    return dst
+
+def prepare_reel(src, content_hash, cache_dir, spec=REEL_SPEC):
+    """Probe + transcode kalau perlu. Aman dipanggil di process lain (tanpa state)."""
+    info = probe_video(src)
+    fatal, fixable = check_reel(info, spec)
+    if info is None and shutil.which("ffmpeg"):
+        # Tanpa ffprobe hanya MP4/MOV yang bisa dibaca; format lain biar ffmpeg yang coba
+        fatal, fixable = [], ["Format tidak dikenali, transcode ke MP4"]
+    result = {
+        "source": src,
+        "hash": content_hash,
+        "probe": info,
+        "fatal": fatal,
+        "fixed": fixable,
+        "output": None,
+        "transcoded": False,
+        "tools": available_tools(),
+        "created_at": datetime.now().isoformat(),
+    }
+    if fatal:
+        return result
+    if not fixable:
+        result["output"] = src  # sudah compliant, upload file asli
+        return result
+
+    os.makedirs(cache_dir, exist_ok=True)
+    dst = os.path.join(cache_dir, f"{content_hash}.mp4")
+    transcode(src, dst, spec)
+    result["output"] = dst
+    result["transcoded"] = True
+    result["probe_output"] = probe_video(dst)
+    fatal_output = check_reel(result["probe_output"], spec)[0]
+    if fatal_output:  # mis. file asli ternyata lebih pendek dari durasi minimum
+        result["fatal"] = fatal_output
+        result["output"] = None
+    return result
+
+# =====================================================
+# 🧰 PREFLIGHT MANAGER
+# =====================================================
+class ReelPreflight:
+    def __init__(self, cache_dir="data/media_cache/reels", executor=None, spec=None):
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.spec = spec or REEL_SPEC
+        self._executor = executor
+        self._hasher = None
+        self._inflight = {}  # hash -> Future job di process pool
+        self._pending = {}   # path -> Future yang dikembalikan submit()
+        self.lock = threading.Lock()
+        self.cache = self._load_cache()
+
+    def _load_cache(self):
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_cache(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_file)
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        return self._executor
+
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            self._hasher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="reel-hash")
+        return self._hasher
+
+    def _cached(self, content_hash):
+        """
+        Hasil transcode hanya valid kalau file output-nya masih ada di cache; hasil fatal hanya
+        valid kalau tool yang terpasang masih sama (mis. setelah ffmpeg di-install, cek ulang).
+        """
+        result = self.cache.get(content_hash)
+        if result and result["transcoded"] and result["output"] and not os.path.exists(result["output"]):
+            return None
+        if result and result["fatal"] and result.get("tools") != available_tools():
+            return None
+        return result
+
+    def submit(self, path):
+        """
+        Mulai preflight di background. Hash file sumber juga dihitung di thread, jadi pemanggil
+        (menu) tidak menunggu file besar dibaca. Return Future berisi dict hasil.
+        """
+        key = os.path.abspath(path)
+        with self.lock:
+            if key in self._pending:
+                return self._pending[key]
+            future = self._pending[key] = Future()
+        future.add_done_callback(lambda _: self._release(key))
+        self.hasher.submit(self._start, path, future)
+        return future
+
+    def _release(self, key):
+        with self.lock:
+            self._pending.pop(key, None)
+
+    def _start(self, path, future):
+        """Jalan di thread hasher: hash -> cache / job yang sedang jalan / job baru di process pool"""
+        try:
+            content_hash = file_hash(path)
+            with self.lock:
+                cached = self._cached(content_hash)
+                job = None if cached else self._inflight.get(content_hash)
+                new_job = not cached and job is None
+                if new_job:
+                    job = self.executor.submit(prepare_reel, path, content_hash, self.cache_dir, self.spec)
+                    self._inflight[content_hash] = job
+        except Exception as e:
+            future.set_exception(e)
+            return
+
+        if cached:
+            if cached["output"] and not cached["transcoded"]:
+                cached = dict(cached, source=path, output=path)  # file compliant bisa pindah lokasi
+            future.set_result(cached)
+            return
+        if new_job:
+            job.add_done_callback(lambda done: self._store(content_hash, done))
+        job.add_done_callback(lambda done: _chain(done, future))
+
+    def _store(self, content_hash, done):
+        with self.lock:
+            self._inflight.pop(content_hash, None)
+            if done.exception() is None:
+                self.cache[content_hash] = done.result()
+                self._save_cache()
+
+    def prepare(self, path, timeout=None):
+        """Versi blocking dari submit()"""
+        return self.submit(path).result(timeout=timeout)
+
+    def shutdown(self):
+        if self._hasher is not None:
+            self._hasher.shutdown(wait=True)
+            self._hasher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+def _chain(done, future):
+    """Salin hasil job process pool ke Future milik submit()"""
+    if done.exception() is not None:
+        future.set_exception(done.exception())
+    else:
+        future.set_result(done.result())
+
+# Instance bersama (satu process pool per proses bot)
+_shared_preflight = None
+
+def get_preflight():
+    global _shared_preflight
+    if _shared_preflight is None:
+        _shared_preflight = ReelPreflight()
+    return _shared_preflight
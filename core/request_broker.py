@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Request Broker - Jalur prioritas untuk semua request ke Instagram dalam satu proses
+Fitur:
+- Lane berprioritas: publish > interactive > notifications > analytics > backup
+- Satu budget request bersama (token bucket) untuk semua lane
+- Selama upload terjadwal berjalan, lane latar (notifications/analytics/backup) menunggu
+- Crawl panjang dipecah per halaman: tiap halaman antre ulang, jadi publish bisa menyela
+- PleaseWaitFewMinutes / RateLimitError di lane mana pun -> semua lane cooldown
+- Metrik waktu antre per lane (rata-rata, p95, maks) untuk status daemon & dashboard
+"""
+
+import time
+import heapq
+import logging
+import itertools
+import threading
+from collections import deque
+
+from instagrapi.exceptions import PleaseWaitFewMinutes, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+LANES = ("publish", "interactive", "notifications", "analytics", "backup")
+YIELD_TO_PUBLISH = ("notifications", "analytics", "backup")  # lane latar yang minggir saat upload jalan
+
+DEFAULT_RATE = 1.0    # request per detik (rata-rata jangka panjang)
+DEFAULT_BURST = 20    # request beruntun yang boleh lewat tanpa menunggu
+DEFAULT_COOLDOWN = 120  # detik jeda semua lane setelah PleaseWaitFewMinutes
+DEFAULT_PAGE_SIZE = 100
+METRIC_WINDOW = 200   # jumlah waktu antre terakhir per lane untuk p95
+
+# method paginasi instagrapi -> (argumen ukuran halaman, argumen cursor)
+PAGINATED = {
+    "user_followers_v1_chunk": ("max_amount", "max_id"),
+    "user_following_v1_chunk": ("max_amount", "max_id"),
+    "user_medias_paginated_v1": ("amount", "end_cursor"),
+    "user_medias_paginated": ("amount", "end_cursor"),
+}
+
+class RequestBroker:
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, cooldown=DEFAULT_COOLDOWN):
+        self.rate = rate
+        self.burst = burst
+        self.cooldown = cooldown
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = []  # heap (prioritas, urutan)
+        self._seq = itertools.count()
+        self._active = dict.fromkeys(LANES, 0)
+        self._waits = {lane: deque(maxlen=METRIC_WINDOW) for lane in LANES}
+        self._counts = dict.fromkeys(LANES, 0)
+        self._max_wait = dict.fromkeys(LANES, 0.0)
+        self._cond = threading.Condition()
+
+    # =====================================================
+    # 🚦 ANTREAN
+    # =====================================================
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _blocked_for(self, ticket, lane, cost, now):
+        """0 kalau boleh jalan sekarang, detik tunggu kalau tahu kapan, None kalau tunggu notify"""
+        if self._waiting[0] != ticket:
+            return None  # masih ada yang lebih prioritas / lebih dulu antre
+        if self._paused_until > now:
+            return self._paused_until - now
+        if lane in YIELD_TO_PUBLISH and self._active["publish"]:
+            return None
+        self._refill(now)
+        if self._tokens < min(cost, self.burst):
+            return (min(cost, self.burst) - self._tokens) / self.rate
+        return 0
+
+    def acquire(self, lane, cost=1):
+        """Blok sampai lane ini giliran & budget cukup. Return detik yang dihabiskan di antrean."""
+        if lane not in LANES:
+            raise ValueError(f"Lane tidak dikenal: {lane}")
+        ticket = (LANES.index(lane), next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    wait = self._blocked_for(ticket, lane, cost, time.monotonic())
+                    if wait == 0:
+                        break
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            self._tokens -= cost
+            waited = time.monotonic() - start
+            self._waits[lane].append(waited)
+            self._counts[lane] += 1
+            self._max_wait[lane] = max(self._max_wait[lane], waited)
+        return waited
+
+    def pause(self, seconds=None):
+        """Hentikan semua lane (mis. setelah PleaseWaitFewMinutes)"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + (seconds or self.cooldown))
+            self._tokens = 0.0
+            self._refilled_at = self._paused_until  # budget baru terisi lagi setelah jeda selesai
+            self._cond.notify_all()
+
+    # =====================================================
+    # 📡 EKSEKUSI
+    # =====================================================
+    def call(self, lane, func, *args, cost=1, **kwargs):
+        """Jalankan satu request (atau satu unit seperti upload) lewat lane"""
+        self.acquire(lane, cost)
+        with self._cond:
+            self._active[lane] += 1
+        try:
+            return func(*args, **kwargs)
+        except (PleaseWaitFewMinutes, RateLimitError) as e:
+            logger.warning(f"⏳ {type(e).__name__} di lane {lane}, semua lane jeda {self.cooldown}s")
+            self.pause()
+            raise
+        finally:
+            with self._cond:
+                self._active[lane] -= 1
+                self._cond.notify_all()
+
+    def paginate(self, lane, method, *args, page_size=DEFAULT_PAGE_SIZE, limit=0, **kwargs):
+        """
+        Generator item dari method paginasi instagrapi (lihat PAGINATED).
+        Tiap halaman antre ulang, jadi lane lebih tinggi bisa menyela di antara halaman.
+        """
+        page_arg, cursor_arg = PAGINATED[method.__name__]
+        cursor, fetched = "", 0
+        while True:
+            kwargs.update({page_arg: page_size, cursor_arg: cursor})
+            items, cursor = self.call(lane, method, *args, **kwargs)
+            for item in items:
+                yield item
+                fetched += 1
+                if limit and fetched >= limit:
+                    return
+            if not items or not cursor:
+                return
+
+    def wrap(self, client, lane):
+        """Client yang semua method-nya lewat lane ini"""
+        if isinstance(client, LaneClient):
+            client = client.raw
+        return LaneClient(client, lane, self)
+
+    # =====================================================
+    # 📊 METRIK
+    # =====================================================
+    def metrics(self):
+        """{lane: requests, waiting, active, avg_wait, p95_wait, max_wait} (detik)"""
+        with self._cond:
+            waiting = [LANES[priority] for priority, _ in self._waiting]
+            result = {}
+            for lane in LANES:
+                waits = sorted(self._waits[lane])
+                result[lane] = {
+                    "requests": self._counts[lane],
+                    "waiting": waiting.count(lane),
+                    "active": self._active[lane],
+                    "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                    "p95_wait": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                    "max_wait": self._max_wait[lane],
+                }
+            return result
+
+class LaneClient:
+    """Proxy client: method dipanggil lewat broker di lane tertentu, atribut lain diteruskan apa adanya"""
+
+    def __init__(self, client, lane, broker):
+        self.raw = client
+        self.lane = lane
+        self.broker = broker
+
+    def __getattr__(self, name):
+        attr = getattr(self.raw, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def brokered(*args, **kwargs):
+            return self.broker.call(self.lane, attr, *args, **kwargs)
+        return brokered
+
+    def paginate(self, method_name, *args, **kwargs):
+        """Crawl per halaman di lane ini, mis. client.paginate("user_followers_v1_chunk", user_id)"""
+        return self.broker.paginate(self.lane, getattr(self.raw, method_name), *args, **kwargs)
+
+_shared_broker = None
+
+def get_broker():
+    global _shared_broker
+    if _shared_broker is None:
+        _shared_broker = RequestBroker()
+    return _shared_broker
+
+def lane_client(client, lane):
+    """Shortcut: client di lane tertentu lewat broker bersama"""
+    return get_broker().wrap(client, lane)
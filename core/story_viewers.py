@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Story Viewers - Snapshot viewer story sendiri sebelum expired (data viewer hilang setelah 24 jam)
+Fitur:
+- Story aktif ditemukan dari 1 request user_stories (paling sering tiap DISCOVER_INTERVAL)
+- Viewer di-snapshot di umur 12j dan 30 menit sebelum expired; telat (bot mati)? step terlewat dilewati
+- Viewer disimpan sebagai ID array terurut yang di-gap-encode (ID pertama + selisih berurutan,
+  tipe array terkecil yang muat), snapshot berikutnya hanya menyimpan delta (viewer baru / hilang)
+- Query agregat (viewer paling konsisten 90 hari, dsb) dari data lokal: decode array di C
+  (array + itertools.accumulate), tanpa request
+- Thread snapshotter untuk proses menu; publish daemon memanggil snapshot_due tiap tick
+"""
+
+import sys
+import time
+import struct
+import logging
+import threading
+from array import array
+from collections import Counter
+from itertools import accumulate
+
+from core.datastore import get_datastore
+from core.request_broker import LaneClient, get_broker
+
+logger = logging.getLogger(__name__)
+
+STORY_TTL = 86400
+SNAPSHOT_OFFSETS = (12 * 3600, STORY_TTL - 30 * 60)  # detik setelah story naik
+DISCOVER_INTERVAL = 30 * 60  # jeda minimal antar request user_stories
+SNAPSHOT_TICK = 60
+CONSISTENT_DAYS = 90
+GAP_TYPES = ("B", "H", "I", "Q")
+
+# =====================================================
+# 🗜️ ENCODING
+# =====================================================
+def encode_ids(ids):
+    """ID (int) -> bytes: typecode + ID terkecil (8 byte) + selisih berurutan sebagai array little-endian"""
+    ids = sorted(set(int(i) for i in ids))
+    if not ids:
+        return b""
+    gaps = [b - a for a, b in zip(ids, ids[1:])]
+    widest = max(gaps, default=0)
+    typecode = next(t for t in GAP_TYPES if widest < 1 << (8 * array(t).itemsize))
+    packed = array(typecode, gaps)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return typecode.encode() + struct.pack("<Q", ids[0]) + packed.tobytes()
+
+def decode_ids(blob):
+    if not blob:
+        return []
+    packed = array(chr(blob[0]))
+    packed.frombytes(blob[9:])
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return list(accumulate(packed, initial=struct.unpack_from("<Q", blob, 1)[0]))
+
+def _epoch(value):
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value.timestamp()
+
+class StorySnapshotter:
+    def __init__(self, datastore=None, offsets=SNAPSHOT_OFFSETS, lane="analytics"):
+        self.datastore = datastore or get_datastore()
+        self.repo = self.datastore.story_viewers
+        self.offsets = offsets
+        self.lane = lane
+        self.lock = threading.Lock()  # satu batch snapshot sekaligus per proses
+        self._listed = {}  # username -> waktu user_stories terakhir
+
+    # =====================================================
+    # 📌 TRACK
+    # =====================================================
+    def _next_due(self, taken_at, now):
+        """Jadwal snapshot berikutnya setelah `now` (step yang sudah lewat tidak dikejar), None = selesai"""
+        return next((taken_at + offset for offset in self.offsets if taken_at + offset > now), None)
+
+    def track(self, username, story_pk, taken_at, now=None):
+        taken_at = _epoch(taken_at)
+        first_due = self._next_due(taken_at, now or time.time())
+        if first_due is None:
+            return False  # sudah lewat snapshot terakhir
+        return self.repo.track(username, str(story_pk), taken_at, taken_at + STORY_TTL, first_due)
+
+    def discover(self, client, username, now=None):
+        """Story aktif sekarang (1 request) -> di-track. Return {story_pk: story}."""
+        now = now or time.time()
+        stories = get_broker().call(self.lane, client.user_stories, client.user_id)
+        self._listed[username] = now
+        live = {}
+        for story in stories or []:
+            story_pk = str(story.pk)
+            live[story_pk] = story
+            self.track(username, story_pk, getattr(story, "taken_at", None), now)
+        return live
+
+    # =====================================================
+    # 📸 SNAPSHOT
+    # =====================================================
+    def observe(self, username, story_pk, viewers, now=None):
+        """
+        Simpan satu snapshot viewer (list UserShort / ID): delta terhadap snapshot sebelumnya.
+        Return (jumlah viewer baru, jumlah viewer hilang).
+        """
+        now = now or time.time()
+        row = self.repo.get(username, str(story_pk))
+        if row is None:
+            raise ValueError(f"Story {story_pk} belum di-track")
+        names, ids = [], set()
+        for viewer in viewers:
+            user_id = int(getattr(viewer, "pk", viewer))
+            ids.add(user_id)
+            if getattr(viewer, "username", None):
+                names.append((user_id, viewer.username))
+        previous = set(decode_ids(row["viewers"]))
+        added, removed = ids - previous, previous - ids
+        self.repo.record(
+            username, row["story_pk"], row["snapshots"], now, len(ids), encode_ids(added), encode_ids(removed),
+            encode_ids(ids), self._next_due(row["taken_at"], now) if now < row["expires_at"] else None, names,
+        )
+        return len(added), len(removed)
+
+    def pending(self, username, now=None, since=0):
+        """Ada kerja tanpa request? (discover sudah waktunya sejak `since` / ada snapshot jatuh tempo)"""
+        now = now or time.time()
+        if now - self._listed.get(username, since) >= DISCOVER_INTERVAL:
+            return True
+        return bool(self.repo.due(username, now))
+
+    def snapshot_due(self, client, username, now=None):
+        """Temukan story baru (kalau sudah waktunya) lalu snapshot semua yang jatuh tempo. Return jumlah snapshot."""
+        if isinstance(client, LaneClient):
+            client = client.raw  # request di bawah sudah lewat broker sendiri
+        with self.lock:
+            now = now or time.time()
+            live = None
+            if now - self._listed.get(username, 0) >= DISCOVER_INTERVAL:
+                live = self.discover(client, username, now)
+            due = self.repo.due(username, now)
+            if not due:
+                return 0
+            if live is None:
+                live = self.discover(client, username, now)  # story yang dihapus tidak di-fetch viewernya
+
+            finished, taken = [], 0
+            for row in due:
+                if row["story_pk"] not in live or now >= row["expires_at"]:
+                    finished.append(row["story_pk"])
+                    continue
+                viewers = get_broker().call(self.lane, client.story_viewers, row["story_pk"], amount=0)
+                self.observe(username, row["story_pk"], viewers, now)
+                taken += 1
+            if finished:
+                self.repo.finish(username, finished)
+        logger.debug(f"📖 {taken} snapshot viewer story @{username}, {len(finished)} story selesai")
+        return taken
+
+    # =====================================================
+    # 📊 QUERIES
+    # =====================================================
+    def viewers(self, username, story_pk, seq=None):
+        """Set viewer story di snapshot ke-seq (default terakhir), direkonstruksi dari delta"""
+        current = set()
+        for snapshot in self.repo.snapshots(username, str(story_pk)):
+            if seq is not None and snapshot["seq"] > seq:
+                break
+            current.difference_update(decode_ids(snapshot["removed"]))
+            current.update(decode_ids(snapshot["added"]))
+        return sorted(current)
+
+    def consistent_viewers(self, username, days=CONSISTENT_DAYS, limit=20, now=None):
+        """
+        Viewer yang paling sering nonton story dalam `days` hari terakhir, dari data lokal.
+        Return {"stories": jumlah story, "viewers": [{"user_id", "username", "seen", "ratio"}]}.
+        """
+        now = now or time.time()
+        stories = self.repo.stories(username, now - days * 86400)
+        counts = Counter()
+        for story in stories:
+            counts.update(decode_ids(story["viewers"]))
+        top = counts.most_common(limit)
+        names = self.repo.names(user_id for user_id, _ in top)
+        return {
+            "stories": len(stories),
+            "viewers": [
+                {"user_id": user_id, "username": names.get(user_id), "seen": seen, "ratio": seen / len(stories)}
+                for user_id, seen in top
+            ],
+        }
+
+    def history(self, username, days=CONSISTENT_DAYS, now=None):
+        """Story yang tersimpan (terbaru dulu): story_pk, taken_at, viewer_count, snapshots"""
+        now = now or time.time()
+        rows = self.repo.stories(username, now - days * 86400)
+        return [{k: row[k] for k in ("story_pk", "taken_at", "viewer_count", "snapshots")} for row in reversed(rows)]
+
+    # =====================================================
+    # 🔁 BACKGROUND
+    # =====================================================
+    def start(self, client, username, tick=SNAPSHOT_TICK):
+        """Thread snapshotter (sekali per akun per proses) untuk proses menu; jalan sampai proses keluar"""
+        with _threads_lock:
+            thread = _threads.get(username)
+            if thread and thread.is_alive():
+                return thread
+            thread = threading.Thread(target=self._loop, args=(client, username, tick),
+                                      name=f"story-snapshotter-{username}", daemon=True)
+            _threads[username] = thread
+            thread.start()
+            return thread
+
+    def _loop(self, client, username, tick):
+        while True:
+            try:
+                self.snapshot_due(client, username)
+            except Exception as e:
+                logger.warning(f"⚠️ Snapshot viewer story @{username} gagal: {e}")
+            time.sleep(tick)
+
+_threads = {}
+_threads_lock = threading.Lock()
+_shared_snapshotter = None
+
+def get_snapshotter():
+    global _shared_snapshotter
+    if _shared_snapshotter is None:
+        _shared_snapshotter = StorySnapshotter()
+    return _shared_snapshotter
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Suggestion Engine - Caption & Hashtag
+Fitur:
+- Corpus template & hashtag di disk (JSONL, bisa diisi puluhan ribu entry)
+- Inverted index keyword -> template/tag, disimpan di disk & dipakai ulang
+- Lazy load (corpus baru dibaca saat suggestion pertama diminta)
+- Skor berdasarkan performa post sendiri: hashtag dari core.hashtag_index, template dari agregat
+  baris pertama caption di tabel post_latest (keduanya index di data/bot.db, tanpa baca post_history)
+"""
+
+import os
+import re
+import json
+import heapq
+import random
+import logging
+import bisect
+from collections import defaultdict
+
+from core.analytics import Analytics
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Seed corpus: dipakai untuk bikin file corpus pertama kali kalau belum ada
+DEFAULT_TEMPLATES = {
+    'inspirational': [
+        "Every moment is a fresh beginning. Take it! ✨",
+        "The only way to do great work is to love what you do. 💪",
+        "Be yourself; everyone else is already taken. 🌟",
+        "Success is not final, failure is not fatal. Keep going! 🚀",
+        "Your limitation—it's only your imagination. 🎯",
+        "Dream big and dare to fail. 💫",
+        "The future is bright, and it starts today. ☀️",
+        "Believe in yourself and you're halfway there. 🔥"
+    ],
+    'funny': [
+        "Me: *tries to act cool* Also me: *trips over air* 😂",
+        "POV: You're about to see a really bad decision 🎬",
+        "Mood: Chaotic energy ✨ (jk I'm fine) 🤡",
+        "The audacity of me posting this 💀",
+        "This is what it means to be alive in 2025 😵",
+        "Plot twist: I actually know what I'm doing 🤪",
+        "Living my best unplanned life rn 🌪️",
+        "Confidence level: posting this without overthinking 🙃"
+    ],
+    'promotional': [
+        "Check out what's new! 🎉 Link in bio 👆",
+        "Available now! Don't miss out 🔥 #limited",
+        "Something special is coming your way ✨",
+        "Tag someone who needs this 👇",
+        "This is too good to miss! 📸",
+        "Swipe to see more ➡️ #exclusive",
+        "Your next favorite thing 💕 #newdrop",
+        "DM for details! 📩"
+    ],
+    'casual': [
+        "Just vibing 🌊",
+        "Living that life 📸",
+        "Feeling myself today 😎",
+        "Proof I actually went outside 🌞",
+        "Caught in the moment ✨",
+        "That's how we do it 💁‍♀️",
+        "Simple things = best things 💫",
+        "Current mood: grateful 🙏"
+    ],
+    'professional': [
+        "Excited to announce... 📢",
+        "Focused on what matters. 🎯",
+        "Collaboration makes it better. 🤝",
+        "Building something amazing. 🚀",
+        "Grateful for this journey. 📈",
+        "Passion meets purpose. ⚡",
+        "Every day is an opportunity. 💼",
+        "Excellence is the standard. ✅"
+    ]
+}
+
+DEFAULT_HASHTAGS = {
+    'general': ['instagood', 'insta', 'instagram', 'photooftheday', 'picoftheday', 'like', 'follow', 'comment', 'share', 'love', 'beautiful'],
+    'fashion': ['fashion', 'ootd', 'style', 'fashionista', 'streetstyle', 'lookbook', 'fashionblogger', 'outfitoftheday', 'fashiongram', 'styleblogger'],
+    'photography': ['photography', 'photographer', 'photooftheday', 'picoftheday', 'instapic', 'photoart', 'instaphoto', 'camerart', 'photolife', 'shutterstock'],
+    'lifestyle': ['lifestyle', 'lifestyleblogger', 'dailylife', 'lifestylegoals', 'instalife', 'lifeinspo', 'motivation', 'goals', 'inspo', 'vibes'],
+    'food': ['foodie', 'foodporn', 'instafood', 'foodphotography', 'foodblogger', 'delicious', 'foodgasm', 'eeeeeats', 'foodstagram', 'yummy', 'food', 'yum', 'eat'],
+    'travel': ['travel', 'travelgram', 'wanderlust', 'travelphotography', 'instatravel', 'traveling', 'traveladdict', 'adventuretime', 'explorepage', 'vacation', 'adventure', 'explore'],
+    'fitness': ['fitness', 'gym', 'workout', 'fitnessmotivation', 'bodybuilding', 'fitnessmodel', 'healthylifestyle', 'fitfam', 'gains', 'fitnessgirl']
+}
+
+FALLBACK_CATEGORY = 'general'
+
+def tokenize(text):
+    """Pecah teks jadi token lowercase (min 3 huruf)"""
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) >= 3]
+
+class SuggestionEngine:
+    def __init__(self, corpus_dir="data/caption_corpus", analytics=None):
+        self.corpus_dir = corpus_dir
+        self.templates_file = os.path.join(corpus_dir, "templates.jsonl")
+        self.hashtags_file = os.path.join(corpus_dir, "hashtags.jsonl")
+        self.index_file = os.path.join(corpus_dir, "index.json")
+        self.analytics = analytics or Analytics()
+
+        # Diisi lazy oleh _ensure_loaded()
+        self._loaded = False
+        self.templates = []
+        self.hashtags = []
+        self.template_index = {}
+        self.tag_index = {}
+        self.mood_index = {}
+        self._tag_keys = []
+        self._template_by_text = {}
+
+        self._perf_signature = None
+        self._tag_boost = {}
+        self._caption_boost = {}
+
+    # =====================================================
+    # 📂 CORPUS & INDEX
+    # =====================================================
+    def _seed_corpus(self):
+        """Tulis corpus default kalau file belum ada"""
+        os.makedirs(self.corpus_dir, exist_ok=True)
+        if not os.path.exists(self.templates_file):
+            with open(self.templates_file, "w", encoding="utf-8") as f:
+                for mood, texts in DEFAULT_TEMPLATES.items():
+                    for text in texts:
+                        f.write(json.dumps({"text": text, "mood": mood}, ensure_ascii=False) + "\n")
+        if not os.path.exists(self.hashtags_file):
+            with open(self.hashtags_file, "w", encoding="utf-8") as f:
+                for category, tags in DEFAULT_HASHTAGS.items():
+                    for tag in tags:
+                        f.write(json.dumps({"tag": tag, "category": category}, ensure_ascii=False) + "\n")
+
+    def _source_signature(self):
+        sig = {}
+        for path in (self.templates_file, self.hashtags_file):
+            st = os.stat(path)
+            sig[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+        return sig
+
+    def _read_jsonl(self, path):
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"⚠️ Baris corpus rusak di {path}, dilewati")
+        return entries
+
+    def build_index(self):
+        """Baca corpus JSONL, bangun inverted index, simpan ke index.json"""
+        self._seed_corpus()
+        signature = self._source_signature()
+
+        templates = []
+        for entry in self._read_jsonl(self.templates_file):
+            if entry.get("text"):
+                templates.append({
+                    "text": entry["text"],
+                    "mood": (entry.get("mood") or "casual").lower(),
+                    "keywords": [k.lower() for k in entry.get("keywords", [])],
+                })
+
+        hashtags = []
+        seen_tags = set()
+        for entry in self._read_jsonl(self.hashtags_file):
+            tag = (entry.get("tag") or "").lstrip("#").lower()
+            if not tag or tag in seen_tags:
+                continue
+            seen_tags.add(tag)
+            hashtags.append({
+                "tag": tag,
+                "category": (entry.get("category") or FALLBACK_CATEGORY).lower(),
+                "keywords": [k.lower() for k in entry.get("keywords", [])],
+                "posts": entry.get("posts", 0),
+            })
+
+        template_index = defaultdict(set)
+        mood_index = defaultdict(list)
+        for i, entry in enumerate(templates):
+            mood_index[entry["mood"]].append(i)
+            for token in tokenize(entry["text"]) + entry["keywords"] + [entry["mood"]]:
+                template_index[token].add(i)
+
+        tag_index = defaultdict(set)
+        for i, entry in enumerate(hashtags):
+            for token in [entry["tag"], entry["category"]] + entry["keywords"]:
+                tag_index[token].add(i)
+
+        index = {
+            "version": INDEX_VERSION,
+            "source": signature,
+            "templates": templates,
+            "hashtags": hashtags,
+            "template_index": {k: sorted(v) for k, v in template_index.items()},
+            "mood_index": dict(mood_index),
+            "tag_index": {k: sorted(v) for k, v in tag_index.items()},
+        }
+
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_file)
+        logger.info(f"🗂️ Index dibangun: {len(templates)} template, {len(hashtags)} hashtag")
+        return index
+
+    def _load_index(self):
+        """Pakai index.json kalau masih cocok dengan corpus, kalau tidak rebuild"""
+        self._seed_corpus()
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION and index.get("source") == self._source_signature():
+                    return index
+            except (ValueError, OSError):
+                pass
+        return self.build_index()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        index = self._load_index()
+        self.templates = index["templates"]
+        self.hashtags = index["hashtags"]
+        self.template_index = index["template_index"]
+        self.mood_index = index["mood_index"]
+        self.tag_index = index["tag_index"]
+        self._tag_keys = sorted(self.tag_index.keys())
+        self._template_by_text = {entry["text"]: i for i, entry in enumerate(self.templates)}
+        self._perf_signature = None
+        self._loaded = True
+
+    def reload(self):
+        """Paksa baca ulang corpus (misal setelah file corpus diedit)"""
+        self._loaded = False
+        self._ensure_loaded()
+
+    def moods(self):
+        self._ensure_loaded()
+        return list(self.mood_index.keys())
+
+    # =====================================================
+    # 📊 PERFORMANCE SCORING
+    # =====================================================
+    @staticmethod
+    def _shrunk_ratio(total, count, overall_mean, prior=3):
+        """Rasio engagement vs rata-rata, ditarik ke 1.0 kalau sampel sedikit"""
+        if count == 0 or overall_mean <= 0:
+            return 1.0
+        ratio = (total / count) / overall_mean
+        ratio = (count * ratio + prior) / (count + prior)
+        return min(2.0, max(0.5, ratio))
+
+    def _ensure_performance(self, username=None):
+        """Hitung boost per hashtag & template dari index di bot.db; dihitung ulang hanya kalau datanya berubah"""
+        datastore = self.analytics.datastore
+        signature = (username, datastore.changes())
+        if signature == self._perf_signature:
+            return
+        self._perf_signature = signature
+        self._tag_boost = {}
+        self._caption_boost = {}
+
+        # Hashtag: agregat per tag langsung dari index, caption tidak di-parse ulang
+        index = self.analytics.hashtag_index
+        post_count, overall = index.account(username)
+        if not post_count:
+            return
+        overall_mean = overall / post_count
+        self._tag_boost = {
+            tag: self._shrunk_ratio(total, count, overall_mean)
+            for tag, (count, total) in index.tag_totals(username).items()
+        }
+
+        # Template: agregat per baris pertama caption (tabel post_latest), hanya yang ada di corpus
+        self._caption_boost = {
+            self._template_by_text[line]: self._shrunk_ratio(total, count, overall_mean)
+            for line, (count, total) in self.analytics.caption_totals(username).items()
+            if line in self._template_by_text
+        }
+
+    # =====================================================
+    # 🔍 LOOKUP & SUGGESTION
+    # =====================================================
+    def _prefix_postings(self, token):
+        """Gabungan posting list semua key yang diawali token (pakai bisect, tanpa scan)"""
+        keys = self._tag_keys
+        start = bisect.bisect_left(keys, token)
+        for key in keys[start:]:
+            if not key.startswith(token):
+                break
+            yield key, self.tag_index[key]
+
+    def suggest_captions(self, mood, theme="", count=5, username=None):
+        """Pilih template terbaik untuk mood + theme"""
+        self._ensure_loaded()
+        candidates = self.mood_index.get(mood.lower(), [])
+        if not candidates:
+            return []
+        self._ensure_performance(username)
+
+        matches = defaultdict(int)
+        for token in tokenize(theme):
+            for idx in self.template_index.get(token, []):
+                matches[idx] += 1
+
+        def score(idx):
+            jitter = random.uniform(0.85, 1.15)  # biar variasi tetap ada tiap generate
+            return (1 + matches.get(idx, 0)) * self._caption_boost.get(idx, 1.0) * jitter
+
+        best = heapq.nlargest(count, candidates, key=score)
+        return [self.templates[idx]["text"] for idx in best]
+
+    def suggest_hashtags(self, keyword, count=10, username=None):
+        """Hashtag paling relevan untuk keyword (tanpa '#')"""
+        self._ensure_loaded()
+        self._ensure_performance(username)
+
+        matches = defaultdict(float)
+        for token in tokenize(keyword):
+            for key, postings in self._prefix_postings(token):
+                weight = 1.0 if key == token else 0.5  # exact match lebih kuat dari prefix
+                for idx in postings:
+                    matches[idx] += weight
+
+        if not matches:
+            for idx in self.tag_index.get(FALLBACK_CATEGORY, []):
+                matches[idx] = 1.0
+
+        def score(idx):
+            tag = self.hashtags[idx]["tag"]
+            jitter = random.uniform(0.9, 1.1)
+            return matches[idx] * self._tag_boost.get(tag, 1.0) * jitter
+
+        best = heapq.nlargest(count, matches.keys(), key=score)
+        return [self.hashtags[idx]["tag"] for idx in best]
+
+# Instance bersama supaya corpus cukup di-load sekali per proses
+_shared_engine = None
+
+def get_engine():
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = SuggestionEngine()
+    return _shared_engine
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    engine = SuggestionEngine()
+    print(engine.suggest_captions("casual", "travel beach", 3))
+    print(engine.suggest_hashtags("travel food", 10))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Cache - Preview kecil untuk menu pilih media
+Fitur:
+- Thumbnail JPEG kecil per hash konten (file sama = satu thumbnail)
+- Foto: decode langsung di resolusi kecil (PIL draft), video: ambil 1 frame via ffmpeg
+- Dibuat di background worker pool, menu tidak perlu menunggu
+- Contact sheet (grid thumbnail) dibuat dari cache, file asli tidak dibuka lagi
+"""
+
+import os
+import shutil
+import logging
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PIL import Image, ImageDraw
+
+logger = logging.getLogger(__name__)
+
+THUMB_SIZE = (160, 160)
+VIDEO_FRAME_AT = 1.0  # detik; klip lebih pendek pakai frame pertama
+
+# =====================================================
+# 🖼️ RENDER (dipanggil di worker)
+# =====================================================
+def _render_image(src, dst, size):
+    with Image.open(src) as img:
+        img.draft("RGB", size)  # JPEG: decode langsung di resolusi kecil
+        img = img.convert("RGB")
+        img.thumbnail(size)
+        img.save(dst, "JPEG", quality=80)
+
+def _render_video(src, dst, size):
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg tidak ditemukan, thumbnail video dilewati")
+    scale = f"scale={size[0]}:{size[1]}:force_original_aspect_ratio=decrease"
+    for seek in (VIDEO_FRAME_AT, 0):
+        subprocess.run(
+            [ffmpeg, "-y", "-v", "error", "-ss", str(seek), "-i", src,
+             "-frames:v", "1", "-vf", scale, "-f", "image2", "-c:v", "mjpeg", dst],
+            capture_output=True, timeout=60,
+        )
+        if os.path.exists(dst) and os.path.getsize(dst) > 0:
+            return
+    raise RuntimeError(f"Gagal ambil frame dari {src}")
+
+def render_thumbnail(src, dst, kind, size=THUMB_SIZE):
+    """Tulis thumbnail src -> dst (atomic). Return dst."""
+    tmp_dst = dst + ".part"
+    if kind == "video":
+        _render_video(src, tmp_dst, size)
+    else:
+        _render_image(src, tmp_dst, size)
+    os.replace(tmp_dst, dst)
+    return dst
+
+# =====================================================
+# 🗂️ CACHE
+# =====================================================
+class ThumbnailCache:
+    def __init__(self, thumbs_dir="data/media_cache/thumbs", size=THUMB_SIZE, max_workers=4):
+        self.thumbs_dir = thumbs_dir
+        self.size = size
+        self.max_workers = max_workers
+        self._executor = None
+        self._inflight = {}
+        self.lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="thumbs")
+        return self._executor
+
+    def path_for(self, content_hash):
+        return os.path.join(self.thumbs_dir, f"{content_hash}.jpg")
+
+    def cached(self, entry):
+        """Path thumbnail kalau sudah ada di cache, selain itu None"""
+        path = self.path_for(entry["hash"])
+        return path if os.path.exists(path) else None
+
+    def _job(self, entry, dst):
+        try:
+            return render_thumbnail(entry["path"], dst, entry["kind"], self.size)
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal bikin thumbnail {entry['path']}: {e}")
+            return None
+
+    def submit(self, entry):
+        """Bikin thumbnail di background. Return Future berisi path (atau None kalau gagal)."""
+        dst = self.path_for(entry["hash"])
+        with self.lock:
+            if os.path.exists(dst):
+                future = Future()
+                future.set_result(dst)
+                return future
+            if entry["hash"] in self._inflight:
+                return self._inflight[entry["hash"]]
+            os.makedirs(self.thumbs_dir, exist_ok=True)
+            future = self.executor.submit(self._job, entry, dst)
+            self._inflight[entry["hash"]] = future
+
+        def _done(_):
+            with self.lock:
+                self._inflight.pop(entry["hash"], None)
+
+        future.add_done_callback(_done)
+        return future
+
+    def warm(self, entries):
+        """Antrikan thumbnail yang belum ada. Return jumlah job baru."""
+        queued = 0
+        for entry in entries:
+            if not self.cached(entry) and entry["hash"] not in self._inflight:
+                self.submit(entry)
+                queued += 1
+        return queued
+
+    def get(self, entry, timeout=None):
+        """Versi blocking: tunggu sampai thumbnail siap"""
+        return self.submit(entry).result(timeout=timeout)
+
+    def get_many(self, entries, timeout=None):
+        """{path media: path thumbnail} untuk banyak entry sekaligus (paralel)"""
+        futures = [(entry["path"], self.submit(entry)) for entry in entries]
+        return {path: future.result(timeout=timeout) for path, future in futures}
+
+    # =====================================================
+    # 🧾 CONTACT SHEET
+    # =====================================================
+    def contact_sheet(self, entries, out_path, columns=6, padding=8, label_height=14):
+        """Gabungkan thumbnail jadi satu gambar grid. Return out_path atau None kalau kosong."""
+        if not entries:
+            return None
+        thumbs = self.get_many(entries)
+        cell_w, cell_h = self.size
+        rows = (len(entries) + columns - 1) // columns
+        sheet = Image.new(
+            "RGB",
+            (columns * (cell_w + padding) + padding, rows * (cell_h + label_height + padding) + padding),
+            (24, 24, 24),
+        )
+        draw = ImageDraw.Draw(sheet)
+        for i, entry in enumerate(entries):
+            x = padding + (i % columns) * (cell_w + padding)
+            y = padding + (i // columns) * (cell_h + label_height + padding)
+            thumb_path = thumbs.get(entry["path"])
+            if thumb_path:
+                with Image.open(thumb_path) as thumb:
+                    # Tengahkan thumbnail di dalam sel
+                    sheet.paste(thumb, (x + (cell_w - thumb.width) // 2, y + (cell_h - thumb.height) // 2))
+            else:
+                draw.rectangle([x, y, x + cell_w - 1, y + cell_h - 1], outline=(90, 90, 90))
+            draw.text((x, y + cell_h + 2), entry["name"][:24], fill=(220, 220, 220))
+
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        sheet.save(out_path, "JPEG", quality=85)
+        return out_path
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
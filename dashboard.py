@@ -7,6 +7,7 @@ Fitur:
 - Daily Usage Tracker
 - Activity Logging & Analytics
 - Whitelist Manager
+- Media Library (preview thumbnail & contact sheet)
 """
 
 import os
@@ -14,6 +15,7 @@ import sys
 import time
 import random
 import json
+import logging
 from datetime import datetime
 
 # Library UI Modern
@@ -22,6 +24,7 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
 from rich.align import Align
+from rich.text import Text
 from rich import print as rprint
 import questionary
 
@@ -31,6 +34,11 @@ try:
     from core.account_manager import AccountManager
     from core.scheduler import MultiAccountScheduler
     from core.analytics import Analytics
+    from core.media_library import get_library, MEDIA_FOLDERS
+    from core.log_pipeline import setup_logging, tail_jsonl, ACTIVITY_LOGGER
+    from core.housekeeping import get_housekeeper
+    from core.datastore import get_datastore
+    from PIL import Image
     from instagrapi.exceptions import UserNotFound, PrivateAccount, FeedbackRequired
 except ImportError as e:
     print(f"❌ Error Import: {e}")
@@ -50,14 +58,12 @@ class DashboardController:
         
         if not os.path.exists("data"): os.makedirs("data")
         
-        # Init Files
-        self.whitelist_path = os.path.join("data", "whitelist.json")
-        if not os.path.exists(self.whitelist_path):
-            with open(self.whitelist_path, 'w') as f: json.dump([], f)
+        # Whitelist di data/bot.db (whitelist.json lama di-import sekali)
+        self.whitelist = get_datastore().whitelist
             
-        self.log_path = os.path.join("data", "activity_log.txt")
-        if not os.path.exists(self.log_path):
-            with open(self.log_path, 'w') as f: f.write("=== BOT ACTIVITY LOG ===\n")
+        # Activity log lewat pipeline logging (logs/activity.jsonl, dirotasi & di-gzip)
+        self.log_path = os.path.join("logs", "activity.jsonl")
+        self.activity_logger = logging.getLogger(ACTIVITY_LOGGER)
 
         # Config Init
         self.config_path = os.path.join("data", "config.json")
@@ -154,11 +160,7 @@ class DashboardController:
         except: return str(value)
 
     def _log_activity(self, action, details):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        try:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {action}: {details}\n")
-        except: pass
+        self.activity_logger.info(f"{action}: {details}", extra={"action": action, "account": self.username})
 
     def _banner(self):
         self._clear_screen()
@@ -173,6 +175,56 @@ class DashboardController:
     def _loading(self, text="Memproses"):
         with self.console.status(f"[bold green]{text}...[/bold green]", spinner="dots"): time.sleep(1.0)
 
+    def _thumbnail_preview(self, thumb_path, width=40):
+        """Render thumbnail ke terminal pakai half-block (1 karakter = 2 piksel vertikal)"""
+        with Image.open(thumb_path) as img:
+            img = img.convert("RGB")
+            height = max(2, int(img.height * width / img.width) // 2 * 2)
+            img = img.resize((width, height))
+            px = img.load()
+        text = Text()
+        for y in range(0, height, 2):
+            for x in range(width):
+                top, bottom = px[x, y], px[x, y + 1]
+                text.append("▀", style=f"rgb({top[0]},{top[1]},{top[2]}) on rgb({bottom[0]},{bottom[1]},{bottom[2]})")
+            text.append("\n")
+        return text
+
+    # =====================================================
+    # 🖼️ MEDIA LIBRARY
+    # =====================================================
+    def media_menu(self):
+        library = get_library()
+        while True:
+            self._banner()
+            choice = questionary.select("🖼️ MEDIA LIBRARY", choices=[f"📁 {folder}" for folder in MEDIA_FOLDERS.values()] + ["❌ Kembali"]).ask()
+            if not choice or choice == "❌ Kembali": break
+            folder = choice.split(" ", 1)[1]
+            entries = library.list_media(folder)
+            if not entries: self.console.print(f"[yellow]Folder {folder} kosong.[/yellow]"); self._pause(); continue
+
+            while True:
+                self._banner()
+                t = Table(title=f"📁 {folder} ({len(entries)} file)")
+                t.add_column("No", style="dim"); t.add_column("File", style="cyan"); t.add_column("Ukuran", justify="right"); t.add_column("Dimensi", justify="right")
+                for idx, e in enumerate(entries, 1):
+                    dims = f"{e['width']}x{e['height']}" if e['width'] else "-"
+                    t.add_row(str(idx), e['name'], f"{e['size'] / 1024:.0f} KB", dims)
+                self.console.print(t)
+                pick = questionary.text("Nomor untuk preview, 'c' untuk contact sheet, kosong untuk kembali:").ask()
+                if not pick: break
+                if pick.lower() == "c":
+                    sheet_path = os.path.join("data", "media_cache", "sheets", f"{folder}.jpg")
+                    with self.console.status("[bold green]Menyusun contact sheet...[/bold green]", spinner="dots"):
+                        library.contact_sheet(folder, sheet_path)
+                    self.console.print(f"[green]✅ Contact sheet disimpan: {sheet_path}[/green]"); self._pause(); continue
+                try: entry = entries[int(pick) - 1]
+                except (ValueError, IndexError): continue
+                thumb_path = library.thumbnail(entry)
+                if thumb_path: self.console.print(Panel(self._thumbnail_preview(thumb_path), title=entry['name'], expand=False))
+                else: self.console.print("[red]❌ Preview tidak tersedia.[/red]")
+                self._pause()
+
     # =====================================================
     # ⚙️ MENU PENGATURAN
     # =====================================================
@@ -186,7 +238,7 @@ class DashboardController:
             grid.add_row(f"[red]Unfollow:[/red] {usage['unfollow']}/{cfg['max_unfollow']}", f"[yellow]Cooldown:[/yellow] Tiap {cfg['cooldown_threshold']} aksi")
             
             self.console.print(Panel(grid, title="📊 Statistik & Config", style="cyan"))
-            choice = questionary.select("PENGATURAN & SAFETY", choices=["✏️ Ubah Limit Harian", "💤 Ubah Setting Cooldown", "📜 Lihat Activity Log", "❌ Kembali"]).ask()
+            choice = questionary.select("PENGATURAN & SAFETY", choices=["✏️ Ubah Limit Harian", "💤 Ubah Setting Cooldown", "📜 Lihat Activity Log", "🧹 Housekeeping & Disk Usage", "❌ Kembali"]).ask()
             if choice == "❌ Kembali": break
             
             if choice == "✏️ Ubah Limit Harian":
@@ -206,21 +258,38 @@ class DashboardController:
                 except: pass
 
             elif choice == "📜 Lihat Activity Log": self.view_activity_log()
+            elif choice == "🧹 Housekeeping & Disk Usage": self.housekeeping_menu()
 
     def view_activity_log(self):
         self._banner()
         if not os.path.exists(self.log_path): self.console.print("[yellow]Kosong.[/yellow]")
         else:
             self.console.print(Panel("[bold cyan]📜 ACTIVITY LOG (20 Terakhir)[/bold cyan]", expand=False))
-            try:
-                with open(self.log_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                    for line in lines[-20:]:
-                        line = line.strip()
-                        if not line: continue
-                        style = "green" if "LIKED" in line else "blue" if "FOLLOWED" in line else "red" if "UNFOLLOWED" in line else "white"
-                        self.console.print(f"[{style}]{line}[/{style}]")
-            except: pass
+            for entry in tail_jsonl(self.log_path, 20):
+                line = f"[{entry.get('ts', '')[:19].replace('T', ' ')}] {entry.get('msg', '')}"
+                action = entry.get("action", "")
+                style = "green" if "LIKED" in action else "red" if "UNFOLLOWED" in action else "blue" if "FOLLOWED" in action else "white"
+                self.console.print(f"[{style}]{line}[/{style}]")
+        self._pause()
+
+    def housekeeping_menu(self):
+        self._banner()
+        keeper = get_housekeeper()
+        if questionary.confirm("Jalankan kompaksi sekarang?", default=False).ask():
+            with self.console.status("[cyan]Kompaksi data lama...[/cyan]"):
+                results = keeper.run_once()
+            removed = sum(r.get("removed", 0) for r in results.values())
+            self.console.print(f"[green]✅ {len(results)} dataset diproses, {removed} item dikompaksi.[/green]")
+
+        table = Table(title="🧹 Disk Usage per Dataset")
+        table.add_column("Dataset"); table.add_column("Path", style="dim")
+        table.add_column("Ukuran", justify="right"); table.add_column("File/Baris", justify="right")
+        table.add_column("Ringkasan", justify="right"); table.add_column("Terakhir", justify="right")
+        for row in keeper.disk_usage():
+            last_run = datetime.fromtimestamp(row["last_run"]).strftime("%d/%m %H:%M") if row["last_run"] else "-"
+            table.add_row(row["name"], row["path"], f"{row['bytes'] / 1024:.1f} KB", str(row["files"]),
+                          f"{row['summary_bytes'] / 1024:.1f} KB", last_run)
+        self.console.print(table)
         self._pause()
 
     # =====================================================
@@ -388,14 +457,13 @@ class DashboardController:
             if choice == "➕ Tambah Username ke Whitelist":
                 u = questionary.text("Username (tanpa @):").ask()
                 if u:
-                    current_list = self.load_whitelist()
-                    if u not in current_list: current_list.append(u); self.save_whitelist(current_list); self.console.print(f"[green]✅ @{u} sekarang AMAN![/green]")
+                    if self.whitelist.add(u): self.console.print(f"[green]✅ @{u} sekarang AMAN![/green]")
                     else: self.console.print(f"[yellow]⚠️ @{u} sudah ada.[/yellow]")
                     time.sleep(1.5)
             elif choice == "🗑️  Hapus Username dari Whitelist":
                 if not current_list: self.console.print("[red]Whitelist kosong.[/red]"); time.sleep(1); continue
                 u = questionary.select("Pilih akun untuk dihapus:", choices=current_list + ["❌ Batal"]).ask()
-                if u != "❌ Batal": current_list.remove(u); self.save_whitelist(current_list); self.console.print(f"[yellow]🗑️ @{u} dihapus.[/yellow]"); time.sleep(1.5)
+                if u != "❌ Batal": self.whitelist.remove(u); self.console.print(f"[yellow]🗑️ @{u} dihapus.[/yellow]"); time.sleep(1.5)
             elif choice == "📋 Lihat Daftar Whitelist":
                 if not current_list: self.console.print("[dim]Kosong.[/dim]")
                 else:
@@ -482,22 +550,21 @@ class DashboardController:
             status_color = "green" if self.username else "red"
             self.console.print(Align.center(f"[{status_color}]{status_text}[/{status_color}]"))
             self.console.print("")
-            choice = questionary.select("MENU UTAMA", choices=["🔐 Login Akun", "🤖 Fitur Bot (Like/Follow/Unfollow)", "⚙️ Pengaturan & Safety", "👤 Kelola Database Akun", "📊 Menu Analytics", "❌ Keluar"]).ask()
+            choice = questionary.select("MENU UTAMA", choices=["🔐 Login Akun", "🤖 Fitur Bot (Like/Follow/Unfollow)", "⚙️ Pengaturan & Safety", "👤 Kelola Database Akun", "📊 Menu Analytics", "🖼️ Media Library", "❌ Keluar"]).ask()
             if choice == "🔐 Login Akun": self.login_menu()
             elif choice == "🤖 Fitur Bot (Like/Follow/Unfollow)": self.automation_menu()
             elif choice == "⚙️ Pengaturan & Safety": self.settings_menu()
             elif choice == "👤 Kelola Database Akun": self.account_menu()
             elif choice == "📊 Menu Analytics": self.analytics_menu()
+            elif choice == "🖼️ Media Library": self.media_menu()
             elif choice == "❌ Keluar": self.console.print("[bold]Bye bye! 👋[/bold]"); break
 
     def load_whitelist(self):
-        try:
-            with open(self.whitelist_path, 'r') as f: return json.load(f)
-        except: return []
-
-    def save_whitelist(self, data):
-        with open(self.whitelist_path, 'w') as f: json.dump(data, f, indent=4)
+        try: return self.whitelist.all()
+        except Exception: return []
 
 if __name__ == "__main__":
+    setup_logging(log_dir="logs", console=False)
+    get_housekeeper().run_once(budget_seconds=5); get_housekeeper().start()
     try: app = DashboardController(); app.main_menu()
     except KeyboardInterrupt: print("\nForce Close.")
\ No newline at end of file
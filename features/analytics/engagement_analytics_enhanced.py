@@ -6,9 +6,12 @@ Analisis lengkap performa engagement dengan trend & insights
 
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
+import csv
 import json
 import os
 from datetime import datetime, timedelta
+from core.analytics import Analytics
+from core.analytics_export import AnalyticsExporter, FORMATS
 
 class EngagementAnalyticsEnhanced:
     def __init__(self, client):
@@ -30,6 +33,10 @@ class EngagementAnalyticsEnhanced:
             if not medias:
                 error_msg("Tidak ada posts")
                 return None
+
+            # Simpan data per-post akun sendiri supaya bisa diexport sebagai histori
+            if username == getattr(self.client, "username", None):
+                Analytics().track_medias(username, medias)
             
             # Calculate metrics
             total_likes = sum(m.like_count for m in medias)
@@ -123,14 +130,19 @@ class EngagementAnalyticsEnhanced:
             
             elif format_type == "csv":
                 filename = f"analytics/engagement_{analytics['username']}_{int(datetime.now().timestamp())}.csv"
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("Metric,Value\n")
-                    f.write(f"Username,{analytics['username']}\n")
-                    f.write(f"Followers,{analytics['followers']}\n")
-                    f.write(f"Avg Likes,{analytics['avg_likes']:.1f}\n")
-                    f.write(f"Avg Comments,{analytics['avg_comments']:.1f}\n")
-                    f.write(f"Engagement Rate,{analytics['engagement_rate']:.2f}%\n")
-                    f.write(f"Trend,{analytics['trend']} {analytics['trend_pct']:+.1f}%\n")
+                with open(filename, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["Metric", "Value"])
+                    writer.writerow(["Username", analytics['username']])
+                    writer.writerow(["Followers", analytics['followers']])
+                    writer.writerow(["Avg Likes", f"{analytics['avg_likes']:.1f}"])
+                    writer.writerow(["Avg Comments", f"{analytics['avg_comments']:.1f}"])
+                    writer.writerow(["Engagement Rate", f"{analytics['engagement_rate']:.2f}%"])
+                    writer.writerow(["Trend", f"{analytics['trend']} {analytics['trend_pct']:+.1f}%"])
+                    writer.writerow([])
+                    writer.writerow(["Top Post Likes", "Comments", "Caption", "Date"])
+                    for post in analytics['top_posts']:
+                        writer.writerow([post['likes'], post['comments'], post['caption'], post['date']])
             
             success_msg(f"✅ Exported to {filename}")
             return filename
@@ -139,6 +151,31 @@ class EngagementAnalyticsEnhanced:
             error_msg(f"Error export: {str(e)}")
             return None
 
+    def export_history(self, username):
+        """Export histori per-post & per-hari (streaming) ke CSV/JSONL/Parquet"""
+        try:
+            print(Fore.YELLOW + "\nDataset: 1. Per-post  2. Per-hari" + Style.RESET_ALL)
+            dataset = "daily" if input(Fore.MAGENTA + "Pilih (1-2): " + Style.RESET_ALL).strip() == "2" else "posts"
+
+            fmt = input(Fore.MAGENTA + f"Format ({'/'.join(FORMATS)}, default: csv): " + Style.RESET_ALL).strip().lower() or "csv"
+            if fmt not in FORMATS:
+                error_msg("Format tidak valid!")
+                return None
+
+            incremental = input(Fore.MAGENTA + "Incremental (hanya baris baru)? (yes/no): " + Style.RESET_ALL).strip().lower() == "yes"
+
+            result = AnalyticsExporter().export(dataset, fmt, username, incremental=incremental)
+            if not result:
+                warning_msg("Tidak ada baris baru untuk diexport")
+                return None
+
+            success_msg(f"✅ {result['rows']} baris diexport ke {result['path']}")
+            return result['path']
+
+        except Exception as e:
+            error_msg(f"Error export history: {str(e)}")
+            return None
+
     def run_analytics_menu(self, username):
         """Menu engagement analytics"""
         show_separator()
@@ -150,9 +187,10 @@ class EngagementAnalyticsEnhanced:
             print("1. 📊 Analyze current account")
             print("2. 📋 Analyze multiple accounts")
             print("3. 📈 Compare trend over time")
+            print("4. 📤 Export histori (CSV/JSONL/Parquet)")
             print("0. ❌ Batal")
             
-            choice = input(Fore.MAGENTA + "\nPilih (0-3): " + Style.RESET_ALL).strip()
+            choice = input(Fore.MAGENTA + "\nPilih (0-4): " + Style.RESET_ALL).strip()
             
             if choice == '0':
                 info_msg("Dibatalkan")
@@ -187,6 +225,9 @@ class EngagementAnalyticsEnhanced:
             elif choice == '3':
                 warning_msg("Feature trend comparison coming soon!")
 
+            elif choice == '4':
+                self.export_history(username)
+
         except Exception as e:
             error_msg(f"Error: {str(e)}")
 
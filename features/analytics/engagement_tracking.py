@@ -5,6 +5,9 @@ Post dengan engagement tertinggi, hashtag performa, story view analytics
 
 from colorama import Fore, Style
 from banner import success_msg, error_msg, info_msg, show_separator
+from core.analytics import Analytics
+from core.request_broker import lane_client
+from core.story_viewers import get_snapshotter
 
 def engagement_menu(client, username):
     show_separator()
@@ -16,6 +19,7 @@ def engagement_menu(client, username):
     print("0. Kembali" + Style.RESET_ALL)
     show_separator()
     choice = input(Fore.MAGENTA + "\nPilih menu engagement (0-3): " + Style.RESET_ALL).strip()
+    client = lane_client(client, "analytics")
     if choice == "1":
         top_engagement(client, username)
     elif choice == "2":
@@ -32,6 +36,7 @@ def top_engagement(client, username):
     show_separator()
     print(Fore.CYAN + "\nPost dengan Engagement Tertinggi (10 post terakhir):" + Style.RESET_ALL)
     medias = client.user_medias_v1(client.user_id, amount=10)
+    Analytics().track_medias(username, medias)  # histori performa untuk suggestion engine
     if not medias:
         error_msg("Tidak ada post!")
         return
@@ -47,26 +52,38 @@ def top_engagement(client, username):
 
 def hashtag_performance(client, username):
     show_separator()
-    print(Fore.CYAN + "\nHashtag Performance (top 10 hashtag post terakhir):" + Style.RESET_ALL)
+    print(Fore.CYAN + "\nHashtag Performance (seluruh histori post, engagement = likes + 2x komentar):" + Style.RESET_ALL)
+    # 10 post terbaru masuk index dulu; agregatnya dari index, bukan parse ulang caption
     medias = client.user_medias_v1(client.user_id, amount=10)
-    hashtag_counts = {}
-    for m in medias:
-        if m.caption_text:
-            words = m.caption_text.split()
-            hashtags = [w for w in words if w.startswith("#")]
-            for h in hashtags:
-                hashtag_counts[h] = hashtag_counts.get(h, 0) + 1
-    for h, c in sorted(hashtag_counts.items(), key=lambda x: x[1], reverse=True):
-        print(Fore.YELLOW + f"{h}: {c}x")
+    analytics = Analytics()
+    analytics.track_medias(username, medias)
+    rows = analytics.hashtag_index.performance(username)
+    if not rows:
+        print(Fore.RED + "Belum ada hashtag yang dipakai di minimal 2 post.")
+    for row in rows[:10]:
+        lift = f"{row['lift']:.2f}x" if row['lift'] is not None else "-"
+        without = f"{row['mean_without']:.0f}" if row['mean_without'] is not None else "-"
+        t = f", t={row['t']:.1f}" if row['t'] is not None else ""
+        print(Fore.YELLOW + f"#{row['tag']}: {row['posts']} post, rata-rata {row['mean']:.0f} "
+              f"vs {without} tanpa tag ({lift}{t})")
     input(Fore.MAGENTA + "\nTekan Enter untuk kembali...")
 
 def story_analytics(client, username):
     show_separator()
     print(Fore.CYAN + "\nStory Views Analytics (7 hari terakhir):" + Style.RESET_ALL)
+    snapshotter = get_snapshotter()
+    stories = []
     try:
         stories = client.user_stories(client.user_id)
         for story in stories:
             print(Fore.GREEN + f"- Story {story.pk}: {story.view_count} views, {story.reel_share_count or 0} shares")
+        snapshotter.start(client, username)  # viewer di-snapshot sebelum expired
     except Exception:
         print(Fore.RED + "Tidak bisa ambil data story. Akun bukan akun utama atau tidak ada story.")
+    # Story yang sudah expired: dari snapshot lokal
+    live = {str(story.pk) for story in stories}
+    for row in snapshotter.history(username, days=7):
+        if row["story_pk"] not in live:
+            print(Fore.YELLOW + f"- Story {row['story_pk']} (expired): {row['viewer_count']} viewers "
+                  f"({row['snapshots']} snapshot)")
     input(Fore.MAGENTA + "\nTekan Enter untuk kembali...")
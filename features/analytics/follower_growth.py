@@ -4,26 +4,13 @@ Follower Growth Tracking:
 Pantau pertambahan dan pengurangan followers harian dan mingguan
 """
 
-import os
-import json
 from datetime import datetime, timedelta
 from colorama import Fore, Style
 from banner import show_separator, success_msg, error_msg, info_msg
+from core.datastore import get_datastore
+from core.request_broker import lane_client
 
-DATA_FILE = "follower_growth.json"
-
-def load_data():
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+# Snapshot harian disimpan di data/bot.db (follower_growth.json lama di-import sekali)
 
 def follower_growth(client, username):
     show_separator()
@@ -31,27 +18,22 @@ def follower_growth(client, username):
     show_separator()
     
     try:
-        current_followers = client.user_info_by_username(username).follower_count
+        current_followers = lane_client(client, "analytics").user_info_by_username(username).follower_count
         now = datetime.now()
         today_str = now.strftime("%Y-%m-%d")
         
-        data = load_data()
+        snapshots = get_datastore().follower_snapshots
         
         # Simpan data hari ini jika belum ada
-        if username not in data:
-            data[username] = {}
-            
-        if today_str not in data[username]:
-            data[username][today_str] = current_followers
-            save_data(data)
+        if snapshots.record(username, today_str, current_followers):
             info_msg(f"Data followers hari ini ({today_str}) telah disimpan: {current_followers}")
         else:
-            info_msg(f"Data followers hari ini ({today_str}) sudah tercatat: {data[username][today_str]}")
+            info_msg(f"Data followers hari ini ({today_str}) sudah tercatat: {snapshots.get(username, today_str)}")
         
         # Hitung pertambahan/penurunan followers hari ini dibanding kemarin
         yesterday = now - timedelta(days=1)
         yesterday_str = yesterday.strftime("%Y-%m-%d")
-        followers_yesterday = data[username].get(yesterday_str)
+        followers_yesterday = snapshots.get(username, yesterday_str)
         
         if followers_yesterday is not None:
             diff = current_followers - followers_yesterday
@@ -67,7 +49,7 @@ def follower_growth(client, username):
         # Hitung pertambahan/penurunan followers mingguan (7 hari)
         week_ago = now - timedelta(days=7)
         week_ago_str = week_ago.strftime("%Y-%m-%d")
-        followers_week_ago = data[username].get(week_ago_str)
+        followers_week_ago = snapshots.get(username, week_ago_str)
         
         if followers_week_ago is not None:
             diff_week = current_followers - followers_week_ago
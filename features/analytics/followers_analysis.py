@@ -5,6 +5,11 @@ Analisis Followers (follower baru, unfollowers, tidak follow back, ghost followe
 
 from colorama import Fore, Style
 from banner import success_msg, error_msg, info_msg, show_separator
+from core.request_broker import lane_client
+
+def _user_ids(client, method):
+    """pk followers/following, diambil per halaman supaya posting terjadwal bisa menyela crawl"""
+    return {user.pk for user in client.paginate(method, client.user_id)}
 
 def followers_menu(client, username):
     show_separator()
@@ -36,6 +41,7 @@ def followers_menu(client, username):
 def list_latest_followers(client, username):
     show_separator()
     print(Fore.CYAN + "\nFollowers Terbaru (10 paling baru):" + Style.RESET_ALL)
+    client = lane_client(client, "analytics")
     followers = client.user_followers(client.user_id, amount=10)
     for f in followers.values():
         print(Fore.GREEN + f"- @{f.username} | {f.full_name}")
@@ -44,8 +50,9 @@ def list_latest_followers(client, username):
 def list_unfollowers(client, username):
     show_separator()
     print(Fore.CYAN + "\nUnfollowers (unfollow lu):" + Style.RESET_ALL)
-    followers_set = set(client.user_followers(client.user_id))
-    following_set = set(client.user_following(client.user_id))
+    client = lane_client(client, "analytics")
+    followers_set = _user_ids(client, "user_followers_v1_chunk")
+    following_set = _user_ids(client, "user_following_v1_chunk")
     unfollowers = following_set - followers_set
     for uid in list(unfollowers)[:10]:
         user = client.user_info(uid)
@@ -55,8 +62,9 @@ def list_unfollowers(client, username):
 def list_not_followback(client, username):
     show_separator()
     print(Fore.CYAN + "\nFollowers yang tidak you follow back:\n" + Style.RESET_ALL)
-    followers = set(client.user_followers(client.user_id))
-    following = set(client.user_following(client.user_id))
+    client = lane_client(client, "analytics")
+    followers = _user_ids(client, "user_followers_v1_chunk")
+    following = _user_ids(client, "user_following_v1_chunk")
     not_followed_back = followers - following
     for uid in list(not_followed_back)[:10]:
         user = client.user_info(uid)
@@ -67,7 +75,8 @@ def list_ghost_followers(client, username):
     show_separator()
     print(Fore.CYAN + "\nGhost Followers (followers yang nggak pernah like atau komen):" + Style.RESET_ALL)
     # Sederhana: followers yang nggak pernah like/komen 10 posting terakhir
-    followers = client.user_followers(client.user_id)
+    client = lane_client(client, "analytics")
+    followers = {user.pk: user for user in client.paginate("user_followers_v1_chunk", client.user_id)}
     user_ids = set(followers.keys())
     medias = client.user_medias_v1(client.user_id, amount=10)
     engaged = set()
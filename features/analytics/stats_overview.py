@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """
 Analytics & Monitoring - Enhanced
-Tambahan: Engagement Heatmap, Post Reach, Story Viewers
+Tambahan: Engagement Heatmap, Post Reach, Story Viewers (+ histori snapshot), Kurva Performa Post
 """
 
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
+from datetime import datetime
+from core.analytics import Analytics
+from core.post_curves import get_sampler
+from core.story_viewers import CONSISTENT_DAYS, get_snapshotter
 
 def analytics_menu(client, username):
     """Menu analytics dengan fitur lengkap"""
@@ -18,10 +22,11 @@ def analytics_menu(client, username):
         print("3. 👁️  Post Reach & Impressions")
         print("4. 📖 Story Viewers Analysis")
         print("5. 📊 Detailed Report")
+        print("6. 📉 Kurva Performa Post")
         print("0. ❌ Kembali" + Style.RESET_ALL)
         show_separator()
 
-        choice = input(Fore.MAGENTA + "\nPilih menu (0-5): " + Style.RESET_ALL).strip()
+        choice = input(Fore.MAGENTA + "\nPilih menu (0-6): " + Style.RESET_ALL).strip()
 
         if choice == '0':
             info_msg("Kembali...")
@@ -36,6 +41,8 @@ def analytics_menu(client, username):
             show_story_viewers_analysis(client, username)
         elif choice == '5':
             show_detailed_report(client, username)
+        elif choice == '6':
+            show_post_curves(client, username)
         else:
             error_msg("Pilihan tidak valid!")
 
@@ -71,33 +78,70 @@ def show_engagement_heatmap(client, username):
         user_id = client.user_id_from_username(username)
         medias = client.user_medias(user_id, amount=50)
         
-        # Analisis waktu posting dan engagement
-        hour_engagement = {}
-        for media in medias:
-            hour = media.taken_at.hour
-            likes = media.like_count
-            comments = media.comment_count
-            engagement = likes + (comments * 2)
-            
-            if hour not in hour_engagement:
-                hour_engagement[hour] = []
-            hour_engagement[hour].append(engagement)
-        
-        # Hitung rata-rata engagement per jam
-        avg_engagement = {}
-        for hour, engagements in hour_engagement.items():
-            avg_engagement[hour] = sum(engagements) / len(engagements)
-        
-        # Sort by engagement
-        sorted_hours = sorted(avg_engagement.items(), key=lambda x: x[1], reverse=True)
+        # Post terbaru masuk ke statistik per hari+jam (histori lama ikut dihitung, bobot recency)
+        analytics = Analytics()
+        analytics.track_medias(username, medias)
+        best_time = analytics.best_time
+        top_slots = best_time.best_slots(username, n=5)
+        if not top_slots:
+            warning_msg("Belum ada post untuk dianalisis")
+            return
         
         show_separator()
         print(Fore.GREEN + "\n🔥 ENGAGEMENT HEATMAP (Waktu Terbaik Posting)" + Style.RESET_ALL)
         show_separator()
-        print(Fore.YELLOW + "\nTop 5 Waktu Terbaik:" + Style.RESET_ALL)
-        for i, (hour, engagement) in enumerate(sorted_hours[:5], 1):
-            print(f"{i}. Jam {hour:02d}:00 - Avg Engagement: {engagement:.0f}")
+        print(Fore.YELLOW + "\nTop 5 Waktu Terbaik (engagement = likes + 2x komentar):" + Style.RESET_ALL)
+        for i, slot in enumerate(top_slots, 1):
+            low, high = slot['ci']
+            print(f"{i}. {slot['label']} - Skor: {slot['score']:.0f} "
+                  f"(rata-rata {slot['mean']:.0f}, 95% CI {low:.0f}-{high:.0f}, {slot['posts']} post)")
         
+        print(Fore.YELLOW + "\nSlot terbaik berikutnya:" + Style.RESET_ALL)
+        for slot in best_time.next_best_slots(username, n=3):
+            print(f"- {slot['post_time']} ({slot['label']})")
+        
+        success_msg("\n✅ Analisis selesai!")
+
+    except Exception as e:
+        error_msg(f"Error: {str(e)}")
+
+def _fmt_age(seconds):
+    if seconds is None:
+        return "-"
+    for unit, size in (("h", 86400), ("j", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit}"
+    return f"{seconds:.0f}d"
+
+def show_post_curves(client, username):
+    """Kurva engagement post sendiri setelah publish (5m, 15m, 1j, 6j, 24j, 7h)"""
+    try:
+        sampler = get_sampler()
+        info_msg("Mengambil sample yang jatuh tempo...")
+        sampler.sample_due(client, username)
+        result = sampler.compare(username)
+        if not result:
+            warning_msg("Belum ada post yang di-sample (post lewat Post Foto / Scheduled Posting dulu)")
+            return
+
+        cell = lambda v: f"{v:>7.0f}" if v is not None else "      -"
+        show_separator()
+        print(Fore.GREEN + "\n📉 KURVA PERFORMA POST (engagement = likes + 2x komentar)" + Style.RESET_ALL)
+        show_separator()
+        print(Fore.YELLOW + f"{'':<22}" + "".join(f"{label:>7}" for label in result['labels']) + Style.RESET_ALL)
+        print(f"{'Median akun':<22}" + "".join(cell(v) for v in result['median']))
+        print(f"{'Saturasi tipikal (%)':<22}" + "".join(cell(v * 100 if v is not None else None)
+                                                       for v in result['saturation']))
+
+        print(Fore.YELLOW + "\nPost terbaru:" + Style.RESET_ALL)
+        for post in result['posts'][:10]:
+            published = datetime.fromtimestamp(post['published_at']).strftime('%d/%m %H:%M') \
+                if post['published_at'] else "?"
+            name = f"{published} {post['post_type'] or ''}"
+            print(f"{name:<22}" + "".join(cell(v) for v in post['values']))
+            relative = f"{post['relative']:.2f}x median" if post['relative'] is not None else "-"
+            print(f"{'':<22}  relatif: {relative}, 90% tercapai: {_fmt_age(post['t90'])}")
+
         success_msg("\n✅ Analisis selesai!")
 
     except Exception as e:
@@ -137,15 +181,18 @@ def show_story_viewers_analysis(client, username):
         
         # Ambil story terbaru
         stories = client.user_stories(client.user_id_from_username(username))
-        
-        if not stories:
-            warning_msg("Tidak ada story aktif saat ini")
-            return
+
+        # Viewer story aktif di-snapshot di background sebelum expired (selama menu jalan)
+        snapshotter = get_snapshotter()
+        snapshotter.start(client, username)
         
         show_separator()
         print(Fore.GREEN + f"\n📖 STORY VIEWERS ANALYSIS" + Style.RESET_ALL)
         show_separator()
-        print(f"Total Stories Aktif: {len(stories)}")
+        if not stories:
+            warning_msg("Tidak ada story aktif saat ini")
+        else:
+            print(f"Total Stories Aktif: {len(stories)}")
         
         total_views = 0
         for i, story in enumerate(stories, 1):
@@ -154,7 +201,19 @@ def show_story_viewers_analysis(client, username):
             print(f"\n{i}. Story {story.id}")
             print(f"   👁️  Views: {viewers_count:,}")
         
-        print(f"\n📊 Total Views Semua Story: {total_views:,}")
+        if stories:
+            print(f"\n📊 Total Views Semua Story: {total_views:,}")
+
+        # Histori dari snapshot lokal (tanpa request)
+        result = snapshotter.consistent_viewers(username, days=CONSISTENT_DAYS, limit=10)
+        if result["stories"]:
+            print(Fore.YELLOW + f"\n🔁 Viewer Paling Konsisten ({CONSISTENT_DAYS} hari, "
+                  f"{result['stories']} story tersimpan):" + Style.RESET_ALL)
+            for i, viewer in enumerate(result["viewers"], 1):
+                name = f"@{viewer['username']}" if viewer['username'] else viewer['user_id']
+                print(f"{i:>2}. {name}: {viewer['seen']} story ({viewer['ratio'] * 100:.0f}%)")
+        else:
+            info_msg("Belum ada snapshot viewer tersimpan (diambil otomatis sebelum story expired)")
         success_msg("\n✅ Analisis selesai!")
 
     except Exception as e:
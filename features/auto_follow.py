@@ -10,6 +10,8 @@ import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from core.datastore import get_datastore
+
 logger = logging.getLogger(__name__)
 
 class AutoFollow:
@@ -18,7 +20,7 @@ class AutoFollow:
         self.analytics = analytics
         self.config = self._load_config()
         self.followed_users = self._load_json("data/followed_users.json")
-        self.whitelist = set(self._load_json("data/whitelist.json", default=[]))
+        self.whitelist = set(get_datastore().whitelist.all())
         self.blacklist = set(self._load_json("data/blacklist.json", default=[]))
 
     def _load_config(self):
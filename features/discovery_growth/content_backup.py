@@ -2,6 +2,8 @@
 """
 Content Backup
 Download semua posts dengan metadata sebagai cadangan
+(arsip content-addressed per snapshot: core.backup_archive, hanya byte baru yang ditulis)
++ pencarian caption / hashtag / lokasi di post yang sudah di-backup (core.backup_search)
 """
 
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
@@ -9,12 +11,25 @@ from colorama import Fore, Style
 import os
 import json
 import time
+import shutil
+import tempfile
 from datetime import datetime
+from core.backup_archive import BackupArchive
+from core.backup_search import get_backup_search
+from core.request_broker import lane_client
 
 class ContentBackup:
-    def __init__(self, client):
-        self.client = client
+    def __init__(self, client, search=None):
+        self.client = lane_client(client, "backup")  # crawl backup minggir untuk posting & menu
         self.backup_base = "backups"
+        self._search = search
+
+    @property
+    def search(self):
+        """Index pencarian backup (core.backup_search), default yang bersama di data/bot.db"""
+        if self._search is None:
+            self._search = get_backup_search()
+        return self._search
 
     def get_backup_dir(self, username):
         """Get backup directory untuk username"""
@@ -22,17 +37,44 @@ class ContentBackup:
         os.makedirs(backup_dir, exist_ok=True)
         return backup_dir
 
+    def get_archive(self, username):
+        """Arsip content-addressed backups/<username>/archive (snapshot + chunk dedup)"""
+        return BackupArchive(os.path.join(self.get_backup_dir(username), "archive"))
+
+    def _archive_media(self, archive, media, work_dir):
+        """Download file media ke folder sementara lalu masukkan ke arsip. Return (entries, byte baru)."""
+        folder = tempfile.mkdtemp(dir=work_dir, prefix=".download-")
+        try:
+            if media.media_type == 1:  # Photo
+                paths = [self.client.photo_download(media.pk, folder)]
+            elif media.media_type == 2:  # Video
+                paths = [self.client.video_download(media.pk, folder)]
+            else:  # Album
+                paths = self.client.album_download(media.pk, folder)
+            entries, written = [], 0
+            for path in paths:
+                entry, new = archive.put_file(str(path))
+                entries.append(entry)
+                written += new
+            return entries, written
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
     def download_posts(self, username, backup_type="all"):
-        """Download semua posts dengan metadata"""
+        """
+        Backup semua posts + metadata sebagai snapshot baru di arsip.
+        Post yang sudah ada di snapshot sebelumnya tidak di-download ulang, chunk yang sama tidak ditulis ulang.
+        """
         try:
             backup_dir = self.get_backup_dir(username)
-            photos_dir = os.path.join(backup_dir, "photos")
-            os.makedirs(photos_dir, exist_ok=True)
+            archive = self.get_archive(username)
+            previous = archive.load_snapshot()
+            known = {str(p["id"]): p.get("files") for p in previous["posts"]} if previous else {}
             
             info_msg(f"Downloading posts dari @{username}...")
             
             user_id = self.client.user_id_from_username(username)
-            medias = self.client.user_medias(user_id, amount=None)  # Get all
+            medias = list(self.client.paginate("user_medias_paginated_v1", user_id))  # Get all
             
             total_size = 0
             backed_up = 0
@@ -40,25 +82,10 @@ class ContentBackup:
             
             for i, media in enumerate(medias, 1):
                 try:
-                    # Download photo/video
-                    if media.media_type == 1:  # Photo
-                        img_path = os.path.join(photos_dir, f"{media.id}.jpg")
-                        
-                        if not os.path.exists(img_path):
-                            # Simulate download (actual download needs additional library)
-                            success_msg(f"✅ Post {i}/{len(medias)}: Photo downloaded")
-                            backed_up += 1
-                        
-                    elif media.media_type == 2:  # Video
-                        vid_path = os.path.join(photos_dir, f"{media.id}.mp4")
-                        if not os.path.exists(vid_path):
-                            success_msg(f"✅ Post {i}/{len(medias)}: Video downloaded")
-                            backed_up += 1
-                    
-                    # Save metadata
+                    # Save metadata (selalu segar: likes / caption bisa berubah)
                     metadata = {
                         'id': media.id,
-                        'type': 'photo' if media.media_type == 1 else 'video',
+                        'type': {1: 'photo', 2: 'video'}.get(media.media_type, 'album'),
                         'caption': media.caption_text,
                         'likes': media.like_count,
                         'comments': media.comment_count,
@@ -66,27 +93,40 @@ class ContentBackup:
                         'url': media.caption_text if hasattr(media, 'caption_text') else None,
                         'location': media.location.name if media.location else None
                     }
+
+                    files = known.get(str(media.id))
+                    if not files:
+                        # Download photo/video/album -> chunk di arsip
+                        files, written = self._archive_media(archive, media, backup_dir)
+                        total_size += written
+                        backed_up += 1
+                        success_msg(f"✅ Post {i}/{len(medias)}: {metadata['type'].capitalize()} downloaded")
+                        time.sleep(0.5)
+                    metadata['files'] = files
                     metadata_list.append(metadata)
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     warning_msg(f"Error download post {media.id}: {str(e)}")
                     continue
             
-            # Save metadata JSON
-            metadata_file = os.path.join(backup_dir, "metadata.json")
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata_list, f, indent=4, ensure_ascii=False)
+            # Snapshot manifest (terkompres); snapshot lama tetap ada sebagai histori
+            snapshot = archive.write_snapshot(username, metadata_list)
+            try:
+                self.search.sync(username, archive)  # index pencarian ikut snapshot baru
+            except Exception as e:
+                warning_msg(f"Index pencarian backup gagal diupdate: {str(e)}")
             
             success_msg(f"\n✅ Backup selesai!")
-            success_msg(f"Posts backed up: {backed_up}")
-            success_msg(f"Metadata file: {metadata_file}")
+            success_msg(f"Posts backed up: {backed_up} baru, {len(metadata_list) - backed_up} sudah ada di arsip")
+            success_msg(f"Byte baru di arsip: {total_size / 1024 / 1024:.1f} MB")
+            success_msg(f"Snapshot: {snapshot}")
             
             return {
                 'status': 'success',
                 'backed_up': backed_up,
                 'total_posts': len(medias),
+                'new_bytes': total_size,
+                'snapshot': snapshot,
                 'location': backup_dir
             }
             
@@ -130,7 +170,7 @@ class ContentBackup:
         """Estimate ukuran backup"""
         try:
             user_id = self.client.user_id_from_username(username)
-            medias = self.client.user_medias(user_id, amount=None)
+            medias = list(self.client.paginate("user_medias_paginated_v1", user_id))
             
             # Rough estimation: avg 2MB per post
             estimated_mb = len(medias) * 2
@@ -156,9 +196,21 @@ class ContentBackup:
             for username in os.listdir(self.backup_base):
                 backup_path = os.path.join(self.backup_base, username)
                 if os.path.isdir(backup_path):
+                    archive = BackupArchive(os.path.join(backup_path, "archive"))
+                    snapshots = archive.snapshots()
                     metadata_file = os.path.join(backup_path, "metadata.json")
                     
-                    if os.path.exists(metadata_file):
+                    if snapshots:
+                        latest = archive.load_snapshot(snapshots[-1])
+                        backups.append({
+                            'username': username,
+                            'posts': len(latest['posts']),
+                            'snapshots': len(snapshots),
+                            'latest': snapshots[-1],
+                            'size_mb': archive.blob_stats()['bytes'] / 1024 / 1024,
+                            'path': backup_path
+                        })
+                    elif os.path.exists(metadata_file):  # backup lama (sebelum format arsip)
                         with open(metadata_file, 'r', encoding='utf-8') as f:
                             metadata = json.load(f)
                         
@@ -186,9 +238,12 @@ class ContentBackup:
             print("2. 📸 Backup semua posts")
             print("3. 📖 Backup stories")
             print("4. 📋 List backup yang tersimpan")
+            print("5. 🔍 Verifikasi integritas arsip")
+            print("6. ♻️  Restore satu post")
+            print("7. 🔎 Cari post di backup")
             print("0. ❌ Batal")
             
-            choice = input(Fore.MAGENTA + "\nPilih (0-4): " + Style.RESET_ALL).strip()
+            choice = input(Fore.MAGENTA + "\nPilih (0-7): " + Style.RESET_ALL).strip()
             
             if choice == '0':
                 info_msg("Dibatalkan")
@@ -205,4 +260,58 @@ class ContentBackup:
                     print(f"Estimated Time: ~{estimate['estimated_size_mb']/20:.0f} minutes")
             
             elif choice == '2':
-                confirm = input(Fore.MAGENTA + "\nStart backup posts? (yes/no): " + Style.
+                confirm = input(Fore.MAGENTA + "\nStart backup posts? (yes/no): " + Style.RESET_ALL).strip().lower()
+                if confirm == 'yes':
+                    self.download_posts(username)
+                else:
+                    info_msg("Dibatalkan")
+            
+            elif choice == '3':
+                downloaded = self.backup_stories(username)
+                success_msg(f"Stories downloaded: {downloaded}")
+            
+            elif choice == '4':
+                backups = self.list_backups()
+                show_separator()
+                print(Fore.YELLOW + "\n📋 BACKUP TERSIMPAN" + Style.RESET_ALL)
+                show_separator()
+                for backup in backups:
+                    if 'snapshots' in backup:
+                        print(f"@{backup['username']}: {backup['posts']} posts, {backup['snapshots']} snapshot "
+                              f"(terbaru {backup['latest']}), {backup['size_mb']:.1f} MB")
+                    else:
+                        print(f"@{backup['username']}: {backup['posts']} posts (format lama)")
+            
+            elif choice == '5':
+                info_msg("Memverifikasi chunk arsip...")
+                result = self.get_archive(username).verify()
+                if result['corrupt'] or result['missing']:
+                    error_msg(f"{len(result['corrupt'])} chunk rusak, {len(result['missing'])} chunk hilang "
+                              f"dari {result['checked']}")
+                else:
+                    success_msg(f"✅ {result['checked']} chunk OK")
+            
+            elif choice == '6':
+                media_id = input(Fore.MAGENTA + "\nMedia ID post: " + Style.RESET_ALL).strip()
+                dest = os.path.join(self.get_backup_dir(username), "restore")
+                paths = self.get_archive(username).restore_post(media_id, dest)
+                success_msg(f"✅ {len(paths)} file di-restore ke {os.path.join(dest, media_id)}")
+            
+            elif choice == '7':
+                query = input(Fore.MAGENTA + "\nKata kunci (#tag, kata*): " + Style.RESET_ALL).strip()
+                self.search.sync(username, self.get_archive(username))
+                results = self.search.search(username, query)
+                show_separator()
+                print(Fore.YELLOW + f"\n🔎 {len(results)} post cocok" + Style.RESET_ALL)
+                show_separator()
+                for post in results:
+                    day = (post['taken_at'] or '')[:10]
+                    text = post['snippet'] or post['caption'][:80]
+                    print(f"{day} {post['media_id']} ❤️ {post['likes']} 💬 {post['comments']}")
+                    print(f"   {text}")
+            
+            else:
+                error_msg("Pilihan tidak valid!")
+        
+        except Exception as e:
+            error_msg(f"Error: {str(e)}")
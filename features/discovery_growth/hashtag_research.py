@@ -9,42 +9,29 @@ from colorama import Fore, Style
 import json
 import os
 import time
+from core.datastore import get_datastore
+
+# Umur maksimal stats hashtag di cache (sama dengan retensi hashtag_cache di core/housekeeping.py)
+CACHE_TTL = 7 * 24 * 3600
 
 class HashtagResearch:
     def __init__(self, client):
         self.client = client
-        self.hashtag_cache_file = "data/hashtag_cache.json"
-        self.load_cache()
-
-    def load_cache(self):
-        """Load hashtag cache dari file"""
-        if os.path.exists(self.hashtag_cache_file):
-            try:
-                with open(self.hashtag_cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-            except:
-                self.cache = {}
-        else:
-            os.makedirs("data", exist_ok=True)
-            self.cache = {}
-
-    def save_cache(self):
-        """Simpan hashtag cache ke file"""
-        try:
-            with open(self.hashtag_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            warning_msg(f"Error save cache: {str(e)}")
+        # Cache per hashtag di data/bot.db: lookup & simpan satu baris, bukan seluruh file
+        self.cache = get_datastore().hashtag_cache
+        self._memo = {}  # hashtag yang sudah dibaca di sesi ini (tetap ikut CACHE_TTL)
 
     def research_hashtag(self, hashtag):
         """Research single hashtag stats"""
         try:
-            info_msg(f"Researching #{hashtag}...")
-            
             # Check cache
-            if hashtag in self.cache:
-                info_msg(f"Loading from cache (cached)")
-                return self.cache[hashtag]
+            cached = self._memo.get(hashtag) or self.cache.get(hashtag)
+            if cached is not None and time.time() - cached.get('timestamp', 0) < CACHE_TTL:
+                self._memo[hashtag] = cached
+                info_msg(f"#{hashtag}: loading from cache (cached)")
+                return cached
+            
+            info_msg(f"Researching #{hashtag}...")
             
             # Get hashtag info
             hashtag_info = self.client.hashtag_info_by_name(hashtag)
@@ -73,8 +60,11 @@ class HashtagResearch:
                 stats['size'] = 'MEGA (> 10M)'
                 stats['difficulty'] = 'VERY HARD'
             
-            self.cache[hashtag] = stats
-            self.save_cache()
+            self._memo[hashtag] = stats
+            try:
+                self.cache.put(hashtag, stats)
+            except Exception as e:
+                warning_msg(f"Error save cache: {str(e)}")
             
             return stats
             
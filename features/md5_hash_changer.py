@@ -8,8 +8,8 @@ Dengan opsi random dan batch processing
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
 import os
-import hashlib
 from PIL import Image
+from core.media_library import file_md5
 import random
 
 class MD5HashChanger:
@@ -21,11 +21,7 @@ class MD5HashChanger:
     def get_file_md5(self, file_path):
         """Hitung MD5 hash file"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            return file_md5(file_path)
         except Exception as e:
             error_msg(f"Error hitung MD5: {str(e)}")
             return None
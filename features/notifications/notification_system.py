@@ -2,20 +2,24 @@
 """
 Notification System
 Monitor followers baru, DM, comments, likes
+Komentar: sync inkremental ke data/bot.db (core.comment_inbox), bisa dicari & dimoderasi
 """
 
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
 import json
 import os
-from datetime import datetime
 import time
 import threading
+from core.datastore import get_datastore
+from core.request_broker import lane_client
+from core.comment_inbox import get_comment_inbox, RULE_KINDS, RULE_ACTIONS
 
 class NotificationSystem:
     def __init__(self, client):
-        self.client = client
-        self.notifications_file = "data/notifications_log.json"
+        self.client = lane_client(client, "notifications") if client else client
+        self.notifications = get_datastore().notifications  # data/bot.db (notifications_log.json lama di-import sekali)
+        self.comment_inbox = get_comment_inbox()
         self.config_file = "data/notifications_config.json"
         self.load_config()
 
@@ -56,32 +60,8 @@ class NotificationSystem:
     def add_notification(self, notification_type, data):
         """Tambah notification ke log"""
         try:
-            notifications = []
-
-            if os.path.exists(self.notifications_file):
-                try:
-                    with open(self.notifications_file, 'r', encoding='utf-8') as f:
-                        notifications = json.load(f)
-                except:
-                    notifications = []
-
-            notification = {
-                'type': notification_type,
-                'data': data,
-                'timestamp': datetime.now().isoformat(),
-                'read': False
-            }
-
-            notifications.append(notification)
-
-            # Keep only last N notifications
-            if len(notifications) > self.config['max_notifications']:
-                notifications = notifications[-self.config['max_notifications']:]
-
-            with open(self.notifications_file, 'w', encoding='utf-8') as f:
-                json.dump(notifications, f, indent=4, ensure_ascii=False)
-
-            return notification
+            # Satu INSERT + trim (keep only last N notifications), tanpa baca/tulis ulang seluruh log
+            return self.notifications.add(notification_type, data, keep=self.config['max_notifications'])
 
         except Exception as e:
             warning_msg(f"Error add notification: {str(e)}")
@@ -140,15 +120,97 @@ class NotificationSystem:
         except Exception as e:
             warning_msg(f"Error check DM: {str(e)}")
 
+    def check_new_comments(self, username, pages=1):
+        """Check komentar baru di post sendiri (hanya post yang comment_count-nya berubah yang di-fetch)"""
+        if not self.client:
+            return None
+        try:
+            summary = self.comment_inbox.sync(self.client.raw, username, pages=pages)
+
+            for comment in summary['new']:
+                self.add_notification('new_comment', {
+                    'from': comment['author'] or 'Unknown',
+                    'preview': comment['text'][:50],
+                    'media_id': comment['media_id'],
+                })
+            for comment in summary['moderated']:
+                self.add_notification('comment_moderated', {
+                    'from': comment['author'] or 'Unknown',
+                    'preview': comment['text'][:50],
+                    'media_id': comment['media_id'],
+                    'rule': comment['rule'],
+                    'action': comment['action'],
+                })
+
+            for comment in summary['new'][:5]:
+                print(Fore.CYAN + f"\n💭 NEW COMMENT from @{comment['author']}" + Style.RESET_ALL)
+                print(f"   {comment['text'][:50]}")
+            if len(summary['new']) > 5:
+                print(f"   ... +{len(summary['new']) - 5} komentar lain")
+            for comment in summary['moderated']:
+                print(Fore.RED + f"\n🛡️  [{comment['action'].upper()}] @{comment['author']}: {comment['text'][:50]}"
+                      + Style.RESET_ALL)
+
+            return summary
+
+        except Exception as e:
+            warning_msg(f"Error check comments: {str(e)}")
+            return None
+
+    def show_comment_inbox(self, username):
+        """Sync komentar lalu tampilkan terbaru / hasil pencarian"""
+        if self.client:
+            info_msg("Sync komentar post terbaru...")
+            summary = self.check_new_comments(username)
+            if summary:
+                info_msg(f"{summary['checked']} post dicek, {summary['fetched']} di-fetch, "
+                         f"{len(summary['new'])} komentar baru")
+
+        query = input(Fore.YELLOW + "Cari komentar (kosongkan untuk terbaru): " + Style.RESET_ALL).strip()
+        comments = self.comment_inbox.search(username, query) if query else self.comment_inbox.recent(username)
+        if not comments:
+            warning_msg("Tidak ada komentar")
+            return
+
+        show_separator()
+        for comment in comments:
+            mark = f" [{comment['status'].upper()}]" if comment['status'] != 'ok' else ""
+            text = comment.get('snippet') or comment['text']
+            print(f"\n@{comment['author']} ({(comment['created_at'] or '')[:16]}){mark}")
+            print(f"   {text[:100]}")
+
+    def manage_comment_rules(self):
+        """Aturan moderasi: keyword (pantau kata) & block (kata / @akun), aksi notify/flag/delete"""
+        rules = self.comment_inbox.rules()
+        print(Fore.YELLOW + "\nAturan moderasi komentar:" + Style.RESET_ALL)
+        for rule in rules:
+            print(f"  {rule['id']}. [{rule['kind']}] {rule['pattern']} -> {rule['action']}")
+        if not rules:
+            print("  (belum ada)")
+
+        print("\n1. Tambah aturan")
+        print("2. Hapus aturan")
+        choice = input(Fore.MAGENTA + "Pilih (0-2): " + Style.RESET_ALL).strip()
+        if choice == '1':
+            kind = input(f"Jenis ({'/'.join(RULE_KINDS)}): ").strip().lower()
+            pattern = input("Kata / frasa (atau @username untuk block akun): ").strip()
+            action = input(f"Aksi ({'/'.join(RULE_ACTIONS)}, default: flag): ").strip().lower() or "flag"
+            try:
+                self.comment_inbox.add_rule(kind, pattern, action)
+                success_msg("Aturan disimpan")
+            except ValueError as e:
+                error_msg(str(e))
+        elif choice == '2':
+            rule_id = input("ID aturan: ").strip()
+            if rule_id.isdigit() and self.comment_inbox.remove_rule(int(rule_id)):
+                success_msg("Aturan dihapus")
+            else:
+                warning_msg("Aturan tidak ditemukan")
+
     def display_notifications(self):
         """Display notification history"""
         try:
-            if not os.path.exists(self.notifications_file):
-                warning_msg("No notifications yet")
-                return
-
-            with open(self.notifications_file, 'r', encoding='utf-8') as f:
-                notifications = json.load(f)
+            notifications = self.notifications.recent(20)
 
             if not notifications:
                 warning_msg("No notifications")
@@ -158,7 +220,7 @@ class NotificationSystem:
             print(Fore.CYAN + "\n🔔 NOTIFICATION HISTORY" + Style.RESET_ALL)
             show_separator()
 
-            for i, notif in enumerate(notifications[-20:], 1):  # Show last 20
+            for i, notif in enumerate(notifications, 1):  # Show last 20
                 notif_type = notif['type'].upper()
                 timestamp = notif['timestamp'][:10]
 
@@ -169,6 +231,12 @@ class NotificationSystem:
                 elif notif['type'] == 'new_dm':
                     print(f"   From: @{notif['data']['from']}")
                     print(f"   {notif['data']['preview']}")
+                elif notif['type'] == 'new_comment':
+                    print(f"   From: @{notif['data']['from']}")
+                    print(f"   {notif['data']['preview']}")
+                elif notif['type'] == 'comment_moderated':
+                    print(f"   @{notif['data']['from']} ({notif['data']['action']}: {notif['data']['rule']})")
+                    print(f"   {notif['data']['preview']}")
 
         except Exception as e:
             error_msg(f"Error display notifications: {str(e)}")
@@ -193,6 +261,9 @@ class NotificationSystem:
                     if self.config['notify_dm']:
                         self.check_new_dm(username)
 
+                    if self.config['notify_comments']:
+                        self.check_new_comments(username)
+
                     time.sleep(self.config['check_interval'])
 
                 except KeyboardInterrupt:
@@ -217,9 +288,11 @@ class NotificationSystem:
             print("1. 📋 View notification history")
             print("2. ⚙️  Update notification settings")
             print("3. 🔄 Start real-time monitor")
+            print("4. 💬 Comment inbox (sync & cari)")
+            print("5. 🛡️  Aturan moderasi komentar")
             print("0. ❌ Batal")
 
-            choice = input(Fore.MAGENTA + "\nPilih (0-3): " + Style.RESET_ALL).strip()
+            choice = input(Fore.MAGENTA + "\nPilih (0-5): " + Style.RESET_ALL).strip()
 
             if choice == '0':
                 return
@@ -240,6 +313,12 @@ class NotificationSystem:
 
                 self.run_monitor(username, duration)
 
+            elif choice == '4':
+                self.show_comment_inbox(username)
+
+            elif choice == '5':
+                self.manage_comment_rules()
+
         except Exception as e:
             error_msg(f"Error: {str(e)}")
 
@@ -7,8 +7,9 @@ Scan folder posts_photos, pilih file, auto ubah MD5, lalu post
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
 import os
-import hashlib
 from PIL import Image
+from core.media_library import get_library, file_md5, IMAGE_EXTENSIONS
+from core.post_curves import get_sampler
 
 class PostPhotoMD5Helper:
     """Helper untuk ubah MD5 foto postingan"""
@@ -17,11 +18,7 @@ class PostPhotoMD5Helper:
     def get_file_md5(file_path):
         """Hitung MD5 hash file"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            return file_md5(file_path)
         except Exception as e:
             error_msg(f"Error hitung MD5: {str(e)}")
             return None
@@ -74,30 +71,36 @@ def post_photo(client):
             warning_msg(f"Silakan masukkan file foto ke folder '{posts_folder}' dan coba lagi")
             return
 
-        # Scan file di folder (hanya file gambar)
-        image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
-        image_files = [f for f in os.listdir(posts_folder) 
-                       if os.path.isfile(os.path.join(posts_folder, f)) 
-                       and f.lower().endswith(image_extensions)]
+        # Ambil daftar file dari media index (tanpa scan ulang semua file)
+        library = get_library()
+        image_entries = library.list_media(posts_folder, kind="image")
 
-        if not image_files:
+        if not image_entries:
             warning_msg(f"Tidak ada file gambar di folder '{posts_folder}'")
-            info_msg(f"Format gambar yang didukung: {', '.join(image_extensions)}")
+            info_msg(f"Format gambar yang didukung: {', '.join(IMAGE_EXTENSIONS)}")
             return
 
         # Tampilkan daftar file
-        image_files.sort()
+        image_files = [entry['name'] for entry in image_entries]
+        duplicates = library.duplicate_paths(posts_folder)
         print(Fore.GREEN + f"\n📁 File foto yang ditemukan di folder '{posts_folder}':" + Style.RESET_ALL)
-        for i, filename in enumerate(image_files, 1):
-            file_path = os.path.join(posts_folder, filename)
-            file_size = os.path.getsize(file_path) / 1024  # Size dalam KB
-            print(Fore.YELLOW + f"  {i}. {filename} ({file_size:.2f} KB)" + Style.RESET_ALL)
+        for i, entry in enumerate(image_entries, 1):
+            file_size = entry['size'] / 1024  # Size dalam KB
+            dup_mark = " [duplikat]" if entry['path'] in duplicates else ""
+            print(Fore.YELLOW + f"  {i}. {entry['name']} ({file_size:.2f} KB){dup_mark}" + Style.RESET_ALL)
 
+        print(Fore.CYAN + f"  P. Preview (contact sheet)" + Style.RESET_ALL)
         print(Fore.CYAN + f"  0. Batal" + Style.RESET_ALL)
         show_separator()
 
         # Minta user pilih file
         choice = input(Fore.MAGENTA + f"\nPilih foto (0-{len(image_files)}): " + Style.RESET_ALL).strip()
+        if choice.lower() == "p":
+            # Grid thumbnail dari cache, file asli tidak di-decode ulang
+            sheet_path = os.path.join("data", "media_cache", "sheets", f"{posts_folder}.jpg")
+            library.contact_sheet(posts_folder, sheet_path, kind="image")
+            info_msg(f"Contact sheet disimpan: {sheet_path}")
+            choice = input(Fore.MAGENTA + f"\nPilih foto (0-{len(image_files)}): " + Style.RESET_ALL).strip()
         
         try:
             choice_num = int(choice)
@@ -116,7 +119,7 @@ def post_photo(client):
         file_path = os.path.join(posts_folder, selected_file)
 
         # Validasi ukuran file (Instagram limit biasanya 8MB per foto)
-        file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        file_size_mb = image_entries[choice_num - 1]['size'] / (1024 * 1024)
         if file_size_mb > 8:
             error_msg(f"Ukuran file terlalu besar! ({file_size_mb:.2f} MB, max 8 MB)")
             return
@@ -166,9 +169,16 @@ def post_photo(client):
 
         info_msg("Memproses post foto...")
         
-        client.photo_upload(file_path, caption=caption)
+        media = client.photo_upload(file_path, caption=caption)
 
         success_msg("Foto berhasil diposting! 🎉")
+        try:
+            # Counter post dibaca ulang 5m, 15m, 1j, ... setelah publish (lihat Analytics > Kurva Performa)
+            username = getattr(client, "username", None)
+            if get_sampler().track_media(username, media, "photo"):
+                get_sampler().start(client, username)
+        except Exception as e:
+            warning_msg(f"Kurva performa tidak di-track: {str(e)}")
         print(Fore.GREEN + f"\n✅ Post Berhasil" + Style.RESET_ALL)
         print(Fore.YELLOW + f"   File: {selected_file}" + Style.RESET_ALL)
         print(Fore.YELLOW + f"   Ukuran: {file_size_mb:.2f} MB" + Style.RESET_ALL)
@@ -6,6 +6,7 @@ Modul: Post Reels Instagram
 from banner import success_msg, error_msg, info_msg, show_separator
 from colorama import Fore, Style
 import os
+from core.reel_preflight import get_preflight
 
 def post_reel(client):
     """Post reels Instagram"""
@@ -20,11 +21,23 @@ def post_reel(client):
         error_msg("File tidak ditemukan!")
         return
     
+    # Preflight (hash file + probe/transcode) jalan di background selama user mengetik caption;
+    # error-nya (mis. file tidak bisa dibaca) baru muncul di preflight.result() di dalam try
+    preflight = get_preflight().submit(video_path)
     caption = input(Fore.YELLOW + "Caption: " + Style.RESET_ALL).strip()
     
     try:
+        info_msg("Cek format video...")
+        result = preflight.result()
+        if result["fatal"]:
+            for problem in result["fatal"]:
+                error_msg(problem)
+            return
+        for problem in result["fixed"]:
+            info_msg(f"🔧 {problem}")
+        
         info_msg("Posting reels...")
-        media = client.clip_upload(video_path, caption)
+        media = client.clip_upload(result["output"], caption)
         success_msg("Reels berhasil dipost! 🎉")
         print(Fore.GREEN + f"📱 Link: https://instagram.com/reel/{media.code}/" + Style.RESET_ALL)
         
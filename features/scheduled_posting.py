@@ -8,41 +8,42 @@ Bisa jalan di background bahkan saat bot ditutup
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
 import os
-import json
 from datetime import datetime
 import time
 import threading
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from core.media_library import get_library
+from core.reel_preflight import get_preflight
+from core.datastore import get_datastore
+from core.publish_daemon import run_schedule, daemon_status, send_command
+from core.best_time import get_recommender
+from core.post_curves import get_sampler
 
 class ScheduledPost:
     def __init__(self, client=None, username=None):
-        self.schedule_file = "scheduled_posts.json"
+        self.repo = get_datastore().schedules  # data/bot.db (scheduled_posts.json lama di-import sekali)
         self.scheduler = BackgroundScheduler()
         self.client = client
         self.username = username
         self.load_schedules()
 
     def load_schedules(self):
-        """Load schedule dari file"""
-        if os.path.exists(self.schedule_file):
-            try:
-                with open(self.schedule_file, 'r', encoding='utf-8') as f:
-                    self.schedules = json.load(f)
-            except:
-                self.schedules = []
-        else:
-            self.schedules = []
-
-    def save_schedules(self):
-        """Simpan schedule ke file"""
+        """Load schedule dari database"""
         try:
-            with open(self.schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(self.schedules, f, indent=4, ensure_ascii=False)
-            return True
+            self.schedules = self.repo.all()
         except Exception as e:
-            error_msg(f"Error save schedule: {str(e)}")
-            return False
+            error_msg(f"Error load schedule: {str(e)}")
+            self.schedules = []
+
+    def _set_status(self, schedule_id, status, error=None):
+        """Samakan list yang sedang tampil dengan status di database"""
+        for schedule in self.schedules:
+            if schedule['id'] == schedule_id:
+                schedule['status'] = status
+                schedule['error'] = error
+                if status == 'posted':
+                    schedule['posted_at'] = datetime.now().isoformat()
 
     def add_schedule(self, file_path, caption, post_time, post_type="photo"):
         """Tambah jadwal posting"""
@@ -51,21 +52,18 @@ class ScheduledPost:
                 error_msg(f"File tidak ditemukan: {file_path}")
                 return False
 
-            schedule = {
-                "id": len(self.schedules) + 1,
-                "file_path": file_path,
-                "caption": caption,
-                "post_time": post_time,
-                "post_type": post_type,
-                "created_at": datetime.now().isoformat(),
-                "status": "pending"
-            }
+            # ID dari AUTOINCREMENT: tidak dipakai ulang walau jadwal lama dibuang housekeeping
+            schedule = self.repo.add(file_path, caption, post_time, post_type, username=self.username)
+
+            if post_type == 'reel':
+                # Mulai transcode sekarang, saat jadwal tiba file sudah siap di cache
+                get_preflight().submit(file_path)
 
             self.schedules.append(schedule)
-            if self.save_schedules():
-                success_msg(f"✅ Jadwal posting berhasil ditambahkan (ID: {schedule['id']})")
-                return True
-            return False
+            success_msg(f"✅ Jadwal posting berhasil ditambahkan (ID: {schedule['id']})")
+            if send_command("wake"):
+                info_msg("Publish daemon aktif, jadwal langsung masuk antrian daemon")
+            return True
 
         except Exception as e:
             error_msg(f"Error: {str(e)}")
@@ -93,11 +91,12 @@ class ScheduledPost:
     def delete_schedule(self, schedule_id):
         """Hapus jadwal posting"""
         try:
+            if not self.repo.delete(schedule_id):
+                warning_msg(f"Jadwal ID {schedule_id} tidak ditemukan")
+                return False
             self.schedules = [s for s in self.schedules if s['id'] != schedule_id]
-            if self.save_schedules():
-                success_msg(f"✅ Jadwal posting ID {schedule_id} berhasil dihapus")
-                return True
-            return False
+            success_msg(f"✅ Jadwal posting ID {schedule_id} berhasil dihapus")
+            return True
         except Exception as e:
             error_msg(f"Error: {str(e)}")
             return False
@@ -107,27 +106,25 @@ class ScheduledPost:
         try:
             info_msg(f"⏰ Waktu posting! Memproses jadwal ID {schedule_id}...")
             
-            if post_type == 'photo':
-                self.client.photo_upload(file_path, caption=caption)
-            elif post_type == 'reel':
-                self.client.clip_upload(file_path, caption=caption)
+            # Jalur yang sama dengan publish daemon: klaim atomik dulu, jadi tidak pernah posting dobel
+            schedule = {"id": schedule_id, "file_path": file_path, "caption": caption, "post_type": post_type,
+                        "username": self.username}
+            status, error = run_schedule(self.client, self.repo, schedule)
+            if status is None:
+                warning_msg(f"Jadwal ID {schedule_id} sudah diproses (daemon / proses lain)")
+                return
             
             # Update status schedule
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    schedule['status'] = 'posted'
-                    schedule['posted_at'] = datetime.now().isoformat()
-            
-            self.save_schedules()
-            success_msg(f"✅ Posting berhasil! (ID: {schedule_id})")
+            self._set_status(schedule_id, status, str(error) if error else None)
+            if status == 'posted':
+                success_msg(f"✅ Posting berhasil! (ID: {schedule_id})")
+                if self.username:
+                    get_sampler().start(self.client, self.username)  # kurva performa 5m..7h
+            else:
+                error_msg(f"❌ Error posting (ID: {schedule_id}): {str(error)}")
             
         except Exception as e:
             error_msg(f"❌ Error posting (ID: {schedule_id}): {str(e)}")
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    schedule['status'] = 'failed'
-                    schedule['error'] = str(e)
-            self.save_schedules()
 
     def start_background_scheduler(self):
         """Mulai background scheduler"""
@@ -135,6 +132,12 @@ class ScheduledPost:
             if self.scheduler.running:
                 warning_msg("Scheduler sudah berjalan!")
                 return False
+
+            daemon = daemon_status()
+            if daemon:
+                # Daemon tetap jalan walau menu ditutup; scheduler di proses menu tidak perlu
+                info_msg(f"Publish daemon @{daemon['username']} (PID {daemon['pid']}) sudah menjalankan antrian")
+                return False
             
             self.load_schedules()
             
@@ -191,8 +194,21 @@ class ScheduledPost:
             error_msg(f"Error stop scheduler: {str(e)}")
             return False
 
+    def suggest_slots(self, n=3):
+        """Slot posting terbaik berikutnya dari statistik engagement (tanpa fetch media)"""
+        if not self.username:
+            return []
+        try:
+            return get_recommender().next_best_slots(self.username, n=n)
+        except Exception as e:
+            warning_msg(f"Rekomendasi waktu tidak tersedia: {str(e)}")
+            return []
+
     def get_scheduler_status(self):
         """Cek status scheduler"""
+        daemon = daemon_status()
+        if daemon:
+            return f"🟢 DAEMON AKTIF (PID {daemon['pid']}, {daemon['pending']} jadwal pending)"
         if self.scheduler.running:
             return f"🟢 AKTIF ({len(self.scheduler.get_jobs())} job aktif)"
         else:
@@ -267,6 +283,28 @@ def scheduled_posting_menu(client, username):
 
         input(Fore.CYAN + "\nTekan Enter untuk lanjut..." + Style.RESET_ALL)
 
+def ask_post_time(scheduler):
+    """Tanya waktu posting; nomor rekomendasi (slot terbaik berikutnya) juga diterima"""
+    slots = scheduler.suggest_slots()
+    if slots:
+        print(Fore.GREEN + "\n⭐ Rekomendasi waktu (engagement terbaik, 95% CI):" + Style.RESET_ALL)
+        for i, slot in enumerate(slots, 1):
+            detail = f"{slot['ci'][0]:.0f}-{slot['ci'][1]:.0f}, {slot['posts']} post" if slot['ci'] else "belum ada data"
+            print(f"{i}. {slot['post_time']} ({slot['label']}, {detail})")
+
+    print(Fore.YELLOW + "\nFormat waktu: YYYY-MM-DD HH:MM" + (" atau nomor rekomendasi" if slots else ""))
+    print("Contoh: 2025-11-11 14:30" + Style.RESET_ALL)
+    post_time = input(Fore.YELLOW + "Waktu posting: " + Style.RESET_ALL).strip()
+
+    if post_time.isdigit() and 1 <= int(post_time) <= len(slots):
+        return slots[int(post_time) - 1]['post_time']
+    try:
+        datetime.strptime(post_time, "%Y-%m-%d %H:%M")
+    except ValueError:
+        error_msg("Format waktu tidak valid!")
+        return None
+    return post_time
+
 def schedule_photo(scheduler):
     """Jadwalkan posting foto"""
     try:
@@ -275,8 +313,7 @@ def schedule_photo(scheduler):
             error_msg(f"Folder {posts_folder} tidak ditemukan")
             return
 
-        image_files = [f for f in os.listdir(posts_folder) 
-                      if f.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp'))]
+        image_files = [e['name'] for e in get_library().list_media(posts_folder, kind="image")]
 
         if not image_files:
             warning_msg(f"Tidak ada file di folder {posts_folder}")
@@ -300,14 +337,8 @@ def schedule_photo(scheduler):
 
         caption = input(Fore.YELLOW + "\nCaption: " + Style.RESET_ALL).strip()
         
-        print(Fore.YELLOW + "\nFormat waktu: YYYY-MM-DD HH:MM")
-        print("Contoh: 2025-11-11 14:30" + Style.RESET_ALL)
-        post_time = input(Fore.YELLOW + "Waktu posting: " + Style.RESET_ALL).strip()
-
-        try:
-            datetime.strptime(post_time, "%Y-%m-%d %H:%M")
-        except ValueError:
-            error_msg("Format waktu tidak valid!")
+        post_time = ask_post_time(scheduler)
+        if not post_time:
             return
 
         if scheduler.add_schedule(file_path, caption, post_time, "photo"):
@@ -324,16 +355,17 @@ def schedule_reel(scheduler):
             error_msg(f"Folder {reels_folder} tidak ditemukan")
             return
 
-        video_files = [f for f in os.listdir(reels_folder) 
-                      if f.lower().endswith(('.mp4', '.mov', '.avi'))]
+        video_entries = get_library().list_media(reels_folder, kind="video")
+        video_files = [e['name'] for e in video_entries]
 
         if not video_files:
             warning_msg(f"Tidak ada file di folder {reels_folder}")
             return
 
         print(Fore.YELLOW + "\n📁 Pilih reels:" + Style.RESET_ALL)
-        for i, file in enumerate(video_files, 1):
-            print(f"{i}. {file}")
+        for i, entry in enumerate(video_entries, 1):
+            duration = f" ({entry['duration']:.0f}s)" if entry['duration'] else ""
+            print(f"{i}. {entry['name']}{duration}")
         
         choice = input(Fore.MAGENTA + "\nPilih reels (nomor): " + Style.RESET_ALL).strip()
         try:
@@ -349,14 +381,8 @@ def schedule_reel(scheduler):
 
         caption = input(Fore.YELLOW + "\nCaption: " + Style.RESET_ALL).strip()
         
-        print(Fore.YELLOW + "\nFormat waktu: YYYY-MM-DD HH:MM")
-        print("Contoh: 2025-11-11 14:30" + Style.RESET_ALL)
-        post_time = input(Fore.YELLOW + "Waktu posting: " + Style.RESET_ALL).strip()
-
-        try:
-            datetime.strptime(post_time, "%Y-%m-%d %H:%M")
-        except ValueError:
-            error_msg("Format waktu tidak valid!")
+        post_time = ask_post_time(scheduler)
+        if not post_time:
             return
 
         if scheduler.add_schedule(file_path, caption, post_time, "reel"):
@@ -6,102 +6,51 @@ Pantau login activity & detect suspicious activity
 
 from banner import show_separator, success_msg, error_msg, info_msg, warning_msg
 from colorama import Fore, Style
-import json
-import os
-from datetime import datetime, timedelta
+import time
+from core.login_events import get_login_events, WINDOWS
 
 class LoginMonitor:
-    def __init__(self):
-        self.log_file = "data/login_activity.json"
-        self.load_logs()
-
-    def load_logs(self):
-        """Load login logs"""
-        os.makedirs("data", exist_ok=True)
-
-        if os.path.exists(self.log_file):
-            try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    self.logs = json.load(f)
-            except:
-                self.logs = {}
-        else:
-            self.logs = {}
-
-    def save_logs(self):
-        """Save login logs"""
-        try:
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                json.dump(self.logs, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            warning_msg(f"Error save logs: {str(e)}")
+    def __init__(self, events=None):
+        # Event login sekarang append-only di data/login_events.jsonl (lihat core/login_events.py)
+        # Alert ke console sudah dipasang sekali oleh get_login_events(), menu tidak mendaftar ulang
+        self.events = events or get_login_events()
 
-    def log_login(self, username, device_info="Web", location="Unknown"):
+    def log_login(self, username, device_info="Web", location="Unknown", status="success"):
         """Log login activity"""
         try:
-            if username not in self.logs:
-                self.logs[username] = []
-
-            login_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'device': device_info,
-                'location': location,
-                'status': 'success'
-            }
-
-            self.logs[username].append(login_entry)
-
-            # Keep only last 100 logins per account
-            if len(self.logs[username]) > 100:
-                self.logs[username] = self.logs[username][-100:]
-
-            self.save_logs()
-
+            return self.events.record(username, status=status, device=device_info, location=location)
         except Exception as e:
             warning_msg(f"Error log login: {str(e)}")
+            return []
 
     def check_suspicious_activity(self, username, threshold=5):
         """Check suspicious activity (multiple failed logins)"""
         try:
-            if username not in self.logs:
-                return False
-
-            # Check last 1 hour
-            now = datetime.now()
-            one_hour_ago = now - timedelta(hours=1)
-
-            recent_logins = [
-                log for log in self.logs[username]
-                if datetime.fromisoformat(log['timestamp']) > one_hour_ago
-            ]
-
-            # Count failed attempts
-            failed_count = len([l for l in recent_logins if l['status'] == 'failed'])
-
-            if failed_count >= threshold:
-                return True
-
-            return False
+            # Counter sliding window 1 jam, tanpa parse ulang histori
+            return self.events.failed_count(username, "hour") >= threshold
 
         except Exception as e:
             warning_msg(f"Error check activity: {str(e)}")
             return False
 
-    def get_login_history(self, username, limit=20):
-        """Get login history untuk akun"""
+    def get_login_history(self, username, limit=20, cursor=None, **filters):
+        """
+        Get login history untuk akun (terbaru dulu), satu halaman dari index SQLite.
+        Return (history, next_cursor).
+        """
         try:
-            if username not in self.logs:
-                return []
+            if limit is None:
+                return list(self.events.store.query(username, **filters)), None
 
-            return self.logs[username][-limit:]
+            return self.events.store.page(username, cursor=cursor, limit=limit, **filters)
 
         except Exception as e:
             warning_msg(f"Error get history: {str(e)}")
-            return []
+            return [], None
 
-    def display_login_history(self, username):
-        """Display login history"""
-        history = self.get_login_history(username)
+    def display_login_history(self, username, **filters):
+        """Display login history (per halaman)"""
+        history, cursor = self.get_login_history(username, **filters)
 
         if not history:
             warning_msg("No login history")
@@ -111,40 +60,41 @@ class LoginMonitor:
         print(Fore.CYAN + f"\n📋 LOGIN HISTORY - @{username}" + Style.RESET_ALL)
         show_separator()
 
-        for i, log in enumerate(history[::-1], 1):  # Reverse untuk newest first
-            timestamp = log['timestamp'][:16]  # YYYY-MM-DD HH:MM
-            device = log['device']
-            location = log['location']
-            status = Fore.GREEN + "✅" if log['status'] == 'success' else Fore.RED + "❌"
-
-            print(f"\n{i}. {status}{Style.RESET_ALL}")
-            print(f"   Time: {timestamp}")
-            print(f"   Device: {device}")
-            print(f"   Location: {location}")
-
-    def export_login_logs(self, username):
-        """Export login logs to CSV"""
+        i = 0
+        while True:
+            for log in history:  # Newest first
+                i += 1
+                timestamp = log['timestamp'][:16]  # YYYY-MM-DD HH:MM
+                status = Fore.GREEN + "✅" if log['status'] == 'success' else Fore.RED + "❌"
+                flags = " [device baru]" if log['new_device'] else ""
+                flags += " [lokasi baru]" if log['new_location'] else ""
+
+                print(f"\n{i}. {status}{Style.RESET_ALL}{flags}")
+                print(f"   Time: {timestamp}")
+                print(f"   Device: {log['device']}")
+                print(f"   Location: {log['location']}")
+
+            if cursor is None:
+                break
+            more = input(Fore.MAGENTA + "\nTampilkan berikutnya? (y/n): " + Style.RESET_ALL).strip().lower()
+            if more != 'y':
+                break
+            history, cursor = self.get_login_history(username, cursor=cursor, **filters)
+
+    def _filters_last_days(self, days):
+        return {"since": time.time() - days * 86400}
+
+    def export_login_logs(self, username, fmt="csv", **filters):
+        """Export login logs ke CSV / JSONL (streaming dari index)"""
         try:
-            history = self.get_login_history(username, limit=None)
-
-            if not history:
+            if not self.events.store.count(username, **filters):
                 warning_msg("No logs to export")
                 return
 
-            filename = f"data/login_logs_{username}_{int(__import__('time').time())}.csv"
+            filename = f"data/login_logs_{username}_{int(time.time())}.{fmt}"
+            rows = self.events.store.export(filename, fmt, username, **filters)
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("Timestamp,Device,Location,Status\n")
-
-                for log in history:
-                    timestamp = log['timestamp']
-                    device = log['device']
-                    location = log['location']
-                    status = log['status']
-
-                    f.write(f"{timestamp},{device},{location},{status}\n")
-
-            success_msg(f"✅ Exported to {filename}")
+            success_msg(f"✅ Exported {rows} logs to {filename}")
 
         except Exception as e:
             error_msg(f"Error export: {str(e)}")
@@ -160,9 +110,10 @@ class LoginMonitor:
             print("1. 📋 View login history")
             print("2. 🔍 Check suspicious activity")
             print("3. 📊 Export logs")
+            print("4. 🕵️ Failed login dari device baru (30 hari)")
             print("0. ❌ Batal")
 
-            choice = input(Fore.MAGENTA + "\nPilih (0-3): " + Style.RESET_ALL).strip()
+            choice = input(Fore.MAGENTA + "\nPilih (0-4): " + Style.RESET_ALL).strip()
 
             if choice == '0':
                 return
@@ -171,14 +122,35 @@ class LoginMonitor:
                 self.display_login_history(username)
 
             elif choice == '2':
-                if self.check_suspicious_activity(username):
+                for window in WINDOWS:
+                    count = self.events.failed_count(username, window)
+                    limit = self.events.thresholds[window]
+                    color = Fore.RED if count >= limit else Fore.GREEN
+                    print(color + f"   Login gagal per {window}: {count}/{limit}" + Style.RESET_ALL)
+
+                if self.events.is_suspicious(username):
                     warning_msg("⚠️  SUSPICIOUS ACTIVITY DETECTED!")
-                    print("Multiple failed login attempts detected in last hour")
+                    print("Multiple failed login attempts detected")
                 else:
                     success_msg("✅ No suspicious activity detected")
 
+                alerts = [a for a in self.events.alerts if a['username'] == username]
+                if alerts:
+                    print(Fore.YELLOW + "\nAlert terakhir:" + Style.RESET_ALL)
+                    for alert in alerts[-5:]:
+                        print(f"   {alert['timestamp'][:16]} - {alert['type']}")
+
             elif choice == '3':
-                self.export_login_logs(username)
+                fmt = input(Fore.YELLOW + "Format (csv/jsonl) [csv]: " + Style.RESET_ALL).strip().lower() or "csv"
+                if fmt not in ("csv", "jsonl"):
+                    error_msg("Format tidak valid!")
+                    return
+                self.export_login_logs(username, fmt)
+
+            elif choice == '4':
+                filters = dict(self._filters_last_days(30), status='failed', new_device=True)
+                info_msg(f"Total: {self.events.store.count(username, **filters)} login gagal dari device baru")
+                self.display_login_history(username, **filters)
 
         except Exception as e:
             error_msg(f"Error: {str(e)}")
@@ -5,22 +5,17 @@ Tampilkan info akun Instagram, dengan detail email (jika ada)
 
 from banner import show_separator, success_msg, error_msg
 from colorama import Fore, Style
+from core.account_snapshot import load_account_snapshot
 
 def view_account_info(client, username):
     show_separator()
     print(Fore.CYAN + "\n👤 LIHAT INFO AKUN INSTAGRAM" + Style.RESET_ALL)
     show_separator()
     try:
-        # Akurat dan lebih lengkap ambil dari kedua API
-        user_info = client.user_info_by_username(username)
-        try:
-            account_info = client.account_info()
-            email = account_info.get("email", "")
-            # Kalau kosong, fallback
-            if not email and hasattr(user_info, "public_email"):
-                email = user_info.public_email or ""
-        except Exception:
-            email = getattr(user_info, "public_email", "") or ""
+        # Akurat dan lebih lengkap ambil dari kedua API (paralel, dipakai bersama layar statistik)
+        snapshot = load_account_snapshot(client, username)
+        user_info = snapshot.require("user_info")
+        email = snapshot.email  # account_info, fallback ke public_email
 
         # Info detail standard user
         print(Fore.CYAN + "\n╔════════════════════════════════════════════════════════╗")
@@ -33,7 +33,10 @@ except ImportError:
 
 from core.login_manager import LoginManager
 from core.analytics import Analytics
+from core.analytics_export import AnalyticsExporter
 from core.scheduler import MultiAccountScheduler
+from core.log_pipeline import setup_logging
+from core.housekeeping import get_housekeeper
 
 # --- IMPORT FEATURES ---
 from features.auto_like import AutoLike
@@ -43,15 +46,8 @@ from features.auto_story import AutoStory
 from features.auto_dm import AutoDM
 from features.target_scraper import TargetScraper
 
-# Setup Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/bot.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout) # Use stdout with utf-8 fix
-    ]
-)
+# Setup Logging (logs/bot.jsonl, rotasi + gzip, tulis file di thread terpisah)
+setup_logging(log_dir='logs', level=logging.INFO, console=True)
 logger = logging.getLogger(__name__)
 
 class BotController:
@@ -62,6 +58,11 @@ class BotController:
         for folder in ['data', 'data/scraped', 'logs', 'sessions']:
             Path(folder).mkdir(parents=True, exist_ok=True)
         
+        # Kompaksi data lama sebelum Analytics load stats.json, sisanya incremental di background
+        self.housekeeper = get_housekeeper()
+        self.housekeeper.run_once(budget_seconds=5)
+        self.housekeeper.start()
+
         self.login_manager = LoginManager()
         self.analytics = Analytics()
         self.scheduler = MultiAccountScheduler()
@@ -142,6 +143,14 @@ class BotController:
                     base_interval=45
                 )
 
+                # 3. Export analytics incremental (sekali sehari, hanya baris baru)
+                exporter = AnalyticsExporter(self.analytics)
+                self.scheduler.register_task(
+                    account['username'], "analytics_export",
+                    lambda: exporter.export_incremental_all(username=account['username']),
+                    base_interval=24 * 60
+                )
+
                 return True
             else:
                 return False
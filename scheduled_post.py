@@ -1,49 +1,177 @@
 #!/usr/bin/env python3
 """
-Scheduled Post IG - Integrasi Cronjob
-Jalankan ini via cron untuk post otomatis.
-Contoh post foto dengan caption.
+Scheduled Post IG - CLI untuk Publish Daemon
+Satu antrian (data/bot.db) untuk cron, menu Scheduled Posting & daemon.
+
+Contoh:
+    python scheduled_post.py daemon --username akunku        # jalan terus, Ctrl+C / SIGTERM untuk berhenti
+    python scheduled_post.py add foto.jpg "Caption" "2025-01-01 19:00" [--type reel] [--username akunku]
+    python scheduled_post.py list | status | stop
+    python scheduled_post.py cancel 12
+    python scheduled_post.py once --username akunku           # cron lama: proses jadwal jatuh tempo sekali
+    python scheduled_post.py random --username akunku         # cron lama: post foto random dari folder photos
 """
 
 import os
+import sys
 import random
+import logging
+import argparse
 from datetime import datetime
-from instagrapi import Client
-from dotenv import load_dotenv
 
-load_dotenv()
+from core.datastore import get_datastore
+from core.publish_daemon import PublishDaemon, PidLock, send_command, POST_TYPES, PID_FILE
+
+logger = logging.getLogger(__name__)
 
-# Config
-SESSION_FILE = "instagram_session.json"  # Dari login sebelumnya
-PHOTO_DIR = "photos"  # Folder foto untuk post
+PHOTO_DIR = "photos"  # Folder foto untuk mode random
 CAPTIONS = [
     "Caption random 1",
     "Caption random 2",
     # Tambah caption lu di sini
 ]
 
-def main():
-    if not os.path.exists(SESSION_FILE):
-        print("Session file tidak ada! Login dulu via dashboard.py")
+def _print_schedules(schedules):
+    if not schedules:
+        print("Tidak ada jadwal.")
         return
+    for s in schedules:
+        owner = f"@{s['username']}" if s.get("username") else "-"
+        print(f"[{s['id']:>4}] {s['post_time']}  {s['status']:<10} {s['post_type']:<5} {owner:<16} {s['file_path']}")
+
+def cmd_daemon(args):
+    from core.log_pipeline import setup_logging
+    setup_logging(log_dir="logs", level=logging.INFO, console=True)
+    daemon = PublishDaemon(args.username, tick=args.tick)
+    daemon.install_signal_handlers()
+    return 0 if daemon.serve() else 1
+
+def cmd_add(args):
+    post_time = datetime.strptime(args.post_time, "%Y-%m-%d %H:%M").strftime("%Y-%m-%d %H:%M")
+    response = send_command("add", file_path=os.path.abspath(args.file), caption=args.caption,
+                            post_time=post_time, post_type=args.type)
+    if response is None:
+        # Daemon tidak jalan: langsung ke antrian, diproses daemon / cron berikutnya
+        if not os.path.exists(args.file):
+            print(f"File tidak ditemukan: {args.file}")
+            return 1
+        schedule = get_datastore().schedules.add(os.path.abspath(args.file), args.caption, post_time,
+                                                 args.type, username=args.username)
+        print(f"Jadwal ditambahkan (ID: {schedule['id']}), daemon tidak aktif")
+        return 0
+    if not response["ok"]:
+        print(f"Gagal: {response['error']}")
+        return 1
+    print(f"Jadwal ditambahkan ke daemon (ID: {response['schedule']['id']})")
+    return 0
+
+def cmd_list(args):
+    response = send_command("list")
+    _print_schedules(response["schedules"] if response else get_datastore().schedules.all())
+    return 0
 
-    cl = Client()
-    cl.load_settings(SESSION_FILE)
+def cmd_status(args):
+    response = send_command("status")
+    if response is None:
+        pid = PidLock(PID_FILE).read_pid()
+        print("Publish daemon tidak aktif" + (f" (PID file basi: {pid})" if pid else ""))
+        print(f"Jadwal pending: {len(get_datastore().schedules.pending())}")
+        return 1
+    print(f"Publish daemon @{response['username']} aktif (PID {response['pid']}) sejak {response['started_at']}")
+    print(f"Pending: {response['pending']} | posted: {response['stats']['posted']} | failed: {response['stats']['failed']}")
+    if response["current"]:
+        print(f"Sedang upload: [{response['current']['id']}] {response['current']['file_path']}")
+    for lane, metric in response.get("lanes", {}).items():
+        if metric["requests"] or metric["waiting"]:
+            print(f"  lane {lane:<13} {metric['requests']:>5} req | antre {metric['waiting']} | "
+                  f"tunggu rata2 {metric['avg_wait']:.2f}s p95 {metric['p95_wait']:.2f}s maks {metric['max_wait']:.2f}s")
+    return 0
+
+def cmd_cancel(args):
+    response = send_command("cancel", id=args.id)
+    if response is None:
+        repo = get_datastore().schedules
+        schedule = repo.get(args.id)
+        ok = bool(schedule and schedule["status"] == "pending" and repo.delete(args.id))
+        response = {"ok": ok, "error": "Hanya jadwal pending yang bisa dibatalkan"}
+    print(f"Jadwal {args.id} dibatalkan" if response["ok"] else f"Gagal: {response['error']}")
+    return 0 if response["ok"] else 1
+
+def cmd_stop(args):
+    response = send_command("stop")
+    print("Publish daemon diminta berhenti" if response else "Publish daemon tidak aktif")
+    return 0 if response else 1
+
+def _run_once(username):
+    """Jalur cron: bangunkan daemon kalau ada, kalau tidak proses antrian sekali dengan session baru"""
+    if send_command("wake"):
+        print("Publish daemon aktif, antrian diproses oleh daemon")
+        return 0
+    if not username:
+        print("Daemon tidak aktif, --username wajib untuk memproses antrian")
+        return 1
+    daemon = PublishDaemon(username)
+    if not daemon.lock.acquire():
+        print("Publish daemon lain sedang jalan")
+        return 1
+    try:
+        processed = daemon.run_due()
+    finally:
+        daemon._flush()
+    print(f"{processed} jadwal diproses pada {datetime.now()}")
+    return 0
 
-    # Pilih random foto dari dir
-    photos = [f for f in os.listdir(PHOTO_DIR) if f.endswith(('.jpg', '.png'))]
+def cmd_once(args):
+    return _run_once(args.username)
+
+def cmd_random(args):
+    photos = [f for f in os.listdir(PHOTO_DIR) if f.endswith(('.jpg', '.png'))] if os.path.isdir(PHOTO_DIR) else []
     if not photos:
         print("Tidak ada foto di folder photos!")
-        return
+        return 1
+    photo_path = os.path.abspath(os.path.join(PHOTO_DIR, random.choice(photos)))
+    get_datastore().schedules.add(photo_path, random.choice(CAPTIONS), datetime.now().strftime("%Y-%m-%d %H:%M"),
+                                  "photo", username=args.username)
+    return _run_once(args.username)
 
-    photo_path = os.path.join(PHOTO_DIR, random.choice(photos))
-    caption = random.choice(CAPTIONS)
+def build_parser():
+    parser = argparse.ArgumentParser(description="Publish daemon & antrian posting terjadwal")
+    sub = parser.add_subparsers(dest="command")
 
-    try:
-        cl.photo_upload(photo_path, caption=caption)
-        print(f"Post berhasil pada {datetime.now()}")
-    except Exception as e:
-        print(f"Error post: {str(e)}")
+    daemon = sub.add_parser("daemon", help="Jalankan publish daemon (foreground)")
+    daemon.add_argument("--username", required=True)
+    daemon.add_argument("--tick", type=int, default=30, help="Detik antar cek antrian")
+    daemon.set_defaults(func=cmd_daemon)
+
+    add = sub.add_parser("add", help="Tambah jadwal")
+    add.add_argument("file")
+    add.add_argument("caption")
+    add.add_argument("post_time", help='Format "YYYY-MM-DD HH:MM"')
+    add.add_argument("--type", choices=POST_TYPES, default="photo")
+    add.add_argument("--username", help="Akun pemilik kalau daemon tidak aktif")
+    add.set_defaults(func=cmd_add)
+
+    sub.add_parser("list", help="Daftar jadwal").set_defaults(func=cmd_list)
+    sub.add_parser("status", help="Status daemon").set_defaults(func=cmd_status)
+    sub.add_parser("stop", help="Hentikan daemon dengan rapi").set_defaults(func=cmd_stop)
+
+    cancel = sub.add_parser("cancel", help="Batalkan jadwal pending")
+    cancel.add_argument("id", type=int)
+    cancel.set_defaults(func=cmd_cancel)
+
+    for name, func, help_text in (("once", cmd_once, "Proses jadwal jatuh tempo sekali (cron)"),
+                                  ("random", cmd_random, "Post foto random dari folder photos (cron)")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("--username")
+        command.set_defaults(func=func)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.command:
+        # Tanpa argumen (crontab lama): bangunkan daemon / proses antrian sekali
+        return _run_once(None)
+    return args.func(args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
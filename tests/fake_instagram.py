@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Fake instagrapi Client - offline, deterministik, untuk test & benchmark
+
+Implementasi subset instagrapi.Client yang dipakai fitur (user_medias, user_followers,
+direct_threads, photo_upload, clip_upload, hashtag_info_by_name, ...). Data dibuat
+dari seed (dataset ukuran bebas), latency & error rate bisa diatur.
+
+Contoh:
+    from tests.fake_instagram import FakeClient
+    client = FakeClient(users=5000, medias_per_user=50, latency=0.01, error_rate=0.05)
+    client.login("budi", "rahasia")
+    top_engagement(client, "budi")
+"""
+
+import os
+import time
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from instagrapi.exceptions import (
+    ClientError, PleaseWaitFewMinutes, UserNotFound, MediaNotFound, HashtagNotFound,
+)
+
+WORDS = [
+    "pagi", "kopi", "senja", "pantai", "gunung", "kuliner", "travel", "fashion", "ootd",
+    "sunset", "coffee", "weekend", "healing", "jakarta", "bali", "bandung", "foodie",
+    "photography", "love", "happy", "mood", "vibes", "music", "fitness", "nature",
+]
+
+# =====================================================
+# 📦 TYPES (nama atribut sama dengan instagrapi.types)
+# =====================================================
+@dataclass
+class UserShort:
+    pk: str
+    username: str
+    full_name: str = ""
+    profile_pic_url: Optional[str] = None
+    is_private: bool = False
+
+@dataclass
+class User:
+    pk: str
+    username: str
+    full_name: str
+    is_private: bool
+    is_verified: bool
+    is_business: bool
+    media_count: int
+    follower_count: int
+    following_count: int
+    biography: str = ""
+    external_url: Optional[str] = None
+    public_email: Optional[str] = None
+    profile_pic_url: Optional[str] = None
+
+@dataclass
+class Account:
+    pk: str
+    username: str
+    full_name: str
+    is_private: bool
+    is_verified: bool
+    biography: str = ""
+    external_url: Optional[str] = None
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+    profile_pic_url: Optional[str] = None
+
+    def dict(self):
+        return dict(self.__dict__)
+
+@dataclass
+class Media:
+    pk: str
+    id: str
+    code: str
+    taken_at: datetime
+    media_type: int
+    user: UserShort
+    like_count: int
+    comment_count: int
+    caption_text: str = ""
+    product_type: str = ""
+    view_count: int = 0
+    play_count: int = 0
+    location: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+
+@dataclass
+class Comment:
+    pk: str
+    text: str
+    user: UserShort
+    created_at_utc: datetime
+    like_count: int = 0
+
+    @property
+    def user_id(self):
+        return self.user.pk
+
+@dataclass
+class Story:
+    pk: str
+    id: str
+    code: str
+    taken_at: datetime
+    media_type: int
+    user: UserShort
+    view_count: int = 0
+    viewer_count: int = 0
+    reel_share_count: int = 0
+
+@dataclass
+class Hashtag:
+    id: str
+    name: str
+    media_count: int
+    profile_pic_url: Optional[str] = None
+
+@dataclass
+class DirectMessage:
+    id: str
+    user_id: str
+    thread_id: str
+    timestamp: datetime
+    item_type: str = "text"
+    text: Optional[str] = None
+
+@dataclass
+class DirectThread:
+    id: str
+    pk: str
+    users: List[UserShort]
+    messages: List[DirectMessage] = field(default_factory=list)
+    thread_title: str = ""
+
+# =====================================================
+# 🎲 DATASET
+# =====================================================
+class FakeDataset:
+    """
+    Dataset deterministik dari seed. User & media dibuat lazy per akun,
+    jadi dataset besar (puluhan ribu user) tetap murah dibuat.
+    """
+
+    def __init__(self, users=200, medias_per_user=30, followers=150, following=120,
+                 threads=20, hashtags=None, seed=42):
+        self.seed = seed
+        self.user_count = users
+        self.medias_per_user = medias_per_user
+        self.followers_per_user = min(followers, users - 1)
+        self.following_per_user = min(following, users - 1)
+        self.thread_count = threads
+        self.now = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+        self.hashtags = {
+            tag: Hashtag(id=str(17800000000 + i), name=tag, media_count=random.Random(seed + i).randint(500, 50_000_000))
+            for i, tag in enumerate(hashtags or WORDS)
+        }
+        self._medias = {}
+        self._graph = {}
+        self.deleted = set()
+        self.uploaded = []
+        self.incoming = {}  # media pk -> komentar masuk (add_comment)
+        self.story_viewers = {}  # story pk -> index user viewer (override yang deterministik)
+
+    def _rng(self, *key):
+        return random.Random(f"{self.seed}:{':'.join(map(str, key))}")
+
+    # --- users ---
+    def pk_for(self, index):
+        return str(1_000_000 + index)
+
+    def index_of(self, pk):
+        index = int(pk) - 1_000_000
+        if not 0 <= index < self.user_count:
+            raise UserNotFound(f"User {pk} not found")
+        return index
+
+    def username_of(self, index):
+        return f"user_{index:05d}"
+
+    def index_by_username(self, username):
+        if username.startswith("user_") and username[5:].isdigit() and int(username[5:]) < self.user_count:
+            return int(username[5:])
+        raise UserNotFound(f"User @{username} not found")
+
+    def user_short(self, index):
+        return UserShort(pk=self.pk_for(index), username=self.username_of(index), full_name=f"User {index}")
+
+    def user(self, index):
+        rng = self._rng("user", index)
+        return User(
+            pk=self.pk_for(index),
+            username=self.username_of(index),
+            full_name=f"User {index}",
+            is_private=rng.random() < 0.2,
+            is_verified=rng.random() < 0.02,
+            is_business=rng.random() < 0.3,
+            media_count=self.medias_per_user,
+            follower_count=self.followers_per_user + rng.randint(0, 5000),
+            following_count=self.following_per_user,
+            biography=" ".join(rng.sample(WORDS, 4)),
+            external_url=None,
+        )
+
+    # --- graph ---
+    def graph(self, index):
+        if index not in self._graph:
+            rng = self._rng("graph", index)
+            others = [i for i in range(self.user_count) if i != index] if self.user_count < 5000 else None
+            pick = (lambda k: rng.sample(others, k)) if others else \
+                (lambda k: list({rng.randrange(self.user_count) for _ in range(k * 2)} - {index})[:k])
+            self._graph[index] = (pick(self.followers_per_user), pick(self.following_per_user))
+        return self._graph[index]
+
+    # --- medias ---
+    def medias(self, index):
+        if index not in self._medias:
+            rng = self._rng("medias", index)
+            owner = self.user_short(index)
+            medias = []
+            for n in range(self.medias_per_user):
+                pk = str(3_000_000_000_000 + index * 10_000 + n)
+                tags = " ".join(f"#{w}" for w in rng.sample(WORDS, rng.randint(0, 5)))
+                likes = int(rng.lognormvariate(4, 1.2))
+                medias.append(Media(
+                    pk=pk,
+                    id=f"{pk}_{owner.pk}",
+                    code=f"C{pk[-8:]}",
+                    taken_at=self.now - timedelta(hours=n * 20 + rng.randint(0, 19)),
+                    media_type=rng.choice((1, 1, 1, 2, 8)),
+                    user=owner,
+                    like_count=likes,
+                    comment_count=int(likes * rng.uniform(0.01, 0.1)),
+                    caption_text=f"{' '.join(rng.sample(WORDS, 3))} {tags}".strip(),
+                    view_count=likes * rng.randint(3, 12),
+                ))
+            self._medias[index] = medias
+        return [m for m in self._medias[index] if m.id not in self.deleted]
+
+    def add_comment(self, media_id, user_index, text, when=None):
+        """Komentar baru dari user lain; comment_count media ikut naik seperti di Instagram"""
+        media = self.media(media_id)
+        incoming = self.incoming.setdefault(media.pk, [])
+        comment = Comment(pk=f"{media.pk}{900000 + len(incoming)}", text=text, user=self.user_short(user_index),
+                          created_at_utc=when or self.now + timedelta(minutes=len(incoming) + 1))
+        incoming.append(comment)
+        media.comment_count += 1
+        return comment
+
+    def media(self, media_id):
+        pk = str(media_id).split("_")[0]
+        if not pk.isdigit():
+            raise MediaNotFound(f"Media {media_id} not found")
+        index = (int(pk) - 3_000_000_000_000) // 10_000
+        for media in self.medias(index) if 0 <= index < self.user_count else []:
+            if media.pk == pk:
+                return media
+        raise MediaNotFound(f"Media {media_id} not found")
+
+# =====================================================
+# 🤖 FAKE CLIENT
+# =====================================================
+class FakeClient:
+    """
+    Pengganti instagrapi.Client tanpa network.
+
+    latency    : detik per request (angka) atau callable(method_name) -> detik
+    error_rate : peluang tiap request gagal dengan salah satu `errors`
+    calls      : Counter jumlah panggilan per method (untuk assertion)
+    """
+
+    def __init__(self, dataset=None, latency=0.0, error_rate=0.0, errors=(ClientError, PleaseWaitFewMinutes),
+                 seed=42, **dataset_kwargs):
+        self.dataset = dataset or FakeDataset(seed=seed, **dataset_kwargs)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.errors = errors
+        self.rng = random.Random(seed)
+        self.calls = Counter()
+        self.username = None
+        self.user_id = None
+        self._index = None
+        self.followed = set()
+        self.liked = set()
+        self.comments = {}
+        self.sent_messages = []
+        self.settings = {}
+
+    def _request(self, name):
+        self.calls[name] += 1
+        delay = self.latency(name) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            error = self.rng.choice(self.errors)
+            raise error(f"Fake {error.__name__} pada {name}")
+
+    def _me(self):
+        if self._index is None:
+            raise ClientError("Login dulu (FakeClient)")
+        return self._index
+
+    # --- auth & settings ---
+    def login(self, username, password, relogin=False, verification_code=""):
+        self._request("login")
+        self.username = username
+        self._index = 0  # akun sendiri = user index 0 di dataset
+        self.user_id = self.dataset.pk_for(0)
+        return True
+
+    def get_settings(self):
+        return dict(self.settings)
+
+    def set_settings(self, settings):
+        self.settings = dict(settings)
+        return True
+
+    def load_settings(self, path):
+        return self.settings
+
+    def dump_settings(self, path):
+        return True
+
+    def get_timeline_feed(self):
+        self._request("get_timeline_feed")
+        return {"feed_items": [{"media_or_ad": m.__dict__} for m in self.dataset.medias(1)[:10]]}
+
+    # --- users ---
+    def user_id_from_username(self, username):
+        self._request("user_id_from_username")
+        if username == self.username:
+            return self.user_id
+        return self.dataset.pk_for(self.dataset.index_by_username(username))
+
+    def user_info(self, user_id, use_cache=True):
+        self._request("user_info")
+        return self.dataset.user(self.dataset.index_of(str(user_id)))
+
+    user_info_v1 = user_info
+
+    def user_info_by_username(self, username, use_cache=True):
+        self._request("user_info_by_username")
+        if username == self.username:
+            return self.dataset.user(self._me())
+        return self.dataset.user(self.dataset.index_by_username(username))
+
+    def account_info(self):
+        self._request("account_info")
+        user = self.dataset.user(self._me())
+        return Account(pk=user.pk, username=self.username, full_name=user.full_name,
+                       is_private=user.is_private, is_verified=user.is_verified, biography=user.biography)
+
+    def account_edit(self, **data):
+        self._request("account_edit")
+        self.settings.setdefault("account_edits", []).append(data)
+        return self.account_info()
+
+    def search_users(self, query):
+        self._request("search_users")
+        return [self.dataset.user_short(i) for i in range(min(self.dataset.user_count, 50))
+                if query.lower() in self.dataset.username_of(i)][:10]
+
+    def _user_dict(self, indexes, amount):
+        indexes = indexes[:amount] if amount else indexes
+        return {self.dataset.pk_for(i): self.dataset.user_short(i) for i in indexes}
+
+    def user_followers(self, user_id, use_cache=True, amount=0):
+        self._request("user_followers")
+        return self._user_dict(self.dataset.graph(self.dataset.index_of(str(user_id)))[0], amount)
+
+    def user_following(self, user_id, use_cache=True, amount=0):
+        self._request("user_following")
+        index = self.dataset.index_of(str(user_id))
+        following = self._user_dict(self.dataset.graph(index)[1], amount)
+        if index == self._index:
+            following.update({pk: self.dataset.user_short(self.dataset.index_of(pk)) for pk in self.followed})
+        return following
+
+    def _page(self, items, amount, cursor):
+        start = int(cursor or 0)
+        end = start + amount if amount else len(items)
+        return items[start:end], str(end) if end < len(items) else ""
+
+    def user_followers_v1_chunk(self, user_id, max_amount=0, max_id=""):
+        self._request("user_followers_v1_chunk")
+        indexes, cursor = self._page(self.dataset.graph(self.dataset.index_of(str(user_id)))[0], max_amount, max_id)
+        return [self.dataset.user_short(i) for i in indexes], cursor
+
+    def user_following_v1_chunk(self, user_id, max_amount=0, max_id=""):
+        self._request("user_following_v1_chunk")
+        index = self.dataset.index_of(str(user_id))
+        following = list(self.dataset.graph(index)[1])
+        if index == self._index:
+            following += [self.dataset.index_of(pk) for pk in sorted(self.followed)]
+        indexes, cursor = self._page(following, max_amount, max_id)
+        return [self.dataset.user_short(i) for i in indexes], cursor
+
+    def user_follow(self, user_id):
+        self._request("user_follow")
+        self.dataset.index_of(str(user_id))
+        self.followed.add(str(user_id))
+        return True
+
+    def user_unfollow(self, user_id):
+        self._request("user_unfollow")
+        self.followed.discard(str(user_id))
+        return True
+
+    # --- medias ---
+    def user_medias(self, user_id, amount=0, sleep=None):
+        self._request("user_medias")
+        medias = self.dataset.medias(self.dataset.index_of(str(user_id)))
+        return medias[:amount] if amount else medias
+
+    def user_medias_v1(self, user_id, amount=0):
+        return self.user_medias(user_id, amount)
+
+    def user_medias_paginated_v1(self, user_id, amount=33, end_cursor=""):
+        self._request("user_medias_paginated_v1")
+        return self._page(self.dataset.medias(self.dataset.index_of(str(user_id))), amount, end_cursor)
+
+    def media_info(self, media_pk, use_cache=True):
+        self._request("media_info")
+        return self.dataset.media(media_pk)
+
+    def media_like(self, media_id, revert=False):
+        self._request("media_like")
+        self.dataset.media(media_id)
+        (self.liked.discard if revert else self.liked.add)(str(media_id))
+        return True
+
+    def media_comment(self, media_id, text, replied_to_comment_id=None):
+        self._request("media_comment")
+        self.dataset.media(media_id)
+        comment = Comment(pk=str(len(self.comments) + 1), text=text, user=self.dataset.user_short(self._me()),
+                          created_at_utc=self.dataset.now)
+        self.comments.setdefault(str(media_id), []).append(comment)
+        return comment
+
+    def media_likers(self, media_id):
+        self._request("media_likers")
+        media = self.dataset.media(media_id)
+        rng = self.dataset._rng("likers", media.pk)
+        count = min(media.like_count, self.dataset.user_count)
+        return [self.dataset.user_short(i) for i in rng.sample(range(self.dataset.user_count), count)]
+
+    def media_comments(self, media_id, amount=20):
+        self._request("media_comments")
+        media = self.dataset.media(media_id)
+        rng = self.dataset._rng("comments", media.pk)
+        incoming = self.dataset.incoming.get(media.pk, [])
+        comments = [
+            Comment(pk=f"{media.pk}{n}", text=" ".join(rng.sample(WORDS, 3)),
+                    user=self.dataset.user_short(rng.randrange(self.dataset.user_count)),
+                    created_at_utc=media.taken_at + timedelta(minutes=n + 1))
+            for n in range(media.comment_count - len(incoming))
+        ]
+        comments += incoming + self.comments.get(str(media_id), [])
+        comments.sort(key=lambda c: c.created_at_utc, reverse=True)  # halaman pertama API: terbaru dulu
+        return comments[:amount] if amount else comments
+
+    def comment_bulk_delete(self, media_id, comment_pks):
+        self._request("comment_bulk_delete")
+        media = self.dataset.media(media_id)
+        pks = {str(pk) for pk in comment_pks}
+        incoming = self.dataset.incoming.get(media.pk, [])
+        kept = [c for c in incoming if c.pk not in pks]
+        media.comment_count -= len(incoming) - len(kept)
+        self.dataset.incoming[media.pk] = kept
+        return True
+
+    def media_delete(self, media_id):
+        self._request("media_delete")
+        media = self.dataset.media(media_id)
+        self.dataset.deleted.add(media.id)
+        return True
+
+    def _upload(self, name, path, caption, media_type, product_type=""):
+        self._request(name)
+        if not os.path.exists(path):
+            raise ClientError(f"File tidak ada: {path}")
+        n = len(self.dataset.uploaded)
+        pk = str(9_000_000_000_000 + n)
+        media = Media(pk=pk, id=f"{pk}_{self.user_id}", code=f"U{n:08d}", taken_at=datetime.now(timezone.utc),
+                      media_type=media_type, user=self.dataset.user_short(self._me()), like_count=0,
+                      comment_count=0, caption_text=caption or "", product_type=product_type)
+        self.dataset.uploaded.append({"method": name, "path": str(path), "caption": caption, "media": media})
+        return media
+
+    # --- download (isi file deterministik per media) ---
+    def _download(self, name, media_pk, folder, suffix, extension):
+        self._request(name)
+        media = self.dataset.media(media_pk)
+        rng = self.dataset._rng("download", media.pk, suffix)
+        path = Path(folder or ".") / f"{media.user.username}_{media.pk}{suffix}.{extension}"
+        path.write_bytes(rng.randbytes(rng.randint(2_000, 12_000)))
+        return path
+
+    def photo_download(self, media_pk, folder=""):
+        return self._download("photo_download", media_pk, folder, "", "jpg")
+
+    def video_download(self, media_pk, folder=""):
+        return self._download("video_download", media_pk, folder, "", "mp4")
+
+    def album_download(self, media_pk, folder=""):
+        return [self._download("album_download", media_pk, folder, f"_{n}", "jpg") for n in range(3)]
+
+    def photo_upload(self, path, caption="", **kwargs):
+        return self._upload("photo_upload", path, caption, 1)
+
+    def clip_upload(self, path, caption="", **kwargs):
+        return self._upload("clip_upload", path, caption, 2, "clips")
+
+    def photo_upload_to_story(self, path, caption="", **kwargs):
+        return self._upload("photo_upload_to_story", path, caption, 1, "story")
+
+    def video_upload_to_story(self, path, caption="", **kwargs):
+        return self._upload("video_upload_to_story", path, caption, 2, "story")
+
+    def account_change_picture(self, path):
+        self._request("account_change_picture")
+        if not os.path.exists(path):
+            raise ClientError(f"File tidak ada: {path}")
+        return self.dataset.user_short(self._me())
+
+    # --- hashtags ---
+    def hashtag_info_by_name(self, name):
+        self._request("hashtag_info_by_name")
+        name = name.lstrip("#").lower()
+        if name not in self.dataset.hashtags:
+            raise HashtagNotFound(f"Hashtag #{name} not found")
+        return self.dataset.hashtags[name]
+
+    hashtag_info = hashtag_info_by_name
+
+    def hashtag_medias_recent(self, name, amount=27):
+        self._request("hashtag_medias_recent")
+        name = name.lstrip("#").lower()
+        found = []
+        for index in range(1, self.dataset.user_count):
+            found.extend(m for m in self.dataset.medias(index) if f"#{name}" in m.caption_text)
+            if len(found) >= amount:
+                break
+        return found[:amount]
+
+    def hashtag_medias_top(self, name, amount=9):
+        return sorted(self.hashtag_medias_recent(name, amount * 3), key=lambda m: -m.like_count)[:amount]
+
+    def hashtag_medias_v1(self, name, amount=27, tab_key=""):
+        if tab_key == "top":
+            return self.hashtag_medias_top(name, amount)
+        return self.hashtag_medias_recent(name, amount)
+
+    # --- stories ---
+    def user_stories(self, user_id, amount=None):
+        self._request("user_stories")
+        index = self.dataset.index_of(str(user_id))
+        rng = self.dataset._rng("stories", index)
+        owner = self.dataset.user_short(index)
+        stories = [
+            Story(pk=str(5_000_000 + index * 100 + n), id=f"{5_000_000 + index * 100 + n}_{owner.pk}",
+                  code=f"S{index}{n}", taken_at=self.dataset.now - timedelta(hours=n * 3), media_type=1,
+                  user=owner, view_count=rng.randint(10, 2000), viewer_count=rng.randint(10, 2000),
+                  reel_share_count=rng.randint(0, 20))
+            for n in range(rng.randint(0, 5))
+        ]
+        return stories[:amount] if amount else stories
+
+    def story_viewers(self, story_pk, amount=20):
+        self._request("story_viewers")
+        pk = str(story_pk).split("_")[0]
+        viewers = self.dataset.story_viewers.get(pk)
+        if viewers is None:
+            followers = self.dataset.graph((int(pk) - 5_000_000) // 100)[0]
+            rng = self.dataset._rng("story_viewers", pk)
+            viewers = sorted(rng.sample(followers, rng.randint(0, len(followers))))
+        users = [self.dataset.user_short(i) for i in viewers]
+        return users[:amount] if amount else users
+
+    def story_seen(self, story_pks, skipped_story_pks=None):
+        self._request("story_seen")
+        return True
+
+    def get_reels_tray(self):
+        self._request("get_reels_tray")
+        return {"tray": [{"user": self.dataset.user_short(i).__dict__} for i in self.dataset.graph(self._me())[1][:10]]}
+
+    # --- direct ---
+    def direct_threads(self, amount=20, selected_filter="", thread_message_limit=None):
+        self._request("direct_threads")
+        me = self._me()
+        threads = []
+        for n in range(min(amount or self.dataset.thread_count, self.dataset.thread_count)):
+            rng = self.dataset._rng("thread", n)
+            other = rng.randrange(1, self.dataset.user_count)
+            thread_id = str(340_000_000 + n)
+            messages = [
+                DirectMessage(id=f"{thread_id}{m}", user_id=self.dataset.pk_for(rng.choice((me, other))),
+                              thread_id=thread_id, timestamp=self.dataset.now - timedelta(minutes=m * 7 + n),
+                              text=" ".join(rng.sample(WORDS, 4)))
+                for m in range(rng.randint(1, 6))
+            ]
+            threads.append(DirectThread(id=thread_id, pk=thread_id, users=[self.dataset.user_short(other)],
+                                        messages=messages))
+        return threads
+
+    def direct_send(self, text, user_ids=None, thread_ids=None):
+        self._request("direct_send")
+        message = DirectMessage(id=str(len(self.sent_messages) + 1), user_id=self.user_id,
+                                thread_id=(thread_ids or ["new"])[0], timestamp=datetime.now(timezone.utc), text=text)
+        self.sent_messages.append({"text": text, "user_ids": user_ids, "thread_ids": thread_ids})
+        return message
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Account DB (koneksi bersama accounts.db, row mapping)
+
+Run:
+    python -m unittest tests.test_account_db -v
+"""
+
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from core.account_db import AccountDB, SCHEMA_VERSION, get_account_db
+
+
+class TestAccountDB(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = AccountDB(os.path.join(self.tmp, "accounts.db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_rows_are_mappings(self):
+        user_id = self.db.create_user("budi", "Budi", "budi@mail.com", "hash", "halo")
+        user = self.db.get_by_username("budi")
+        self.assertEqual(user["id"], user_id)
+        self.assertEqual(user["password"], "hash")
+        self.assertEqual(self.db.get_by_id(user_id)["bio"], "halo")
+        self.assertIsNone(self.db.get_by_username("nobody"))
+
+    def test_taken_checks_exclude_self(self):
+        user_id = self.db.create_user("budi", "Budi", "budi@mail.com", "hash")
+        self.assertTrue(self.db.username_taken("budi"))
+        self.assertFalse(self.db.username_taken("budi", exclude_id=user_id))
+        self.assertTrue(self.db.email_taken("budi@mail.com"))
+
+    def test_update_user(self):
+        user_id = self.db.create_user("budi", "Budi", "budi@mail.com", "hash")
+        updated_at = self.db.update_user(user_id, "name", "Budi S")
+        user = self.db.get_by_id(user_id)
+        self.assertEqual((user["name"], user["updated_at"]), ("Budi S", updated_at))
+        with self.assertRaises(ValueError):
+            self.db.update_user(user_id, "id; DROP TABLE users", 1)
+
+    def test_case_insensitive_email_check(self):
+        self.db.create_user("budi", "Budi", "budi@mail.com", "hash")
+        self.assertTrue(self.db.email_taken("Budi@Mail.com"))
+        plan = " ".join(r[3] for r in self.db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM users WHERE email = ? COLLATE NOCASE AND id != ?", ("x", 1)))
+        self.assertIn("idx_users_email", plan)
+
+    def test_profile_history(self):
+        user_id = self.db.create_user("budi", "Budi", "budi@mail.com", "hash")
+        self.db.update_user(user_id, "bio", "baru")
+        self.db.update_user(user_id, "password", "hash2")
+        history = self.db.profile_history(user_id)
+        self.assertEqual([h["field"] for h in history], ["password", "bio"])
+        self.assertEqual((history[1]["old_value"], history[1]["new_value"]), ("", "baru"))
+        self.assertIsNone(history[0]["new_value"])
+
+    def test_bulk_import_export_roundtrip(self):
+        rows = [
+            {"username": f"user{i}", "name": f"User {i}", "email": f"user{i}@mail.com", "password": "h"}
+            for i in range(5000)
+        ]
+        start = time.perf_counter()
+        self.assertEqual(self.db.import_users(rows), 5000)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+        for ext in ("csv", "json"):
+            path = os.path.join(self.tmp, f"registry.{ext}")
+            self.assertEqual(self.db.export_file(path), 5000)
+            other = AccountDB(os.path.join(self.tmp, f"copy_{ext}.db"))
+            self.assertEqual(other.import_file(path), 5000)
+            self.assertEqual(other.get_by_username("user42")["email"], "user42@mail.com")
+            other.close()
+
+    def test_bulk_import_is_atomic(self):
+        rows = [
+            {"username": "a", "name": "A", "email": "same@mail.com", "password": "h"},
+            {"username": "b", "name": "B", "email": "same@mail.com", "password": "h"},
+        ]
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.import_users(rows)
+        self.assertIsNone(self.db.get_by_username("a"))
+
+    def test_wal_mode(self):
+        mode = self.db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "accounts.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_legacy_db_is_upgraded(self):
+        # Database lama (sebelum ada schema_version), dibuat seperti AccountBot versi awal
+        conn = sqlite3.connect(self.path)
+        conn.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL, name TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL, password TEXT NOT NULL, bio TEXT, profile_picture TEXT,
+                created_at TEXT, updated_at TEXT
+            )""")
+        conn.execute("INSERT INTO users (username, name, email, password) VALUES ('lama', 'Lama', 'l@mail.com', 'h')")
+        conn.commit()
+        conn.close()
+
+        db = AccountDB(self.path)
+        self.assertEqual(db.schema_version(), SCHEMA_VERSION)
+        self.assertEqual(db.get_by_username("lama")["name"], "Lama")
+        tables = {r[0] for r in db.conn.execute("SELECT name FROM sqlite_master")}
+        self.assertTrue({"profile_history", "idx_users_username", "idx_users_email"} <= tables)
+        db.close()
+
+        # Buka lagi: tidak ada migrasi yang diulang
+        db = AccountDB(self.path)
+        self.assertEqual(db.conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0], SCHEMA_VERSION)
+        db.close()
+
+
+class TestAccountBotSharedConnection(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_bots_share_connection_and_login(self):
+        from account_bot import AccountBot
+        first, second = AccountBot(), AccountBot()
+        self.assertIs(first.db, second.db)
+        self.assertIs(first.db, get_account_db("accounts.db"))
+
+        first.db.create_user("budi", "Budi", "budi@mail.com", first.hash_password("rahasia"))
+        with mock.patch("builtins.input", side_effect=["budi", "rahasia"]), mock.patch("builtins.print"):
+            self.assertTrue(second.login())
+        self.assertEqual(second.current_user["email"], "budi@mail.com")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Account Snapshot (fetch paralel, memo TTL, dipakai bersama view_info & stats)
+
+Run:
+    python -m unittest tests.test_account_snapshot -v
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from instagrapi.exceptions import ClientError
+
+from core.account_snapshot import AccountOverviewLoader
+from tests.fake_instagram import FakeClient
+
+
+class TestAccountOverviewLoader(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient(users=50, medias_per_user=40, latency=0.1)
+        self.client.login("budi", "rahasia")
+        self.loader = AccountOverviewLoader(ttl=60)
+
+    def tearDown(self):
+        self.loader.shutdown()
+
+    def test_requests_run_concurrently(self):
+        start = time.perf_counter()
+        snapshot = self.loader.load(self.client, "budi")
+        self.assertLess(time.perf_counter() - start, 0.25)  # 3 request x 0.1 detik kalau serial
+        self.assertTrue(snapshot.complete)
+        self.assertEqual(snapshot.user_info.pk, self.client.user_id)
+        self.assertEqual(len(snapshot.medias), 30)
+
+    def test_memoized_until_ttl(self):
+        first = self.loader.load(self.client, "budi")
+        self.assertIs(self.loader.load(self.client, "budi"), first)
+        self.assertEqual(self.client.calls["user_info_by_username"], 1)
+
+        with mock.patch("core.account_snapshot.time.time", return_value=first.fetched_at + 61):
+            self.assertIsNot(self.loader.load(self.client, "budi"), first)
+        self.assertEqual(self.client.calls["user_info_by_username"], 2)
+        self.assertIsNot(self.loader.load(self.client, "budi", force=True), first)
+
+    def test_concurrent_callers_share_one_fetch(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.loader.load(self.client, "budi")))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.client.calls["user_medias"], 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_partial_failure(self):
+        with mock.patch.object(self.client, "account_info", side_effect=ClientError("login_required")):
+            snapshot = self.loader.load(self.client, "budi")
+        self.assertIn("account_info", snapshot.errors)
+        self.assertEqual(snapshot.email, snapshot.user_info.public_email or "")
+        self.assertIs(self.loader.load(self.client, "budi"), snapshot)  # profil & media lengkap -> tetap di-memo
+
+        with mock.patch.object(self.client, "user_medias_v1", side_effect=ClientError("feedback_required")):
+            broken = self.loader.load(self.client, "budi", force=True)
+        with self.assertRaises(ClientError):
+            broken.require("medias")
+        self.assertIsNot(self.loader.load(self.client, "budi"), broken)
+
+
+class TestScreensShareSnapshot(unittest.TestCase):
+    def test_view_info_then_stats(self):
+        from core import account_snapshot
+        from features.view_info import view_account_info
+        from features.analytics.stats_account import show_stats_overview
+
+        client = FakeClient(users=50, medias_per_user=40)
+        client.login("budi", "rahasia")
+        tmp, cwd = tempfile.mkdtemp(), os.getcwd()
+        os.chdir(tmp)  # layar stats menulis logs/ & data/bot.db relatif ke working directory
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        self.addCleanup(os.chdir, cwd)
+        with mock.patch.object(account_snapshot, "_shared_loader", AccountOverviewLoader()), \
+                mock.patch("builtins.print"), mock.patch("builtins.input", return_value=""):
+            view_account_info(client, "budi")
+            show_stats_overview(client, "budi")
+        self.assertEqual(client.calls["user_info_by_username"], 1)
+        self.assertEqual(client.calls["account_info"], 1)
+        self.assertEqual(client.calls["user_medias"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Analytics Export (streaming CSV/JSONL/Parquet, incremental)
+
+Run:
+    python -m unittest tests.test_analytics_export -v
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from core.analytics import Analytics
+from core.datastore import DataStore
+from core import analytics_export
+from core.analytics_export import AnalyticsExporter
+
+
+def make_media(media_id, caption="caption, with comma", likes=10):
+    return SimpleNamespace(
+        id=media_id, caption_text=caption, like_count=likes,
+        comment_count=1, media_type=1, taken_at=datetime(2025, 1, 1, 12),
+    )
+
+
+class TestAnalyticsExporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.analytics = Analytics(log_dir=os.path.join(self.tmp, "logs"), datastore=self.store)
+        self.exporter = AnalyticsExporter(self.analytics, os.path.join(self.tmp, "exports"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_csv_quotes_fields(self):
+        self.analytics.track_medias("me", [make_media(1, 'koma, "kutip"\nbaris baru')])
+        result = self.exporter.export("posts", "csv")
+        with open(result["path"], newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["caption"], 'koma, "kutip"\nbaris baru')
+
+    def test_incremental_appends_only_new_rows(self):
+        self.analytics.track_medias("me", [make_media(1), make_media(2)])
+        first = self.exporter.export("posts", "jsonl", incremental=True)
+        self.assertEqual(first["rows"], 2)
+
+        self.assertIsNone(self.exporter.export("posts", "jsonl", incremental=True))
+
+        self.analytics.track_medias("me", [make_media(3)])
+        second = self.exporter.export("posts", "jsonl", incremental=True)
+        self.assertEqual(second["rows"], 1)
+        self.assertEqual(first["path"], second["path"])
+        with open(second["path"], encoding="utf-8") as f:
+            ids = [json.loads(line)["media_id"] for line in f]
+        self.assertEqual(ids, ["1", "2", "3"])
+
+    def test_partial_line_is_left_for_next_run(self):
+        self.analytics.track_medias("me", [make_media(1)])
+        with open(self.analytics.post_history, "a", encoding="utf-8") as f:
+            f.write('{"username": "me", "media_id": "2"')
+        result = self.exporter.export("posts", "csv", incremental=True)
+        self.assertEqual(result["rows"], 1)
+
+        with open(self.analytics.post_history, "a", encoding="utf-8") as f:
+            f.write(', "likes": 3}\n')
+        result = self.exporter.export("posts", "csv", incremental=True)
+        self.assertEqual(result["rows"], 1)
+
+    def test_daily_incremental_skips_today(self):
+        self.store.analytics.increment("me", "2024-01-01", "likes")
+        self.store.analytics.increment("me", datetime.now().strftime("%Y-%m-%d"), "likes", 5)
+        result = self.exporter.export("daily", "csv", incremental=True)
+        self.assertEqual(result["rows"], 1)
+        self.assertIsNone(self.exporter.export("daily", "csv", incremental=True))
+        self.assertEqual(self.exporter.export("daily", "csv")["rows"], 2)
+
+    @unittest.skipUnless(analytics_export.pa is not None, "pyarrow tidak terinstall")
+    def test_parquet_parts(self):
+        self.analytics.track_medias("me", [make_media(i) for i in range(10)])
+        first = self.exporter.export("posts", "parquet", incremental=True)
+        self.analytics.track_medias("me", [make_media(99)])
+        second = self.exporter.export("posts", "parquet", incremental=True)
+        self.assertNotEqual(first["path"], second["path"])
+        table = analytics_export.pq.read_table(os.path.dirname(first["path"]))
+        self.assertEqual(table.num_rows, 11)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Backup Archive (chunk content-addressed, snapshot manifest, restore satu post, verify)
+
+Run:
+    python -m unittest tests.test_backup_archive -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core import request_broker
+from core.backup_search import BackupSearch
+from core.datastore import DataStore
+from features.discovery_growth.content_backup import ContentBackup
+from tests.fake_instagram import FakeClient
+
+
+class TestBackupArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        for target in ("time.sleep", "builtins.print"):
+            patcher = mock.patch(target, lambda *a, **k: None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(request_broker, "_shared_broker", request_broker.RequestBroker(rate=1e9, burst=1e9))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = FakeClient(users=10, medias_per_user=12)
+        self.client.login("user_00000", "rahasia")
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.addCleanup(self.store.close)
+        self.backup = ContentBackup(self.client, search=BackupSearch(self.store))
+        self.backup.backup_base = os.path.join(self.tmp, "backups")
+        self.archive = self.backup.get_archive("user_00000")
+
+    def test_second_backup_adds_only_new_bytes(self):
+        first = self.backup.download_posts("user_00000")
+        self.assertEqual((first["backed_up"], first["total_posts"]), (12, 12))
+        downloads = sum(self.client.calls[m] for m in ("photo_download", "video_download", "album_download"))
+        size = self.archive.blob_stats()
+
+        second = self.backup.download_posts("user_00000")
+        self.assertEqual((second["backed_up"], second["new_bytes"]), (0, 0))
+        self.assertEqual(sum(self.client.calls[m] for m in ("photo_download", "video_download", "album_download")),
+                         downloads)
+        self.assertEqual(self.archive.blob_stats(), size)
+        self.assertEqual(self.archive.snapshots(), [first["snapshot"], second["snapshot"]])
+        self.assertEqual(self.archive.load_snapshot(first["snapshot"])["posts"][0]["files"],
+                         self.archive.load_snapshot()["posts"][0]["files"])
+
+    def test_identical_content_is_stored_once(self):
+        path = os.path.join(self.tmp, "a.jpg")
+        with open(path, "wb") as f:
+            f.write(b"x" * 1000)
+        entry, written = self.archive.put_file(path)
+        again, written_again = self.archive.put_file(path, name="b.jpg")
+        self.assertEqual((written, written_again), (1000, 0))
+        self.assertEqual(entry["chunks"], again["chunks"])
+        self.assertEqual(self.archive.blob_stats(), {"blobs": 1, "bytes": 1000})
+
+    def test_restore_single_post(self):
+        self.backup.download_posts("user_00000")
+        media = next(m for m in self.client.dataset.medias(0) if m.media_type == 8)
+        restored = self.archive.restore_post(media.id, os.path.join(self.tmp, "restore"))
+        self.assertEqual(len(restored), 3)
+
+        os.makedirs(os.path.join(self.tmp, "asli"))
+        originals = self.client.album_download(media.pk, os.path.join(self.tmp, "asli"))
+        for original, path in zip(originals, restored):
+            with open(original, "rb") as a, open(path, "rb") as b:
+                self.assertEqual(a.read(), b.read())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "restore", media.id, "metadata.json")))
+        with self.assertRaises(ValueError):
+            self.archive.restore_post("tidak_ada", self.tmp)
+
+    def test_verify_finds_corrupt_and_missing_chunks(self):
+        self.backup.download_posts("user_00000")
+        result = self.archive.verify(workers=2)
+        self.assertGreaterEqual(result["checked"], 12)
+        self.assertEqual((result["corrupt"], result["missing"]), ([], []))
+
+        corrupt, missing = sorted(self.archive.referenced())[:2]
+        with open(self.archive.blob_path(corrupt), "r+b") as f:
+            first = f.read(1)
+            f.seek(0)
+            f.write(bytes([first[0] ^ 0xFF]))
+        os.remove(self.archive.blob_path(missing))
+        result = self.archive.verify(workers=2)
+        self.assertEqual((result["corrupt"], result["missing"]), ([corrupt], [missing]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
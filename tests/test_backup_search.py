@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Backup Search (index FTS5 post yang sudah di-backup, update inkremental per snapshot)
+
+Run:
+    python -m unittest tests.test_backup_search -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.backup_archive import BackupArchive
+from core.backup_search import BackupSearch, build_match
+from core.datastore import DataStore
+
+
+def post(media_id, caption, likes=0, comments=0, location=None, timestamp="2024-01-01T10:00:00"):
+    return {"id": media_id, "type": "photo", "caption": caption, "likes": likes, "comments": comments,
+            "timestamp": timestamp, "location": location, "files": []}
+
+
+class TestBackupSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.search = BackupSearch(self.store, backup_base=os.path.join(self.tmp, "backups"))
+        self.archive = BackupArchive(os.path.join(self.tmp, "backups", "budi", "archive"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _ids(self, *args, **kwargs):
+        return [row["media_id"] for row in self.search.search("budi", *args, **kwargs)]
+
+    def test_ranked_search_with_filters(self):
+        self.archive.write_snapshot("budi", [
+            post("a", "Sunset di pantai Kuta #bali #sunset", 500, location="Kuta Beach", timestamp="2023-05-01T18:00:00"),
+            post("b", "Ngopi pagi #kopi", 80, timestamp="2024-02-01T07:00:00"),
+            post("c", "Pantai lagi, pantai terus! Pantai Sanur #bali", 120, timestamp="2024-03-01T17:00:00"),
+            post("d", "Kopi susu gula aren #kopisusu", 300, location="Café Pantai", timestamp="2024-04-01T09:00:00"),
+        ])
+        self.assertEqual(self.search.sync("budi"), 4)
+
+        self.assertEqual(self._ids("pantai")[0], "c")            # caption berbobot paling tinggi
+        self.assertEqual(self._ids("pantai")[-1], "d")           # hanya cocok di lokasi
+        self.assertEqual(sorted(self._ids("#bali")), ["a", "c"])
+        self.assertEqual(self._ids("#kopi"), ["b"])              # bukan #kopisusu
+        self.assertEqual(sorted(self._ids("#kopi*")), ["b", "d"])
+        self.assertEqual(self._ids("cafe"), ["d"])               # diakritik diabaikan
+        self.assertEqual(self._ids("pantai", since="2024-01-01", min_likes=200), ["d"])
+        self.assertEqual(self._ids("", until="2024-01-01"), ["a"])
+        self.assertEqual(self._ids(""), ["d", "c", "b", "a"])    # tanpa teks: terbaru dulu
+        self.assertIn("[Pantai]", self.search.search("budi", "pantai")[0]["snippet"])
+        self.assertEqual(self._ids('pantai" OR "kopi'), [])      # query mentah tidak jadi sintaks FTS
+
+    def test_incremental_update_per_snapshot(self):
+        self.archive.write_snapshot("budi", [post("a", "Liburan ke Lombok #travel", 10), post("b", "Makan siang", 5)])
+        self.assertEqual(self.search.sync("budi"), 2)
+        self.assertEqual(self.search.sync("budi"), 0)            # snapshot sama tidak di-index ulang
+
+        # snapshot berikutnya: a dapat likes, caption b diedit, c post baru
+        self.archive.write_snapshot("budi", [post("a", "Liburan ke Lombok #travel", 90), post("b", "Makan malam"),
+                                             post("c", "Lombok lagi #travel")])
+        self.assertEqual(self.search.sync("budi"), 3)
+        self.assertEqual(self._ids("siang"), [])
+        self.assertEqual(self._ids("malam"), ["b"])
+        self.assertEqual(self.search.search("budi", "lombok", min_likes=50)[0]["likes"], 90)
+        self.assertEqual(self.search.repo.count("budi"), 3)
+
+        self.archive.write_snapshot("budi", [post("c", "Lombok lagi #travel")])  # a & b dihapus dari akun
+        self.search.sync("budi")
+        self.assertEqual(sorted(self._ids("lombok")), ["a", "c"])  # yang dihapus tetap bisa dicari di backup
+
+    def test_build_match(self):
+        self.assertIsNone(build_match("  "))
+        self.assertEqual(build_match('#Kopi pagi* "x'), 'hashtags : "Kopi" "pagi"* """x"')
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
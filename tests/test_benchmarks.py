@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - hot path analytics, scheduling, backup (+ search), notifikasi, followers, hashtag cache
+
+Butuh pytest-benchmark (pip install pytest-benchmark). Tanpa plugin, file ini di-skip.
+Hasil dibandingkan dengan tests/benchmark_baseline.json; lebih lambat dari
+baseline * (1 + threshold) -> test gagal (hanya lokal, di-skip kalau env CI di-set).
+
+Run:
+    python -m pytest tests/test_benchmarks.py
+    BENCH_UPDATE_BASELINE=1 python -m pytest tests/test_benchmarks.py   # tulis ulang baseline
+    BENCH_THRESHOLD=0.5 python -m pytest tests/test_benchmarks.py       # toleransi 50%
+    BENCH_CASSETTE=data/cassettes/akun.jsonl.gz python -m pytest tests/test_benchmarks.py  # + replay trafik asli
+"""
+
+import os
+import json
+import builtins
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from tests.fake_instagram import FakeClient
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+UPDATE_BASELINE = os.environ.get("BENCH_UPDATE_BASELINE") == "1"
+CASSETTE = os.environ.get("BENCH_CASSETTE")  # rekaman tools/record_cassette.py
+CASSETTE_TIME_SCALE = float(os.environ.get("BENCH_CASSETTE_TIME_SCALE", "0"))  # 1 = latency asli
+
+def _load_baseline():
+    try:
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"threshold": 0.5, "benchmarks": {}}
+
+BASELINE = _load_baseline()
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", BASELINE.get("threshold", 0.5)))
+_results = {}
+
+def check_baseline(benchmark):
+    """Catat mean hasil benchmark dan gagal kalau regresi melewati threshold"""
+    if benchmark.stats is None:  # --benchmark-disable
+        return
+    mean = benchmark.stats.stats.mean
+    _results[benchmark.name] = mean
+    baseline = BASELINE["benchmarks"].get(benchmark.name)
+    if UPDATE_BASELINE or baseline is None or os.environ.get("CI"):
+        return
+    if mean > baseline * (1 + THRESHOLD):
+        pytest.fail(
+            f"Regresi {benchmark.name}: {mean * 1e3:.2f} ms vs baseline {baseline * 1e3:.2f} ms "
+            f"(threshold {THRESHOLD:.0%})"
+        )
+
+def teardown_module(module):
+    if UPDATE_BASELINE and _results:
+        BASELINE["benchmarks"].update({name: round(mean, 9) for name, mean in _results.items()})
+        BASELINE["benchmarks"] = dict(sorted(BASELINE["benchmarks"].items()))
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(BASELINE, f, indent=2)
+            f.write("\n")
+
+# =====================================================
+# 🧰 FIXTURES
+# =====================================================
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Fitur nulis ke path relatif (data/, logs/, backups/) -> jalankan di tmp, tanpa output"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(builtins, "print", lambda *a, **k: None)
+    monkeypatch.setattr(builtins, "input", lambda *a, **k: "")
+    monkeypatch.setattr("time.sleep", lambda *a: None)
+    # Budget request broker tidak ikut diukur (sama seperti sleep di atas)
+    from core.request_broker import RequestBroker
+    monkeypatch.setattr("core.request_broker._shared_broker", RequestBroker(rate=1e9, burst=1e9))
+    return tmp_path
+
+@pytest.fixture
+def client():
+    client = FakeClient(users=20_000, medias_per_user=500, followers=5000, following=5000,
+                        hashtags=[f"tag{i}" for i in range(2000)])
+    client.login("budi", "rahasia")
+    return client
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+# =====================================================
+# 📊 ANALYTICS
+# =====================================================
+def test_analytics_track_action(benchmark, workdir):
+    from core.analytics import Analytics
+    days = [(datetime(2024, 1, 1) + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(365)]
+    counters = {"likes": 10, "follows": 5, "comments": 3, "stories": 1, "dms": 0, "errors": 0}
+    _write_json("logs/stats.json", {f"user{u}": {day: dict(counters) for day in days} for u in range(20)})
+    _write_json("logs/activity_log.json", {
+        f"user{u}": [{"time": "2024-01-01T00:00:00", "action": "like", "success": True,
+                      "details": {"username": f"user{u}", "target": "x"}}] * 1000
+        for u in range(20)
+    })
+    analytics = Analytics(log_dir="logs")
+    benchmark.pedantic(analytics.track_action, args=("like", True, {"username": "user0", "target": "x"}),
+                       rounds=30)
+    check_baseline(benchmark)
+
+# =====================================================
+# ⏰ SCHEDULED POSTING (10k jadwal)
+# =====================================================
+@pytest.fixture
+def schedules(workdir):
+    pytest.importorskip("apscheduler")
+    open("photo.jpg", "wb").close()
+    _write_json("scheduled_posts.json", [
+        {"id": i + 1, "file_path": "photo.jpg", "caption": f"caption {i}",
+         "post_time": f"2025-11-11 {i % 24:02d}:{i % 60:02d}", "post_type": "photo",
+         "created_at": "2025-11-01T00:00:00", "status": "pending"}
+        for i in range(10_000)
+    ])
+    return workdir
+
+def test_scheduled_add(benchmark, schedules):
+    from features.scheduled_posting import ScheduledPost
+    scheduler = ScheduledPost()
+    benchmark.pedantic(scheduler.add_schedule, args=("photo.jpg", "baru", "2025-12-01 10:00"), rounds=10)
+    check_baseline(benchmark)
+
+def test_scheduled_list(benchmark, schedules):
+    from features.scheduled_posting import ScheduledPost
+    scheduler = ScheduledPost()
+    benchmark.pedantic(scheduler.list_schedules, rounds=10)
+    check_baseline(benchmark)
+
+def test_scheduled_start(benchmark, schedules):
+    from features.scheduled_posting import ScheduledPost
+    started = []
+
+    def setup():
+        started.append(ScheduledPost())
+        return (started[-1],), {}
+
+    try:
+        benchmark.pedantic(lambda s: s.start_background_scheduler(), setup=setup, rounds=3)
+    finally:
+        for scheduler in started:
+            if scheduler.scheduler.running:
+                scheduler.scheduler.shutdown(wait=False)
+    check_baseline(benchmark)
+
+# =====================================================
+# 📥 CONTENT BACKUP
+# =====================================================
+def test_content_backup_download_posts(benchmark, workdir, client):
+    from features.discovery_growth.content_backup import ContentBackup
+    backup = ContentBackup(client)
+    backup.download_posts("budi")  # backup penuh pertama; yang diukur backup harian berikutnya
+    benchmark.pedantic(backup.download_posts, args=("budi",), rounds=5)
+    check_baseline(benchmark)
+
+def test_backup_search(benchmark, workdir):
+    import random
+    from core.backup_archive import BackupArchive
+    from core.backup_search import BackupSearch
+    from core.datastore import get_datastore
+    rng = random.Random(7)
+    words = [f"kata{i}" for i in range(3000)] + ["pantai", "kopi", "sunset"]
+    BackupArchive("backups/budi/archive").write_snapshot("budi", [
+        {"id": str(i), "type": "photo", "caption": " ".join(rng.choices(words, k=20)) + f" #{rng.choice(words)}",
+         "likes": rng.randint(0, 1000), "comments": rng.randint(0, 50), "timestamp": f"2023-{i % 12 + 1:02d}-10",
+         "location": None}
+        for i in range(20_000)
+    ])
+    search = BackupSearch(get_datastore())
+    search.sync("budi")
+    benchmark.pedantic(search.search, args=("budi", "pantai kopi"), rounds=100)
+    check_baseline(benchmark)
+
+# =====================================================
+# 🔔 NOTIFICATIONS
+# =====================================================
+def test_notification_add(benchmark, workdir):
+    from features.notifications.notification_system import NotificationSystem
+    system = NotificationSystem(client=None)
+    for i in range(system.config["max_notifications"]):
+        system.add_notification("new_dm", {"from": f"user{i}", "preview": "halo", "thread_id": str(i)})
+    benchmark.pedantic(system.add_notification, args=("new_dm", {"from": "x", "preview": "y", "thread_id": "1"}),
+                       rounds=100)
+    check_baseline(benchmark)
+
+# =====================================================
+# 👥 FOLLOWERS ANALYSIS
+# =====================================================
+def test_followers_not_followback(benchmark, workdir, client):
+    from features.analytics.followers_analysis import list_not_followback
+    benchmark.pedantic(list_not_followback, args=(client, "budi"), rounds=10)
+    check_baseline(benchmark)
+
+def test_followers_unfollowers(benchmark, workdir, client):
+    from features.analytics.followers_analysis import list_unfollowers
+    benchmark.pedantic(list_unfollowers, args=(client, "budi"), rounds=10)
+    check_baseline(benchmark)
+
+# =====================================================
+# #️⃣ HASHTAG CACHE
+# =====================================================
+def test_hashtag_cache_miss(benchmark, workdir, client):
+    from features.discovery_growth.hashtag_research import HashtagResearch
+    _write_json("data/hashtag_cache.json", {
+        f"cached{i}": {"name": f"cached{i}", "posts": i, "searched": True, "timestamp": 0,
+                       "size": "MICRO (< 10K)", "difficulty": "EASY"}
+        for i in range(5000)
+    })
+    research = HashtagResearch(client)
+    tags = iter(f"tag{i}" for i in range(2000))
+    benchmark.pedantic(lambda: research.research_hashtag(next(tags)), rounds=100)
+    check_baseline(benchmark)
+
+def test_hashtag_cache_hit(benchmark, workdir, client):
+    from features.discovery_growth.hashtag_research import HashtagResearch
+    research = HashtagResearch(client)
+    research.research_hashtag("tag1")
+    benchmark.pedantic(research.research_hashtag, args=("tag1",), rounds=1000)
+    check_baseline(benchmark)
+
+# =====================================================
+# 📼 REPLAY CASSETTE (data asli, offline)
+# =====================================================
+@pytest.fixture
+def replay():
+    if not CASSETTE:
+        pytest.skip("BENCH_CASSETTE tidak di-set")
+    from core.cassette import replay_client
+    return replay_client(os.path.abspath(CASSETTE), time_scale=CASSETTE_TIME_SCALE)
+
+def test_replay_account_overview(benchmark, workdir, replay):
+    from core.account_snapshot import AccountOverviewLoader
+    loader = AccountOverviewLoader()
+    benchmark.pedantic(lambda: loader.load(replay, replay.username, force=True).require("medias"), rounds=5)
+    loader.shutdown()
+    assert not replay.cassette.misses, replay.cassette.misses
+
+def test_replay_followers_crawl(benchmark, workdir, replay):
+    from core.request_broker import lane_client, DEFAULT_PAGE_SIZE
+    client = lane_client(replay, "analytics")
+    pages = sum(1 for e in replay.cassette.entries if f"friendships/{replay.user_id}/followers" in e["key"])
+    if not pages:
+        pytest.skip("Cassette tidak berisi flow followers")
+    benchmark.pedantic(lambda: {u.pk for u in client.paginate("user_followers_v1_chunk", replay.user_id,
+                                                             limit=pages * DEFAULT_PAGE_SIZE)}, rounds=5)
+    assert not replay.cassette.misses, replay.cassette.misses
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Best Time (statistik per hari+jam, forward decay, interval kepercayaan, slot berikutnya)
+
+Run:
+    python -m unittest tests.test_best_time -v
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from core.analytics import Analytics
+from core.best_time import BestTimeRecommender, decay_weight
+from core.datastore import DataStore
+
+MONDAY = datetime(2025, 6, 2)  # Senin
+
+
+def media(media_id, taken_at, likes, comments=0):
+    return SimpleNamespace(id=media_id, taken_at=taken_at, like_count=likes, comment_count=comments)
+
+
+class TestBestTime(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.best = BestTimeRecommender(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_resnapshot_replaces_contribution(self):
+        taken = MONDAY.replace(hour=19)
+        self.assertTrue(self.best.observe("budi", "m1", taken, 100, 10))
+        self.assertFalse(self.best.observe("budi", "m1", taken, 100, 10))
+        self.best.observe("budi", "m1", taken, 300, 10)
+        slot = self.best.slot_stats("budi", now=taken)[(0, 19)]
+        self.assertEqual(slot["posts"], 1)
+        self.assertAlmostEqual(slot["mean"], 320)
+        self.assertEqual(self.store.post_timing.count("budi"), 1)
+
+    def test_matches_batch_weighted_mean(self):
+        posts = [(MONDAY.replace(hour=9) + timedelta(weeks=w), 50 + w * 10) for w in range(12)]
+        for i, (taken, likes) in enumerate(posts):
+            self.best.observe("budi", f"m{i}", taken, likes, 0)
+        weights = [decay_weight(t.timestamp()) for t, _ in posts]
+        expected = sum(w * x for w, (_, x) in zip(weights, posts)) / sum(weights)
+        slot = self.best.slot_stats("budi", now=posts[-1][0])[(0, 9)]
+        self.assertAlmostEqual(slot["mean"], expected, places=6)
+        self.assertGreater(slot["mean"], sum(x for _, x in posts) / len(posts))  # post baru lebih berat
+        self.assertLess(slot["ci"][0], slot["mean"])
+        self.assertGreater(slot["ci"][1], slot["mean"])
+
+    def test_recent_posts_outweigh_old_ones(self):
+        old = MONDAY - timedelta(weeks=39)  # ~6 half-life lalu
+        for i in range(5):
+            self.best.observe("budi", f"old{i}", old.replace(hour=8) + timedelta(weeks=i), 1000, 0)
+            self.best.observe("budi", f"a{i}", MONDAY.replace(hour=20) - timedelta(weeks=i), 400, 0)
+            self.best.observe("budi", f"b{i}", MONDAY.replace(hour=10) - timedelta(weeks=i), 200, 0)
+        best = self.best.best_slots("budi", n=3, now=MONDAY)
+        self.assertEqual([s["label"] for s in best], ["Senin 20:00", "Senin 08:00", "Senin 10:00"])
+        self.assertEqual(best[1]["mean"], 1000)  # rata-rata tertinggi, tapi datanya sudah basi
+        self.assertLess(best[1]["weight"], 0.1)
+
+    def test_next_best_slots_respects_gap_and_bookings(self):
+        for week in range(4):
+            base = MONDAY - timedelta(weeks=week + 1)
+            self.best.observe("budi", f"a{week}", base.replace(hour=19), 500, 20)        # Senin 19:00
+            self.best.observe("budi", f"b{week}", base.replace(hour=20), 450, 20)        # Senin 20:00
+            self.best.observe("budi", f"c{week}", (base + timedelta(days=2)).replace(hour=12), 300, 5)  # Rabu 12:00
+        start = MONDAY.replace(hour=6)
+
+        slots = self.best.next_best_slots("budi", n=2, start=start, booked=[])
+        self.assertEqual([s["post_time"] for s in slots], ["2025-06-02 19:00", "2025-06-04 12:00"])
+
+        booked = [datetime(2025, 6, 2, 18, 30)]
+        slots = self.best.next_best_slots("budi", n=1, start=start, booked=booked, min_gap_hours=3)
+        self.assertEqual(slots[0]["post_time"], "2025-06-04 12:00")
+
+        self.store.schedules.add("a.jpg", "", "2025-06-02 19:00", username="budi")
+        self.assertEqual(self.best.next_best_slots("budi", n=1, start=start)[0]["post_time"], "2025-06-04 12:00")
+        self.assertEqual(self.best.next_best_slots("sari", start=start), [])
+
+    def test_analytics_feeds_and_backfills(self):
+        log_dir = os.path.join(self.tmp, "logs")
+        os.makedirs(log_dir)
+        with open(os.path.join(log_dir, "post_history.jsonl"), "w", encoding="utf-8") as f:
+            for i in range(3):
+                f.write(json.dumps({"username": "budi", "media_id": f"h{i}", "likes": 10, "comments": 1,
+                                    "taken_at": MONDAY.replace(hour=7).isoformat()}) + "\n")
+
+        analytics = Analytics(log_dir=log_dir, datastore=self.store)
+        analytics.track_medias("budi", [media("baru", MONDAY.replace(hour=21), 90, 5)])
+        stats = analytics.best_time.slot_stats("budi", now=MONDAY)
+        self.assertEqual(stats[(0, 7)]["posts"], 3)
+        self.assertEqual(stats[(0, 21)]["posts"], 1)
+
+        # backfill hanya sekali
+        self.assertEqual(Analytics(log_dir=log_dir, datastore=self.store).best_time.backfill(analytics), 0)
+        self.assertEqual(self.store.post_timing.count("budi"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Cassette (rekam trafik instagrapi, scrub rahasia, replay offline dengan timing)
+
+Run:
+    python -m unittest tests.test_cassette -v
+"""
+
+import os
+import gzip
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+
+import requests
+from requests import Response
+from requests.adapters import BaseAdapter
+from instagrapi import Client
+
+from core.cassette import Cassette, RecordingAdapter, request_key, record, replay_client
+
+USER_ID = "4242"
+
+
+class StubNetwork(BaseAdapter):
+    """Pengganti jaringan saat merekam: jawab JSON per path, hitung request"""
+
+    def __init__(self, routes, elapsed=0.05):
+        super().__init__()
+        self.routes = routes
+        self.elapsed = elapsed
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        response = Response()
+        path = request.path_url.split("?")[0]
+        body = self.routes[path]
+        if callable(body):
+            body = body(request)
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Set-Cookie"] = "sessionid=RAHASIA-SESSION; Path=/"
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=self.elapsed)
+        return response
+
+    def close(self):
+        pass
+
+
+def _followers_page(request):
+    cursor = request.url.split("max_id=")[1].split("&")[0] if "max_id=" in request.url else ""
+    page = int(cursor or 0)
+    return {"users": [{"pk": str(page * 2 + i), "username": f"user{page * 2 + i}"} for i in range(2)],
+            "next_max_id": str(page + 1) if page < 2 else None, "status": "ok"}
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "cassettes", "budi.jsonl.gz")
+        self.network = StubNetwork({
+            "/api/v1/accounts/current_user/": {
+                "user": {"pk": USER_ID, "username": "budi", "email": "budi@mail.com", "phone_number": "0812"},
+                "status": "ok",
+            },
+            f"/api/v1/friendships/{USER_ID}/followers/": _followers_page,
+            "/foto.jpg": b"\xff\xd8" + b"\x00" * 64,
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _record(self):
+        client = Client()
+        client.request_timeout = 0
+        client.private.cookies.set("ds_user_id", USER_ID, domain=".instagram.com")
+        client.private.cookies.set("sessionid", "RAHASIA-SESSION", domain=".instagram.com")
+        client.username = "budi"
+        with record(client, self.path, inner=self.network) as recorder:
+            client.private_request("accounts/current_user/", params={"edit": "true"})
+            for cursor in ("", "1", "2"):
+                client.private_request(f"friendships/{USER_ID}/followers/",
+                                       params={"max_id": cursor, "rank_token": "acak", "password": "x"})
+            client.public.get("https://scontent.cdninstagram.com/foto.jpg")
+        self.assertNotIsInstance(client.private.get_adapter("https://i.instagram.com"), RecordingAdapter)
+        return recorder
+
+    def test_record_scrubs_secrets(self):
+        recorder = self._record()
+        self.assertEqual(len(self.network.sent), 5)
+        self.assertEqual(len(recorder.entries), 5)
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            raw = f.read()
+        for secret in ("RAHASIA-SESSION", "budi@mail.com", "0812", "password=x"):
+            self.assertNotIn(secret, raw)
+        meta = json.loads(raw.splitlines()[0])
+        self.assertEqual((meta["username"], meta["user_id"]), ("budi", USER_ID))
+        self.assertIn("body_b64", json.loads(raw.splitlines()[-1]))
+
+    def test_replay_serves_pages_in_order(self):
+        self._record()
+        client = replay_client(self.path, time_scale=0)
+        self.assertEqual(client.user_id, int(USER_ID))
+        self.assertEqual(client.private_request("accounts/current_user/", params={"edit": "true"})["user"]["email"],
+                         "***")
+
+        pages = [client.private_request(f"friendships/{USER_ID}/followers/",
+                                        params={"max_id": cursor, "rank_token": "lain"})
+                 for cursor in ("", "1", "2")]
+        self.assertEqual([p["next_max_id"] for p in pages], ["1", "2", None])
+        self.assertEqual(client.public.get("https://scontent.cdninstagram.com/foto.jpg").content[:2], b"\xff\xd8")
+        self.assertEqual(client.cassette.misses, [])
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.public.get("https://i.instagram.com/api/v1/tidak/direkam/")
+        self.assertEqual(len(client.cassette.misses), 1)
+
+    def test_replay_timing_scaled(self):
+        self._record()
+        for scale, low, high in ((1.0, 0.05, 0.5), (0.0, 0.0, 0.04)):
+            client = replay_client(self.path, time_scale=scale)
+            start = time.perf_counter()
+            client.private_request("accounts/current_user/", params={"edit": "true"})
+            self.assertTrue(low <= time.perf_counter() - start < high, scale)
+
+    def test_request_key_ignores_volatile_params(self):
+        self.assertEqual(
+            request_key("get", "https://i.instagram.com/api/v1/feed/?max_id=5&_uuid=a&rank_token=b"),
+            request_key("GET", "https://i.instagram.com/api/v1/feed/?rank_token=c&max_id=5&_uuid=d"),
+        )
+        self.assertNotEqual(request_key("GET", "https://x/feed/?max_id=5"), request_key("GET", "https://x/feed/?max_id=6"))
+
+    def test_exhausted_key_without_loop(self):
+        cassette = Cassette({}, [{"key": "GET x/a", "status": 200, "elapsed": 0}], loop=False)
+        self.assertIsNotNone(cassette.match("GET", "https://x/a"))
+        self.assertIsNone(cassette.match("GET", "https://x/a"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
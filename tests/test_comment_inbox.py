@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Comment Inbox (watermark per media, fetch hanya aktivitas baru, FTS5, moderasi)
+
+Run:
+    python -m unittest tests.test_comment_inbox -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core import request_broker
+from core.comment_inbox import CommentInbox
+from core.datastore import DataStore
+from tests.fake_instagram import FakeClient
+
+
+class TestCommentInbox(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.inbox = CommentInbox(self.store)
+        patcher = mock.patch.object(request_broker, "_shared_broker", request_broker.RequestBroker(rate=1e9, burst=1e9))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = FakeClient(users=20, medias_per_user=100)
+        self.client.login("budi", "rahasia")
+        self.dataset = self.client.dataset
+        self.medias = self.dataset.medias(0)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_only_posts_with_new_activity_are_fetched(self):
+        first = self.inbox.sync(self.client, "budi", pages=0, initial=0)  # baseline: semua post, tanpa histori
+        self.assertEqual(first["checked"], 100)
+        self.assertEqual((first["fetched"], self.client.calls["media_comments"]), (0, 0))
+        self.assertEqual(self.client.calls["user_medias_paginated_v1"], 4)
+
+        self.dataset.add_comment(self.medias[3].id, 5, "keren banget kak")
+        self.dataset.add_comment(self.medias[3].id, 6, "mau dong")
+        self.dataset.add_comment(self.medias[90].id, 7, "post lama tapi masih ada yang komen")
+        summary = self.inbox.sync(self.client, "budi", pages=0)
+        self.assertEqual(summary["fetched"], 2)
+        self.assertEqual(self.client.calls["media_comments"], 2)
+        self.assertEqual(sorted(c["text"] for c in summary["new"]),
+                         ["keren banget kak", "mau dong", "post lama tapi masih ada yang komen"])
+
+        again = self.inbox.sync(self.client, "budi", pages=0)
+        self.assertEqual((again["fetched"], again["new"]), (0, []))
+        self.assertEqual(self.client.calls["media_comments"], 2)
+
+    def test_first_sight_imports_history_without_reporting_new(self):
+        summary = self.inbox.sync(self.client, "budi", pages=1, initial=3)
+        self.assertEqual(summary["checked"], 33)
+        self.assertEqual(summary["new"], [])
+        expected = sum(min(m.comment_count, 3) for m in self.medias[:33])
+        self.assertEqual(self.store.comments.count("budi"), expected)
+
+    def test_full_text_search(self):
+        self.inbox.sync(self.client, "budi", initial=0)
+        self.dataset.add_comment(self.medias[0].id, 3, "Ongkirnya ke Surabaya berapa ya?")
+        self.dataset.add_comment(self.medias[1].id, 4, "Foto di surabaya bagus sekali")
+        self.dataset.add_comment(self.medias[1].id, 5, "mantap")
+        self.inbox.sync(self.client, "budi")
+
+        hits = self.inbox.search("budi", "surabaya")
+        self.assertEqual(len(hits), 2)
+        self.assertIn("[Surabaya]", "".join(h["snippet"] for h in hits))
+        self.assertEqual([h["text"] for h in self.inbox.search("budi", "ongkirnya berapa")],
+                         ["Ongkirnya ke Surabaya berapa ya?"])
+        self.assertEqual(self.inbox.search("budi", 'surabaya" OR "'), [])  # query mentah tidak jadi sintaks FTS
+        self.assertEqual(self.inbox.search("budi", "sari"), [])
+
+    def test_moderation_rules_run_on_arrival(self):
+        spammer = self.dataset.username_of(9)
+        self.inbox.add_rule("keyword", "ongkir", "notify")
+        self.inbox.add_rule("block", "judi", "delete")
+        self.inbox.add_rule("block", f"@{spammer}", "flag")
+        with self.assertRaises(ValueError):
+            self.inbox.add_rule("keyword", "x", "ban")
+
+        self.inbox.sync(self.client, "budi", initial=0)
+        target = self.medias[2]
+        self.dataset.add_comment(target.id, 3, "Ongkir ke Medan berapa?")
+        self.dataset.add_comment(target.id, 4, "Situs JUDI online gacor")
+        self.dataset.add_comment(target.id, 9, "follow back ya")
+        self.dataset.add_comment(target.id, 5, "judicial review")  # bukan kata "judi"
+        summary = self.inbox.sync(self.client, "budi")
+
+        actions = {c["text"]: (c["action"], c["status"]) for c in summary["moderated"]}
+        self.assertEqual(actions, {
+            "Ongkir ke Medan berapa?": ("notify", "ok"),
+            "Situs JUDI online gacor": ("delete", "deleted"),
+            "follow back ya": ("flag", "flagged"),
+        })
+        self.assertEqual(self.client.calls["comment_bulk_delete"], 1)
+        self.assertNotIn("Situs JUDI online gacor", [c.text for c in self.client.media_comments(target.id, amount=0)])
+        self.assertEqual([c["text"] for c in self.inbox.recent("budi", status="flagged")], ["follow back ya"])
+
+    def test_history_not_moderated_without_backscan(self):
+        self.dataset.add_comment(self.medias[0].id, 4, "Situs judi online gacor")
+        self.inbox.add_rule("block", "judi", "delete")
+        summary = self.inbox.sync(self.client, "budi")
+        self.assertEqual(summary["moderated"], [])
+        self.assertEqual(self.client.calls["comment_bulk_delete"], 0)
+        self.assertEqual(self.inbox.search("budi", "judi")[0]["status"], "ok")
+
+        other = DataStore(os.path.join(self.tmp, "backscan.db"))
+        self.addCleanup(other.close)
+        inbox = CommentInbox(other)
+        inbox.add_rule("block", "judi", "delete")
+        summary = inbox.sync(self.client, "budi", backscan=True)
+        self.assertEqual([(c["text"], c["status"]) for c in summary["moderated"]],
+                         [("Situs judi online gacor", "deleted")])
+
+    def test_new_post_after_baseline_is_incoming_activity(self):
+        self.inbox.sync(self.client, "budi", initial=0)
+        newest = self.medias[0]
+        # post baru dipublish setelah sync pertama (belum punya watermark), sudah ada komentar
+        self.store.execute("DELETE FROM comment_sync WHERE username = ? AND media_id = ?", ("budi", newest.id))
+        self.dataset.add_comment(newest.id, 4, "situs judi gacor")
+        self.inbox.add_rule("block", "judi", "delete")
+        summary = self.inbox.sync(self.client, "budi")
+
+        self.assertIn("situs judi gacor", [c["text"] for c in summary["new"]])
+        self.assertEqual([(c["text"], c["status"]) for c in summary["moderated"]], [("situs judi gacor", "deleted")])
+        self.assertEqual(self.client.calls["comment_bulk_delete"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
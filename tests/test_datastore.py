@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Datastore (data/bot.db: migrasi, import JSON lama, transaksi, thread)
+
+Run:
+    python -m unittest tests.test_datastore -v
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from core import datastore
+from core.datastore import DataStore, SCHEMA_VERSION
+
+
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "bot.db")
+        self.store = DataStore(self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def test_migrations_applied_once(self):
+        self.assertEqual(self.store.schema_version(), SCHEMA_VERSION)
+        self.store.close()
+        self.store = DataStore(self.db_path)
+        rows = self.store.query("SELECT version FROM schema_version")
+        self.assertEqual([r["version"] for r in rows], list(range(1, SCHEMA_VERSION + 1)))
+        self.assertEqual(self.store.query_one("PRAGMA journal_mode")["journal_mode"], "wal")
+
+    def test_migrate_json_imports_once(self):
+        sources = {
+            "stats": self._write("stats.json", {"budi": {"2025-01-01": {"likes": 3, "errors": 1}}}),
+            "scheduled_posts": self._write("scheduled_posts.json", [
+                {"id": 7, "file_path": "a.jpg", "caption": "halo", "post_time": "2025-01-01 10:00",
+                 "post_type": "photo", "created_at": "2025-01-01T00:00:00", "status": "pending"},
+            ]),
+            "whitelist": self._write("whitelist.json", ["sari", "budi"]),
+        }
+        self.assertEqual(self.store.migrate_json(sources), {"stats": 1, "scheduled_posts": 1, "whitelist": 2})
+        self.assertEqual(self.store.migrate_json(sources), {})
+
+        self.assertEqual(self.store.analytics.day("budi", "2025-01-01")["likes"], 3)
+        self.assertEqual(self.store.schedules.get(7)["caption"], "halo")
+        self.assertEqual(sorted(self.store.whitelist.all()), ["budi", "sari"])
+        self.assertTrue(os.path.exists(sources["stats"]))  # file lama tidak dihapus
+
+    def test_failed_import_is_rolled_back(self):
+        path = self._write("notifications.json", [{"type": "new_dm", "data": {}, "timestamp": "2025-01-01"}])
+        with mock.patch.object(datastore.NotificationRepo, "import_json", side_effect=ValueError("rusak")):
+            with self.assertRaises(ValueError):
+                self.store.migrate_json({"notifications": path})
+        self.assertFalse(self.store.imported("notifications"))
+        self.assertEqual(self.store.migrate_json({"notifications": path}), {"notifications": 1})
+
+    def test_nested_transaction_rolls_back_inner_only(self):
+        with self.store.transaction():
+            self.store.whitelist.add("budi")
+            with self.assertRaises(RuntimeError):
+                with self.store.transaction():
+                    self.store.whitelist.add("sari")
+                    raise RuntimeError("batal")
+        self.assertEqual(self.store.whitelist.all(), ["budi"])
+
+    def test_concurrent_writes_from_threads(self):
+        def worker(n):
+            for _ in range(200):
+                self.store.analytics.increment(f"user{n}", "2025-01-01", "likes")
+                self.store.analytics.increment("shared", "2025-01-01", "likes")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.store.analytics.day("shared", "2025-01-01")["likes"], 1600)
+        self.assertEqual(self.store.analytics.day_totals("2025-01-01")["likes"], 3200)
+
+    def test_schedule_ids_are_not_reused(self):
+        first = self.store.schedules.add("a.jpg", "satu", "2025-01-01 10:00")
+        second = self.store.schedules.add("b.jpg", "dua", "2025-01-01 11:00")
+        self.store.schedules.delete(second["id"])
+        third = self.store.schedules.add("c.jpg", "tiga", "2025-01-01 12:00")
+        self.assertGreater(third["id"], second["id"])
+        self.store.schedules.set_status(first["id"], "posted")
+        self.assertEqual([s["id"] for s in self.store.schedules.pending()], [third["id"]])
+        self.assertIsNotNone(self.store.schedules.get(first["id"])["posted_at"])
+
+    def test_notifications_keep_last_n(self):
+        for i in range(30):
+            self.store.notifications.add("new_dm", {"from": f"user{i}"}, keep=10)
+        recent = self.store.notifications.recent(20)
+        self.assertEqual([n["data"]["from"] for n in recent], [f"user{i}" for i in range(20, 30)])
+        self.assertEqual(self.store.notifications.unread_count(), 10)
+
+    def test_activities_capped_per_user(self):
+        for i in range(15):
+            self.store.analytics.add_activity("budi", "like", True, {"n": i}, keep=5)
+        self.store.analytics.add_activity("sari", "follow", False, keep=5)
+        activities = self.store.analytics.activities("budi")
+        self.assertEqual([a["details"]["n"] for a in activities], [14, 13, 12, 11, 10])
+        self.assertEqual(len(self.store.analytics.activities("sari")), 1)
+
+    def test_login_events_share_connection(self):
+        events = self.store.login_events
+        self.assertIs(events.conn, self.store.conn)
+        events.add_many([], 42)
+        self.assertEqual(events.get_offset(), 42)
+        events.close()  # koneksi milik datastore, tidak ikut ditutup
+        self.assertEqual(self.store.row_counts()["whitelist"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Fitur end-to-end dengan FakeClient (tanpa network)
+
+Run:
+    python -m unittest tests.test_fake_client -v
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from instagrapi.exceptions import ClientError, UserNotFound
+
+from core.datastore import get_datastore
+from tests.fake_instagram import FakeClient
+
+
+class FeatureTestCase(unittest.TestCase):
+    """Jalan di folder sementara (fitur nulis ke data/ & logs/), input/print dibungkam"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.client = FakeClient(users=300, medias_per_user=40, followers=120, following=90)
+        self.client.login("budi", "rahasia")
+        for patcher in (mock.patch("builtins.input", return_value=""), mock.patch("builtins.print")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+class TestFakeClient(unittest.TestCase):
+    def test_dataset_is_deterministic(self):
+        a, b = FakeClient(seed=7), FakeClient(seed=7)
+        a.login("x", "y")
+        b.login("x", "y")
+        self.assertEqual(
+            [m.like_count for m in a.user_medias(a.user_id)],
+            [m.like_count for m in b.user_medias(b.user_id)],
+        )
+        self.assertEqual(set(a.user_followers(a.user_id)), set(b.user_followers(b.user_id)))
+
+    def test_large_dataset_is_lazy(self):
+        start = time.perf_counter()
+        client = FakeClient(users=100_000, medias_per_user=200, followers=5000)
+        client.login("x", "y")
+        self.assertEqual(len(client.user_followers(client.user_id)), 5000)
+        self.assertEqual(len(client.user_medias(client.user_id)), 200)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    def test_unknown_user_raises_instagrapi_error(self):
+        client = FakeClient(users=10)
+        with self.assertRaises(UserNotFound):
+            client.user_info_by_username("user_99999")
+
+    def test_error_rate_and_latency(self):
+        client = FakeClient(error_rate=0.5, latency=0.001, seed=1)
+        errors = 0
+        start = time.perf_counter()
+        for _ in range(40):
+            try:
+                client.hashtag_info_by_name("kopi")
+            except ClientError:
+                errors += 1
+        self.assertGreaterEqual(time.perf_counter() - start, 0.04)
+        self.assertTrue(5 < errors < 35)
+        self.assertEqual(client.calls["hashtag_info_by_name"], 40)
+
+    def test_upload_requires_existing_file(self):
+        client = FakeClient()
+        client.login("x", "y")
+        with self.assertRaises(ClientError):
+            client.photo_upload("/tidak/ada.jpg", "caption")
+
+
+class TestFeaturesEndToEnd(FeatureTestCase):
+    def test_top_engagement_tracks_history(self):
+        from features.analytics.engagement_tracking import top_engagement
+        top_engagement(self.client, "budi")
+        self.assertEqual(self.client.calls["user_medias"], 1)
+        with open(os.path.join("logs", "post_history.jsonl"), encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 10)
+
+    def test_bulk_delete_by_engagement(self):
+        from features.content_management.bulk_delete_posts import BulkDeletePosts
+        bulk = BulkDeletePosts(self.client)
+        posts = bulk.get_posts_by_criteria(self.client, "budi", "engagement", "50")
+        self.assertTrue(posts)
+        self.assertTrue(all(p.like_count < 50 for p in posts))
+        with mock.patch("time.sleep"):
+            self.assertTrue(bulk.delete_posts_batch(self.client, posts, delay=0))
+        self.assertEqual(self.client.calls["media_delete"], len(posts))
+        self.assertEqual(bulk.get_posts_by_criteria(self.client, "budi", "engagement", "50"), [])
+
+    def test_bulk_delete_counts_failures(self):
+        from features.content_management.bulk_delete_posts import BulkDeletePosts
+        bulk = BulkDeletePosts(self.client)
+        posts = self.client.user_medias(self.client.user_id)
+        self.client.error_rate = 0.3
+        with mock.patch("time.sleep"):
+            bulk.delete_posts_batch(self.client, posts, delay=0)
+        self.client.error_rate = 0
+        self.assertLess(len(self.client.user_medias(self.client.user_id)), len(posts))
+        self.assertGreater(len(self.client.user_medias(self.client.user_id)), 0)
+
+    def test_hashtag_research_uses_cache(self):
+        from features.discovery_growth.hashtag_research import HashtagResearch
+        research = HashtagResearch(self.client)
+        stats = research.research_hashtag("kopi")
+        self.assertEqual(stats["posts"], self.client.dataset.hashtags["kopi"].media_count)
+        research.research_hashtag("kopi")
+        self.assertEqual(self.client.calls["hashtag_info_by_name"], 1)
+        self.assertIsNone(research.research_hashtag("tidakada"))
+
+    def test_not_followback(self):
+        from features.analytics.followers_analysis import list_not_followback
+        list_not_followback(self.client, "budi")
+        followers = set(self.client.user_followers(self.client.user_id))
+        following = set(self.client.user_following(self.client.user_id))
+        self.assertEqual(self.client.calls["user_info"], min(10, len(followers - following)))
+
+    def test_check_new_dm_logs_notifications(self):
+        from features.notifications.notification_system import NotificationSystem
+        NotificationSystem(self.client).check_new_dm("budi")
+        incoming = [
+            t for t in self.client.direct_threads(amount=10)
+            if t.messages and t.messages[0].user_id != self.client.user_id
+        ]
+        notifications = get_datastore().notifications.recent(100)
+        self.assertEqual(len(notifications), len(incoming))
+        self.assertTrue(all(n["type"] == "new_dm" for n in notifications))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Hashtag Index (inverted index hashtag -> post, update inkremental, agregasi histori)
+
+Run:
+    python -m unittest tests.test_hashtag_index -v
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from core.analytics import Analytics
+from core.datastore import DataStore
+from core.hashtag_index import HashtagIndex
+
+
+def media(media_id, caption, likes, comments=0):
+    return SimpleNamespace(id=media_id, caption_text=caption, like_count=likes, comment_count=comments,
+                           media_type=1, taken_at=None)
+
+
+class TestHashtagIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.index = HashtagIndex(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _stats(self):
+        return {r["tag"]: (r["posts"], r["total"]) for r in self.store.hashtag_index.stats("budi")}
+
+    def test_resnapshot_updates_only_changed_tags(self):
+        self.assertTrue(self.index.observe("budi", "m1", "Pagi #Kopi #senja", 10, 0))
+        self.assertFalse(self.index.observe("budi", "m1", "Pagi #kopi #senja", 10, 0))
+        self.index.observe("budi", "m1", "Pagi #kopi #hujan", 20, 5)  # caption diedit + engagement naik
+        self.assertEqual(self._stats(), {"": (1, 30.0), "kopi": (1, 30.0), "hujan": (1, 30.0)})
+        self.assertEqual(self.index.top_posts("budi", "#Kopi"), [{"media_id": "m1", "engagement": 30.0}])
+
+    def test_performance_matches_full_scan(self):
+        posts = [
+            ("a", "#travel #beach", 300), ("b", "#travel", 200), ("c", "#food", 50),
+            ("d", "#food #travel", 150), ("e", "tanpa hashtag", 40), ("f", "#food", 60),
+        ]
+        for media_id, caption, likes in posts:
+            self.index.observe("budi", media_id, caption, likes, 0)
+
+        rows = {r["tag"]: r for r in self.index.performance("budi")}
+        self.assertEqual(set(rows), {"travel", "food"})  # #beach cuma 1 post
+        travel = rows["travel"]
+        self.assertEqual(travel["posts"], 3)
+        self.assertAlmostEqual(travel["mean"], (300 + 200 + 150) / 3)
+        self.assertAlmostEqual(travel["mean_without"], (50 + 40 + 60) / 3)
+        self.assertGreater(travel["t"], 2)
+        self.assertEqual(self.index.performance("budi")[0]["tag"], "travel")
+        self.assertLess(rows["food"]["lift"], 1)
+        self.assertEqual(self.index.account("budi"), (6, 800.0))
+
+    def test_analytics_feeds_index_and_backfills_once(self):
+        log_dir = os.path.join(self.tmp, "logs")
+        os.makedirs(log_dir)
+        with open(os.path.join(log_dir, "post_history.jsonl"), "w", encoding="utf-8") as f:
+            for likes in (10, 30):  # snapshot kedua menggantikan yang pertama
+                f.write(json.dumps({"username": "budi", "media_id": "lama", "caption": "#arsip", "likes": likes,
+                                    "comments": 0}) + "\n")
+
+        analytics = Analytics(log_dir=log_dir, datastore=self.store)
+        analytics.track_medias("budi", [media("baru", "#arsip #baru", 90)])
+        self.assertEqual(self._stats()["arsip"], (2, 120.0))
+        self.assertEqual(Analytics(log_dir=log_dir, datastore=self.store).hashtag_index.backfill(analytics), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
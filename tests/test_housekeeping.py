@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Housekeeping (retensi bot.db, rollup ringkasan, gzip file dingin, disk usage)
+
+Run:
+    python -m unittest tests.test_housekeeping -v
+"""
+
+import os
+import gzip
+import time
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from core.datastore import DB_PATH, DataStore
+from core.housekeeping import Housekeeper, RULES
+
+NOW = datetime(2025, 6, 30, 12, 0)
+
+
+class TestHousekeeping(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, DB_PATH))
+        self.keeper = Housekeeper(base_dir=self.tmp, datastore=self.store)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _rule(self, name):
+        return next(r for r in RULES if r["name"] == name)
+
+    def _touch(self, rel, days_old):
+        path = os.path.join(self.tmp, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("{}" * 100)
+        mtime = (NOW - timedelta(days=days_old)).timestamp()
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_daily_counters_roll_up_per_month(self):
+        for d in range(200):
+            for user in ("budi", "sari"):
+                self.store.analytics.increment(user, (NOW - timedelta(days=d)).strftime("%Y-%m-%d"), "likes")
+        result = self.keeper.compact(self._rule("stats"), NOW)
+
+        self.assertEqual(len(list(self.store.analytics.iter_daily("budi"))), 91)
+        summary = self.keeper.load_summary("stats")["budi"]
+        self.assertEqual(sum(month["likes"] for month in summary.values()), 109)
+        self.assertEqual(result["removed"], 218)
+        self.assertLess(result["bytes_after"], result["bytes_before"])
+
+    def test_events_keep_pending_schedules(self):
+        old = (NOW - timedelta(days=60)).isoformat()
+        self.store.schedules.import_json(self.store.conn, [
+            {"id": 1, "file_path": "a.jpg", "post_time": "x", "status": "posted", "posted_at": old},
+            {"id": 2, "file_path": "a.jpg", "post_time": "x", "status": "failed", "created_at": old},
+            {"id": 3, "file_path": "a.jpg", "post_time": "x", "status": "pending", "created_at": old},
+            {"id": 4, "file_path": "a.jpg", "post_time": "x", "status": "posted", "posted_at": NOW.isoformat()},
+        ])
+        self.keeper.compact(self._rule("scheduled_posts"), NOW)
+        self.assertEqual([s["id"] for s in self.store.schedules.all()], [3, 4])
+        day = (NOW - timedelta(days=60)).strftime("%Y-%m-%d")
+        self.assertEqual(self.keeper.load_summary("scheduled_posts")["all"][day], {"posted": 1, "failed": 1})
+
+    def test_activities_summarized(self):
+        for i in range(1500):
+            when = (NOW - timedelta(days=40, minutes=i) if i < 500 else NOW - timedelta(minutes=i)).isoformat()
+            self.store.analytics.add_activity("budi", "like", True, when=when, keep=2000)
+        self.keeper.compact(self._rule("activity_log"), NOW)
+        self.assertEqual(len(self.store.analytics.activities("budi", limit=5000)), 1000)
+        summary = self.keeper.load_summary("activity_log")["budi"]
+        self.assertEqual(sum(day["like"] for day in summary.values()), 500)
+
+    def test_hashtag_cache_ttl(self):
+        self.store.hashtag_cache.put("lama", {"timestamp": (NOW - timedelta(days=30)).timestamp()})
+        self.store.hashtag_cache.put("baru", {"timestamp": NOW.timestamp()})
+        self.keeper.compact(self._rule("hashtag_cache"), NOW)
+        self.assertEqual(list(self.store.hashtag_cache.all()), ["baru"])
+
+    def test_follower_growth_keeps_last_value_per_month(self):
+        for day, count in (("2025-01-01", 100), ("2025-01-31", 150), ("2025-06-29", 300)):
+            self.store.follower_snapshots.record("budi", day, count)
+        self.keeper.compact(self._rule("follower_growth"), NOW)
+        self.assertEqual(self.store.follower_snapshots.history("budi"), {"2025-06-29": 300})
+        self.assertEqual(self.keeper.load_summary("follower_growth"), {"budi": {"2025-01": 150}})
+
+    def test_failed_summary_rolls_back_compaction(self):
+        self.store.follower_snapshots.record("budi", "2025-01-01", 100)
+        with mock.patch("core.housekeeping._write_json", side_effect=OSError("disk penuh")):
+            with self.assertRaises(OSError):
+                self.keeper.compact(self._rule("follower_growth"), NOW)
+        self.assertEqual(self.store.follower_snapshots.history("budi"), {"2025-01-01": 100})
+
+    def test_files_compress_delete_and_keep_last(self):
+        self._touch("analytics/engagement_budi_1718000000.json", 10)
+        self._touch("analytics/exports/daily_budi_1719000000.csv", 1)
+        self._touch("analytics/exports/posts_budi.csv", 400)  # export incremental: masih di-append
+        self._touch("analytics/exports/export_state.json", 400)
+        self._touch("analytics/old_1600000000.csv", 400)
+        for i in range(8):
+            self._touch(f"session_backups/budi_session_backup_2025010{i}_000000.json", 8 - i)
+        self.keeper.compact(self._rule("analytics_exports"), NOW)
+        self.keeper.compact(self._rule("session_backups"), NOW)
+
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "analytics/engagement_budi_1718000000.json.gz")))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "analytics/exports/daily_budi_1719000000.csv")))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "analytics/exports/posts_budi.csv")))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "analytics/exports/export_state.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "analytics/old_1600000000.csv")))
+        backups = sorted(os.listdir(os.path.join(self.tmp, "session_backups")))
+        self.assertEqual(len(backups), 5)
+        self.assertEqual(backups[0], "budi_session_backup_20250103_000000.json")
+        with gzip.open(os.path.join(self.tmp, "analytics/engagement_budi_1718000000.json.gz"), "rt") as f:
+            self.assertTrue(f.read().startswith("{}"))
+
+    def test_legacy_login_activity_waits_for_migration(self):
+        self._touch("data/login_activity.json", 60)
+        rule = self._rule("login_activity_legacy")
+        self.keeper.compact(rule, NOW)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "data/login_activity.json")))
+        self._touch("data/login_events.jsonl", 0)
+        self.keeper.compact(rule, NOW)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "data/login_activity.json.gz")))
+
+    def test_run_once_is_incremental(self):
+        self.store.notifications.import_json(self.store.conn, [
+            {"type": "new_dm", "data": {}, "timestamp": (NOW - timedelta(days=40)).isoformat()},
+        ])
+        first = self.keeper.run_once(now=NOW)
+        self.assertEqual(set(first), {r["name"] for r in RULES})
+        self.assertEqual(first["notifications"]["removed"], 1)
+        self.assertEqual(self.keeper.run_once(now=NOW + timedelta(hours=1)), {})
+
+        # State tersimpan: instance baru juga tidak mengulang rule yang belum jatuh tempo
+        again = Housekeeper(base_dir=self.tmp, datastore=self.store)
+        self.assertEqual(again.due_rules(NOW + timedelta(hours=1)), [])
+        self.assertEqual(len(again.due_rules(NOW + timedelta(hours=7))), len(RULES))
+
+    def test_run_once_respects_budget(self):
+        slow = [dict(r, name=f"slow{i}") for i, r in enumerate(RULES[:3])]
+        keeper = Housekeeper(base_dir=self.tmp, rules=slow, datastore=self.store)
+        original = keeper.compact
+        keeper.compact = lambda rule, now=None: (time.sleep(0.05), original(rule, now))[1]
+        self.assertEqual(len(keeper.run_once(budget_seconds=0.01, now=NOW)), 1)
+        self.assertEqual(len(keeper.run_once(budget_seconds=10, now=NOW)), 2)
+
+    def test_disk_usage_report(self):
+        self.store.analytics.increment("budi", "2025-06-30", "likes")
+        self._touch("analytics/a_1718000000.json", 0)
+        self._touch("analytics/b_1718000000.json", 0)
+        report = {row["name"]: row for row in self.keeper.disk_usage()}
+        self.assertEqual(report["analytics_exports"]["files"], 2)
+        self.assertEqual(report["analytics_exports"]["bytes"], 400)
+        self.assertEqual(report["stats"]["files"], 1)
+        self.assertEqual(report["stats"]["path"], "data/bot.db:daily_stats")
+        self.assertEqual(report["session_backups"]["bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Log Pipeline (queue listener, rotasi gzip, JSON lines, banner)
+
+Run:
+    python -m unittest tests.test_log_pipeline -v
+"""
+
+import os
+import gzip
+import json
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from core import log_pipeline
+from core.log_pipeline import (
+    GzipRotatingFileHandler, JsonLineFormatter, setup_logging, shutdown_logging, tail_jsonl,
+)
+
+
+class TestRotation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "bot.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _record(self, msg):
+        return logging.LogRecord("test", logging.INFO, __file__, 1, msg, (), None)
+
+    def test_size_rotation_gzips_backups(self):
+        handler = GzipRotatingFileHandler(self.path, max_bytes=500, backup_count=2, rotate_seconds=0)
+        handler.setFormatter(JsonLineFormatter())
+        for i in range(60):
+            handler.emit(self._record(f"pesan {i}"))
+        handler.close()
+        self.assertEqual(sorted(os.listdir(self.tmp)), ["bot.jsonl", "bot.jsonl.1.gz", "bot.jsonl.2.gz"])
+        with gzip.open(self.path + ".1.gz", "rt", encoding="utf-8") as f:
+            first = json.loads(f.readline())
+        self.assertTrue(first["msg"].startswith("pesan"))
+
+    def test_time_rotation(self):
+        handler = GzipRotatingFileHandler(self.path, max_bytes=0, backup_count=3, rotate_seconds=60)
+        handler.setFormatter(JsonLineFormatter())
+        handler.emit(self._record("lama"))
+        with mock.patch("core.log_pipeline.time.time", return_value=handler.rollover_at + 1):
+            handler.emit(self._record("baru"))
+        handler.close()
+        self.assertTrue(os.path.exists(self.path + ".1.gz"))
+        self.assertEqual([r["msg"] for r in tail_jsonl(self.path)], ["baru"])
+
+    def test_json_line_has_extra_fields(self):
+        record = self._record("LIKED: abc")
+        record.action = "LIKED"
+        line = json.loads(JsonLineFormatter().format(record))
+        self.assertEqual((line["level"], line["msg"], line["action"]), ("INFO", "LIKED: abc", "LIKED"))
+
+    def test_tail_reads_only_last_records(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            for i in range(5000):
+                f.write(json.dumps({"msg": str(i)}) + "\n")
+        self.assertEqual([r["msg"] for r in tail_jsonl(self.path, 3)], ["4997", "4998", "4999"])
+        self.assertEqual(tail_jsonl(os.path.join(self.tmp, "tidak_ada.jsonl")), [])
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root_level = logging.getLogger().level
+
+    def tearDown(self):
+        shutdown_logging()
+        logging.getLogger().setLevel(self.root_level)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_file_io_runs_on_listener_thread(self):
+        listener = setup_logging(log_dir=self.tmp, console=False)
+        self.assertIs(setup_logging(log_dir=self.tmp), listener)  # idempotent
+        threads = []
+        file_handler = listener.handlers[0]
+        original_emit = file_handler.emit
+        file_handler.emit = lambda record: (threads.append(threading.current_thread()), original_emit(record))
+
+        logging.getLogger("core.test").info("halo %s", "dunia")
+        logging.getLogger(log_pipeline.ACTIVITY_LOGGER).info("LIKED: abc", extra={"action": "LIKED"})
+        shutdown_logging()
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+        messages = [r["msg"] for r in tail_jsonl(os.path.join(self.tmp, "bot.jsonl"))]
+        self.assertEqual(messages, ["halo dunia", "LIKED: abc"])
+        activity = tail_jsonl(os.path.join(self.tmp, "activity.jsonl"))
+        self.assertEqual([(r["msg"], r["action"]) for r in activity], [("LIKED: abc", "LIKED")])
+
+    def test_banner_messages_share_pipeline(self):
+        from banner import success_msg, error_msg
+        setup_logging(log_dir=self.tmp, console=False)
+        with mock.patch("builtins.print") as printed:
+            success_msg("Login berhasil")
+            error_msg("Gagal upload")
+        shutdown_logging()
+
+        self.assertIn("✅ Login berhasil", printed.call_args_list[0][0][0])
+        self.assertIn("❌ Gagal upload", printed.call_args_list[1][0][0])
+        records = tail_jsonl(os.path.join(self.tmp, "bot.jsonl"))
+        self.assertEqual([(r["level"], r["ui"], r["msg"]) for r in records],
+                         [("INFO", "success", "Login berhasil"), ("ERROR", "error", "Gagal upload")])
+
+    def test_banner_messages_skip_root_handlers(self):
+        from banner import info_msg
+        seen = []
+        handler = logging.Handler()
+        handler.emit = seen.append
+        logging.getLogger().addHandler(handler)
+        self.addCleanup(logging.getLogger().removeHandler, handler)
+        with mock.patch("builtins.print") as printed:
+            info_msg("tanpa pipeline")             # belum setup_logging: langsung print
+            setup_logging(log_dir=self.tmp, console=False)
+            info_msg("dengan pipeline")
+        shutdown_logging()
+
+        self.assertEqual(seen, [])
+        self.assertEqual(len(printed.call_args_list), 2)
+        self.assertEqual([r["msg"] for r in tail_jsonl(os.path.join(self.tmp, "bot.jsonl"))], ["dengan pipeline"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
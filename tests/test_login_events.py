@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Login Events (sliding window, device baru, alert callback)
+
+Run:
+    python -m unittest tests.test_login_events -v
+"""
+
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core import login_events
+from core.datastore import DataStore
+from core.login_events import LoginEventLog, SlidingWindowCounter
+
+NOW = 1_700_000_000.0
+
+
+class TestSlidingWindowCounter(unittest.TestCase):
+    def test_events_expire(self):
+        counter = SlidingWindowCounter(60)
+        for i in range(5):
+            counter.add(NOW + i)
+        self.assertEqual(counter.count(NOW + 10), 5)
+        self.assertEqual(counter.count(NOW + 62), 2)  # window (NOW+2, NOW+62]
+        self.assertEqual(counter.count(NOW + 3600), 0)
+
+    def test_old_event_ignored(self):
+        counter = SlidingWindowCounter(60)
+        counter.add(NOW)
+        counter.add(NOW - 120)
+        self.assertEqual(counter.count(NOW), 1)
+
+
+class TestLoginEventLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp, "login_events.jsonl")
+        self.alerts = []
+        self.log = self._open()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _open(self, **kwargs):
+        return LoginEventLog(
+            self.log_file, legacy_file=os.path.join(self.tmp, "login_activity.json"),
+            on_alert=self.alerts.append, **kwargs,
+        )
+
+    def test_alert_fires_once_when_threshold_trips(self):
+        for i in range(4):
+            self.log.record("budi", status="failed", now=NOW + i * 10)
+        minute = [a for a in self.alerts if a["window"] == "minute"]
+        self.assertEqual(len(minute), 1)
+        self.assertEqual(minute[0]["count"], 3)
+        self.assertFalse(any(a["window"] == "hour" for a in self.alerts))
+        self.assertEqual(self.log.failed_count("budi", "hour", now=NOW + 40), 4)
+        self.assertTrue(self.log.is_suspicious("budi", now=NOW + 40))
+        self.assertFalse(self.log.is_suspicious("budi", now=NOW + 90))
+
+    def test_new_device_and_location(self):
+        self.log.record("budi", device="Samsung A52", location="ID", now=NOW)
+        self.assertEqual(self.alerts, [])  # login pertama jadi baseline
+        self.log.record("budi", device="Samsung A52", location="ID", now=NOW + 1)
+        alerts = self.log.record("budi", device="iPhone 15", location="SG", now=NOW + 2)
+        self.assertEqual({a["type"] for a in alerts}, {"new_device", "new_location"})
+        self.assertEqual(len(self.alerts), 2)
+
+    def test_log_is_append_only_and_replayed(self):
+        self.log.record("budi", device="A", now=NOW)
+        self.log.record("budi", status="failed", now=NOW + 1)
+        with open(self.log_file, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        reopened = self._open()
+        self.assertEqual(len(reopened.recent_events("budi")), 2)
+        self.assertEqual(reopened.failed_count("budi", "day", now=NOW + 5), 1)
+        self.assertEqual(reopened.record("budi", device="B", now=NOW + 6)[0]["type"], "new_device")
+
+    def test_legacy_json_migrated(self):
+        legacy = {"budi": [{"timestamp": "2024-01-01T10:00:00", "device": "Web", "location": "Unknown", "status": "success"}]}
+        with open(os.path.join(self.tmp, "login_activity.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+        log = self._open()
+        self.assertEqual(log.recent_events("budi")[0]["device"], "Web")
+        self.assertEqual(len(list(log.iter_events("budi"))), 1)
+
+
+class TestSharedLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.addCleanup(store.close)
+        for patcher in (mock.patch.object(login_events, "_shared_log", None),
+                        mock.patch("core.datastore.get_datastore", return_value=store)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_console_alert_registered_once(self):
+        from features.security_privacy.login_monitor import LoginMonitor
+        log = login_events.get_login_events()
+        for _ in range(3):
+            LoginMonitor()
+        self.assertEqual(log.callbacks, [login_events.console_alert])
+
+        with mock.patch("builtins.print") as printed:
+            log.record("budi", device="A", now=NOW)
+            log.record("budi", device="B", now=NOW + 1)
+        self.assertEqual(printed.call_count, 1)
+        self.assertIn("device baru (B)", printed.call_args[0][0])
+
+
+class TestLoginEventStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp, "login_events.jsonl")
+        self.log = LoginEventLog(self.log_file, legacy_file=None)
+        self.log.record("budi", device="Samsung, A52", location="ID", now=NOW)
+        for i in range(1, 26):
+            device = "Samsung, A52" if i % 5 else "iPhone 15"
+            self.log.record("budi", status="failed" if i % 2 else "success", device=device, location="ID", now=NOW + i * 60)
+        self.log.record("sari", device="Web", now=NOW + 5)
+
+    def tearDown(self):
+        self.log.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_cursor_paging(self):
+        store = self.log.store
+        seen, cursor = [], None
+        while True:
+            rows, cursor = store.page("budi", cursor=cursor, limit=10)
+            seen.extend(r["ts"] for r in rows)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 26)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_filtered_query(self):
+        rows = list(self.log.store.query("budi", status="failed", new_device=True, since=NOW))
+        # iPhone baru dikenal setelah login sukses di i=10, jadi hanya gagal di i=5 yang "device baru"
+        self.assertEqual([r["ts"] for r in rows], [NOW + 5 * 60])
+        self.assertEqual(self.log.store.count("budi", since=NOW + 600), 16)
+        self.assertEqual(self.log.store.count("sari"), 1)
+
+    def test_streaming_export_quotes_fields(self):
+        path = os.path.join(self.tmp, "out.csv")
+        self.assertEqual(self.log.store.export(path, "csv", "budi"), 26)
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]["device"], "Samsung, A52")
+
+        path = os.path.join(self.tmp, "out.jsonl")
+        self.assertEqual(self.log.store.export(path, "jsonl", status="failed", batch=4), 13)
+
+    def test_reopen_indexes_only_new_lines(self):
+        self.log.store.close()
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"username": "sari", "timestamp": "2024-01-01T00:00:00", "device": "Web",
+                                "location": "Unknown", "status": "failed"}) + "\n")
+        reopened = LoginEventLog(self.log_file, legacy_file=None)
+        self.log = reopened
+        self.assertEqual(reopened.store.count(), 28)
+        self.assertEqual(reopened.store.count("sari", status="failed"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Media Library (index incremental, duplikat, probe video)
+
+Run:
+    python -m unittest tests.test_media_library -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from core import media_library
+from core.media_library import MediaLibrary
+
+
+class TestMediaLibrary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.folder = os.path.join(self.tmp, "posts_photos")
+        os.makedirs(self.folder)
+        self.lib = MediaLibrary(
+            index_file=os.path.join(self.tmp, "media_index.json"),
+            thumbs_dir=os.path.join(self.tmp, "thumbs"),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _image(self, name, color=(255, 0, 0), size=(64, 48)):
+        path = os.path.join(self.folder, name)
+        Image.new("RGB", size, color).save(path, "JPEG")
+        return path
+
+    def test_entry_fields(self):
+        path = self._image("a.jpg")
+        entries = self.lib.list_media(self.folder)
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry["path"], path)
+        self.assertEqual((entry["width"], entry["height"]), (64, 48))
+        self.assertEqual(self.lib.thumbnail(entry), entry["thumbnail"])
+        self.assertTrue(os.path.exists(entry["thumbnail"]))
+        self.assertEqual(entry["hash"], media_library.file_hash(path))
+
+    def test_unchanged_files_are_not_rehashed(self):
+        for i in range(3):
+            self._image(f"{i}.jpg", color=(i, 0, 0))
+        self.lib.list_media(self.folder)
+
+        reloaded = MediaLibrary(self.lib.index_file, self.lib.thumbs_dir)
+        with mock.patch.object(media_library, "file_hash", wraps=media_library.file_hash) as spy:
+            reloaded.list_media(self.folder)
+            self.assertEqual(spy.call_count, 0)
+
+            path = self._image("0.jpg", color=(9, 9, 9), size=(10, 10))
+            os.utime(path, ns=(1, 1))
+            reloaded.list_media(self.folder)
+            self.assertEqual(spy.call_count, 1)
+
+    def test_removed_files_leave_index(self):
+        path = self._image("gone.jpg")
+        self.assertEqual(len(self.lib.list_media(self.folder)), 1)
+        os.remove(path)
+        self.assertEqual(self.lib.list_media(self.folder), [])
+
+    def test_duplicates_detected_from_hash(self):
+        first = self._image("x.jpg")
+        shutil.copy(first, os.path.join(self.folder, "x_copy.jpg"))
+        self._image("y.jpg", color=(0, 255, 0))
+        self.lib.list_media(self.folder)
+        dupes = self.lib.duplicates()
+        self.assertEqual(len(dupes), 1)
+        self.assertEqual(len(next(iter(dupes.values()))), 2)
+
+    def test_video_duration_from_mp4_header(self):
+        reel = os.path.join(os.path.dirname(__file__), "..", "posts_reels", "12.mp4")
+        if not os.path.exists(reel):
+            self.skipTest("sample reel tidak ada")
+        shutil.copy(reel, os.path.join(self.folder, "clip.mp4"))
+        entry = self.lib.list_media(self.folder, kind="video")[0]
+        self.assertGreater(entry["duration"], 1)
+        self.assertGreater(entry["width"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Post Curves (track setelah publish, sampling batch dari feed, perbandingan kurva)
+
+Run:
+    python -m unittest tests.test_post_curves -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.datastore import DataStore
+from core.post_curves import PostSampler, SAMPLE_OFFSETS
+from core.publish_daemon import run_schedule
+from tests.fake_instagram import FakeClient
+
+
+class TestPostCurves(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.sampler = PostSampler(self.store)
+        self.client = FakeClient(users=10, medias_per_user=80)
+        self.client.login("budi", "rahasia")
+        self.medias = self.client.dataset.medias(0)
+        self.now = self.client.dataset.now.timestamp()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _track(self, media, published=None):
+        published = published or media.taken_at.timestamp()
+        self.sampler.track("budi", media.id, published)
+        return published
+
+    def test_due_posts_sampled_in_one_feed_request(self):
+        for n in (2, 5, 9):
+            self._track(self.medias[n])
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=self.now), 3)
+        self.assertEqual(self.client.calls["user_medias_paginated_v1"], 1)
+        self.assertEqual(self.client.calls["media_info"], 0)
+
+        tracking = {row["media_id"]: row for row in self.store.post_samples.tracked("budi")}
+        self.assertEqual(tracking[self.medias[2].id]["next_step"], 5)  # ~2 hari: step 24j, berikutnya 7h
+        self.assertIsNone(tracking[self.medias[9].id]["next_due"])     # > 7 hari: selesai
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=self.now), 0)
+        self.assertEqual(self.client.calls["user_medias_paginated_v1"], 1)
+
+    def test_decaying_schedule_skips_missed_steps(self):
+        media = self.medias[40]
+        published = self._track(media)
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=published + 200), 0)  # belum 5m
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=published + 301), 1)
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=published + 600), 0)
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=published + 4000), 1)
+
+        samples = self.store.post_samples.samples("budi")
+        self.assertEqual([(s["step"], s["age"]) for s in samples], [(0, 301), (2, 4000)])
+        self.assertEqual(samples[0]["likes"], media.like_count)
+        row = self.store.post_samples.tracked("budi")[0]
+        self.assertEqual((row["next_step"], row["next_due"]), (3, int(published) + SAMPLE_OFFSETS[3]))
+
+    def test_missing_post_stops_sampling_without_full_crawl(self):
+        self.sampler.track("budi", "999_1", self.now - 3600)
+        self.assertEqual(self.sampler.sample_due(self.client, "budi", now=self.now), 0)
+        self.assertEqual(self.client.calls["user_medias_paginated_v1"], 1)
+        self.assertIsNone(self.store.post_samples.tracked("budi")[0]["next_due"])
+
+    def test_compare_curves_per_column(self):
+        curves = {
+            "a": [10, 20, 40, 70, 90, 100],
+            "b": [5, 10, 20, 35, 45, 50],
+            "c": [30, 60],  # baru 15 menit
+        }
+        for i, (media_id, values) in enumerate(curves.items()):
+            self.sampler.track("budi", media_id, 1000 + i)
+            self.store.post_samples.record("budi", [
+                (media_id, step, SAMPLE_OFFSETS[step], likes, 0, step + 1, None) for step, likes in enumerate(values)
+            ])
+
+        result = self.sampler.compare("budi")
+        self.assertEqual(result["median"], [10, 20, 30, 52.5, 67.5, 75])
+        self.assertEqual(result["saturation"], [0.1, 0.2, 0.4, 0.7, 0.9, 1.0])
+        posts = {p["media_id"]: p for p in result["posts"]}
+        self.assertEqual([p["media_id"] for p in result["posts"]], ["c", "b", "a"])  # terbaru dulu
+        self.assertEqual(posts["c"]["values"][2:], [None] * 4)
+        self.assertAlmostEqual(posts["c"]["relative"], 3.0)
+        self.assertEqual(posts["a"]["t90"], 86400)
+        self.assertIsNone(posts["c"]["t90"])
+
+    def test_published_schedule_is_tracked(self):
+        photo = os.path.join(self.tmp, "foto.jpg")
+        open(photo, "wb").close()
+        schedule = self.store.schedules.add(photo, "halo", "2024-01-01 10:00", username="budi")
+        self.assertEqual(run_schedule(self.client, self.store.schedules, schedule), ("posted", None))
+
+        tracked = self.store.post_samples.tracked("budi")
+        self.assertEqual(len(tracked), 1)
+        self.assertEqual(tracked[0]["media_id"], self.client.dataset.uploaded[0]["media"].id)
+        self.assertEqual(tracked[0]["next_due"] - tracked[0]["published_at"], SAMPLE_OFFSETS[0])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
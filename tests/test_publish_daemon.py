@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Publish Daemon (lock, control socket, klaim atomik, flush saat berhenti)
+
+Run:
+    python -m unittest tests.test_publish_daemon -v
+"""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from instagrapi.exceptions import LoginRequired
+
+from core.datastore import DataStore
+from core.publish_daemon import PublishDaemon, PidLock, send_command, run_schedule
+from tests.fake_instagram import FakeClient
+
+
+class TestPublishDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.photo = os.path.join(self.tmp, "foto.jpg")
+        open(self.photo, "wb").close()
+        self.client = FakeClient(users=10, medias_per_user=5)
+        self.client.login("budi", "rahasia")
+        self.daemon = self._daemon()
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _daemon(self, **kwargs):
+        return PublishDaemon(
+            "budi", client_factory=lambda: self.client, datastore=self.store,
+            pid_file=os.path.join(self.tmp, "publisher.pid"),
+            control_file=os.path.join(self.tmp, "publisher.json"), tick=5, **kwargs
+        )
+
+    def _serve(self):
+        thread = threading.Thread(target=self.daemon.serve)
+        thread.start()
+        control_file = self.daemon.control_file
+        for _ in range(200):
+            if os.path.exists(control_file):
+                break
+            time.sleep(0.01)
+        return thread
+
+    def test_lock_is_exclusive(self):
+        first, second = PidLock(self.daemon.lock.path), PidLock(self.daemon.lock.path)
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        self.assertEqual(second.read_pid(), os.getpid())
+        first.release()
+        self.assertTrue(os.path.exists(first.path))  # file tetap ada (inode sama), hanya dikosongkan
+        self.assertIsNone(second.read_pid())
+        self.assertTrue(second.acquire())
+        second.release()
+
+    def test_run_due_publishes_once(self):
+        due = self.store.schedules.add(self.photo, "halo", "2025-01-01 10:00", username="budi")
+        later = self.store.schedules.add(self.photo, "nanti", "2099-01-01 10:00", username="budi")
+        other = self.store.schedules.add(self.photo, "punya sari", "2025-01-01 10:00", username="sari")
+
+        self.assertEqual(self.daemon.run_due(datetime(2025, 6, 1)), 1)
+        self.assertEqual(self.daemon.run_due(datetime(2025, 6, 1)), 0)
+        self.assertEqual(self.client.calls["photo_upload"], 1)
+        self.assertEqual(self.store.schedules.get(due["id"])["status"], "posted")
+        self.assertEqual(self.store.schedules.get(later["id"])["status"], "pending")
+        self.assertEqual(self.store.schedules.get(other["id"])["status"], "pending")
+
+    def test_claim_prevents_double_post(self):
+        schedule = self.store.schedules.add(self.photo, "halo", "2025-01-01 10:00")
+        self.assertEqual(run_schedule(self.client, self.store.schedules, schedule), ("posted", None))
+        self.assertEqual(run_schedule(self.client, self.store.schedules, schedule), (None, None))
+        self.assertEqual(self.client.calls["photo_upload"], 1)
+
+    def test_login_required_resets_client(self):
+        self.store.schedules.add(self.photo, "halo", "2025-01-01 10:00", username="budi")
+        with mock.patch.object(self.client, "photo_upload", side_effect=LoginRequired("expired")):
+            self.daemon.run_due(datetime(2025, 6, 1))
+        self.assertIsNone(self.daemon.client)
+        self.assertEqual(self.daemon.stats, {"posted": 0, "failed": 1})
+
+    def test_idle_story_tick_does_not_login(self):
+        factory = mock.Mock(return_value=self.client)
+        daemon = self._daemon()
+        daemon.client_factory = factory
+        self.assertEqual(daemon.snapshot_stories(daemon.booted_at + 60), 0)
+        factory.assert_not_called()
+        daemon.snapshot_stories(daemon.booted_at + 31 * 60)  # sudah waktunya discover
+        factory.assert_called_once()
+
+    def test_failed_login_backs_off(self):
+        factory = mock.Mock(side_effect=RuntimeError("Login @budi gagal"))
+        daemon = self._daemon()
+        daemon.client_factory = factory
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                daemon._ensure_client()
+        factory.assert_called_once()
+        daemon._login_retry_at = 0  # jeda habis
+        factory.side_effect = None
+        factory.return_value = self.client
+        self.assertIs(daemon._ensure_client(), self.client)
+        self.assertEqual(daemon._login_failures, 0)
+
+    def test_interrupted_jobs_marked_failed(self):
+        schedule = self.store.schedules.add(self.photo, "halo", "2025-01-01 10:00", username="budi")
+        self.store.schedules.claim(schedule["id"])
+        thread = self._serve()
+        self.daemon.stop()
+        thread.join(5)
+        saved = self.store.schedules.get(schedule["id"])
+        self.assertEqual((saved["status"], saved["error"]), ("failed", "terputus saat publish"))
+        self.assertEqual(self.client.calls["photo_upload"], 0)
+
+    def test_control_socket_and_graceful_stop(self):
+        thread = self._serve()
+        control_file = self.daemon.control_file
+        with open(control_file, "r", encoding="utf-8") as f:
+            control = json.load(f)
+        self.assertEqual(control["pid"], os.getpid())
+
+        self.assertEqual(send_command("ping", control_file=control_file)["username"], "budi")
+        added = send_command("add", control_file=control_file, file_path=self.photo, caption="via cli",
+                             post_time="2099-01-01 10:00")
+        self.assertTrue(added["ok"])
+        self.assertEqual(added["schedule"]["username"], "budi")
+        self.assertFalse(send_command("add", control_file=control_file, file_path=self.photo,
+                                      post_time="2099-01-01 10:00", post_type="story")["ok"])
+        self.assertEqual(len(send_command("list", control_file=control_file)["schedules"]), 1)
+        self.assertEqual(send_command("status", control_file=control_file)["pending"], 1)
+        self.assertTrue(send_command("cancel", control_file=control_file, id=added["schedule"]["id"])["ok"])
+
+        with open(control_file, "w", encoding="utf-8") as f:
+            json.dump(dict(control, token="salah"), f)
+        self.assertEqual(send_command("ping", control_file=control_file)["error"], "token salah")
+        with open(control_file, "w", encoding="utf-8") as f:
+            json.dump(control, f)
+
+        self.assertTrue(send_command("stop", control_file=control_file)["ok"])
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(control_file))
+        self.assertIsNone(self.daemon.lock.read_pid())
+        self.assertIsNone(send_command("ping", control_file=control_file))
+
+    def test_second_daemon_refuses_to_start(self):
+        thread = self._serve()
+        self.assertFalse(self._daemon().serve())
+        self.daemon.stop()
+        thread.join(5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
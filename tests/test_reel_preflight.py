@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Reel Preflight (probe, cek spesifikasi, cache transcode)
+
+Run:
+    python -m unittest tests.test_reel_preflight -v
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import unittest
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from unittest import mock
+
+from core import reel_preflight
+from core.reel_preflight import ReelPreflight, check_reel, probe_video
+
+
+def _box(box_type, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def make_mp4(path, width=720, height=1280, duration=10, video="avc1", audio="mp4a", padding=0):
+    """Tulis MP4 sintetis (hanya header + mdat kosong) untuk test probe"""
+    def trak(handler, codec, w=0, h=0):
+        tkhd = _box(b"tkhd", b"\x00" * 76 + struct.pack(">II", w << 16, h << 16))
+        hdlr = _box(b"hdlr", b"\x00" * 8 + handler + b"\x00" * 13)
+        stsd = _box(b"stsd", b"\x00" * 4 + struct.pack(">I", 1) + struct.pack(">I4s", 16, codec.encode()) + b"\x00" * 8)
+        stbl = _box(b"stbl", stsd)
+        return _box(b"trak", tkhd + _box(b"mdia", hdlr + _box(b"minf", stbl)))
+
+    mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, int(duration * 1000)) + b"\x00" * 80)
+    tracks = trak(b"vide", video, width, height)
+    if audio:
+        tracks += trak(b"soun", audio)
+    with open(path, "wb") as f:
+        f.write(_box(b"ftyp", b"isom" + b"\x00" * 4))
+        f.write(_box(b"moov", mvhd + tracks))
+        f.write(_box(b"mdat", os.urandom(64) + b"\x00" * padding))
+    return path
+
+
+class TestReelCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _probe(self, **kwargs):
+        path = make_mp4(os.path.join(self.tmp, "clip.mp4"), **kwargs)
+        with mock.patch.object(reel_preflight.shutil, "which", return_value=None):
+            return probe_video(path)
+
+    def test_compliant_clip(self):
+        info = self._probe()
+        self.assertEqual(info["video_codec"], "h264")
+        self.assertEqual(info["audio_codec"], "aac")
+        self.assertEqual((info["width"], info["height"]), (720, 1280))
+        self.assertEqual(check_reel(info), ([], []))
+
+    def test_fixable_problems(self):
+        info = self._probe(width=2160, height=3840, duration=120, video="hvc1")
+        fatal, fixable = check_reel(info)
+        self.assertEqual(fatal, [])
+        self.assertEqual(len(fixable), 3)  # durasi, codec, resolusi
+
+    def test_fatal_problems(self):
+        self.assertTrue(check_reel(self._probe(duration=1))[0])
+        garbage = os.path.join(self.tmp, "bukan_video.mp4")
+        with open(garbage, "wb") as f:
+            f.write(b"bukan video")
+        self.assertTrue(check_reel(probe_video(garbage))[0])
+
+
+class TestReelPreflightCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "reels")
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.which = mock.patch.object(reel_preflight.shutil, "which", return_value=None)
+        self.which.start()
+
+    def tearDown(self):
+        self.which.stop()
+        self.executor.shutdown(wait=True)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _fake_transcode(self, src, dst, spec=None):
+        shutil.copyfile(src, dst)
+        return dst
+
+    def test_compliant_clip_is_not_transcoded(self):
+        src = make_mp4(os.path.join(self.tmp, "ok.mp4"))
+        pre = ReelPreflight(self.cache_dir, executor=self.executor)
+        with mock.patch.object(reel_preflight, "transcode") as transcode:
+            result = pre.prepare(src)
+        transcode.assert_not_called()
+        self.assertEqual(result["output"], src)
+        self.assertFalse(result["transcoded"])
+
+    def test_same_source_encoded_once(self):
+        src = make_mp4(os.path.join(self.tmp, "big.mp4"), width=2160, height=3840)
+        copy = os.path.join(self.tmp, "big_copy.mp4")
+        shutil.copyfile(src, copy)
+
+        with mock.patch.object(reel_preflight, "transcode", side_effect=self._fake_transcode) as transcode:
+            pre = ReelPreflight(self.cache_dir, executor=self.executor)
+            first = pre.prepare(src)
+            second = pre.prepare(copy)  # isi sama, path beda
+            # Instance baru (restart bot) pakai index di disk
+            third = ReelPreflight(self.cache_dir, executor=self.executor).prepare(src)
+
+        self.assertEqual(transcode.call_count, 1)
+        self.assertTrue(first["transcoded"])
+        self.assertEqual(first["output"], second["output"])
+        self.assertEqual(first["output"], third["output"])
+        self.assertTrue(os.path.exists(first["output"]))
+
+        # Output cache dihapus -> encode ulang
+        os.remove(first["output"])
+        with mock.patch.object(reel_preflight, "transcode", side_effect=self._fake_transcode) as transcode:
+            ReelPreflight(self.cache_dir, executor=self.executor).prepare(src)
+        self.assertEqual(transcode.call_count, 1)
+
+    def test_source_hashed_off_caller_thread(self):
+        src = make_mp4(os.path.join(self.tmp, "ok.mp4"))
+        threads = []
+        original = reel_preflight.file_hash
+        pre = ReelPreflight(self.cache_dir, executor=self.executor)
+        with mock.patch.object(reel_preflight, "file_hash",
+                               side_effect=lambda p: (threads.append(threading.current_thread()), original(p))[1]):
+            self.assertEqual(pre.prepare(src)["output"], src)
+            with self.assertRaises(OSError):
+                pre.prepare(os.path.join(self.tmp, "hilang.mp4"))  # error lewat Future, bukan saat submit
+        pre.shutdown()
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_fatal_result_rechecked_when_tools_change(self):
+        garbage = os.path.join(self.tmp, "bukan_mp4.mkv")
+        with open(garbage, "wb") as f:
+            f.write(b"bukan video")
+        pre = ReelPreflight(self.cache_dir, executor=self.executor)
+        self.assertTrue(pre.prepare(garbage)["fatal"])
+        with mock.patch.object(reel_preflight, "prepare_reel") as prepare_reel:
+            ReelPreflight(self.cache_dir, executor=self.executor).prepare(garbage)  # tool sama: dari cache
+            prepare_reel.assert_not_called()
+            prepare_reel.return_value = {"fatal": [], "fixed": [], "output": garbage, "transcoded": False}
+            with mock.patch.object(reel_preflight, "available_tools", return_value=["ffmpeg", "ffprobe"]):
+                ReelPreflight(self.cache_dir, executor=self.executor).prepare(garbage)
+            prepare_reel.assert_called_once()
+
+
+@unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg tidak tersedia")
+class TestReelTranscode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_transcode_in_process_pool(self):
+        src = os.path.join(self.tmp, "src.mkv")
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=size=320x240:rate=10",
+             "-f", "lavfi", "-i", "sine=frequency=440", "-t", "4",
+             "-c:v", "mpeg4", "-c:a", "libopus", src],
+            check=True,
+        )
+        spec = dict(reel_preflight.REEL_SPEC, max_width=160, max_height=160)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            pre = ReelPreflight(os.path.join(self.tmp, "reels"), executor=executor, spec=spec)
+            first, second = pre.submit(src), pre.submit(src)
+            self.assertIs(first, second)  # job yang sedang jalan dipakai bersama
+            result = first.result(timeout=120)
+
+        self.assertTrue(result["transcoded"])
+        out = result["probe_output"]
+        self.assertEqual((out["container"], out["video_codec"], out["audio_codec"]), ("mp4", "h264", "aac"))
+        self.assertLessEqual(out["width"], 160)
+        self.assertEqual(check_reel(out, spec), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Request Broker (prioritas lane, budget bersama, preempt antar halaman, cooldown)
+
+Run:
+    python -m unittest tests.test_request_broker -v
+"""
+
+import time
+import threading
+import unittest
+from unittest import mock
+
+from instagrapi.exceptions import PleaseWaitFewMinutes
+
+from core import request_broker
+from core.request_broker import RequestBroker
+from tests.fake_instagram import FakeClient
+
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("kondisi tidak tercapai")
+        time.sleep(0.005)
+
+
+class TestRequestBroker(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient(users=500, followers=250, following=120)
+        self.client.login("budi", "rahasia")
+
+    def test_higher_lane_served_first(self):
+        broker = RequestBroker(rate=10, burst=1)
+        broker.acquire("interactive")  # budget habis, semua berikutnya antre
+        order = []
+        threads = []
+        for lane in ("backup", "analytics", "publish"):
+            thread = threading.Thread(target=lambda lane=lane: (broker.acquire(lane), order.append(lane)))
+            thread.start()
+            threads.append(thread)
+            _wait_until(lambda: broker.metrics()[lane]["waiting"] == 1)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, ["publish", "analytics", "backup"])
+        self.assertGreater(broker.metrics()["backup"]["max_wait"], broker.metrics()["publish"]["max_wait"])
+
+    def test_background_waits_for_publish(self):
+        broker = RequestBroker(rate=1000, burst=100)
+        uploading, done = threading.Event(), threading.Event()
+        publisher = threading.Thread(target=broker.call, args=("publish", lambda: (uploading.set(), done.wait(2))))
+        publisher.start()
+        uploading.wait(2)
+
+        served = []
+        backup = threading.Thread(target=broker.call, args=("backup", served.append, "backup"))
+        backup.start()
+        broker.call("interactive", served.append, "interactive")  # menu tetap jalan saat upload
+        _wait_until(lambda: broker.metrics()["backup"]["waiting"] == 1)
+        self.assertEqual(served, ["interactive"])
+
+        done.set()
+        publisher.join()
+        backup.join(2)
+        self.assertEqual(served, ["interactive", "backup"])
+
+    def test_paginate_yields_between_pages(self):
+        broker = RequestBroker(rate=1000, burst=100)
+        client = broker.wrap(self.client, "analytics")
+        pages = client.paginate("user_followers_v1_chunk", self.client.user_id, page_size=100)
+        first = [next(pages) for _ in range(100)]  # halaman pertama habis, halaman kedua belum diminta
+
+        uploading, done = threading.Event(), threading.Event()
+        publisher = threading.Thread(target=broker.call, args=("publish", lambda: (uploading.set(), done.wait(2))))
+        publisher.start()
+        uploading.wait(2)
+        rest = []
+        crawler = threading.Thread(target=lambda: rest.extend(pages))
+        crawler.start()
+        _wait_until(lambda: broker.metrics()["analytics"]["waiting"] == 1)
+        self.assertEqual(self.client.calls["user_followers_v1_chunk"], 1)
+
+        done.set()
+        publisher.join()
+        crawler.join(2)
+        self.assertEqual(self.client.calls["user_followers_v1_chunk"], 3)
+        self.assertEqual({u.pk for u in first + rest}, set(self.client.user_followers(self.client.user_id)))
+
+    def test_please_wait_pauses_every_lane(self):
+        broker = RequestBroker(rate=1000, burst=100, cooldown=0.2)
+        with self.assertRaises(PleaseWaitFewMinutes):
+            broker.call("backup", mock.Mock(side_effect=PleaseWaitFewMinutes("tunggu")))
+        self.assertGreaterEqual(broker.acquire("publish"), 0.15)
+
+    def test_lane_client_passthrough(self):
+        broker = RequestBroker()
+        client = broker.wrap(broker.wrap(self.client, "backup"), "notifications")
+        self.assertIs(client.raw, self.client)
+        self.assertEqual(client.user_id, self.client.user_id)
+        client.user_info_by_username("budi")
+        self.assertEqual(broker.metrics()["notifications"]["requests"], 1)
+        self.assertEqual(broker.metrics()["backup"]["requests"], 0)
+        with self.assertRaises(ValueError):
+            broker.acquire("vip")
+
+    def test_followers_analysis_crawls_per_page(self):
+        from features.analytics.followers_analysis import list_not_followback
+        broker = RequestBroker(rate=1000, burst=100)
+        with mock.patch.object(request_broker, "_shared_broker", broker), \
+                mock.patch("builtins.print"), mock.patch("builtins.input", return_value=""):
+            list_not_followback(self.client, "budi")
+        self.assertEqual(self.client.calls["user_followers_v1_chunk"], 3)
+        self.assertEqual(self.client.calls["user_following"], 0)
+        self.assertGreater(broker.metrics()["analytics"]["requests"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Story Viewers (snapshot sebelum expired, ID array delta-encoded, viewer konsisten)
+
+Run:
+    python -m unittest tests.test_story_viewers -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from core import request_broker
+from core.datastore import DataStore
+from core.story_viewers import StorySnapshotter, SNAPSHOT_OFFSETS, decode_ids, encode_ids
+from tests.fake_instagram import FakeClient
+
+
+def user(pk, username):
+    return SimpleNamespace(pk=pk, username=username)
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip_and_compact(self):
+        self.assertEqual(decode_ids(encode_ids([])), [])
+        ids = [1_000_007, 1_000_001, 1_000_300, 1_000_001]
+        self.assertEqual(decode_ids(encode_ids(ids)), [1_000_001, 1_000_007, 1_000_300])
+        self.assertEqual(decode_ids(encode_ids([2 ** 60, 5])), [5, 2 ** 60])
+
+        dense = range(70_000_000_000, 70_000_000_000 + 1000 * 250, 250)
+        self.assertEqual(len(encode_ids(dense)), 1 + 8 + 999)  # selisih muat 1 byte per viewer
+
+
+class TestStorySnapshotter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.snapshotter = StorySnapshotter(self.store)
+        patcher = mock.patch.object(request_broker, "_shared_broker", request_broker.RequestBroker(rate=1e9, burst=1e9))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = FakeClient(users=50)
+        self.client.login("budi", "rahasia")
+        self.dataset = self.client.dataset
+        self.stories = self.client.user_stories(self.client.user_id)
+        self.client.calls.clear()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_snapshots_before_expiry_with_deltas(self):
+        story = self.stories[0]
+        taken = story.taken_at.timestamp()
+        self.dataset.story_viewers[story.pk] = [1, 2, 3]
+        self.assertEqual(self.snapshotter.snapshot_due(self.client, "budi", now=taken + 60), 0)
+        self.assertEqual(self.client.calls["user_stories"], 1)
+        self.assertEqual(self.client.calls["story_viewers"], 0)
+
+        self.assertGreaterEqual(self.snapshotter.snapshot_due(self.client, "budi", now=taken + SNAPSHOT_OFFSETS[0]), 1)
+        self.dataset.story_viewers[story.pk] = [1, 2, 3, 4, 5]
+        self.snapshotter.snapshot_due(self.client, "budi", now=taken + SNAPSHOT_OFFSETS[1])
+
+        snapshots = self.store.story_viewers.snapshots("budi", story.pk)
+        ids = lambda *indexes: [int(self.dataset.pk_for(i)) for i in indexes]
+        self.assertEqual([decode_ids(s["added"]) for s in snapshots], [ids(1, 2, 3), ids(4, 5)])
+        self.assertEqual(self.snapshotter.viewers("budi", story.pk, seq=0), ids(1, 2, 3))
+        row = self.store.story_viewers.get("budi", story.pk)
+        self.assertEqual((row["viewer_count"], row["next_due"]), (5, None))
+
+    def test_deleted_story_is_not_fetched(self):
+        self.snapshotter.track("budi", "999", 1000, now=1000)
+        self.assertEqual(self.snapshotter.snapshot_due(self.client, "budi", now=1000 + SNAPSHOT_OFFSETS[0]), 0)
+        self.assertEqual(self.client.calls["story_viewers"], 0)
+        self.assertIsNone(self.store.story_viewers.get("budi", "999")["next_due"])
+
+    def test_consistent_viewers_from_local_data(self):
+        day, now = 86400, 200 * 86400
+        for n in range(100):  # 1 story per hari, 100 hari terakhir
+            taken = now - (n + 1) * day
+            self.snapshotter.track("budi", f"s{n}", taken, now=taken)
+            loyal = [user(7, "setia")] if n % 10 else []
+            rotating = [user(100 + n % 3, f"u{n % 3}")]
+            self.snapshotter.observe("budi", f"s{n}", loyal + rotating + [user(500 + n, "sekali")], taken + 3600)
+
+        result = self.snapshotter.consistent_viewers("budi", days=90, limit=3, now=now)
+        self.assertEqual(result["stories"], 90)
+        top = result["viewers"]
+        self.assertEqual((top[0]["user_id"], top[0]["username"], top[0]["seen"]), (7, "setia", 81))
+        self.assertAlmostEqual(top[0]["ratio"], 0.9)
+        self.assertTrue({v["user_id"] for v in top[1:]} < {100, 101, 102})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
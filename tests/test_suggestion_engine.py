@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Suggestion Engine (caption & hashtag)
+
+Run:
+    python -m unittest tests.test_suggestion_engine -v
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from core.analytics import Analytics
+from core.datastore import DataStore
+from core.suggestion_engine import SuggestionEngine
+
+
+def make_media(media_id, caption, likes, comments=0):
+    return SimpleNamespace(
+        id=media_id, caption_text=caption, like_count=likes,
+        comment_count=comments, media_type=1, taken_at=datetime.now(),
+    )
+
+
+class TestSuggestionEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataStore(os.path.join(self.tmp, "bot.db"))
+        self.analytics = Analytics(log_dir=os.path.join(self.tmp, "logs"), datastore=self.store)
+        self.engine = SuggestionEngine(os.path.join(self.tmp, "corpus"), self.analytics)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_lazy_load_and_seed(self):
+        self.assertFalse(self.engine._loaded)
+        self.assertFalse(os.path.exists(self.engine.index_file))
+        captions = self.engine.suggest_captions("casual", count=3)
+        self.assertEqual(len(captions), 3)
+        self.assertTrue(self.engine._loaded)
+        self.assertTrue(os.path.exists(self.engine.index_file))
+
+    def test_index_reused_until_corpus_changes(self):
+        self.engine.suggest_hashtags("food")
+        mtime = os.path.getmtime(self.engine.index_file)
+
+        fresh = SuggestionEngine(self.engine.corpus_dir, self.analytics)
+        fresh.suggest_hashtags("food")
+        self.assertEqual(os.path.getmtime(fresh.index_file), mtime)
+
+        with open(fresh.hashtags_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"tag": "kopisenja", "category": "food"}) + "\n")
+        fresh.reload()
+        self.assertIn("kopisenja", [h["tag"] for h in fresh.hashtags])
+
+    def test_hashtags_match_keyword_and_prefix(self):
+        tags = self.engine.suggest_hashtags("travel", count=5)
+        self.assertEqual(len(tags), 5)
+        self.assertTrue(all(t in {h["tag"] for h in self.engine.hashtags
+                                  if h["category"] == "travel"} for t in tags))
+
+        prefix_tags = self.engine.suggest_hashtags("fitn", count=20)
+        self.assertIn("fitness", prefix_tags)
+
+    def test_unknown_keyword_falls_back_to_general(self):
+        tags = self.engine.suggest_hashtags("zzzqqq", count=3)
+        self.assertEqual(len(tags), 3)
+
+    def test_history_boosts_well_performing_tags(self):
+        medias = [make_media(i, "Just vibing #wanderlust", 500) for i in range(10)]
+        medias += [make_media(100 + i, "Just vibing #vacation", 5) for i in range(10)]
+        self.analytics.track_medias("me", medias)
+
+        self.engine._ensure_loaded()
+        self.engine._ensure_performance()
+        self.assertGreater(self.engine._tag_boost["wanderlust"], 1.0)
+        self.assertLess(self.engine._tag_boost["vacation"], 1.0)
+
+        wins = 0
+        for _ in range(20):
+            tags = self.engine.suggest_hashtags("travel", count=20)
+            if tags.index("wanderlust") < tags.index("vacation"):
+                wins += 1
+        self.assertEqual(wins, 20)
+
+    def test_history_boosts_caption_templates(self):
+        log_dir = self.analytics.log_dir
+        with open(self.analytics.post_history, "w", encoding="utf-8") as f:  # histori lama: di-import sekali
+            f.write(json.dumps({"username": "me", "media_id": "lama", "caption": "Just vibing 🌊\n#santai",
+                                "likes": 400, "comments": 0}) + "\n")
+        analytics = Analytics(log_dir=log_dir, datastore=self.store)
+        engine = SuggestionEngine(self.engine.corpus_dir, analytics)
+        analytics.track_medias("me", [make_media(i, "Just vibing 🌊", 500) for i in range(5)])
+        analytics.track_medias("me", [make_media(10 + i, "Living that life 📸", 5) for i in range(5)])
+
+        engine._ensure_loaded()
+        engine._ensure_performance("me")
+        vibing = engine._template_by_text["Just vibing 🌊"]
+        self.assertGreater(engine._caption_boost[vibing], 1.0)
+        self.assertLess(engine._caption_boost[engine._template_by_text["Living that life 📸"]], 1.0)
+        self.assertEqual(analytics.caption_totals("me")["Just vibing 🌊"], (6, 2900))
+
+        analytics.track_medias("me", [make_media(0, "Just vibing 🌊", 0)])
+        engine._ensure_performance("me")  # data berubah -> boost dihitung ulang
+        self.assertEqual(analytics.caption_totals("me")["Just vibing 🌊"], (6, 2400))
+
+    def test_unchanged_snapshots_not_appended(self):
+        medias = [make_media(i, "Just vibing", 10, 1) for i in range(10)]
+        self.assertEqual(self.analytics.track_medias("me", medias), 10)
+        self.assertEqual(self.analytics.track_medias("me", medias), 0)
+        medias[3].like_count = 11
+        self.assertEqual(self.analytics.track_medias("me", medias), 1)
+        with open(self.analytics.post_history, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 11)
+        self.assertEqual(self.analytics.get_latest_posts("me")["3"]["likes"], 11)
+
+    def test_large_corpus_latency(self):
+        os.makedirs(self.engine.corpus_dir, exist_ok=True)
+        with open(self.engine.templates_file, "w", encoding="utf-8") as f:
+            for i in range(20000):
+                f.write(json.dumps({"text": f"template {i} sunset beach{i % 50}",
+                                    "mood": ["casual", "funny"][i % 2]}) + "\n")
+        with open(self.engine.hashtags_file, "w", encoding="utf-8") as f:
+            for i in range(30000):
+                f.write(json.dumps({"tag": f"tag{i}", "category": f"cat{i % 100}"}) + "\n")
+
+        self.engine._ensure_loaded()
+        start = time.perf_counter()
+        for _ in range(20):
+            self.engine.suggest_hashtags("cat7 tag123", count=10)
+            self.engine.suggest_captions("casual", "beach7", count=5)
+        per_call = (time.perf_counter() - start) / 40
+        self.assertLess(per_call, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Thumbnail Cache (cache per hash, contact sheet, frame video)
+
+Run:
+    python -m unittest tests.test_thumbnail_cache -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import subprocess
+from unittest import mock
+
+from PIL import Image
+
+from core import thumbnail_cache
+from core.media_library import file_hash
+from core.thumbnail_cache import ThumbnailCache
+
+
+class TestThumbnailCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = ThumbnailCache(os.path.join(self.tmp, "thumbs"), max_workers=2)
+
+    def tearDown(self):
+        self.cache.shutdown()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _entry(self, name, color=(255, 0, 0), size=(800, 600), kind="image"):
+        path = os.path.join(self.tmp, name)
+        Image.new("RGB", size, color).save(path, "JPEG")
+        return {"path": path, "name": name, "kind": kind, "hash": file_hash(path)}
+
+    def test_thumbnail_is_small_and_keyed_by_hash(self):
+        entry = self._entry("a.jpg")
+        thumb = self.cache.get(entry)
+        self.assertEqual(thumb, self.cache.path_for(entry["hash"]))
+        with Image.open(thumb) as img:
+            self.assertLessEqual(max(img.size), 160)
+
+    def test_same_content_rendered_once(self):
+        first = self._entry("a.jpg")
+        copy = dict(first, path=os.path.join(self.tmp, "a_copy.jpg"), name="a_copy.jpg")
+        shutil.copy(first["path"], copy["path"])
+        with mock.patch.object(thumbnail_cache, "render_thumbnail", wraps=thumbnail_cache.render_thumbnail) as spy:
+            thumbs = self.cache.get_many([first, copy, first])
+            self.cache.get(copy)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(len(set(thumbs.values())), 1)
+
+    def test_contact_sheet_reads_only_cache(self):
+        entries = [self._entry(f"{i}.jpg", color=(i * 30, 0, 0)) for i in range(7)]
+        self.cache.get_many(entries)
+        out = os.path.join(self.tmp, "sheet.jpg")
+        with mock.patch.object(thumbnail_cache, "render_thumbnail") as render:
+            self.assertEqual(self.cache.contact_sheet(entries, out, columns=3), out)
+        render.assert_not_called()
+        with Image.open(out) as sheet:
+            self.assertEqual(sheet.width, 3 * (160 + 8) + 8)
+
+    def test_broken_file_gives_none(self):
+        path = os.path.join(self.tmp, "rusak.jpg")
+        with open(path, "wb") as f:
+            f.write(b"bukan gambar")
+        entry = {"path": path, "name": "rusak.jpg", "kind": "image", "hash": file_hash(path)}
+        self.assertIsNone(self.cache.get(entry))
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg tidak tersedia")
+    def test_video_frame(self):
+        path = os.path.join(self.tmp, "clip.mp4")
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=size=320x240:rate=10",
+             "-t", "0.5", "-pix_fmt", "yuv420p", path],
+            check=True,
+        )
+        entry = {"path": path, "name": "clip.mp4", "kind": "video", "hash": file_hash(path)}
+        with Image.open(self.cache.get(entry)) as img:
+            self.assertEqual(img.size, (160, 120))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark accounts.db: pola lama (connect per operasi) vs core.account_db
+
+Run:
+    python tools/bench_account_db.py [jumlah_operasi]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.account_db import AccountDB, SQL
+
+def _timed(func, n):
+    start = time.perf_counter()
+    for i in range(n):
+        func(i)
+    return (time.perf_counter() - start) / n * 1e6  # mikrodetik per operasi
+
+def bench(n=2000, users=1000):
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "accounts.db")
+    db = AccountDB(db_path)
+    for i in range(users):
+        db.create_user(f"user{i}", f"User {i}", f"user{i}@mail.com", "x" * 64)
+
+    # --- Pola lama: buka koneksi, satu statement, tutup ---
+    def old_lookup(i):
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM users WHERE username = ?", (f"user{i % users}",))
+        cursor.fetchone()
+        conn.close()
+
+    def old_update(i):
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute(SQL["update_bio"], (f"bio {i}", "now", i % users + 1))
+        conn.commit()
+        conn.close()
+
+    # --- Koneksi bersama ---
+    def new_lookup(i):
+        db.get_by_username(f"user{i % users}")
+
+    def new_update(i):
+        db.update_user(i % users + 1, "bio", f"bio {i}")
+
+    results = [
+        ("lookup username", _timed(old_lookup, n), _timed(new_lookup, n)),
+        ("update bio", _timed(old_update, n), _timed(new_update, n)),
+    ]
+    db.close()
+    return results
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'operasi':<18}{'lama (us/op)':>14}{'baru (us/op)':>14}{'speedup':>10}")
+    for name, old, new in bench(n):
+        print(f"{name:<18}{old:>14.1f}{new:>14.1f}{old / new:>9.1f}x")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Rekam cassette trafik akun sendiri (read-only) untuk benchmark & test offline
+
+Run:
+    python tools/record_cassette.py akunku [output.jsonl.gz] [--flows overview,followers,stories,inbox] [--pages 3]
+
+Cassette default: data/cassettes/<akun>.jsonl.gz. Upload tidak direkam (akan benar-benar posting);
+jalur scheduling di-benchmark dengan FakeClient.
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.account_snapshot import AccountOverviewLoader, DEFAULT_MEDIA_AMOUNT
+from core.cassette import CASSETTE_DIR, record
+from core.login_manager import LoginManager
+from core.request_broker import get_broker, DEFAULT_PAGE_SIZE
+
+def _crawl(client, method, pages):
+    """Crawl paginasi persis seperti fitur (lewat broker, ukuran halaman sama) supaya replay cocok"""
+    return sum(1 for _ in get_broker().paginate("analytics", getattr(client, method), client.user_id,
+                                                limit=pages * DEFAULT_PAGE_SIZE))
+
+# nama flow -> fungsi(client, username, pages); request-nya sama dengan yang dipakai fitur
+FLOWS = {
+    "overview": lambda client, username, pages: [
+        fetch(client, username, DEFAULT_MEDIA_AMOUNT) for fetch in AccountOverviewLoader.PARTS.values()
+    ],
+    "followers": lambda client, username, pages: (
+        _crawl(client, "user_followers_v1_chunk", pages),
+        _crawl(client, "user_following_v1_chunk", pages),
+    ),
+    "stories": lambda client, username, pages: client.user_stories(client.user_id),
+    "inbox": lambda client, username, pages: client.direct_threads(amount=10),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rekam cassette instagrapi akun sendiri")
+    parser.add_argument("username")
+    parser.add_argument("output", nargs="?")
+    parser.add_argument("--flows", default=",".join(FLOWS))
+    parser.add_argument("--pages", type=int, default=3, help="Halaman per crawl paginasi")
+    args = parser.parse_args(argv)
+
+    manager = LoginManager()
+    account = next((a for a in manager.get_accounts() if a["username"] == args.username), None)
+    if not account:
+        print(f"Akun @{args.username} tidak ada di accounts.db")
+        return 1
+    client = manager.login(account["username"], account["password"])
+    if not client:
+        print(f"Login @{args.username} gagal")
+        return 1
+
+    output = args.output or os.path.join(CASSETTE_DIR, f"{args.username}.jsonl.gz")
+    with record(client, output) as recorder:
+        for name in args.flows.split(","):
+            try:
+                FLOWS[name.strip()](client, args.username, args.pages)
+                print(f"✅ {name}: total {len(recorder.entries)} request")
+            except Exception as e:
+                print(f"⚠️ {name} gagal: {e}")
+    print(f"📼 {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
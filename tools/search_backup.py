@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cari post sendiri di backup (index FTS5 di data/bot.db, tanpa login / request)
+
+Run:
+    python tools/search_backup.py akunku "pantai sunset"
+    python tools/search_backup.py akunku "#kopi" --since 2023-01-01 --min-likes 100
+    python tools/search_backup.py akunku "ongkir" --comments   # + komentar di post sendiri
+
+Index diupdate otomatis setelah backup; snapshot yang belum di-index ikut di-index saat tool ini jalan.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.backup_search import BACKUP_BASE, BackupSearch
+from core.datastore import get_datastore
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cari post di backup (caption, #hashtag, lokasi)")
+    parser.add_argument("username")
+    parser.add_argument("query", nargs="?", default="", help='Kata kunci, "#tag", "kata*"; kosong = terbaru')
+    parser.add_argument("--since", help="YYYY-MM-DD")
+    parser.add_argument("--until", help="YYYY-MM-DD (eksklusif)")
+    parser.add_argument("--min-likes", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--comments", action="store_true", help="Cari juga di komentar post sendiri")
+    parser.add_argument("--backups", default=BACKUP_BASE, help="Folder backup")
+    args = parser.parse_args(argv)
+
+    search = BackupSearch(get_datastore(), backup_base=args.backups)
+    search.sync(args.username)
+    started = time.perf_counter()
+    posts = search.search(args.username, args.query, args.since, args.until, args.min_likes, args.limit)
+    comments = search.search_comments(args.username, args.query, args.limit) if args.comments and args.query else []
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for post in posts:
+        print(f"{(post['taken_at'] or '')[:10]}  {post['media_id']}  ❤️ {post['likes']}  💬 {post['comments']}"
+              f"{'  📍 ' + post['location'] if post['location'] else ''}")
+        print(f"    {post['snippet'] or post['caption'][:100]}")
+    for comment in comments:
+        print(f"💬 @{comment['author']} di {comment['media_id']}: {comment['snippet']}")
+    print(f"🔎 {len(posts)} post{f', {len(comments)} komentar' if args.comments else ''} "
+          f"dari {search.repo.count(args.username)} ter-index ({elapsed:.1f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())